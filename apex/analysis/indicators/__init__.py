@@ -0,0 +1,19 @@
+"""
+Apex Indicators Module
+
+Technical indicators, per-frame memoization, incremental updates and the
+array kernels behind the path-dependent loops.
+
+Kernel backend (Numba when installed, NumPy otherwise):
+    from analysis.indicators import set_backend
+    set_backend('numpy')
+"""
+
+from .kernels import BACKENDS, NUMBA_AVAILABLE, get_backend, set_backend
+
+__all__ = [
+    'BACKENDS',
+    'NUMBA_AVAILABLE',
+    'get_backend',
+    'set_backend',
+]
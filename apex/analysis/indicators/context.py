@@ -0,0 +1,100 @@
+"""
+Indicator Context
+Per-frame memoization of indicator series.
+
+Strategies that look at the same candles (e.g. the members of a
+StrategyEnsemble) draw indicators from one shared context, so each
+(indicator, params) series is computed once per tick however many strategies
+use it.
+"""
+
+from typing import Callable, Dict, Hashable, Tuple
+import pandas as pd
+
+from analysis.indicators.technical import (
+    calculate_sma, calculate_ema, calculate_rsi, calculate_macd,
+    calculate_atr, calculate_adx
+)
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class IndicatorContext:
+    """
+    Memoized indicators over one OHLCV frame.
+
+    Example:
+        context = IndicatorContext(data)
+        rsi = context.rsi(14)        # computed
+        rsi = context.rsi(14)        # cached
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._cache: Dict[Tuple[str, Hashable], object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def covers(self, data: pd.DataFrame) -> bool:
+        """Whether data holds the same candles as this context's frame (e.g. a copy of it)"""
+        if data is self.data:
+            return True
+        if len(data) != len(self.data) or not data.index.equals(self.data.index):
+            return False
+        columns = [c for c in OHLCV_COLUMNS if c in self.data.columns]
+        return all(c in data.columns and data[c].equals(self.data[c]) for c in columns)
+
+    def get(self, name: str, params: Hashable, compute: Callable[[], object]):
+        """Return the cached value for (name, params), computing it on first use"""
+        key = (name, params)
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        value = compute()
+        self._cache[key] = value
+        return value
+
+    def sma(self, period: int, column: str = 'close') -> pd.Series:
+        return self.get('sma', (column, period), lambda: calculate_sma(self.data[column], period))
+
+    def ema(self, period: int, column: str = 'close') -> pd.Series:
+        return self.get('ema', (column, period), lambda: calculate_ema(self.data[column], period))
+
+    def rolling_std(self, period: int, column: str = 'close') -> pd.Series:
+        return self.get('rolling_std', (column, period),
+                        lambda: self.data[column].rolling(window=period).std())
+
+    def rolling_max(self, period: int, column: str = 'high') -> pd.Series:
+        return self.get('rolling_max', (column, period),
+                        lambda: self.data[column].rolling(window=period).max())
+
+    def rolling_min(self, period: int, column: str = 'low') -> pd.Series:
+        return self.get('rolling_min', (column, period),
+                        lambda: self.data[column].rolling(window=period).min())
+
+    def rsi(self, period: int = 14, column: str = 'close') -> pd.Series:
+        return self.get('rsi', (column, period), lambda: calculate_rsi(self.data[column], period))
+
+    def macd(self, fast: int = 12, slow: int = 26,
+             signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        return self.get('macd', (fast, slow, signal),
+                        lambda: calculate_macd(self.data['close'], fast, slow, signal))
+
+    def bollinger_bands(self, period: int = 20,
+                        std_dev: float = 2.0) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        def compute():
+            middle = self.sma(period)
+            std = self.rolling_std(period)
+            return middle + (std * std_dev), middle, middle - (std * std_dev)
+        return self.get('bollinger_bands', (period, std_dev), compute)
+
+    def atr(self, period: int = 14) -> pd.Series:
+        return self.get('atr', period, lambda: calculate_atr(
+            self.data['high'], self.data['low'], self.data['close'], period))
+
+    def adx(self, period: int = 14) -> pd.Series:
+        return self.get('adx', period, lambda: calculate_adx(
+            self.data['high'], self.data['low'], self.data['close'], period))
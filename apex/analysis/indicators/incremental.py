@@ -0,0 +1,305 @@
+"""
+Incremental Technical Indicators
+Stateful O(1)-per-update counterparts of the functions in technical.py.
+
+Each indicator keeps its rolling state, so a paper/live loop can push one new
+candle instead of recomputing the whole history. Values match the pandas
+versions (NaN during warm-up, same edge cases).
+"""
+
+from collections import deque
+from typing import Tuple
+import math
+
+
+NAN = float('nan')
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """Division with pandas/NumPy semantics for zero denominators"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+class RollingMean:
+    """
+    Fixed-window mean, NaN while the window is not full or contains NaN.
+    Equivalent to Series.rolling(window=period).mean(), including its exact
+    result for a window of identical values.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._nan_count = 0
+        self._same_run = 0
+        self._last = NAN
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._window.append(x)
+        if math.isnan(x):
+            self._nan_count += 1
+        else:
+            self._sum += x
+        self._same_run = self._same_run + 1 if x == self._last else 1
+        self._last = x
+
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if math.isnan(old):
+                self._nan_count -= 1
+            else:
+                self._sum -= old
+
+        if len(self._window) < self.period or self._nan_count:
+            self.value = NAN
+        elif self._same_run >= self.period:
+            self.value = x
+        else:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class RollingStd:
+    """
+    Fixed-window sample standard deviation (ddof=1), NaN while the window is
+    not full or contains NaN. Equivalent to Series.rolling(window=period).std().
+
+    Follows pandas' compensated Welford updates (remove the oldest value,
+    then add the newest) so rounding matches as well.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque()
+        self._nan_count = 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self.value = NAN
+
+    def _add(self, x: float):
+        self._n += 1
+        prev_mean = self._mean - self._add_compensation
+        y = x - self._add_compensation
+        t = y - self._mean
+        self._add_compensation = t + self._mean - y
+        self._mean += t / self._n
+        self._m2 += (x - prev_mean) * (x - self._mean)
+
+    def _remove(self, x: float):
+        self._n -= 1
+        if self._n == 0:
+            self._mean = self._m2 = 0.0
+            return
+        prev_mean = self._mean - self._remove_compensation
+        y = x - self._remove_compensation
+        t = y - self._mean
+        self._remove_compensation = t + self._mean - y
+        self._mean -= t / self._n
+        self._m2 -= (x - prev_mean) * (x - self._mean)
+
+    def update(self, x: float) -> float:
+        self._window.append(x)
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if math.isnan(old):
+                self._nan_count -= 1
+            else:
+                self._remove(old)
+
+        if math.isnan(x):
+            self._nan_count += 1
+        else:
+            self._add(x)
+
+        if len(self._window) < self.period or self._nan_count:
+            self.value = NAN
+        else:
+            self.value = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+        return self.value
+
+
+class RollingExtreme:
+    """
+    Fixed-window max (or min) using a monotonic deque.
+    Equivalent to Series.rolling(window=period).max() / .min().
+    """
+
+    def __init__(self, period: int, mode: str = 'max'):
+        self.period = period
+        self._better = (lambda a, b: a >= b) if mode == 'max' else (lambda a, b: a <= b)
+        self._candidates = deque()  # (index, value), best first
+        self._count = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        while self._candidates and self._better(x, self._candidates[-1][1]):
+            self._candidates.pop()
+        self._candidates.append((self._count, x))
+        self._count += 1
+
+        while self._candidates[0][0] <= self._count - 1 - self.period:
+            self._candidates.popleft()
+
+        self.value = self._candidates[0][1] if self._count >= self.period else NAN
+        return self.value
+
+
+class IncrementalSMA:
+    """Simple Moving Average, see calculate_sma()"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._mean = RollingMean(period)
+        self.value = NAN
+
+    def update(self, price: float) -> float:
+        self.value = self._mean.update(price)
+        return self.value
+
+
+class IncrementalEMA:
+    """Exponential Moving Average (adjust=False), see calculate_ema()"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.value = NAN
+
+    def update(self, price: float) -> float:
+        if math.isnan(self.value):
+            self.value = price
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * price
+        return self.value
+
+
+class IncrementalRSI:
+    """Relative Strength Index (simple average of gains/losses), see calculate_rsi()"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gain = RollingMean(period)
+        self._loss = RollingMean(period)
+        self._prev_close = None
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        # pandas' where() turns the first (NaN) delta into a zero gain/loss
+        delta = 0.0 if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+
+        rs = _div(gain, loss)
+        self.value = 100 - _div(100, 1 + rs)
+        return self.value
+
+
+class _TrueRange:
+    """True range of the latest candle (high - low on the first candle)"""
+
+    def __init__(self):
+        self._prev_close = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return tr
+
+
+class IncrementalATR:
+    """Average True Range, see calculate_atr()"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._tr = _TrueRange()
+        self._mean = RollingMean(period)
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.value = self._mean.update(self._tr.update(high, low, close))
+        return self.value
+
+
+class IncrementalADX:
+    """Average Directional Index, see calculate_adx()"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._tr = _TrueRange()
+        self._atr = RollingMean(period)
+        self._plus_dm = RollingMean(period)
+        self._minus_dm = RollingMean(period)
+        self._dx = RollingMean(period)
+        self._prev_high = None
+        self._prev_low = None
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_high is None:
+            plus_dm = minus_dm = 0.0
+        else:
+            up = high - self._prev_high
+            down = self._prev_low - low
+            plus_dm = up if (up > 0 and up > down) else 0.0
+            minus_dm = down if (down > 0 and down > up) else 0.0
+        self._prev_high = high
+        self._prev_low = low
+
+        atr = self._atr.update(self._tr.update(high, low, close))
+        plus_di = _div(100 * self._plus_dm.update(plus_dm), atr)
+        minus_di = _div(100 * self._minus_dm.update(minus_dm), atr)
+
+        dx = _div(100 * abs(plus_di - minus_di), plus_di + minus_di)
+        self.value = self._dx.update(dx)
+        return self.value
+
+
+class IncrementalStochastic:
+    """Stochastic Oscillator, see calculate_stochastic()"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.k_period = k_period
+        self.d_period = d_period
+        self._lowest = RollingExtreme(k_period, 'min')
+        self._highest = RollingExtreme(k_period, 'max')
+        self._d = RollingMean(d_period)
+        self.k = NAN
+        self.d = NAN
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        lowest_low = self._lowest.update(low)
+        highest_high = self._highest.update(high)
+
+        self.k = _div(100 * (close - lowest_low), highest_high - lowest_low)
+        self.d = self._d.update(self.k)
+        return self.k, self.d
+
+
+class IncrementalVWAP:
+    """Cumulative Volume Weighted Average Price, see calculate_vwap()"""
+
+    def __init__(self):
+        self._price_volume = 0.0
+        self._volume = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        typical_price = (high + low + close) / 3
+        self._price_volume += typical_price * volume
+        self._volume += volume
+        self.value = _div(self._price_volume, self._volume)
+        return self.value
@@ -0,0 +1,281 @@
+"""
+Indicator Kernels
+Array kernels for the path-dependent hot loops: true range, ADX smoothing,
+the stop-loss/take-profit exit scan and trailing stops over a price path.
+
+Two backends implement every kernel:
+- 'numpy': vectorized NumPy, always available
+- 'numba': compiled loops, used by default when Numba is installed
+
+The backend is selected once for the whole package, either with
+set_backend() or with the APEX_INDICATOR_BACKEND environment variable.
+"""
+
+import logging
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ('numpy', 'numba')
+
+_backend = 'numba' if NUMBA_AVAILABLE else 'numpy'
+
+
+def get_backend() -> str:
+    """Name of the active kernel backend"""
+    return _backend
+
+
+def set_backend(name: str):
+    """
+    Select the kernel backend.
+
+    Args:
+        name: 'numpy' or 'numba'
+
+    Raises:
+        ValueError: Unknown backend
+        ImportError: 'numba' requested but Numba isn't installed
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend '{name}', expected one of {BACKENDS}")
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        raise ImportError("Numba is not installed; use the 'numpy' backend")
+    _backend = name
+
+
+# Compiled loops. Each is a plain Python function first, so the loop logic
+# can be checked against the NumPy backend without Numba installed.
+
+def _true_range_loop(high, low, close):
+    n = len(high)
+    tr = np.empty(n)
+    if n == 0:
+        return tr
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        tr[i] = np.fmax(np.fmax(high[i] - low[i], abs(high[i] - close[i - 1])),
+                        abs(low[i] - close[i - 1]))
+    return tr
+
+
+def _rolling_mean_loop(values, period):
+    n = len(values)
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        total = 0.0
+        for j in range(i - period + 1, i + 1):
+            total += values[j]
+        out[i] = total / period
+    return out
+
+
+def _adx_loop(high, low, close, period):
+    n = len(high)
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    for i in range(1, n):
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        if up > 0 and up > down:
+            plus_dm[i] = up
+        if down > 0 and down > up:
+            minus_dm[i] = down
+
+    atr = _rolling_mean_loop(_true_range_loop(high, low, close), period)
+    plus_avg = _rolling_mean_loop(plus_dm, period)
+    minus_avg = _rolling_mean_loop(minus_dm, period)
+
+    dx = np.empty(n)
+    for i in range(n):
+        plus_di = 100 * plus_avg[i] / atr[i]
+        minus_di = 100 * minus_avg[i] / atr[i]
+        dx[i] = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _rolling_mean_loop(dx, period)
+
+
+def _exit_scan_loop(start, low, high, sell, stop_loss, take_profit):
+    for i in range(start, len(low)):
+        if low[i] <= stop_loss or high[i] >= take_profit or sell[i]:
+            return i
+    return -1
+
+
+def _trail_stop(extreme, is_sell, trail_amount, trail_percent):
+    if is_sell:
+        if trail_amount:
+            return extreme - trail_amount
+        return extreme * (1 - trail_percent / 100)
+    if trail_amount:
+        return extreme + trail_amount
+    return extreme * (1 + trail_percent / 100)
+
+
+def _trailing_stop_loop(prices, is_sell, trail_amount, trail_percent, extreme):
+    stop = _trail_stop(extreme, is_sell, trail_amount, trail_percent)
+    for i in range(len(prices)):
+        price = prices[i]
+        if is_sell:
+            if price > extreme:
+                extreme = price
+                stop = _trail_stop(extreme, is_sell, trail_amount, trail_percent)
+            if price <= stop:
+                return i, extreme, stop
+        else:
+            if price < extreme:
+                extreme = price
+                stop = _trail_stop(extreme, is_sell, trail_amount, trail_percent)
+            if price >= stop:
+                return i, extreme, stop
+    return -1, extreme, stop
+
+
+if NUMBA_AVAILABLE:
+    _jit = njit(cache=True, error_model='numpy')
+    # Helpers first: compiled loops resolve the functions they call as globals
+    _true_range_loop = _jit(_true_range_loop)
+    _rolling_mean_loop = _jit(_rolling_mean_loop)
+    _trail_stop = _jit(_trail_stop)
+    _adx_loop = _jit(_adx_loop)
+    _exit_scan_loop = _jit(_exit_scan_loop)
+    _trailing_stop_loop = _jit(_trailing_stop_loop)
+
+
+def _float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Mean of each full window of `period` values, NaN before the first"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        out[period - 1:] = windows.mean(axis=1)
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range: max(high - low, |high - prev close|, |low - prev close|).
+
+    The first candle has no previous close, so its range is high - low.
+    """
+    high, low, close = _float_array(high), _float_array(low), _float_array(close)
+    if _backend == 'numba':
+        return _true_range_loop(high, low, close)
+
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax ignores the missing previous close like DataFrame.max() does
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)),
+                   np.abs(low - prev_close))
+
+
+def adx(high, low, close, period: int = 14) -> np.ndarray:
+    """Average Directional Index with simple moving average smoothing"""
+    high, low, close = _float_array(high), _float_array(low), _float_array(close)
+    if _backend == 'numba':
+        return _adx_loop(high, low, close, period)
+
+    up = np.diff(high, prepend=np.nan)
+    down = -np.diff(low, prepend=np.nan)
+    plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+    minus_dm = np.where((down > 0) & (down > up), down, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        atr = _rolling_mean(true_range(high, low, close), period)
+        plus_di = 100 * _rolling_mean(plus_dm, period) / atr
+        minus_di = 100 * _rolling_mean(minus_dm, period) / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _rolling_mean(dx, period)
+
+
+def exit_scan(start: int, low, high, sell, stop_loss: float, take_profit: float) -> int:
+    """
+    Index of the first candle at or after start that exits a long position
+    (low reaches the stop, high reaches the target, or a sell signal).
+
+    Returns:
+        Candle index, or -1 if the position is still open at the end
+    """
+    if _backend == 'numba':
+        return int(_exit_scan_loop(start, low, high, sell, stop_loss, take_profit))
+
+    # Scan in growing chunks so short trades don't touch the whole history
+    n = len(low)
+    window = 256
+    while start < n:
+        end = min(start + window, n)
+        hits = np.flatnonzero(
+            (low[start:end] <= stop_loss) |
+            (high[start:end] >= take_profit) |
+            sell[start:end]
+        )
+        if len(hits):
+            return start + int(hits[0])
+        start = end
+        window *= 2
+    return -1
+
+
+def trailing_stop_scan(prices, is_sell: bool, trail_amount: float,
+                       trail_percent: float, extreme: float) -> Tuple[int, float, float]:
+    """
+    Run an activated trailing stop over a price path.
+
+    Args:
+        prices: Market prices in order
+        is_sell: True for a SELL stop (trails the highest price)
+        trail_amount: Fixed trail (0 to use trail_percent)
+        trail_percent: Percentage trail
+        extreme: Highest (SELL) / lowest (BUY) price seen so far
+
+    Returns:
+        (index of the triggering price or -1, extreme, stop price) where the
+        last two are the state at the trigger or at the end of the path
+    """
+    prices = _float_array(prices)
+    trail_amount = float(trail_amount or 0.0)
+    trail_percent = float(trail_percent or 0.0)
+    if _backend == 'numba':
+        index, extreme, stop = _trailing_stop_loop(prices, is_sell, trail_amount,
+                                                   trail_percent, extreme)
+        return int(index), float(extreme), float(stop)
+
+    accumulate = np.maximum.accumulate if is_sell else np.minimum.accumulate
+    start = 0
+    window = 256
+    while start < len(prices):
+        chunk = prices[start:start + window]
+        extremes = accumulate(np.concatenate(([extreme], chunk)))[1:]
+        if is_sell:
+            stops = extremes - trail_amount if trail_amount else extremes * (1 - trail_percent / 100)
+            hits = np.flatnonzero(chunk <= stops)
+        else:
+            stops = extremes + trail_amount if trail_amount else extremes * (1 + trail_percent / 100)
+            hits = np.flatnonzero(chunk >= stops)
+        if len(hits):
+            i = int(hits[0])
+            return start + i, float(extremes[i]), float(stops[i])
+        extreme = float(extremes[-1])
+        start += len(chunk)
+        window *= 2
+
+    return -1, extreme, _trail_stop(extreme, is_sell, trail_amount, trail_percent)
+
+
+_env_backend = os.getenv('APEX_INDICATOR_BACKEND')
+if _env_backend:
+    try:
+        set_backend(_env_backend)
+    except (ValueError, ImportError) as e:
+        logging.warning(f"Ignoring APEX_INDICATOR_BACKEND: {e}")
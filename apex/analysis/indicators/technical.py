@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, Optional
 
+from . import kernels
+
 
 def calculate_sma(data: pd.Series, period: int) -> pd.Series:
     """Simple Moving Average"""
@@ -100,10 +102,7 @@ def calculate_atr(high: pd.Series,
     Returns:
         ATR values
     """
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    tr = pd.Series(kernels.true_range(high, low, close), index=high.index)
     atr = tr.rolling(window=period).mean()
     
     return atr
@@ -152,30 +151,8 @@ def calculate_adx(high: pd.Series,
     Returns:
         ADX values
     """
-    # True Range
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    # Plus Directional Movement (+DM)
-    plus_dm = high.diff()
-    plus_dm = plus_dm.where((plus_dm > 0) & (plus_dm > -low.diff()), 0)
-    
-    # Minus Directional Movement (-DM)
-    minus_dm = -low.diff()
-    minus_dm = minus_dm.where((minus_dm > 0) & (minus_dm > high.diff()), 0)
-    
-    # Smooth TR, +DM, -DM
-    atr = tr.rolling(window=period).mean()
-    plus_di = 100 * plus_dm.rolling(window=period).mean() / atr
-    minus_di = 100 * minus_dm.rolling(window=period).mean() / atr
-    
-    # Directional Movement Index (DX)
-    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-    
-    # Average Directional Index (ADX)
-    adx = dx.rolling(window=period).mean()
+    # True range, directional movement and their smoothing run in one kernel
+    adx = pd.Series(kernels.adx(high, low, close, period), index=high.index)
     
     return adx
 
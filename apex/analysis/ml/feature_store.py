@@ -0,0 +1,251 @@
+"""
+Feature Store
+On-disk cache of computed feature matrices, read back through memory maps.
+
+Entries are keyed by a content hash of (symbol, timeframe, candle range and
+values, FeatureConfig), so retraining, cross-validation folds and multi-symbol
+training reuse features instead of regenerating them. Features only look
+back, so a request whose candles are a prefix of a cached entry (an expanding
+walk-forward window) is served by slicing that entry.
+
+Layout: <root>/<symbol>/<timeframe>/<key>/ holding features.npy (rows x
+features; float32 for compact configs), candles.npy (rows x OHLCV),
+index.npy (int64 ns) and meta.json.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import FeatureConfig, FeatureEngineer
+
+
+# Bump when create_features() changes, so entries from older code are not reused
+FEATURES_VERSION = 1
+
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def config_hash(config: FeatureConfig) -> str:
+    """Stable digest of a FeatureConfig (and the feature code version)"""
+    payload = json.dumps({'version': FEATURES_VERSION, 'config': asdict(config)}, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def _index_ns(data: pd.DataFrame) -> np.ndarray:
+    """Candle open times as int64 nanoseconds"""
+    index = pd.DatetimeIndex(data['timestamp'] if 'timestamp' in data.columns else data.index)
+    return index.as_unit('ns').asi8
+
+
+class FeatureStore:
+    """
+    Content-addressed cache of FeatureEngineer output.
+
+    Example:
+        store = FeatureStore()
+        X, y = store.get_training_data(engineer, data, 'BTC/USDT', '1h')
+        store.invalidate(stale_for=engineer.config)   # after a config change
+    """
+
+    def __init__(self, root: str = 'apex/data/features'):
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.replace('/', '_') / timeframe
+
+    def key(self, symbol: str, timeframe: str, data: pd.DataFrame,
+            config: FeatureConfig) -> str:
+        """
+        Content hash identifying the features of `data`.
+
+        Covers the symbol, timeframe, candle range and the candle values
+        themselves, so a refreshed candle never serves stale features.
+        """
+        index = _index_ns(data)
+        candles = np.ascontiguousarray(data[CANDLE_COLUMNS].to_numpy(dtype=np.float64))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{symbol}|{timeframe}|{config_hash(config)}|{len(index)}'.encode())
+        digest.update(np.ascontiguousarray(index).tobytes())
+        digest.update(candles.tobytes())
+        return digest.hexdigest()
+
+    def get_features(self, engineer: FeatureEngineer, data: pd.DataFrame,
+                     symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Feature columns of engineer.create_features(data), cached.
+
+        Args:
+            engineer: Feature engineer (its config is part of the key)
+            data: DataFrame with OHLCV columns
+            symbol: Trading pair
+            timeframe: Candle timeframe
+
+        Returns:
+            DataFrame of engineer.feature_names indexed like data, backed by
+            a read-only memory map on a cache hit
+        """
+        key = self.key(symbol, timeframe, data, engineer.config)
+        entry = self._dir(symbol, timeframe) / key
+        if not entry.exists():
+            entry = self._find_prefix_entry(symbol, timeframe, data, engineer.config)
+
+        if entry is not None:
+            loaded = self._load(entry, len(data), data.index)
+            if loaded is not None:
+                self.hits += 1
+                engineer.feature_names = list(loaded.columns)
+                return loaded
+
+        self.misses += 1
+        features = engineer.create_features(data)[engineer.feature_names]
+        try:
+            self._save(symbol, timeframe, key, data, features, engineer.config)
+        except (OSError, ValueError, TypeError) as e:
+            # Non-numeric extra columns or a full disk: still return the features
+            self.logger.warning(f"Not caching features for {symbol} {timeframe}: {e}")
+        return features
+
+    def get_training_data(self, engineer: FeatureEngineer, data: pd.DataFrame,
+                          symbol: str, timeframe: str, horizon: int = 5,
+                          threshold: float = 0.01) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Feature matrix and classification target for training.
+
+        The target needs only closes, so it is rebuilt on every call and the
+        cached features stay valid for any horizon/threshold.
+
+        Returns:
+            (X, y) as returned by engineer.get_feature_matrix()
+        """
+        features = self.get_features(engineer, data, symbol, timeframe)
+        df = features.assign(close=data['close'].to_numpy())
+        df = engineer.create_target(df, horizon=horizon, threshold=threshold)
+        return engineer.get_feature_matrix(df, drop_na=True)
+
+    def _find_prefix_entry(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                           config: FeatureConfig) -> Optional[Path]:
+        """Cached entry whose candles start with exactly these candles"""
+        directory = self._dir(symbol, timeframe)
+        if not directory.exists() or len(data) == 0:
+            return None
+
+        index = _index_ns(data)
+        wanted = config_hash(config)
+        for meta_file in directory.glob('*/meta.json'):
+            meta = self._read_meta(meta_file)
+            if (meta is None or meta['config_hash'] != wanted or meta['rows'] < len(index)
+                    or meta['start'] != int(index[0])):
+                continue
+            entry = meta_file.parent
+            cached_index = np.load(entry / 'index.npy', mmap_mode='r')[:len(index)]
+            cached_candles = np.load(entry / 'candles.npy', mmap_mode='r')[:len(index)]
+            if (np.array_equal(cached_index, index) and
+                    np.array_equal(cached_candles, data[CANDLE_COLUMNS].to_numpy(dtype=np.float64))):
+                return entry
+        return None
+
+    def _read_meta(self, meta_file: Path) -> Optional[Dict]:
+        try:
+            return json.loads(meta_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, entry: Path, rows: int, index: pd.Index) -> Optional[pd.DataFrame]:
+        """First `rows` rows of an entry as a memory-mapped DataFrame"""
+        meta = self._read_meta(entry / 'meta.json')
+        if meta is None:
+            return None
+        try:
+            values = np.load(entry / 'features.npy', mmap_mode='r')[:rows]
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable feature cache {entry}: {e}")
+            return None
+        return pd.DataFrame(values, index=index, columns=meta['feature_names'], copy=False)
+
+    def _save(self, symbol: str, timeframe: str, key: str, data: pd.DataFrame,
+              features: pd.DataFrame, config: FeatureConfig):
+        directory = self._dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        index = _index_ns(data)
+
+        # Write to a temporary directory and rename, so readers never see a partial entry
+        tmp = directory / f'.{key}.{os.getpid()}.tmp'
+        tmp.mkdir(exist_ok=True)
+        try:
+            dtype = np.float32 if config.compact else np.float64
+            np.save(tmp / 'features.npy', np.ascontiguousarray(features.to_numpy(dtype=dtype)))
+            np.save(tmp / 'candles.npy', np.ascontiguousarray(data[CANDLE_COLUMNS].to_numpy(dtype=np.float64)))
+            np.save(tmp / 'index.npy', index)
+            meta = {
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'config': asdict(config),
+                'config_hash': config_hash(config),
+                'feature_names': list(features.columns),
+                'rows': len(index),
+                'start': int(index[0]) if len(index) else None,
+                'end': int(index[-1]) if len(index) else None,
+                'created': time.time(),
+            }
+            (tmp / 'meta.json').write_text(json.dumps(meta))
+            os.replace(tmp, directory / key)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not (directory / key).exists():
+                raise
+
+    def entries(self, symbol: str = None, timeframe: str = None) -> List[Dict]:
+        """Metadata of cached entries, optionally for one symbol/timeframe"""
+        pattern = (f"{symbol.replace('/', '_') if symbol else '*'}/"
+                   f"{timeframe or '*'}/*/meta.json")
+        metas = []
+        for meta_file in self.root.glob(pattern):
+            meta = self._read_meta(meta_file)
+            if meta is not None:
+                metas.append({**meta, 'path': str(meta_file.parent)})
+        return metas
+
+    def invalidate(self, symbol: str = None, timeframe: str = None,
+                   stale_for: FeatureConfig = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            symbol: Only this symbol (default: all)
+            timeframe: Only this timeframe (default: all)
+            stale_for: Only entries built with a different config than this
+                one, i.e. the ones a config change made obsolete
+
+        Returns:
+            Number of entries removed
+        """
+        keep = config_hash(stale_for) if stale_for is not None else None
+        removed = 0
+        for meta in self.entries(symbol, timeframe):
+            if keep is not None and meta['config_hash'] == keep:
+                continue
+            shutil.rmtree(meta['path'], ignore_errors=True)
+            removed += 1
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -3,11 +3,19 @@ Feature Engineering for Machine Learning
 Creates features from OHLCV data for ML models.
 """
 
+import math
+import re
+from collections import deque
+
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from analysis.indicators.incremental import (
+    NAN, _div, RollingMean, RollingStd, IncrementalEMA, IncrementalRSI
+)
+
 
 @dataclass
 class FeatureConfig:
@@ -37,6 +45,9 @@ class FeatureConfig:
     # Pattern features
     include_candlestick: bool = True
     
+    # Memory layout: float32 features, int8 flags, intermediate columns dropped
+    compact: bool = False
+    
     def __post_init__(self):
         if self.return_periods is None:
             self.return_periods = [1, 3, 5, 10, 20]
@@ -48,6 +59,23 @@ class FeatureConfig:
             self.volume_periods = [5, 10, 20]
 
 
+# 0/1 (or -1/0/1) indicator columns, stored as int8 in compact mode
+FLAG_FEATURES = frozenset([
+    'golden_cross', 'volatility_regime', 'rsi_oversold', 'rsi_overbought',
+    'macd_above_signal', 'macd_crossover', 'macd_crossunder', 'bb_squeeze',
+    'volume_price_trend', 'bullish', 'doji', 'hammer', 'shooting_star',
+    'bullish_engulfing', 'bearish_engulfing'
+])
+
+# Raw price/volume levels that only feed the ratio features derived from them
+_INTERMEDIATE = re.compile(r'^((sma|ema|volume_sma)_\d+|true_range|bb_upper|bb_lower|bb_middle)$')
+
+
+def is_intermediate(name: str) -> bool:
+    """Whether a feature column is dropped in compact mode"""
+    return bool(_INTERMEDIATE.match(name))
+
+
 class FeatureEngineer:
     """
     Creates machine learning features from price data.
@@ -102,12 +130,28 @@ class FeatureEngineer:
         if self.config.include_candlestick:
             df = self._add_candlestick_features(df)
         
+        if self.config.compact:
+            df = self._compact(df)
+        
         # Store feature names (exclude OHLCV and target columns)
         self.feature_names = [col for col in df.columns 
                              if col not in ['open', 'high', 'low', 'close', 'volume', 'timestamp']]
         
         return df
     
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop intermediate columns and downcast features (OHLCV stays float64)"""
+        df = df.drop(columns=[c for c in df.columns if is_intermediate(c)])
+        dtypes = {}
+        for col in df.columns:
+            if col in ('open', 'high', 'low', 'close', 'volume', 'timestamp'):
+                continue
+            if col in FLAG_FEATURES:
+                dtypes[col] = np.int8
+            elif pd.api.types.is_float_dtype(df[col]):
+                dtypes[col] = np.float32
+        return df.astype(dtypes)
+    
     def _add_return_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add return features for different periods"""
         for period in self.config.return_periods:
@@ -330,7 +374,9 @@ class FeatureEngineer:
             drop_na: Whether to drop rows with NaN values
             
         Returns:
-            Tuple of (X, y) where X is feature matrix and y is target vector
+            Tuple of (X, y) where X is feature matrix and y is target vector.
+            In compact mode X is backed by one C-contiguous float32 array,
+            the layout tree models use internally, so fitting doesn't copy it.
         """
         if not self.feature_names:
             raise ValueError("Features not created yet. Call create_features() first.")
@@ -345,8 +391,32 @@ class FeatureEngineer:
             X = X[mask]
             y = y[mask] if y is not None else None
         
+        if self.config.compact:
+            values = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+            X = pd.DataFrame(values, index=X.index, columns=X.columns, copy=False)
+        
         return X, y
     
+    def memory_footprint(self, data: pd.DataFrame) -> Dict[str, float]:
+        """
+        Memory used by the features of `data`.
+        
+        Args:
+            data: DataFrame with OHLCV columns
+            
+        Returns:
+            Dict with rows, features, feature_bytes (feature columns of
+            create_features()) and matrix_bytes (X from get_feature_matrix())
+        """
+        df = self.create_features(data)
+        X, _ = self.get_feature_matrix(df, drop_na=False)
+        return {
+            'rows': len(df),
+            'features': len(self.feature_names),
+            'feature_bytes': int(df[self.feature_names].memory_usage(index=False, deep=True).sum()),
+            'matrix_bytes': int(X.memory_usage(index=False, deep=True).sum()),
+        }
+    
     def get_feature_importance_report(self, feature_importance: np.ndarray) -> pd.DataFrame:
         """
         Create a feature importance report.
@@ -363,3 +433,261 @@ class FeatureEngineer:
         })
         importance_df = importance_df.sort_values('importance', ascending=False)
         return importance_df
+    
+    def incremental(self) -> 'IncrementalFeatureEngineer':
+        """
+        Stateful feature pipeline with this engineer's config.
+        
+        Returns:
+            IncrementalFeatureEngineer that computes one feature row per
+            appended candle, matching create_features() row for row
+        """
+        return IncrementalFeatureEngineer(self.config)
+
+
+def _log(x: float) -> float:
+    """np.log semantics without the array overhead"""
+    if x > 0:
+        return math.log(x)
+    return -math.inf if x == 0 else NAN
+
+
+class _Lag:
+    """The last n + 1 values of a series, for shift(k)/diff(k) with k <= n"""
+
+    def __init__(self, n: int):
+        self._values = deque(maxlen=n + 1)
+
+    def push(self, x: float):
+        self._values.append(x)
+
+    def ago(self, k: int) -> float:
+        return self._values[-1 - k] if len(self._values) > k else NAN
+
+
+class IncrementalFeatureEngineer:
+    """
+    Stateful counterpart of FeatureEngineer.create_features().
+
+    update() appends one candle and computes only its feature row from the
+    rolling state of every window (moving averages, deviations, EMAs, lags),
+    so live inference costs O(features) per bar instead of rebuilding the
+    whole history. Rows equal the last row of create_features() over the same
+    candles, with the same column order; only the engineered features are
+    produced, not extra input columns.
+
+    Example:
+        features = FeatureEngineer(config).incremental()
+        features.warm_up(history)
+        row = features.update(open_, high, low, close, volume)
+    """
+
+    def __init__(self, config: Optional[FeatureConfig] = None):
+        self.config = config or FeatureConfig()
+        self.feature_names: List[str] = []
+        self.latest: Dict[str, float] = {}
+        self.bars = 0
+        config = self.config
+
+        lags = list(config.return_periods) if config.include_returns else []
+        self._close = _Lag(max(lags + [10]))
+        self._prev_open = NAN
+        self._prev_bullish = NAN
+
+        self._sma = {p: RollingMean(p) for p in config.ma_periods}
+        self._ema = {p: IncrementalEMA(p) for p in config.ma_periods}
+
+        self._volatility = {p: RollingStd(p) for p in config.volatility_periods}
+        self._atr = {p: RollingMean(p) for p in config.volatility_periods}
+        self._volatility_mean = RollingMean(50)
+
+        self._rsi = IncrementalRSI(14)
+        self._rsi_lag = _Lag(5)
+
+        self._ema_12 = IncrementalEMA(12)
+        self._ema_26 = IncrementalEMA(26)
+        self._macd_signal = IncrementalEMA(9)
+        self._prev_macd = NAN
+        self._prev_macd_signal = NAN
+
+        self._bb_mean = RollingMean(20)
+        self._bb_std = RollingStd(20)
+        self._bb_width_mean = RollingMean(50)
+
+        self._atr_14 = RollingMean(14)
+        self._atr_14_mean = RollingMean(50)
+
+        self._volume_sma = {p: RollingMean(p) for p in config.volume_periods}
+        self._volume = _Lag(5)
+        self._obv = 0.0
+        self._obv_lag = _Lag(10)
+
+    def warm_up(self, data: pd.DataFrame) -> Dict[str, float]:
+        """
+        Feed historical candles in order.
+
+        Args:
+            data: DataFrame with OHLCV columns
+
+        Returns:
+            Feature row of the last candle (empty if data is empty)
+        """
+        candles = data[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+        for open_, high, low, close, volume in candles.tolist():
+            self.update(open_, high, low, close, volume)
+        return self.latest
+
+    def update(self, open_: float, high: float, low: float, close: float,
+               volume: float) -> Dict[str, float]:
+        """
+        Append one candle.
+
+        Returns:
+            Feature name -> value for the new candle, in create_features()
+            column order (NaN while a window is still warming up)
+        """
+        open_, high, low, close, volume = (float(open_), float(high), float(low),
+                                           float(close), float(volume))
+        config = self.config
+        row: Dict[str, float] = {}
+
+        self._close.push(close)
+        prev_close = self._close.ago(1)
+        prev_volume = self._volume.ago(0)
+        self._volume.push(volume)
+
+        if self.bars == 0:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        if config.include_returns:
+            for period in config.return_periods:
+                ratio = _div(close, self._close.ago(period))
+                row[f'return_{period}d'] = ratio - 1
+                row[f'log_return_{period}d'] = _log(ratio)
+            row['momentum'] = close - self._close.ago(10)
+            row['momentum_pct'] = _div(row['momentum'], self._close.ago(10))
+
+        if config.include_ma_ratios:
+            sma = {p: m.update(close) for p, m in self._sma.items()}
+            ema = {p: e.update(close) for p, e in self._ema.items()}
+            for period in config.ma_periods:
+                row[f'sma_{period}'] = sma[period]
+                row[f'ema_{period}'] = ema[period]
+                row[f'price_to_sma_{period}'] = _div(close, sma[period])
+                row[f'price_to_ema_{period}'] = _div(close, ema[period])
+            if 50 in sma and 200 in sma:
+                row['golden_cross'] = int(sma[50] > sma[200])
+                row['sma_ratio'] = _div(sma[50], sma[200])
+
+        if config.include_volatility:
+            ret = _div(close, prev_close) - 1
+            volatility = {p: s.update(ret) for p, s in self._volatility.items()}
+            atr = {p: m.update(true_range) for p, m in self._atr.items()}
+            for period in config.volatility_periods:
+                row[f'volatility_{period}d'] = volatility[period]
+                row['true_range'] = true_range
+                row[f'atr_{period}'] = atr[period]
+            volatility_20d = row['volatility_20d']
+            row['volatility_regime'] = int(volatility_20d > self._volatility_mean.update(volatility_20d))
+
+        if config.include_rsi:
+            rsi = self._rsi.update(close)
+            self._rsi_lag.push(rsi)
+            row['rsi'] = rsi
+            row['rsi_normalized'] = rsi / 100.0
+            row['rsi_oversold'] = int(rsi < 30)
+            row['rsi_overbought'] = int(rsi > 70)
+            row['rsi_slope'] = rsi - self._rsi_lag.ago(5)
+
+        if config.include_macd:
+            macd = self._ema_12.update(close) - self._ema_26.update(close)
+            signal = self._macd_signal.update(macd)
+            row['macd'] = macd
+            row['macd_signal'] = signal
+            row['macd_histogram'] = macd - signal
+            row['macd_above_signal'] = int(macd > signal)
+            row['macd_crossover'] = int(macd > signal and self._prev_macd <= self._prev_macd_signal)
+            row['macd_crossunder'] = int(macd < signal and self._prev_macd >= self._prev_macd_signal)
+            self._prev_macd = macd
+            self._prev_macd_signal = signal
+
+        if config.include_bollinger:
+            sma_20 = self._bb_mean.update(close)
+            std_20 = self._bb_std.update(close)
+            upper = sma_20 + std_20 * 2
+            lower = sma_20 - std_20 * 2
+            width = _div(upper - lower, sma_20)
+            position = _div(close - lower, upper - lower)
+            row['bb_upper'] = upper
+            row['bb_lower'] = lower
+            row['bb_middle'] = sma_20
+            row['bb_width'] = width
+            row['bb_position'] = position if math.isnan(position) else min(max(position, 0.0), 1.0)
+            row['bb_squeeze'] = int(width < self._bb_width_mean.update(width) * 0.6)
+
+        if config.include_atr:
+            atr_14 = self._atr_14.update(true_range)
+            row['atr_14'] = atr_14
+            row['atr_ratio'] = _div(atr_14, close)
+            row['atr_normalized'] = _div(atr_14, self._atr_14_mean.update(atr_14))
+
+        if config.include_volume:
+            volume_sma = {p: m.update(volume) for p, m in self._volume_sma.items()}
+            for period in config.volume_periods:
+                row[f'volume_sma_{period}'] = volume_sma[period]
+                row[f'volume_ratio_{period}'] = _div(volume, volume_sma[period])
+            row['volume_trend'] = volume - self._volume.ago(5)
+            if close > prev_close and volume > prev_volume:
+                row['volume_price_trend'] = 1
+            elif close < prev_close and volume > prev_volume:
+                row['volume_price_trend'] = -1
+            else:
+                row['volume_price_trend'] = 0
+
+            # cumsum() skips the first candle's missing direction
+            if self.bars == 0:
+                obv = NAN
+            else:
+                direction = (close > prev_close) - (close < prev_close)
+                self._obv += direction * volume
+                obv = self._obv
+            self._obv_lag.push(obv)
+            row['obv'] = obv
+            row['obv_slope'] = obv - self._obv_lag.ago(10)
+
+        if config.include_candlestick:
+            candle_range = high - low + 1e-10
+            body_size = abs(close - open_)
+            upper_shadow = high - max(close, open_)
+            lower_shadow = min(close, open_) - low
+            body_pct = _div(body_size, candle_range)
+            upper_shadow_pct = _div(upper_shadow, candle_range)
+            lower_shadow_pct = _div(lower_shadow, candle_range)
+            bullish = int(close > open_)
+            row['body_size'] = body_size
+            row['body_pct'] = body_pct
+            row['upper_shadow'] = upper_shadow
+            row['lower_shadow'] = lower_shadow
+            row['upper_shadow_pct'] = upper_shadow_pct
+            row['lower_shadow_pct'] = lower_shadow_pct
+            row['bullish'] = bullish
+            row['doji'] = int(body_pct < 0.1)
+            row['hammer'] = int(lower_shadow_pct > 0.6 and body_pct < 0.3 and bullish == 1)
+            row['shooting_star'] = int(upper_shadow_pct > 0.6 and body_pct < 0.3 and bullish == 0)
+            row['bullish_engulfing'] = int(bullish == 1 and self._prev_bullish == 0 and
+                                           open_ < prev_close and close > self._prev_open)
+            row['bearish_engulfing'] = int(bullish == 0 and self._prev_bullish == 1 and
+                                           open_ > prev_close and close < self._prev_open)
+            self._prev_bullish = bullish
+        self._prev_open = open_
+
+        if config.compact:
+            row = {name: value for name, value in row.items() if not is_intermediate(name)}
+
+        self.bars += 1
+        self.latest = row
+        if not self.feature_names:
+            self.feature_names = list(row)
+        return row
@@ -8,9 +8,24 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
+import json
+import logging
+import os
 import pickle
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+from .features import FeatureEngineer, FeatureConfig
+from .feature_store import FeatureStore
+
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
 
 class ModelType(Enum):
     """Types of prediction models"""
@@ -29,6 +44,65 @@ class Prediction:
     metadata: Dict[str, Any] = None
 
 
+@dataclass
+class BatchPrediction:
+    """Predictions for many rows as parallel arrays"""
+    direction: np.ndarray  # -1, 0, 1 per row
+    probability: np.ndarray
+    confidence: np.ndarray
+    expected_return: np.ndarray
+    classes: Optional[np.ndarray] = None  # Columns of class_probabilities
+    class_probabilities: Optional[np.ndarray] = None  # (rows, classes)
+    
+    def __len__(self) -> int:
+        return len(self.direction)
+    
+    @classmethod
+    def from_predictions(cls, predictions: List[Prediction]) -> 'BatchPrediction':
+        """Pack per-row predictions into arrays"""
+        return cls(
+            direction=np.array([p.direction for p in predictions], dtype=int),
+            probability=np.array([p.probability for p in predictions], dtype=float),
+            confidence=np.array([p.confidence for p in predictions], dtype=float),
+            expected_return=np.array([p.expected_return for p in predictions], dtype=float)
+        )
+    
+    def to_predictions(self) -> List[Prediction]:
+        """One Prediction per row"""
+        predictions = []
+        for i in range(len(self)):
+            metadata = None
+            if self.class_probabilities is not None:
+                metadata = {'class_probabilities': dict(zip(self.classes, self.class_probabilities[i]))}
+            predictions.append(Prediction(
+                direction=int(self.direction[i]),
+                probability=self.probability[i],
+                confidence=self.confidence[i],
+                expected_return=self.expected_return[i],
+                metadata=metadata
+            ))
+        return predictions
+    
+    def to_frame(self, index=None) -> pd.DataFrame:
+        """direction/probability/confidence/expected_return columns"""
+        return pd.DataFrame({
+            'direction': self.direction,
+            'probability': self.probability,
+            'confidence': self.confidence,
+            'expected_return': self.expected_return,
+        }, index=index)
+
+
+def resolve_jobs(n_jobs: Optional[int]) -> int:
+    """Number of cores an sklearn-style n_jobs value means (-1 = all)"""
+    cores = os.cpu_count() or 1
+    if not n_jobs:
+        return 1
+    if n_jobs < 0:
+        return max(1, cores + 1 + n_jobs)
+    return min(n_jobs, cores)
+
+
 class BasePriceModel:
     """Base class for price prediction models"""
     
@@ -37,7 +111,13 @@ class BasePriceModel:
         self.model = None
         self.is_trained = False
         self.feature_names: List[str] = []
+        self.n_jobs = -1
+        self.training_window: Optional[Dict[str, Any]] = None  # Set by ModelManager
         
+    def set_n_jobs(self, n_jobs: int) -> None:
+        """Cap the cores used by training (sklearn n_jobs semantics)"""
+        self.n_jobs = n_jobs
+    
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Train the model"""
         raise NotImplementedError
@@ -46,6 +126,14 @@ class BasePriceModel:
         """Make predictions"""
         raise NotImplementedError
     
+    def predict_batch(self, X: pd.DataFrame) -> BatchPrediction:
+        """
+        Make predictions for all rows of X at once.
+        
+        Models without a vectorized path fall back to predict().
+        """
+        return BatchPrediction.from_predictions(self.predict(X))
+    
     def predict_single(self, features: Dict[str, float]) -> Prediction:
         """Make prediction for a single sample"""
         X = pd.DataFrame([features])
@@ -81,18 +169,27 @@ class RandomForestPriceModel(BasePriceModel):
     
     def __init__(self, model_type: ModelType = ModelType.CLASSIFICATION,
                  n_estimators: int = 100, max_depth: int = 10,
-                 min_samples_split: int = 5, random_state: int = 42):
+                 min_samples_split: int = 5, random_state: int = 42,
+                 cv_folds: int = 5, n_jobs: int = -1):
+        """
+        Args:
+            cv_folds: Cross-validation folds scored after fitting a
+                classifier (0 to skip cross-validation)
+            n_jobs: Cores for fitting and cross-validation (-1 = all)
+        """
         super().__init__(model_type)
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.min_samples_split = min_samples_split
         self.random_state = random_state
+        self.cv_folds = cv_folds
+        self.n_jobs = n_jobs
+        self.cv_scores: Optional[np.ndarray] = None
         
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Train Random Forest model"""
         try:
             from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-            from sklearn.model_selection import cross_val_score
             
             self.feature_names = list(X.columns)
             
@@ -102,7 +199,7 @@ class RandomForestPriceModel(BasePriceModel):
                     max_depth=self.max_depth,
                     min_samples_split=self.min_samples_split,
                     random_state=self.random_state,
-                    n_jobs=-1
+                    n_jobs=self.n_jobs
                 )
             else:
                 self.model = RandomForestRegressor(
@@ -110,21 +207,61 @@ class RandomForestPriceModel(BasePriceModel):
                     max_depth=self.max_depth,
                     min_samples_split=self.min_samples_split,
                     random_state=self.random_state,
-                    n_jobs=-1
+                    n_jobs=self.n_jobs
                 )
             
             self.model.fit(X, y)
             self.is_trained = True
             
             # Calculate cross-validation score
-            if self.model_type == ModelType.CLASSIFICATION:
-                scores = cross_val_score(self.model, X, y, cv=5, scoring='accuracy')
+            if self.model_type == ModelType.CLASSIFICATION and self.cv_folds >= 2:
+                self.cv_scores = self.cross_validate(X, y)
+                scores = self.cv_scores
                 print(f"Cross-validation accuracy: {scores.mean():.3f} (+/- {scores.std()*2:.3f})")
             
         except ImportError:
             print("scikit-learn not installed. Using mock model.")
             self._train_mock(X, y)
     
+    def cross_validate(self, X: pd.DataFrame, y: pd.Series,
+                       folds: Optional[int] = None) -> np.ndarray:
+        """
+        Accuracy of each cross-validation fold.
+        
+        Folds are fitted in parallel threads (tree building releases the
+        GIL) and share the model's core budget, so folds x trees never
+        exceed n_jobs cores.
+        
+        Args:
+            X: Feature matrix
+            y: Target
+            folds: Number of folds (default: cv_folds)
+            
+        Returns:
+            Array of fold accuracies
+        """
+        from joblib import parallel_backend
+        from sklearn.base import clone
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import cross_val_score
+        
+        folds = folds or self.cv_folds
+        cores = resolve_jobs(self.n_jobs)
+        fold_jobs = min(folds, cores)
+        if isinstance(self.model, RandomForestClassifier):
+            estimator = clone(self.model).set_params(n_jobs=max(1, cores // fold_jobs))
+        else:
+            estimator = RandomForestClassifier(
+                n_estimators=self.n_estimators,
+                max_depth=self.max_depth,
+                min_samples_split=self.min_samples_split,
+                random_state=self.random_state,
+                n_jobs=max(1, cores // fold_jobs)
+            )
+        
+        with parallel_backend('threading', n_jobs=fold_jobs):
+            return cross_val_score(estimator, X, y, cv=folds, scoring='accuracy', n_jobs=fold_jobs)
+    
     def _train_mock(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Train a simple mock model when sklearn is not available"""
         self.feature_names = list(X.columns)
@@ -138,77 +275,75 @@ class RandomForestPriceModel(BasePriceModel):
     
     def predict(self, X: pd.DataFrame) -> List[Prediction]:
         """Make predictions using Random Forest"""
+        return self.predict_batch(X).to_predictions()
+    
+    def predict_batch(self, X: pd.DataFrame) -> BatchPrediction:
+        """
+        Vectorized predictions: one predict_proba() call for all rows.
+        
+        Args:
+            X: Feature matrix (rows can be bars or symbols)
+            
+        Returns:
+            BatchPrediction with one entry per row
+        """
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
-        predictions = []
-        
         if isinstance(self.model, dict):  # Mock model
-            return self._predict_mock(X)
+            return self._predict_mock(len(X))
         
         if self.model_type == ModelType.CLASSIFICATION:
             # Get class probabilities
             probs = self.model.predict_proba(X)
             classes = self.model.classes_
             
-            for i, prob in enumerate(probs):
-                # Find class with highest probability
-                max_idx = np.argmax(prob)
-                direction = int(classes[max_idx])
-                probability = prob[max_idx]
-                
-                # Calculate confidence based on probability spread
-                confidence = (prob[max_idx] - np.mean(prob)) / (np.std(prob) + 1e-10)
-                confidence = min(max(confidence, 0), 1)  # Clip to [0, 1]
-                
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=probability,
-                    confidence=confidence,
-                    expected_return=direction * probability * 0.01,  # Rough estimate
-                    metadata={'class_probabilities': dict(zip(classes, prob))}
-                ))
-        else:
-            # Regression
-            y_pred = self.model.predict(X)
+            # Class with highest probability
+            max_idx = np.argmax(probs, axis=1)
+            direction = classes[max_idx].astype(int)
+            probability = probs[np.arange(len(probs)), max_idx]
             
-            for pred in y_pred:
-                direction = 1 if pred > 0.005 else (-1 if pred < -0.005 else 0)
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=0.5 + abs(pred) * 10,  # Rough probability estimate
-                    confidence=min(abs(pred) * 50, 1.0),
-                    expected_return=pred
-                ))
+            # Confidence based on probability spread, clipped to [0, 1]
+            confidence = (probability - probs.mean(axis=1)) / (probs.std(axis=1) + 1e-10)
+            confidence = np.clip(confidence, 0, 1)
+            
+            return BatchPrediction(
+                direction=direction,
+                probability=probability,
+                confidence=confidence,
+                expected_return=direction * probability * 0.01,  # Rough estimate
+                classes=classes,
+                class_probabilities=probs
+            )
         
-        return predictions
+        # Regression
+        y_pred = np.asarray(self.model.predict(X), dtype=float)
+        return BatchPrediction(
+            direction=np.where(y_pred > 0.005, 1, np.where(y_pred < -0.005, -1, 0)),
+            probability=0.5 + np.abs(y_pred) * 10,  # Rough probability estimate
+            confidence=np.minimum(np.abs(y_pred) * 50, 1.0),
+            expected_return=y_pred
+        )
     
-    def _predict_mock(self, X: pd.DataFrame) -> List[Prediction]:
+    def _predict_mock(self, n: int) -> BatchPrediction:
         """Mock predictions when sklearn is not available"""
-        predictions = []
-        
-        for _ in range(len(X)):
-            if self.model_type == ModelType.CLASSIFICATION:
-                # Random prediction based on class distribution
-                direction = np.random.choice([-1, 0, 1])
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=0.33,
-                    confidence=0.3,
-                    expected_return=0
-                ))
-            else:
-                # Random return prediction
-                expected_return = np.random.normal(0, 0.01)
-                direction = 1 if expected_return > 0 else -1
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=0.5,
-                    confidence=0.3,
-                    expected_return=expected_return
-                ))
+        if self.model_type == ModelType.CLASSIFICATION:
+            # Random prediction based on class distribution
+            return BatchPrediction(
+                direction=np.random.choice([-1, 0, 1], size=n),
+                probability=np.full(n, 0.33),
+                confidence=np.full(n, 0.3),
+                expected_return=np.zeros(n)
+            )
         
-        return predictions
+        # Random return prediction
+        expected_return = np.random.normal(0, 0.01, size=n)
+        return BatchPrediction(
+            direction=np.where(expected_return > 0, 1, -1),
+            probability=np.full(n, 0.5),
+            confidence=np.full(n, 0.3),
+            expected_return=expected_return
+        )
     
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance from the model"""
@@ -278,44 +413,44 @@ class GradientBoostingPriceModel(BasePriceModel):
     
     def predict(self, X: pd.DataFrame) -> List[Prediction]:
         """Make predictions"""
+        return self.predict_batch(X).to_predictions()
+    
+    def predict_batch(self, X: pd.DataFrame) -> BatchPrediction:
+        """Vectorized predictions for all rows of X"""
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
         if isinstance(self.model, dict):
-            return self._predict_mock(X)
-        
-        predictions = []
+            return self._predict_mock(len(X))
         
         if self.model_type == ModelType.CLASSIFICATION:
             probs = self.model.predict_proba(X)
-            classes = self.model.classes_
-            
-            for prob in probs:
-                max_idx = np.argmax(prob)
-                direction = int(classes[max_idx])
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=prob[max_idx],
-                    confidence=prob[max_idx],
-                    expected_return=direction * prob[max_idx] * 0.01
-                ))
-        else:
-            y_pred = self.model.predict(X)
-            for pred in y_pred:
-                direction = 1 if pred > 0 else -1
-                predictions.append(Prediction(
-                    direction=direction,
-                    probability=0.5 + abs(pred),
-                    confidence=min(abs(pred) * 10, 1.0),
-                    expected_return=pred
-                ))
+            max_idx = np.argmax(probs, axis=1)
+            direction = self.model.classes_[max_idx].astype(int)
+            probability = probs[np.arange(len(probs)), max_idx]
+            return BatchPrediction(
+                direction=direction,
+                probability=probability,
+                confidence=probability,
+                expected_return=direction * probability * 0.01
+            )
         
-        return predictions
+        y_pred = np.asarray(self.model.predict(X), dtype=float)
+        return BatchPrediction(
+            direction=np.where(y_pred > 0, 1, -1),
+            probability=0.5 + np.abs(y_pred),
+            confidence=np.minimum(np.abs(y_pred) * 10, 1.0),
+            expected_return=y_pred
+        )
     
-    def _predict_mock(self, X: pd.DataFrame) -> List[Prediction]:
+    def _predict_mock(self, n: int) -> BatchPrediction:
         """Mock predictions"""
-        return [Prediction(direction=0, probability=0.33, confidence=0.3, expected_return=0) 
-                for _ in range(len(X))]
+        return BatchPrediction(
+            direction=np.zeros(n, dtype=int),
+            probability=np.full(n, 0.33),
+            confidence=np.full(n, 0.3),
+            expected_return=np.zeros(n)
+        )
     
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance"""
@@ -333,10 +468,17 @@ class EnsemblePriceModel(BasePriceModel):
     Ensemble of multiple models for more robust predictions.
     """
     
-    def __init__(self, models: Optional[List[BasePriceModel]] = None):
+    def __init__(self, models: Optional[List[BasePriceModel]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            models: Member models
+            max_workers: Members trained at once (default: all of them)
+        """
         super().__init__(ModelType.CLASSIFICATION)
         self.models = models or []
         self.weights: List[float] = []
+        self.max_workers = max_workers
     
     def add_model(self, model: BasePriceModel, weight: float = 1.0) -> None:
         """Add a model to the ensemble"""
@@ -344,66 +486,129 @@ class EnsemblePriceModel(BasePriceModel):
         self.weights.append(weight)
     
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
-        """Train all models in the ensemble"""
-        for i, model in enumerate(self.models):
-            print(f"Training model {i+1}/{len(self.models)}...")
-            model.train(X, y)
+        """
+        Train all models in the ensemble.
+        
+        Members train concurrently in threads on the shared X (scikit-learn
+        releases the GIL while building trees); the ensemble's core budget
+        is split between them so n_jobs=-1 members don't oversubscribe.
+        """
+        cores = resolve_jobs(self.n_jobs)
+        workers = max(1, min(self.max_workers or len(self.models), len(self.models), cores))
+        for model in self.models:
+            model.set_n_jobs(max(1, cores // workers))
+        
+        if workers == 1:
+            for i, model in enumerate(self.models):
+                print(f"Training model {i+1}/{len(self.models)}...")
+                model.train(X, y)
+        else:
+            print(f"Training {len(self.models)} models on {workers} threads...")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda model: model.train(X, y), self.models))
         self.is_trained = True
     
     def predict(self, X: pd.DataFrame) -> List[Prediction]:
         """Make ensemble predictions"""
+        return self.predict_batch(X).to_predictions()
+    
+    def predict_batch(self, X: pd.DataFrame) -> BatchPrediction:
+        """Weighted average of the members' batch predictions"""
         if not self.is_trained:
             raise ValueError("Models not trained yet")
         
-        # Collect predictions from all models
-        all_predictions = []
-        for model in self.models:
-            preds = model.predict(X)
-            all_predictions.append(preds)
+        n = len(X)
+        directions = np.zeros(n)
+        probabilities = np.zeros(n)
+        confidences = np.zeros(n)
+        expected_returns = np.zeros(n)
         
-        # Weighted average
-        predictions = []
-        for i in range(len(X)):
-            # Aggregate predictions
-            directions = []
-            probabilities = []
-            confidences = []
-            expected_returns = []
-            
-            for j, model_preds in enumerate(all_predictions):
-                pred = model_preds[i]
-                weight = self.weights[j] if j < len(self.weights) else 1.0
-                
-                directions.append(pred.direction * weight)
-                probabilities.append(pred.probability * weight)
-                confidences.append(pred.confidence * weight)
-                expected_returns.append(pred.expected_return * weight)
-            
-            total_weight = sum(self.weights) if self.weights else len(self.models)
-            
-            # Final prediction
-            avg_direction = sum(directions) / total_weight
-            final_direction = 1 if avg_direction > 0.2 else (-1 if avg_direction < -0.2 else 0)
-            
-            predictions.append(Prediction(
-                direction=final_direction,
-                probability=sum(probabilities) / total_weight,
-                confidence=sum(confidences) / total_weight,
-                expected_return=sum(expected_returns) / total_weight
-            ))
+        for j, model in enumerate(self.models):
+            batch = model.predict_batch(X)
+            weight = self.weights[j] if j < len(self.weights) else 1.0
+            directions += batch.direction * weight
+            probabilities += batch.probability * weight
+            confidences += batch.confidence * weight
+            expected_returns += batch.expected_return * weight
         
-        return predictions
+        total_weight = sum(self.weights) if self.weights else len(self.models)
+        
+        # Final prediction
+        avg_direction = directions / total_weight
+        return BatchPrediction(
+            direction=np.where(avg_direction > 0.2, 1, np.where(avg_direction < -0.2, -1, 0)),
+            probability=probabilities / total_weight,
+            confidence=confidences / total_weight,
+            expected_return=expected_returns / total_weight
+        )
+
+
+def training_window(X: pd.DataFrame) -> Dict[str, Any]:
+    """First/last index and row count of a training matrix"""
+    return {
+        'start': str(X.index[0]) if len(X) else None,
+        'end': str(X.index[-1]) if len(X) else None,
+        'rows': len(X),
+    }
+
+
+@dataclass
+class TrainingJob:
+    """One model to train in ModelManager.train_all()"""
+    symbol: str
+    timeframe: str
+    model: BasePriceModel
+    model_name: str = "rf"
+    horizon: int = 5
+    threshold: float = 0.01
+
+
+def _train_job(payload: Tuple) -> Tuple[Optional[BasePriceModel], Optional[str]]:
+    """Worker for train_all(): (trained model, None) or (None, error)"""
+    job, data, config, feature_store, n_jobs = payload
+    try:
+        engineer = FeatureEngineer(config)
+        if feature_store is not None:
+            X, y = feature_store.get_training_data(engineer, data, job.symbol, job.timeframe,
+                                                   horizon=job.horizon, threshold=job.threshold)
+        else:
+            df = engineer.create_target(engineer.create_features(data),
+                                        horizon=job.horizon, threshold=job.threshold)
+            X, y = engineer.get_feature_matrix(df, drop_na=True)
+        job.model.training_window = training_window(X)
+        job.model.set_n_jobs(n_jobs)
+        job.model.train(X, y)
+        return job.model, None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
 
 
 class ModelManager:
     """
     Manages multiple models for different symbols/timeframes.
+    
+    Saved models are listed in <model_dir>/index.json with their class, type,
+    feature names and training window. Startup reads only the index; a model
+    is loaded on its first get_model() (arrays memory-mapped by joblib) and
+    at most max_loaded models stay resident, least recently used evicted
+    first. Models registered since the last save_all() are never evicted.
     """
     
-    def __init__(self, model_dir: str = 'apex/models'):
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, model_dir: str = 'apex/models',
+                 feature_store: Optional[FeatureStore] = None,
+                 max_loaded: int = 32):
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(parents=True, exist_ok=True)
-        self.models: Dict[str, BasePriceModel] = {}
+        self.models: 'OrderedDict[str, BasePriceModel]' = OrderedDict()  # Resident, LRU first
+        self.feature_store = feature_store
+        self.max_loaded = max_loaded
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.loads = 0
+        self.logger = logging.getLogger(__name__)
+        self._unsaved = set()
+        self._read_index()
     
     def get_model_key(self, symbol: str, timeframe: str, model_type: str) -> str:
         """Generate a unique key for a model"""
@@ -414,26 +619,229 @@ class ModelManager:
         """Register a model for a symbol/timeframe"""
         key = self.get_model_key(symbol, timeframe, model_name)
         self.models[key] = model
+        self.models.move_to_end(key)
+        self._unsaved.add(key)
+        self.index[key] = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'model_name': model_name,
+            'class': type(model).__name__,
+            'model_type': model.model_type.value,
+            'feature_names': list(model.feature_names),
+            'training_window': model.training_window,
+            'file': None,
+            'format': None,
+            'saved': None,
+        }
+        self._evict()
     
     def get_model(self, symbol: str, timeframe: str, 
                   model_name: str = "rf") -> Optional[BasePriceModel]:
-        """Get a model for a symbol/timeframe"""
+        """Get a model for a symbol/timeframe, loading it if not resident"""
         key = self.get_model_key(symbol, timeframe, model_name)
-        return self.models.get(key)
+        model = self.models.get(key)
+        if model is not None:
+            self.models.move_to_end(key)
+            return model
+        
+        entry = self.index.get(key)
+        if entry is None or entry['file'] is None:
+            return None
+        model = self._load(entry)
+        if model is not None:
+            self.models[key] = model
+            self._evict()
+        return model
+    
+    def list_models(self, symbol: str = None, timeframe: str = None) -> List[Dict[str, Any]]:
+        """Index entries (loaded or not), optionally for one symbol/timeframe"""
+        return [
+            {'key': key, **entry} for key, entry in self.index.items()
+            if (symbol is None or entry['symbol'] == symbol)
+            and (timeframe is None or entry['timeframe'] == timeframe)
+        ]
+    
+    def _evict(self) -> None:
+        """Drop least recently used saved models beyond max_loaded"""
+        excess = len(self.models) - self.max_loaded
+        if excess <= 0:
+            return
+        for key in [k for k in self.models if k not in self._unsaved][:excess]:
+            del self.models[key]
+    
+    def get_training_data(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                          engineer: Optional[FeatureEngineer] = None,
+                          horizon: int = 5, threshold: float = 0.01) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Feature matrix and target for one symbol/timeframe.
+        
+        Features come from the feature store when one is configured.
+        """
+        engineer = engineer or FeatureEngineer()
+        if self.feature_store is not None:
+            return self.feature_store.get_training_data(engineer, data, symbol, timeframe,
+                                                        horizon=horizon, threshold=threshold)
+        df = engineer.create_target(engineer.create_features(data), horizon=horizon, threshold=threshold)
+        return engineer.get_feature_matrix(df, drop_na=True)
+    
+    def train_model(self, symbol: str, timeframe: str, data: pd.DataFrame,
+                    model: BasePriceModel, engineer: Optional[FeatureEngineer] = None,
+                    horizon: int = 5, threshold: float = 0.01,
+                    model_name: str = "rf") -> BasePriceModel:
+        """
+        Train a model on a symbol's candles and register it.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            data: DataFrame with OHLCV columns
+            model: Untrained model
+            engineer: Feature engineer (default config if omitted)
+            horizon: Prediction horizon in candles
+            threshold: Minimum return for an up/down label
+            model_name: Registry name of the model
+            
+        Returns:
+            The trained model
+        """
+        X, y = self.get_training_data(symbol, timeframe, data, engineer, horizon, threshold)
+        model.training_window = training_window(X)
+        model.train(X, y)
+        self.register_model(symbol, timeframe, model, model_name)
+        return model
+    
+    def train_all(self, jobs: List[TrainingJob],
+                  data: Dict[Tuple[str, str], pd.DataFrame],
+                  config: Optional[FeatureConfig] = None,
+                  max_workers: Optional[int] = None,
+                  max_cores: Optional[int] = None) -> Dict[str, BasePriceModel]:
+        """
+        Train many symbol/timeframe/model combinations in a process pool.
+        
+        Each job runs in its own process (feature engineering included) and
+        gets an equal share of max_cores, so models built with n_jobs=-1 don't
+        start cores x cores threads. Failed jobs are logged and skipped.
+        
+        Args:
+            jobs: Models to train
+            data: Candles for each (symbol, timeframe) used by the jobs
+            config: Feature configuration (default config if omitted)
+            max_workers: Jobs trained at once (default: max_cores)
+            max_cores: Cores shared by all jobs (default: all cores)
+            
+        Returns:
+            Trained models by registry key, also registered in the manager
+        """
+        logger = logging.getLogger(__name__)
+        cores = max_cores or os.cpu_count() or 1
+        workers = max(1, min(max_workers or cores, len(jobs), cores))
+        n_jobs = max(1, cores // workers)
+        
+        payloads = []
+        for job in jobs:
+            candles = data.get((job.symbol, job.timeframe))
+            if candles is None:
+                logger.error(f"No candles for {job.symbol} {job.timeframe}, skipping {job.model_name}")
+                continue
+            payloads.append((job, candles, config, self.feature_store, n_jobs))
+        
+        if workers == 1:
+            results = [_train_job(payload) for payload in payloads]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_train_job, payloads))
+        
+        trained = {}
+        for (job, *_), (model, error) in zip(payloads, results):
+            if model is None:
+                logger.error(f"Training {job.model_name} for {job.symbol} {job.timeframe} failed: {error}")
+                continue
+            self.register_model(job.symbol, job.timeframe, model, job.model_name)
+            trained[self.get_model_key(job.symbol, job.timeframe, job.model_name)] = model
+        return trained
     
     def save_all(self) -> None:
-        """Save all registered models"""
-        for key, model in self.models.items():
-            filepath = self.model_dir / f"{key}.pkl"
-            model.save(str(filepath))
+        """Save models registered since the last save and update the index"""
+        for key in [k for k in self.models if k in self._unsaved]:
+            filepath = self._save(key, self.models[key])
             print(f"Saved model: {filepath}")
+        self._unsaved.clear()
+        self._write_index()
     
     def load_all(self) -> None:
-        """Load all models from directory"""
+        """
+        Re-read the model index without loading any model.
+        
+        Pickles written by older versions (no index entry) are indexed as
+        Random Forest models and loaded on first use like the others.
+        """
+        self._read_index()
+        indexed = {entry['file'] for entry in self.index.values()}
         for filepath in self.model_dir.glob("*.pkl"):
-            key = filepath.stem
-            # Determine model type from filename or default to RF
-            model = RandomForestPriceModel()
-            model.load(str(filepath))
-            self.models[key] = model
-            print(f"Loaded model: {key}")
+            if filepath.name not in indexed:
+                self.index[filepath.stem] = {
+                    'symbol': None, 'timeframe': None, 'model_name': None,
+                    'class': RandomForestPriceModel.__name__, 'model_type': None,
+                    'feature_names': None, 'training_window': None,
+                    'file': filepath.name, 'format': 'legacy', 'saved': None,
+                }
+        print(f"Indexed {len(self.index)} models")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Indexed/resident model counts and loads from disk"""
+        return {
+            'indexed': len(self.index),
+            'resident': len(self.models),
+            'unsaved': len(self._unsaved),
+            'loads': self.loads,
+        }
+    
+    def _save(self, key: str, model: BasePriceModel) -> Path:
+        """Write one model (uncompressed, so joblib can memory-map it)"""
+        if JOBLIB_AVAILABLE:
+            filepath, fmt = self.model_dir / f"{key}.joblib", 'joblib'
+        else:
+            filepath, fmt = self.model_dir / f"{key}.pkl", 'pickle'
+        
+        # Write then rename, so a reader never maps a partial file
+        tmp = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+        if JOBLIB_AVAILABLE:
+            joblib.dump(model, tmp)
+        else:
+            with open(tmp, 'wb') as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, filepath)
+        
+        self.index[key].update(file=filepath.name, format=fmt, saved=time.time())
+        return filepath
+    
+    def _load(self, entry: Dict[str, Any]) -> Optional[BasePriceModel]:
+        filepath = self.model_dir / entry['file']
+        try:
+            if entry['format'] == 'joblib':
+                model = joblib.load(filepath, mmap_mode='r')
+            elif entry['format'] == 'pickle':
+                with open(filepath, 'rb') as f:
+                    model = pickle.load(f)
+            else:
+                model = RandomForestPriceModel()
+                model.load(str(filepath))
+        except Exception as e:
+            self.logger.error(f"Error loading model {filepath}: {e}")
+            return None
+        self.loads += 1
+        return model
+    
+    def _read_index(self) -> None:
+        try:
+            self.index.update(json.loads((self.model_dir / self.INDEX_FILE).read_text()))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ignoring unreadable model index: {e}")
+    
+    def _write_index(self) -> None:
+        saved = {key: entry for key, entry in self.index.items() if entry['file'] is not None}
+        tmp = self.model_dir / f".{self.INDEX_FILE}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(saved, indent=1))
+        os.replace(tmp, self.model_dir / self.INDEX_FILE)
@@ -10,10 +10,14 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import json
+import heapq
 
-from ..trading.strategies.base import BaseStrategy, Signal, SignalType, Position
-from ..trading.risk.manager import RiskManager, RiskConfig
-from ..execution.exchanges.binance import BinanceConnector
+from trading.strategies.base import BaseStrategy, Signal, SignalType, Position
+from trading.risk.manager import RiskManager, RiskConfig
+from analysis.indicators import kernels
+from execution.exchanges.binance import BinanceConnector
+from execution.exchanges.base import timeframe_to_seconds
+from execution.exchanges.candle_store import CandleStore
 
 
 @dataclass
@@ -29,6 +33,7 @@ class Trade:
     pnl: float
     pnl_percent: float
     exit_reason: str  # 'stop_loss', 'take_profit', 'signal', 'end_of_data'
+    strategy: str = None  # Strategy that opened the trade (portfolio backtests)
 
 
 @dataclass
@@ -184,13 +189,15 @@ class BacktestEngine:
         self.trades = []
         self.current_position: Optional[Position] = None
         
-    def run(self, data: pd.DataFrame, symbol: str) -> BacktestResult:
+    def run(self, data: pd.DataFrame, symbol: str, warmup: int = 0) -> BacktestResult:
         """
         Run backtest on historical data.
         
         Args:
             data: DataFrame with OHLCV data
             symbol: Trading symbol
+            warmup: Leading candles only used for indicators; no trades are
+                opened and no equity is recorded before data.index[warmup]
             
         Returns:
             BacktestResult with complete performance metrics
@@ -199,7 +206,7 @@ class BacktestEngine:
             strategy_name=self.strategy.name,
             symbol=symbol,
             timeframe=self.strategy.timeframe,
-            start_date=data.index[0],
+            start_date=data.index[warmup],
             end_date=data.index[-1],
             initial_capital=self.initial_capital
         )
@@ -210,7 +217,7 @@ class BacktestEngine:
         self.current_position = None
         
         # Process each candle
-        for i in range(len(data)):
+        for i in range(warmup, len(data)):
             current_data = data.iloc[:i+1]
             current_candle = data.iloc[i]
             current_time = data.index[i]
@@ -282,6 +289,126 @@ class BacktestEngine:
         
         return result
     
+    def run_vectorized(self, data: pd.DataFrame, symbol: str, warmup: int = 0) -> BacktestResult:
+        """
+        Run backtest in a single pass over NumPy arrays.
+        
+        Indicators and signals are computed once over the whole frame via
+        strategy.generate_signal_series(), so the run is O(n) instead of
+        re-generating signals on every growing slice. Produces the same trades
+        as run() (entry_time is the candle timestamp rather than signal time).
+        Uses the default stop loss / take profit levels of _open_position.
+        
+        Args:
+            data: DataFrame with OHLCV data
+            symbol: Trading symbol
+            warmup: Leading candles only used for indicators, as in run()
+            
+        Returns:
+            BacktestResult with complete performance metrics
+        """
+        result = BacktestResult(
+            strategy_name=self.strategy.name,
+            symbol=symbol,
+            timeframe=self.strategy.timeframe,
+            start_date=data.index[warmup],
+            end_date=data.index[-1],
+            initial_capital=self.initial_capital
+        )
+        
+        self.capital = self.initial_capital
+        self.equity_curve = []
+        self.trades = []
+        self.current_position = None
+        
+        signals = self.strategy.generate_signal_series(data).to_numpy()
+        close = data['close'].to_numpy(dtype=float)
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        index = data.index
+        n = len(data)
+        
+        buy_bars = np.flatnonzero(signals == 1)
+        buy_bars = buy_bars[buy_bars >= warmup]
+        sell = signals == -1
+        
+        # Per-candle realized capital and open position, filled per trade
+        capital = np.empty(n)
+        entry = np.zeros(n)
+        quantity = np.zeros(n)
+        
+        bar = warmup
+        while True:
+            k = np.searchsorted(buy_bars, bar)
+            if k == len(buy_bars):
+                capital[bar:] = self.capital
+                break
+            
+            entry_bar = buy_bars[k]
+            capital[bar:entry_bar + 1] = self.capital
+            
+            entry_price = close[entry_bar] * (1 + self.slippage)
+            stop_loss = entry_price * 0.98
+            take_profit = entry_price * 1.05
+            self.current_position = Position(
+                symbol=symbol,
+                side='long',
+                entry_price=entry_price,
+                quantity=(self.capital * 0.95) / entry_price,
+                timestamp=index[entry_bar],
+                stop_loss=stop_loss,
+                take_profit=take_profit
+            )
+            
+            exit_bar = self._find_exit(entry_bar + 1, low, high, sell,
+                                       stop_loss, take_profit)
+            held = slice(entry_bar + 1, (exit_bar if exit_bar is not None else n - 1) + 1)
+            capital[held] = self.capital
+            entry[held] = entry_price
+            quantity[held] = self.current_position.quantity
+            
+            if exit_bar is None:
+                self._close_position(index[-1], close[-1], 'end_of_data', result)
+                break
+            
+            if low[exit_bar] <= stop_loss:
+                self._close_position(index[exit_bar], stop_loss, 'stop_loss', result)
+            elif high[exit_bar] >= take_profit:
+                self._close_position(index[exit_bar], take_profit, 'take_profit', result)
+            else:
+                self._close_position(index[exit_bar], close[exit_bar], 'signal', result)
+            
+            bar = exit_bar + 1
+            if bar >= n:
+                break
+        
+        # Equity is marked before any exit on that candle, as in run()
+        equity = capital + (close - entry) * quantity
+        self.equity_curve = [
+            {'timestamp': t, 'equity': e, 'price': p}
+            for t, e, p in zip(index[warmup:], equity[warmup:].tolist(), close[warmup:].tolist())
+        ]
+        
+        result.equity_curve = self.equity_curve
+        result.trades = self.trades
+        result.final_capital = self.capital
+        result.total_pnl = self.capital - self.initial_capital
+        result.total_pnl_percent = result.total_pnl / self.initial_capital
+        result.total_trades = len(self.trades)
+        result.winning_trades = len([t for t in self.trades if t.pnl > 0])
+        result.losing_trades = len([t for t in self.trades if t.pnl < 0])
+        
+        result.calculate_metrics()
+        
+        return result
+    
+    @staticmethod
+    def _find_exit(start: int, low: np.ndarray, high: np.ndarray, sell: np.ndarray,
+                   stop_loss: float, take_profit: float) -> Optional[int]:
+        """Index of the first candle at or after start that exits a long position"""
+        exit_bar = kernels.exit_scan(start, low, high, sell, stop_loss, take_profit)
+        return exit_bar if exit_bar >= 0 else None
+    
     def _open_position(self, signal: Signal, candle: pd.Series, side: str):
         """Open a new position"""
         # Apply slippage
@@ -380,11 +507,299 @@ class BacktestEngine:
         print(f"Results saved to {filepath}")
 
 
+@dataclass
+class PortfolioBacktestResult(BacktestResult):
+    """Results of a multi-symbol, multi-strategy backtest"""
+    symbols: List[str] = field(default_factory=list)
+    strategy_names: List[str] = field(default_factory=list)
+    rejected_entries: int = 0  # Buy signals blocked by risk limits or cash
+    
+    def breakdown(self, key: str) -> Dict[str, Dict]:
+        """Trade count, P&L and win rate per 'symbol' or 'strategy'"""
+        stats = {}
+        for trade in self.trades:
+            entry = stats.setdefault(getattr(trade, key), {'trades': 0, 'wins': 0, 'pnl': 0.0})
+            entry['trades'] += 1
+            entry['wins'] += 1 if trade.pnl > 0 else 0
+            entry['pnl'] += trade.pnl
+        for entry in stats.values():
+            entry['win_rate'] = entry.pop('wins') / entry['trades']
+        return stats
+    
+    def to_dict(self) -> Dict:
+        data = super().to_dict()
+        data.update({
+            'symbols': self.symbols,
+            'strategy_names': self.strategy_names,
+            'rejected_entries': self.rejected_entries,
+            'by_symbol': self.breakdown('symbol'),
+            'by_strategy': self.breakdown('strategy'),
+        })
+        return data
+
+
+class PortfolioBacktestEngine:
+    """
+    Backtest several strategies over many symbols with shared capital.
+    
+    Candles of all symbols are aligned on a common clock. Each strategy's
+    signals are computed once per symbol via generate_signal_series(), and
+    each open position's exit bar (stop loss, take profit or a sell from the
+    strategy that opened it) is found with a vectorized forward scan, so the
+    event loop only visits candles where something can happen: a buy signal,
+    an exit or a new day.
+    
+    Entries go through the RiskManager: can_open_position() (one position per
+    symbol, total risk, daily loss), calculate_stop_loss/take_profit() and
+    calculate_position_size(), capped by the cash left.
+    
+    Example:
+        engine = PortfolioBacktestEngine([BreakoutStrategy(cfg), TrendFollowingStrategy(cfg)])
+        result = engine.run({'BTC/USDT': btc, 'ETH/USDT': eth})
+    """
+    
+    def __init__(self,
+                 strategies: List[BaseStrategy],
+                 risk_manager: RiskManager = None,
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.001,
+                 slippage: float = 0.0005):
+        """
+        Args:
+            strategies: Strategies run on every symbol (must implement
+                generate_signal_series); when several buy the same candle
+                the earlier one in the list owns the position
+            risk_manager: Position sizing and limits (default: RiskManager())
+            initial_capital: Starting capital shared by all positions
+            commission: Commission per side
+            slippage: Slippage per side
+        """
+        unsupported = [s.name for s in strategies if not s.supports_signal_series()]
+        if unsupported:
+            raise ValueError(f"Portfolio backtests need generate_signal_series(), "
+                             f"not implemented by {', '.join(unsupported)}")
+        self.strategies = strategies
+        self.risk_manager = risk_manager or RiskManager()
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+    
+    def run(self, data: Dict[str, pd.DataFrame]) -> PortfolioBacktestResult:
+        """
+        Run the backtest.
+        
+        Args:
+            data: OHLCV DataFrame per symbol, indexed by candle time
+            
+        Returns:
+            PortfolioBacktestResult with trades of all symbols
+        """
+        symbols = list(data)
+        index = data[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.union(data[symbol].index)
+        n_bars = len(index)
+        
+        # (symbol, bar) arrays so each symbol's history is contiguous
+        def aligned(column):
+            return np.vstack([
+                data[s][column].reindex(index).to_numpy(dtype=float) for s in symbols
+            ])
+        
+        high = aligned('high')
+        low = aligned('low')
+        close = aligned('close')
+        # Symbols without a candle are marked at their last close
+        mark = pd.DataFrame(close.T).ffill().to_numpy().T
+        
+        # Signals per strategy, and the strategy owning each buy
+        sell = np.zeros((len(self.strategies), len(symbols), n_bars), dtype=bool)
+        buy_owner = np.full((len(symbols), n_bars), -1, dtype=np.int8)
+        for k in reversed(range(len(self.strategies))):
+            for j, symbol in enumerate(symbols):
+                series = self.strategies[k].generate_signal_series(data[symbol])
+                series = series.reindex(index, fill_value=0).to_numpy()
+                sell[k, j] = series == -1
+                buy_owner[j, series == 1] = k
+        
+        result = PortfolioBacktestResult(
+            strategy_name='+'.join(s.name for s in self.strategies),
+            symbol=','.join(symbols),
+            timeframe=self.strategies[0].timeframe,
+            start_date=index[0],
+            end_date=index[-1],
+            initial_capital=self.initial_capital,
+            symbols=symbols,
+            strategy_names=[s.name for s in self.strategies]
+        )
+        
+        risk = self.risk_manager
+        risk.daily_pnl = 0.0
+        cash = self.initial_capital
+        open_qty = np.zeros(len(symbols))
+        exited_at = np.full(len(symbols), -1)
+        positions: Dict[int, Dict] = {}
+        exits = []           # heap of (exit bar, symbol)
+        trades = []
+        
+        # Cash changes and holdings, applied from the candle after the event
+        cash_delta = np.zeros(n_bars + 1)
+        held = np.zeros((len(symbols), n_bars))
+        
+        def close_position(j: int, bar: int, price: float, reason: str):
+            nonlocal cash
+            position = positions.pop(j)
+            exit_price = price * (1 - self.slippage)
+            quantity = position['quantity']
+            entry_price = position['entry_price']
+            pnl = (exit_price - entry_price) * quantity
+            pnl -= (entry_price + exit_price) * quantity * self.commission
+            proceeds = exit_price * quantity - (entry_price + exit_price) * quantity * self.commission
+            cash += proceeds
+            cash_delta[bar + 1] += proceeds
+            open_qty[j] = 0.0
+            exited_at[j] = bar
+            held[j, position['bar'] + 1:bar + 1] = quantity
+            risk.remove_position_risk(symbols[j])
+            trades.append(Trade(
+                entry_time=index[position['bar']],
+                exit_time=index[bar],
+                symbol=symbols[j],
+                side='long',
+                entry_price=entry_price,
+                exit_price=exit_price,
+                quantity=quantity,
+                pnl=pnl,
+                pnl_percent=pnl / (entry_price * quantity),
+                exit_reason=reason,
+                strategy=self.strategies[position['owner']].name
+            ))
+        
+        def process_exits(until: int):
+            while exits and exits[0][0] <= until:
+                bar, j = heapq.heappop(exits)
+                position = positions[j]
+                if low[j, bar] <= position['stop_loss']:
+                    close_position(j, bar, position['stop_loss'], 'stop_loss')
+                elif high[j, bar] >= position['take_profit']:
+                    close_position(j, bar, position['take_profit'], 'take_profit')
+                else:
+                    close_position(j, bar, close[j, bar], 'signal')
+        
+        days = index.normalize()
+        day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        entry_bars = np.flatnonzero((buy_owner >= 0).any(axis=0))
+        events = np.union1d(entry_bars, day_starts)
+        is_day_start = np.isin(events, day_starts)
+        is_entry = np.isin(events, entry_bars)
+        
+        day_start_equity = self.initial_capital
+        for bar, day_start, entry in zip(events.tolist(), is_day_start, is_entry):
+            # Positions exiting on this candle are still held when it's marked
+            process_exits(bar - 1)
+            equity = cash + open_qty @ np.nan_to_num(mark[:, bar])
+            if day_start:
+                day_start_equity = equity
+            process_exits(bar)
+            if not entry:
+                continue
+            
+            risk.check_daily_loss_limit((equity - day_start_equity) / day_start_equity)
+            for j in np.flatnonzero(buy_owner[:, bar] >= 0).tolist():
+                # No re-entry on the candle a position was closed
+                if j in positions or exited_at[j] == bar:
+                    continue
+                if not risk.can_open_position(equity, symbols[j]):
+                    result.rejected_entries += 1
+                    continue
+                
+                entry_price = close[j, bar] * (1 + self.slippage)
+                stop_loss = risk.calculate_stop_loss(entry_price)
+                take_profit = risk.calculate_take_profit(entry_price)
+                quantity = min(
+                    risk.calculate_position_size(equity, entry_price, stop_loss),
+                    cash / (entry_price * (1 + self.commission))
+                )
+                if quantity <= 0:
+                    result.rejected_entries += 1
+                    continue
+                
+                owner = int(buy_owner[j, bar])
+                cash -= entry_price * quantity
+                cash_delta[bar + 1] -= entry_price * quantity
+                open_qty[j] = quantity
+                risk.add_position_risk(symbols[j], (entry_price - stop_loss) * quantity, equity)
+                positions[j] = {
+                    'bar': bar, 'owner': owner, 'quantity': quantity,
+                    'entry_price': entry_price, 'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                }
+                exit_bar = BacktestEngine._find_exit(bar + 1, low[j], high[j], sell[owner, j],
+                                                     stop_loss, take_profit)
+                if exit_bar is not None:
+                    heapq.heappush(exits, (exit_bar, j))
+        
+        process_exits(n_bars - 1)
+        for j in list(positions):
+            close_position(j, n_bars - 1, mark[j, -1], 'end_of_data')
+        
+        # Equity is marked before any exit on that candle, as in BacktestEngine
+        cash_curve = self.initial_capital + np.cumsum(cash_delta)[:n_bars]
+        equity = cash_curve + (held * np.nan_to_num(mark)).sum(axis=0)
+        result.equity_curve = [
+            {'timestamp': t, 'equity': e}
+            for t, e in zip(index, equity.tolist())
+        ]
+        
+        trades.sort(key=lambda t: (t.exit_time, t.symbol))
+        result.trades = trades
+        result.final_capital = cash
+        result.total_pnl = cash - self.initial_capital
+        result.total_pnl_percent = result.total_pnl / self.initial_capital
+        result.total_trades = len(trades)
+        result.winning_trades = len([t for t in trades if t.pnl > 0])
+        result.losing_trades = len([t for t in trades if t.pnl < 0])
+        
+        result.calculate_metrics()
+        
+        return result
+
+
+def load_history(symbol: str = 'BTC/USDT',
+                 timeframe: str = '1h',
+                 days: int = 30,
+                 store: CandleStore = None) -> pd.DataFrame:
+    """
+    Load historical OHLCV data for backtesting.
+    
+    Candles are read through the local candle store; only candles newer
+    than the cached history are requested from the exchange.
+    
+    Args:
+        symbol: Trading pair
+        timeframe: Candle timeframe
+        days: Number of days of history
+        store: Candle store (default: CandleStore())
+        
+    Returns:
+        DataFrame with OHLCV data indexed by candle open time
+    """
+    # Create exchange connector (falls back to mock data)
+    exchange = BinanceConnector(testnet=True)
+    exchange.connect()
+    store = store or CandleStore()
+    
+    limit = days * 86400 // timeframe_to_seconds(timeframe)
+    print(f"Loading {days} days of {timeframe} data for {symbol}...")
+    return store.get_ohlcv(exchange, symbol, timeframe, limit=limit)
+
+
 def run_backtest(strategy: BaseStrategy, 
                  symbol: str = 'BTC/USDT',
                  timeframe: str = '1h',
                  days: int = 30,
-                 initial_capital: float = 10000.0) -> BacktestResult:
+                 initial_capital: float = 10000.0,
+                 vectorized: bool = False) -> BacktestResult:
     """
     Convenience function to run a backtest.
     
@@ -394,16 +809,13 @@ def run_backtest(strategy: BaseStrategy,
         timeframe: Candle timeframe
         days: Number of days to backtest
         initial_capital: Starting capital
+        vectorized: Use the single-pass engine (strategy must implement
+            generate_signal_series)
         
     Returns:
         BacktestResult
     """
-    # Create exchange connector (uses mock data)
-    exchange = BinanceConnector(testnet=True)
-    
-    # Fetch historical data
-    print(f"Fetching {days} days of {timeframe} data for {symbol}...")
-    data = exchange.fetch_ohlcv(symbol, timeframe, limit=days*24)
+    data = load_history(symbol, timeframe, days)
     
     if data is None or len(data) == 0:
         print("Error: Could not fetch data")
@@ -413,7 +825,10 @@ def run_backtest(strategy: BaseStrategy,
     
     # Create and run backtest engine
     engine = BacktestEngine(strategy, initial_capital=initial_capital)
-    result = engine.run(data, symbol)
+    if vectorized:
+        result = engine.run_vectorized(data, symbol)
+    else:
+        result = engine.run(data, symbol)
     
     # Print results
     result.print_summary()
@@ -421,6 +836,44 @@ def run_backtest(strategy: BaseStrategy,
     return result
 
 
+def run_portfolio_backtest(strategies: List[BaseStrategy],
+                           symbols: List[str],
+                           timeframe: str = '1h',
+                           days: int = 30,
+                           initial_capital: float = 10000.0,
+                           risk_manager: RiskManager = None) -> PortfolioBacktestResult:
+    """
+    Convenience function to backtest strategies over several symbols.
+    
+    Args:
+        strategies: Strategies run on every symbol (must implement
+            generate_signal_series)
+        symbols: Trading pairs
+        timeframe: Candle timeframe
+        days: Number of days to backtest
+        initial_capital: Capital shared by all positions
+        risk_manager: Position sizing and limits
+        
+    Returns:
+        PortfolioBacktestResult
+    """
+    store = CandleStore()
+    data = {symbol: load_history(symbol, timeframe, days, store) for symbol in symbols}
+    data = {symbol: frame for symbol, frame in data.items() if frame is not None and len(frame)}
+    
+    if not data:
+        print("Error: Could not fetch data")
+        return None
+    
+    print(f"Running portfolio backtest on {len(data)} symbols...")
+    engine = PortfolioBacktestEngine(strategies, risk_manager=risk_manager,
+                                     initial_capital=initial_capital)
+    result = engine.run(data)
+    result.print_summary()
+    
+    return result
+
+
 if __name__ == '__main__':
     # Example usage
     import sys
@@ -9,8 +9,9 @@ Handles order execution across multiple exchanges with:
 - Arbitrage detection
 """
 
-from .manager import ExchangeManager
+from .manager import ExchangeManager, BatchResult
 from .routing import SmartOrderRouter, RoutingPriority
+from .cache import MarketDataCache
 from .orders.manager import OrderManager
 from .orders.advanced import (
     AdvancedOrderManager,
@@ -28,12 +29,17 @@ from .orders.algorithms import (
     AlgoStatus,
     MarketVolumeProfile
 )
+from .orders.simulator import ExecutionSimulator, ImpactModel
+from .orders.volume_profile import HistoricalVolumeProfile, VolumeProfileStore
+from .scheduler import TimerScheduler
 
 __all__ = [
     # Exchange management
     'ExchangeManager',
+    'BatchResult',
     'SmartOrderRouter',
     'RoutingPriority',
+    'MarketDataCache',
     
     # Order management
     'OrderManager',
@@ -53,4 +59,9 @@ __all__ = [
     'AlgoType',
     'AlgoStatus',
     'MarketVolumeProfile',
+    'HistoricalVolumeProfile',
+    'VolumeProfileStore',
+    'ExecutionSimulator',
+    'ImpactModel',
+    'TimerScheduler',
 ]
@@ -0,0 +1,155 @@
+"""
+Market Data Cache
+Short-lived cache of exchange tickers and fees shared by routing and pricing.
+
+One routed order asks every exchange for its ticker several times (routing,
+spread, cost estimate); fees change on the order of days. Entries expire per
+data type, and the tickers of an exchange/symbol are dropped as soon as an
+order is placed there. Each key has a generation that invalidation bumps,
+so a fetch that was in flight when its key was invalidated isn't stored.
+"""
+
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from .exchanges.base import BaseExchange, ExchangeFees, Ticker
+
+
+# Seconds each kind of data stays fresh
+DEFAULT_TTL = {
+    'ticker': 0.5,
+    'fees': 3600.0,
+}
+
+
+class MarketDataCache:
+    """
+    TTL cache keyed by (data type, exchange, key).
+
+    Example:
+        cache = MarketDataCache({'ticker': 0.25})
+        ticker = cache.get_ticker(exchange, 'BTC/USDT')   # fetched
+        ticker = cache.get_ticker(exchange, 'BTC/USDT')   # cached
+        cache.invalidate(exchange.name, 'BTC/USDT')       # after an order
+    """
+
+    def __init__(self, ttl: Dict[str, float] = None):
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self._entries: Dict[Tuple[str, str, Hashable], Tuple[float, object]] = {}
+        self._generations: Dict[Tuple[str, str, Hashable], int] = {}
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def get(self, kind: str, exchange_name: str, key: Hashable,
+            fetch: Callable[[], object]):
+        """
+        Return the cached value, calling fetch() if it is missing or stale.
+
+        Data types without a TTL are never cached.
+        """
+        found, value, expires, generation = self._lookup(kind, exchange_name, key)
+        if found:
+            return value
+
+        # Fetch outside the lock so one slow exchange doesn't block the others
+        value = fetch()
+        self._store(kind, exchange_name, key, value, expires, generation)
+        return value
+
+    async def get_async(self, kind: str, exchange_name: str, key: Hashable,
+                        fetch: Callable[[], Awaitable]):
+        """Coroutine version of get() for async connectors"""
+        found, value, expires, generation = self._lookup(kind, exchange_name, key)
+        if found:
+            return value
+
+        value = await fetch()
+        self._store(kind, exchange_name, key, value, expires, generation)
+        return value
+
+    def _lookup(self, kind: str, exchange_name: str, key: Hashable) -> Tuple[bool, object, float, int]:
+        """(hit, value, expiry and generation for a value fetched now) with counters updated"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((kind, exchange_name, key))
+            if entry is not None and entry[0] > now:
+                self.hits[kind] = self.hits.get(kind, 0) + 1
+                return True, entry[1], entry[0], 0
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            generation = self._generations.setdefault((kind, exchange_name, key), 0)
+        return False, None, now + self.ttl.get(kind, 0), generation
+
+    def _store(self, kind: str, exchange_name: str, key: Hashable,
+               value: object, expires: float, generation: int):
+        if self.ttl.get(kind, 0) > 0:
+            k = (kind, exchange_name, key)
+            with self._lock:
+                # Invalidated while the fetch was in flight
+                if self._generations.get(k) != generation:
+                    return
+                self._entries[k] = (expires, value)
+
+    def get_ticker(self, exchange: BaseExchange, symbol: str,
+                   fetch: Callable[[], Ticker] = None) -> Ticker:
+        """Cached exchange.get_ticker(symbol)"""
+        return self.get('ticker', exchange.name, symbol,
+                        fetch or (lambda: exchange.get_ticker(symbol)))
+
+    def get_fees(self, exchange: BaseExchange) -> ExchangeFees:
+        """Cached exchange.get_fees()"""
+        return self.get('fees', exchange.name, None, exchange.get_fees)
+
+    def invalidate(self, exchange_name: str = None, symbol: str = None,
+                   kind: str = None) -> int:
+        """
+        Drop matching entries.
+
+        Args:
+            exchange_name: Only this exchange (default: all)
+            symbol: Only entries for this symbol (default: all)
+            kind: Only this data type (default: all)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            matching = [
+                k for k in self._generations
+                if (kind is None or k[0] == kind)
+                and (exchange_name is None or k[1] == exchange_name)
+                and (symbol is None or k[2] == symbol)
+            ]
+            removed = 0
+            for k in matching:
+                self._generations[k] += 1
+                removed += self._entries.pop(k, None) is not None
+        return removed
+
+    def on_order_placed(self, exchange_name: str, symbol: str):
+        """Our own order moves the book, so cached prices are no longer valid"""
+        self.invalidate(exchange_name, symbol, kind='ticker')
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            for k in self._generations:
+                self._generations[k] += 1
+            self.hits.clear()
+            self.misses.clear()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Hit/miss counters per data type"""
+        with self._lock:
+            stats = {}
+            for kind in sorted(set(self.hits) | set(self.misses)):
+                hits = self.hits.get(kind, 0)
+                misses = self.misses.get(kind, 0)
+                stats[kind] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                }
+            return stats
@@ -0,0 +1,168 @@
+"""
+Async Exchange Interface
+Asyncio counterpart of BaseExchange, so many exchanges can be queried from
+one event loop instead of one blocked thread per request.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Awaitable, Dict, Iterable, List
+import pandas as pd
+
+from .base import (
+    BaseExchange, MockExchange, Order, OrderSide, Balance, Ticker, ExchangeFees
+)
+
+
+class AsyncBaseExchange(ABC):
+    """
+    Abstract base class for asyncio exchange connectors.
+
+    Network calls are coroutines; fees are static configuration and stay
+    synchronous so the shared MarketDataCache can serve them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._connected = False
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        """Connect to exchange API"""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Release connections"""
+        pass
+
+    def is_connected(self) -> bool:
+        """Check if connected to exchange"""
+        return self._connected
+
+    @abstractmethod
+    async def get_ticker(self, symbol: str) -> Ticker:
+        """Get current price ticker"""
+        pass
+
+    @abstractmethod
+    async def get_ohlcv(self, symbol: str, timeframe: str = '1h',
+                        limit: int = 100) -> pd.DataFrame:
+        """Get OHLCV data"""
+        pass
+
+    @abstractmethod
+    async def place_order(self, order: Order) -> Order:
+        """Place an order"""
+        pass
+
+    @abstractmethod
+    async def get_balance(self, asset: str = None) -> Dict[str, Balance]:
+        """Get account balance"""
+        pass
+
+    @abstractmethod
+    def get_fees(self) -> ExchangeFees:
+        """Get trading fees"""
+        pass
+
+    async def get_spread(self, symbol: str) -> float:
+        """Calculate bid-ask spread"""
+        ticker = await self.get_ticker(symbol)
+        return (ticker.ask - ticker.bid) / ticker.last * 100
+
+    async def get_price(self, symbol: str, side: OrderSide) -> float:
+        """Price an order of the given side would trade at"""
+        ticker = await self.get_ticker(symbol)
+        return ticker.ask if side == OrderSide.BUY else ticker.bid
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncExchangeAdapter(AsyncBaseExchange):
+    """
+    Async view of a synchronous connector.
+
+    Blocking calls run in the default thread pool, so a sync exchange can be
+    queried alongside native async ones.
+    """
+
+    def __init__(self, exchange: BaseExchange):
+        super().__init__(exchange.name)
+        self.exchange = exchange
+
+    async def _call(self, method, *args):
+        return await asyncio.to_thread(method, *args)
+
+    async def connect(self) -> bool:
+        self._connected = await self._call(self.exchange.connect)
+        return self._connected
+
+    async def close(self):
+        await self._call(self.exchange.disconnect)
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self.exchange.is_connected()
+
+    async def get_ticker(self, symbol: str) -> Ticker:
+        return await self._call(self.exchange.get_ticker, symbol)
+
+    async def get_ohlcv(self, symbol: str, timeframe: str = '1h',
+                        limit: int = 100) -> pd.DataFrame:
+        return await self._call(self.exchange.get_ohlcv, symbol, timeframe, limit)
+
+    async def place_order(self, order: Order) -> Order:
+        return await self._call(self.exchange.place_order, order)
+
+    async def get_balance(self, asset: str = None) -> Dict[str, Balance]:
+        return await self._call(self.exchange.get_balance, asset)
+
+    def get_fees(self) -> ExchangeFees:
+        return self.exchange.get_fees()
+
+
+class AsyncMockExchange(AsyncExchangeAdapter):
+    """
+    Offline async exchange built on MockExchange.
+
+    Calls run inline on the event loop (MockExchange never blocks) after an
+    optional simulated network latency.
+    """
+
+    def __init__(self, name: str = "MockExchange", latency: float = 0.0):
+        super().__init__(MockExchange(name))
+        self.latency = latency
+
+    async def _call(self, method, *args):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return method(*args)
+
+
+async def gather_bounded(calls: Iterable[Awaitable], limit: int = 10,
+                         return_exceptions: bool = True) -> List:
+    """
+    asyncio.gather with at most `limit` awaitables in flight.
+
+    Args:
+        calls: Coroutines to run
+        limit: Maximum concurrency
+        return_exceptions: Return exceptions as results instead of raising
+
+    Returns:
+        Results in the order of calls
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(call):
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(bounded(c) for c in calls),
+                                return_exceptions=return_exceptions)
@@ -0,0 +1,292 @@
+"""
+Async CCXT Connectors
+Binance, Coinbase and Kraken over ccxt.async_support, sharing pooled HTTP
+sessions. Like the synchronous connectors they fall back to mock mode when
+ccxt/aiohttp are missing or the exchange can't be reached.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional
+import pandas as pd
+
+from .base import Order, OrderType, OrderSide, OrderStatus, Balance, Ticker, ExchangeFees
+from .async_base import AsyncBaseExchange, AsyncMockExchange
+
+try:
+    import aiohttp
+    import ccxt.async_support as ccxt_async
+    CCXT_ASYNC_AVAILABLE = True
+except ImportError:
+    CCXT_ASYNC_AVAILABLE = False
+    logging.warning("ccxt.async_support/aiohttp not installed. Async connectors will use mock mode.")
+
+
+class SessionPool:
+    """
+    One aiohttp session per event loop, shared by all async connectors.
+
+    Connections (and TLS handshakes) to each exchange host are reused across
+    requests and connectors instead of every ccxt instance opening its own.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._sessions: Dict[asyncio.AbstractEventLoop, 'aiohttp.ClientSession'] = {}
+
+    def get(self) -> 'aiohttp.ClientSession':
+        """Session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    async def close(self):
+        """Close the session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+# Default pool used by connectors that aren't given one
+default_session_pool = SessionPool()
+
+
+class CcxtAsyncExchange(AsyncBaseExchange):
+    """
+    Async connector for a ccxt exchange id.
+
+    Subclasses provide the ccxt config and the fee schedule.
+    """
+
+    ccxt_id: str = ''
+    default_fees = ExchangeFees(maker=0.001, taker=0.001, withdrawal={})
+
+    def __init__(self, name: str, session_pool: SessionPool = None):
+        super().__init__(name)
+        self.session_pool = session_pool or default_session_pool
+        self.exchange = None
+        self._mock: Optional[AsyncMockExchange] = None
+
+    def _config(self) -> Dict:
+        return {'enableRateLimit': True}
+
+    async def connect(self) -> bool:
+        """Connect to the exchange API"""
+        if not CCXT_ASYNC_AVAILABLE:
+            return await self._connect_mock()
+
+        try:
+            config = self._config()
+            config['session'] = self.session_pool.get()
+            self.exchange = getattr(ccxt_async, self.ccxt_id)(config)
+
+            # Test connection
+            await self.exchange.load_markets()
+            self._connected = True
+            logging.info(f"Connected to {self.name} (async)")
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to connect to {self.name}: {e}")
+            if self.exchange is not None:
+                await self.exchange.close()
+                self.exchange = None
+            return await self._connect_mock()
+
+    async def _connect_mock(self) -> bool:
+        """Fallback to mock mode"""
+        self._mock = AsyncMockExchange(self.name)
+        await self._mock.connect()
+        self._connected = True
+        logging.info(f"{self.name} using async mock mode")
+        return True
+
+    async def close(self):
+        """Close the connector; the pooled session stays open for others"""
+        if self.exchange is not None:
+            await self.exchange.close()
+            self.exchange = None
+        self._connected = False
+
+    async def get_ticker(self, symbol: str) -> Ticker:
+        if self._mock:
+            return await self._mock.get_ticker(symbol)
+
+        data = await self.exchange.fetch_ticker(symbol)
+        return Ticker(
+            symbol=symbol,
+            bid=data.get('bid', 0),
+            ask=data.get('ask', 0),
+            last=data.get('last', 0),
+            volume=data.get('quoteVolume', 0),
+            timestamp=datetime.fromtimestamp(data['timestamp'] / 1000),
+            exchange=self.name
+        )
+
+    async def get_ohlcv(self, symbol: str, timeframe: str = '1h',
+                        limit: int = 100) -> pd.DataFrame:
+        if self._mock:
+            return await self._mock.get_ohlcv(symbol, timeframe, limit)
+
+        ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+        df = pd.DataFrame(
+            ohlcv,
+            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    async def place_order(self, order: Order) -> Order:
+        if self._mock:
+            return await self._mock.place_order(order)
+
+        try:
+            type_map = {
+                OrderType.MARKET: 'market',
+                OrderType.LIMIT: 'limit',
+                OrderType.STOP_LOSS: 'stop_loss',
+                OrderType.STOP_LIMIT: 'stop_limit'
+            }
+            params = {}
+            if order.stop_price:
+                params['stopPrice'] = order.stop_price
+
+            result = await self.exchange.create_order(
+                order.symbol,
+                type_map.get(order.order_type, 'market'),
+                'buy' if order.side == OrderSide.BUY else 'sell',
+                order.amount,
+                order.price,
+                params
+            )
+
+            order.order_id = result['id']
+            order.status = OrderStatus.OPEN
+            order.exchange = self.name
+            return order
+
+        except Exception as e:
+            logging.error(f"Error placing order on {self.name}: {e}")
+            order.status = OrderStatus.REJECTED
+            return order
+
+    async def get_balance(self, asset: str = None) -> Dict[str, Balance]:
+        if self._mock:
+            return await self._mock.get_balance(asset)
+
+        data = await self.exchange.fetch_balance()
+        balances = {
+            code: Balance(code, b.get('free', 0), b.get('used', 0), b.get('total', 0))
+            for code, b in data.items()
+            if isinstance(b, dict) and 'free' in b
+        }
+        if asset:
+            return {asset: balances.get(asset, Balance(asset, 0, 0, 0))}
+        return balances
+
+    def get_fees(self) -> ExchangeFees:
+        if self._mock:
+            return self._mock.get_fees()
+        return self.default_fees
+
+
+class AsyncBinanceConnector(CcxtAsyncExchange):
+    """Async Binance spot connector"""
+
+    ccxt_id = 'binance'
+    default_fees = ExchangeFees(
+        maker=0.001,
+        taker=0.001,
+        withdrawal={'BTC': 0.0005, 'ETH': 0.005, 'USDT': 1.0}
+    )
+
+    def __init__(self, api_key: str = None, secret: str = None,
+                 testnet: bool = True, session_pool: SessionPool = None):
+        super().__init__("Binance", session_pool)
+        self.api_key = api_key or os.getenv('BINANCE_API_KEY')
+        self.secret = secret or os.getenv('BINANCE_SECRET')
+        self.testnet = testnet
+
+    def _config(self) -> Dict:
+        config = {
+            'apiKey': self.api_key,
+            'secret': self.secret,
+            'enableRateLimit': True,
+            'options': {'defaultType': 'spot'},
+        }
+        if self.testnet:
+            config['sandbox'] = True
+            config['urls'] = {
+                'api': {
+                    'public': 'https://testnet.binance.vision/api',
+                    'private': 'https://testnet.binance.vision/api',
+                }
+            }
+        return config
+
+
+class AsyncCoinbaseConnector(CcxtAsyncExchange):
+    """Async Coinbase connector"""
+
+    ccxt_id = 'coinbase'
+    default_fees = ExchangeFees(
+        maker=0.006,
+        taker=0.008,
+        withdrawal={'BTC': 0.0001, 'ETH': 0.001}
+    )
+
+    def __init__(self, api_key: str = None, secret: str = None,
+                 passphrase: str = None, sandbox: bool = True,
+                 session_pool: SessionPool = None):
+        super().__init__("Coinbase", session_pool)
+        self.api_key = api_key or os.getenv('COINBASE_API_KEY')
+        self.secret = secret or os.getenv('COINBASE_SECRET')
+        self.passphrase = passphrase or os.getenv('COINBASE_PASSPHRASE')
+        self.sandbox = sandbox
+
+    def _config(self) -> Dict:
+        config = {
+            'apiKey': self.api_key,
+            'secret': self.secret,
+            'enableRateLimit': True,
+        }
+        if self.passphrase:
+            config['password'] = self.passphrase
+        if self.sandbox:
+            config['sandbox'] = True
+        return config
+
+
+class AsyncKrakenConnector(CcxtAsyncExchange):
+    """Async Kraken connector"""
+
+    ccxt_id = 'kraken'
+    default_fees = ExchangeFees(
+        maker=0.0016,
+        taker=0.0026,
+        withdrawal={'BTC': 0.0005, 'ETH': 0.005}
+    )
+
+    def __init__(self, api_key: str = None, secret: str = None,
+                 session_pool: SessionPool = None):
+        super().__init__("Kraken", session_pool)
+        self.api_key = api_key or os.getenv('KRAKEN_API_KEY')
+        self.secret = secret or os.getenv('KRAKEN_SECRET')
+
+    def _config(self) -> Dict:
+        return {
+            'apiKey': self.api_key,
+            'secret': self.secret,
+            'enableRateLimit': True,
+        }
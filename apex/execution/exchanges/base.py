@@ -8,9 +8,33 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import re
+import threading
+import time
 import pandas as pd
 
 
+TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """Convert a ccxt-style timeframe ('1m', '15m', '4h', '1d') to seconds"""
+    match = re.fullmatch(r'(\d+)([mhdw])', timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+
+
+def candle_close_after(now: float, timeframe: str) -> float:
+    """Epoch seconds at which the candle open at `now` closes"""
+    period = timeframe_to_seconds(timeframe)
+    return (now // period + 1) * period
+
+
+# Batch operations a connector may have native endpoints for
+BATCH_FEATURES = ('place_orders', 'cancel_orders', 'cancel_all_orders')
+
+
 class OrderType(Enum):
     MARKET = "market"
     LIMIT = "limit"
@@ -89,6 +113,9 @@ class BaseExchange(ABC):
     All exchange implementations must inherit from this class.
     """
     
+    # Most orders one native batch request may carry
+    max_batch_size: int = 1
+    
     def __init__(self, name: str, api_key: str = None, secret: str = None, 
                  testnet: bool = True, sandbox: bool = False):
         self.name = name
@@ -98,6 +125,8 @@ class BaseExchange(ABC):
         self.sandbox = sandbox
         self._connected = False
         self._fees: Optional[ExchangeFees] = None
+        # MarketDataCache shared with the router, set when the exchange is added
+        self.cache = None
     
     @abstractmethod
     def connect(self) -> bool:
@@ -160,14 +189,58 @@ class BaseExchange(ABC):
         """Get available trading pairs"""
         pass
     
+    def supports(self, feature: str) -> bool:
+        """
+        Whether the exchange has a native endpoint for a batch feature.
+        
+        Args:
+            feature: One of BATCH_FEATURES
+        """
+        return False
+    
+    def place_orders(self, orders: List[Order]) -> List[Order]:
+        """
+        Place several orders, at most max_batch_size per call.
+        
+        One request for all of them when supports('place_orders'), otherwise
+        one request per order.
+        """
+        return [self.place_order(order) for order in orders]
+    
+    def cancel_orders(self, order_ids: List[str], symbol: str) -> List[bool]:
+        """Cancel several orders of a symbol, at most max_batch_size per call"""
+        return [self.cancel_order(order_id, symbol) for order_id in order_ids]
+    
+    def cancel_all_orders(self, symbol: str = None) -> List[str]:
+        """
+        Cancel every open order, optionally of one symbol.
+        
+        Returns:
+            Ids of the canceled orders
+        """
+        return [order.order_id for order in self.get_open_orders(symbol)
+                if self.cancel_order(order.order_id, order.symbol)]
+    
+    def get_cached_ticker(self, symbol: str) -> Ticker:
+        """Get ticker through the shared market data cache, if attached"""
+        if self.cache is None:
+            return self.get_ticker(symbol)
+        return self.cache.get_ticker(self, symbol)
+    
+    def get_cached_fees(self) -> ExchangeFees:
+        """Get fees through the shared market data cache, if attached"""
+        if self.cache is None:
+            return self.get_fees()
+        return self.cache.get_fees(self)
+    
     def get_spread(self, symbol: str) -> float:
         """Calculate bid-ask spread"""
-        ticker = self.get_ticker(symbol)
+        ticker = self.get_cached_ticker(symbol)
         return (ticker.ask - ticker.bid) / ticker.last * 100
     
     def get_mid_price(self, symbol: str) -> float:
         """Get mid price (average of bid and ask)"""
-        ticker = self.get_ticker(symbol)
+        ticker = self.get_cached_ticker(symbol)
         return (ticker.bid + ticker.ask) / 2
     
     def estimate_cost(self, symbol: str, amount: float, 
@@ -176,10 +249,10 @@ class BaseExchange(ABC):
         Estimate total cost including fees
         Returns: (cost_without_fees, total_cost_with_fees)
         """
-        ticker = self.get_ticker(symbol)
+        ticker = self.get_cached_ticker(symbol)
         price = ticker.ask if side == OrderSide.BUY else ticker.bid
         cost = amount * price
-        fees = self.get_fees()
+        fees = self.get_cached_fees()
         fee_rate = fees.taker  # Assume taker fee for estimation
         total_cost = cost * (1 + fee_rate)
         return cost, total_cost
@@ -285,6 +358,13 @@ class MockExchange(BaseExchange):
         returns = np.random.normal(0.0001, 0.02, limit)
         prices = base_price * np.exp(np.cumsum(returns))
         
+        # Candle open times, the last one being the currently forming candle
+        period = timeframe_to_seconds(timeframe)
+        last_open = int(time.time()) // period * period
+        timestamps = pd.to_datetime(
+            [last_open - (limit - 1 - i) * period for i in range(limit)], unit='s'
+        )
+        
         # Create OHLCV data
         data = []
         for i, price in enumerate(prices):
@@ -296,7 +376,7 @@ class MockExchange(BaseExchange):
             volume = np.random.uniform(100, 1000)
             
             data.append({
-                'timestamp': datetime.now(),
+                'timestamp': timestamps[i],
                 'open': open_p,
                 'high': high_p,
                 'low': low_p,
@@ -354,3 +434,108 @@ class MockExchange(BaseExchange):
     
     def get_symbols(self) -> List[str]:
         return list(self._prices.keys())
+
+
+
+class MockBatchExchange(MockExchange):
+    """
+    MockExchange for testing batch order handling.
+    
+    Counts requests per operation and the most requests in flight at once,
+    waits `latency` seconds per request, and leaves limit orders resting so
+    they can be canceled. With native=True it has batch endpoints taking up
+    to max_batch_size orders of one symbol per request; orders with a
+    non-positive amount are rejected.
+    """
+    
+    def __init__(self, name: str = "MockBatchExchange", native: bool = True,
+                 max_batch_size: int = 5, latency: float = 0.0):
+        super().__init__(name)
+        self.native = native
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def _request(self, operation: str):
+        with self._lock:
+            self.requests[operation] = self.requests.get(operation, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+    
+    def _check_batch(self, size: int):
+        if not self.native:
+            raise NotImplementedError(f"{self.name} has no batch endpoints")
+        if size > self.max_batch_size:
+            raise ValueError(f"Batch of {size} exceeds {self.name} limit of {self.max_batch_size}")
+    
+    def _fill(self, order: Order) -> Order:
+        if order.amount <= 0:
+            order.status = OrderStatus.REJECTED
+            order.exchange = self.name
+            return order
+        if order.order_type != OrderType.LIMIT:
+            return super().place_order(order)
+        with self._lock:
+            self._order_counter += 1
+            order.order_id = f"mock_{self.name}_{self._order_counter}"
+        order.status = OrderStatus.OPEN
+        order.exchange = self.name
+        self._orders[order.order_id] = order
+        return order
+    
+    def supports(self, feature: str) -> bool:
+        return self.native and feature in BATCH_FEATURES
+    
+    def place_order(self, order: Order) -> Order:
+        self._request('place_order')
+        return self._fill(order)
+    
+    def cancel_order(self, order_id: str, symbol: str) -> bool:
+        self._request('cancel_order')
+        order = self._orders.get(order_id)
+        if order is None or order.status != OrderStatus.OPEN:
+            return False
+        order.status = OrderStatus.CANCELED
+        return True
+    
+    def get_open_orders(self, symbol: str = None) -> List[Order]:
+        self._request('get_open_orders')
+        return super().get_open_orders(symbol)
+    
+    def place_orders(self, orders: List[Order]) -> List[Order]:
+        self._check_batch(len(orders))
+        if len({order.symbol for order in orders}) > 1:
+            raise ValueError(f"{self.name} batches take one symbol per request")
+        self._request('place_orders')
+        return [self._fill(order) for order in orders]
+    
+    def cancel_orders(self, order_ids: List[str], symbol: str) -> List[bool]:
+        self._check_batch(len(order_ids))
+        self._request('cancel_orders')
+        canceled = []
+        for order_id in order_ids:
+            order = self._orders.get(order_id)
+            ok = order is not None and order.status == OrderStatus.OPEN and order.symbol == symbol
+            if ok:
+                order.status = OrderStatus.CANCELED
+            canceled.append(ok)
+        return canceled
+    
+    def cancel_all_orders(self, symbol: str = None) -> List[str]:
+        if not self.native:
+            return super().cancel_all_orders(symbol)
+        self._request('cancel_all_orders')
+        canceled = []
+        for order in super().get_open_orders(symbol):
+            order.status = OrderStatus.CANCELED
+            canceled.append(order.order_id)
+        return canceled
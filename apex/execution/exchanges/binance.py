@@ -13,6 +13,7 @@ from .base import (
     BaseExchange, Order, OrderType, OrderSide, OrderStatus,
     Balance, Ticker, ExchangeFees
 )
+from .ccxt_batch import CcxtBatchMixin
 
 # Try to import ccxt, handle if not installed
 try:
@@ -23,12 +24,19 @@ except ImportError:
     logging.warning("ccxt not installed. Binance connector will use mock mode.")
 
 
-class BinanceConnector(BaseExchange):
+class BinanceConnector(CcxtBatchMixin, BaseExchange):
     """
     Binance exchange connector using CCXT library.
     Implements the standardized BaseExchange interface.
     """
     
+    max_batch_size = 5     # batchOrders takes up to 5 orders
+    # Batch create/cancel are contract-only; spot has cancel-all (openOrders) only
+    batch_market_types = {
+        'place_orders': ('future', 'delivery'),
+        'cancel_orders': ('future', 'delivery'),
+    }
+    
     def __init__(self, api_key: str = None, secret: str = None, 
                  testnet: bool = True):
         super().__init__("Binance", api_key, secret, testnet)
@@ -0,0 +1,213 @@
+"""
+Local OHLCV Candle Store
+Columnar on-disk cache of exchange candles, read through memory maps.
+
+Layout: <root>/<exchange>/<symbol>/<timeframe>/<column>.bin, one raw
+little-endian array per column (timestamp as int64 milliseconds, prices and
+volume as float64). Appends only write the new rows and reads map the files,
+copying just the requested range.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import BaseExchange, timeframe_to_seconds
+
+
+COLUMN_DTYPES = {
+    'timestamp': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<f8'),
+}
+
+
+class CandleStore:
+    """
+    On-disk candle cache keyed by exchange / symbol / timeframe.
+
+    Example:
+        store = CandleStore()
+        data = store.get_ohlcv(exchange, 'BTC/USDT', '1h', limit=720)
+    """
+
+    def __init__(self, root: str = 'apex/data/candles'):
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        return self.root / exchange.lower() / symbol.replace('/', '_') / timeframe
+
+    def _length(self, path: Path) -> int:
+        """Number of complete rows (a torn append is ignored)"""
+        lengths = []
+        for column, dtype in COLUMN_DTYPES.items():
+            file = path / f'{column}.bin'
+            if not file.exists():
+                return 0
+            lengths.append(file.stat().st_size // dtype.itemsize)
+        return min(lengths)
+
+    def _columns(self, path: Path, length: int) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of each column"""
+        if length == 0:
+            return {c: np.empty(0, dtype=d) for c, d in COLUMN_DTYPES.items()}
+        return {
+            column: np.memmap(path / f'{column}.bin', dtype=dtype, mode='r', shape=(length,))
+            for column, dtype in COLUMN_DTYPES.items()
+        }
+
+    def read(self, exchange: str, symbol: str, timeframe: str,
+             start: Optional[pd.Timestamp] = None,
+             end: Optional[pd.Timestamp] = None,
+             limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read cached candles.
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start: First candle timestamp (inclusive)
+            end: Last candle timestamp (inclusive)
+            limit: Return only the most recent candles
+
+        Returns:
+            DataFrame with OHLCV columns and a DatetimeIndex
+        """
+        path = self._path(exchange, symbol, timeframe)
+        columns = self._columns(path, self._length(path))
+        timestamps = columns['timestamp']
+
+        lo, hi = 0, len(timestamps)
+        if start is not None:
+            lo = int(np.searchsorted(timestamps, _to_ms(start), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(timestamps, _to_ms(end), side='right'))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps[lo:hi], unit='ms'), name='timestamp')
+        return pd.DataFrame(
+            {column: columns[column][lo:hi] for column in COLUMN_DTYPES if column != 'timestamp'},
+            index=index
+        )
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest cached candle"""
+        path = self._path(exchange, symbol, timeframe)
+        length = self._length(path)
+        if length == 0:
+            return None
+        return pd.Timestamp(int(self._columns(path, length)['timestamp'][-1]), unit='ms')
+
+    def write(self, exchange: str, symbol: str, timeframe: str, data: pd.DataFrame) -> int:
+        """
+        Merge candles into the store.
+
+        Rows at or after the first new timestamp are replaced (this refreshes a
+        candle that was still forming when it was cached). Newer data is
+        appended in place; data older than the cache triggers a full rewrite.
+
+        Returns:
+            Number of rows in the store afterwards
+        """
+        new = _normalize(data)
+        if len(new['timestamp']) == 0:
+            return self._length(self._path(exchange, symbol, timeframe))
+
+        path = self._path(exchange, symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        length = self._length(path)
+        stored = self._columns(path, length)['timestamp']
+
+        first_new = new['timestamp'][0]
+        if length and first_new < stored[0]:
+            merged = _normalize(pd.concat([self.read(exchange, symbol, timeframe), _to_frame(new)]))
+            self._rewrite(path, merged)
+            return len(merged['timestamp'])
+
+        keep = int(np.searchsorted(stored, first_new, side='left'))
+        del stored
+        for column, dtype in COLUMN_DTYPES.items():
+            file = path / f'{column}.bin'
+            with open(file, 'ab') as f:
+                f.truncate(keep * dtype.itemsize)
+                f.write(new[column].astype(dtype).tobytes())
+
+        return keep + len(new['timestamp'])
+
+    def _rewrite(self, path: Path, columns: Dict[str, np.ndarray]):
+        for column, dtype in COLUMN_DTYPES.items():
+            tmp = path / f'{column}.bin.tmp'
+            columns[column].astype(dtype).tofile(tmp)
+            os.replace(tmp, path / f'{column}.bin')
+
+    def get_ohlcv(self, exchange: BaseExchange, symbol: str,
+                  timeframe: str = '1h', limit: int = 100) -> pd.DataFrame:
+        """
+        Read-through equivalent of exchange.get_ohlcv().
+
+        Only the candles missing since the newest cached one (plus that one,
+        which may have been incomplete) are requested from the exchange. If
+        more than `limit` candles are missing, the fetched block can't be
+        joined to the cache without a hole, so it replaces the cached history.
+        """
+        name = exchange.name
+        period_ms = timeframe_to_seconds(timeframe) * 1000
+        path = self._path(name, symbol, timeframe)
+        length = self._length(path)
+
+        if length == 0:
+            fetch = limit
+        else:
+            last = int(self._columns(path, length)['timestamp'][-1])
+            missing = max(0, int(time.time() * 1000) - last) // period_ms
+            fetch = min(limit, missing + 1) if length >= limit else limit
+
+        if fetch > 0:
+            self.logger.debug(f"Fetching {fetch} {timeframe} candles for {symbol} from {name}")
+            new = _normalize(exchange.get_ohlcv(symbol, timeframe, limit=fetch))
+            if length and len(new['timestamp']) and new['timestamp'][0] > last + period_ms:
+                self.logger.warning(f"Cached {timeframe} {symbol} candles from {name} end "
+                                    f"{(new['timestamp'][0] - last) // period_ms - 1} candles "
+                                    f"before the fetched ones, replacing them")
+                self._rewrite(path, new)
+            else:
+                self.write(name, symbol, timeframe, _to_frame(new))
+
+        return self.read(name, symbol, timeframe, limit=limit)
+
+
+def _to_ms(timestamp) -> int:
+    return int(pd.Timestamp(timestamp).value // 1_000_000)
+
+
+def _normalize(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Sorted, de-duplicated column arrays from a connector DataFrame"""
+    if 'timestamp' in data.columns:
+        timestamps = pd.to_datetime(data['timestamp'])
+    else:
+        timestamps = pd.to_datetime(data.index)
+
+    frame = pd.DataFrame({
+        'timestamp': np.asarray(timestamps, dtype='datetime64[ms]').astype(np.int64),
+        **{c: data[c].to_numpy(dtype=np.float64) for c in COLUMN_DTYPES if c != 'timestamp'}
+    })
+    frame = frame.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+    return {column: frame[column].to_numpy() for column in COLUMN_DTYPES}
+
+
+def _to_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {c: columns[c] for c in COLUMN_DTYPES if c != 'timestamp'},
+        index=pd.to_datetime(columns['timestamp'], unit='ms')
+    )
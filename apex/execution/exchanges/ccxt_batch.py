@@ -0,0 +1,152 @@
+"""
+CCXT Batch Orders
+Native batch endpoints for the synchronous ccxt connectors.
+
+ccxt reports per exchange whether createOrders, cancelOrders and
+cancelAllOrders are implemented, but not for which market types: Binance's
+batch endpoints are contract-only, for example. Connectors list the market
+types a feature works for, and a NotSupported error turns the feature off
+for the connector. Without a native endpoint the connector keeps the
+BaseExchange behaviour of one request per order.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+from .base import BATCH_FEATURES, Order, OrderSide, OrderStatus, OrderType
+
+try:
+    from ccxt.base.errors import NotSupported
+except ImportError:
+    class NotSupported(Exception):
+        """Stand-in for ccxt's NotSupported when ccxt isn't installed"""
+
+
+CCXT_FEATURES = dict(zip(BATCH_FEATURES, ('createOrders', 'cancelOrders', 'cancelAllOrders')))
+
+CCXT_ORDER_TYPES = {
+    OrderType.MARKET: 'market',
+    OrderType.LIMIT: 'limit',
+    OrderType.STOP_LOSS: 'stop_loss',
+    OrderType.STOP_LIMIT: 'stop_limit'
+}
+
+
+class CcxtBatchMixin:
+    """
+    Batch order methods for a BaseExchange connector wrapping a ccxt
+    instance in self.exchange (and a MockExchange in self._mock in mock mode).
+
+    Example:
+        class BinanceConnector(CcxtBatchMixin, BaseExchange):
+            max_batch_size = 5
+            batch_market_types = {'place_orders': ('future', 'delivery')}
+    """
+
+    # ccxt defaultType values a native feature works for; unlisted features work for all
+    batch_market_types: Dict[str, Tuple[str, ...]] = {}
+
+    def _mock_mode(self) -> bool:
+        return getattr(self, '_using_mock', False)
+
+    def supports(self, feature: str) -> bool:
+        if self._mock_mode():
+            return self._mock.supports(feature)
+        exchange = getattr(self, 'exchange', None)
+        if exchange is None or feature in getattr(self, '_batch_unsupported', ()):
+            return False
+        if not exchange.has.get(CCXT_FEATURES.get(feature)):
+            return False
+        market_types = self.batch_market_types.get(feature)
+        return market_types is None or exchange.options.get('defaultType', 'spot') in market_types
+
+    def _not_supported(self, feature: str, error: Exception):
+        """Stop using a native feature the exchange refused"""
+        logging.warning(f"{self.name} has no native {feature} here, using single requests: {error}")
+        if not hasattr(self, '_batch_unsupported'):
+            self._batch_unsupported = set()
+        self._batch_unsupported.add(feature)
+
+    def _order_request(self, order: Order) -> dict:
+        """createOrders entry of an order"""
+        params = {}
+        if order.stop_price:
+            params['stopPrice'] = order.stop_price
+        return {
+            'symbol': order.symbol,
+            'type': CCXT_ORDER_TYPES.get(order.order_type, 'market'),
+            'side': 'buy' if order.side == OrderSide.BUY else 'sell',
+            'amount': order.amount,
+            'price': order.price,
+            'params': params,
+        }
+
+    def place_orders(self, orders: List[Order]) -> List[Order]:
+        """Place orders in one createOrders request"""
+        if self._mock_mode():
+            return self._mock.place_orders(orders)
+        if not self.supports('place_orders'):
+            return super().place_orders(orders)
+
+        try:
+            results = self.exchange.create_orders([self._order_request(o) for o in orders])
+        except NotSupported as e:
+            self._not_supported('place_orders', e)
+            return super().place_orders(orders)
+        except Exception as e:
+            logging.error(f"Error placing batch of {len(orders)} orders: {e}")
+            for order in orders:
+                order.status = OrderStatus.REJECTED
+            return orders
+
+        for order, result in zip(orders, results):
+            # Orders the exchange refused come back without an id
+            if result.get('id'):
+                order.order_id = result['id']
+                order.status = OrderStatus.OPEN
+                order.exchange = self.name
+            else:
+                order.status = OrderStatus.REJECTED
+        return orders
+
+    def cancel_orders(self, order_ids: List[str], symbol: str) -> List[bool]:
+        """Cancel orders of a symbol in one cancelOrders request"""
+        if self._mock_mode():
+            return self._mock.cancel_orders(order_ids, symbol)
+        if not self.supports('cancel_orders'):
+            return super().cancel_orders(order_ids, symbol)
+
+        try:
+            results = self.exchange.cancel_orders(order_ids, symbol)
+        except NotSupported as e:
+            self._not_supported('cancel_orders', e)
+            return super().cancel_orders(order_ids, symbol)
+        except Exception as e:
+            logging.error(f"Error canceling batch of {len(order_ids)} orders: {e}")
+            return [False] * len(order_ids)
+
+        # Orders the exchange couldn't cancel come back without an id (or not at all)
+        statuses = {entry['id']: entry.get('status') for entry in results or []
+                    if isinstance(entry, dict) and entry.get('id')}
+        return [order_id in statuses and statuses[order_id] in (None, 'canceled')
+                for order_id in order_ids]
+
+    def cancel_all_orders(self, symbol: str = None) -> List[str]:
+        """Cancel open orders with cancelAllOrders (most exchanges need a symbol)"""
+        if self._mock_mode():
+            return self._mock.cancel_all_orders(symbol)
+        if symbol is None or not self.supports('cancel_all_orders'):
+            return super().cancel_all_orders(symbol)
+
+        try:
+            result = self.exchange.cancel_all_orders(symbol)
+        except NotSupported as e:
+            self._not_supported('cancel_all_orders', e)
+            return super().cancel_all_orders(symbol)
+        except Exception as e:
+            logging.error(f"Error canceling all {symbol} orders: {e}")
+            return []
+        # Ids of the canceled orders, where the exchange reports them
+        if not isinstance(result, list):
+            return []
+        return [entry['id'] for entry in result if isinstance(entry, dict) and entry.get('id')]
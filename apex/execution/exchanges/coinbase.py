@@ -13,6 +13,7 @@ from .base import (
     BaseExchange, Order, OrderType, OrderSide, OrderStatus,
     Balance, Ticker, ExchangeFees
 )
+from .ccxt_batch import CcxtBatchMixin
 
 # Try to import ccxt
 try:
@@ -22,12 +23,14 @@ except ImportError:
     CCXT_AVAILABLE = False
 
 
-class CoinbaseConnector(BaseExchange):
+class CoinbaseConnector(CcxtBatchMixin, BaseExchange):
     """
     Coinbase exchange connector.
     Implements the standardized BaseExchange interface.
     """
     
+    max_batch_size = 100   # batch_cancel takes up to 100 orders
+    
     def __init__(self, api_key: str = None, secret: str = None,
                  passphrase: str = None, sandbox: bool = True):
         super().__init__("Coinbase", api_key, secret, sandbox=sandbox)
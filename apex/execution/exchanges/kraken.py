@@ -13,6 +13,7 @@ from .base import (
     BaseExchange, Order, OrderType, OrderSide, OrderStatus,
     Balance, Ticker, ExchangeFees
 )
+from .ccxt_batch import CcxtBatchMixin
 
 # Try to import ccxt
 try:
@@ -22,12 +23,14 @@ except ImportError:
     CCXT_AVAILABLE = False
 
 
-class KrakenConnector(BaseExchange):
+class KrakenConnector(CcxtBatchMixin, BaseExchange):
     """
     Kraken exchange connector.
     Implements the standardized BaseExchange interface.
     """
     
+    max_batch_size = 15    # AddOrderBatch takes up to 15 orders
+    
     def __init__(self, api_key: str = None, secret: str = None):
         super().__init__("Kraken", api_key, secret)
         self.exchange = None
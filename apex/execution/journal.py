@@ -0,0 +1,145 @@
+"""
+Append-only Journal
+Event log persistence for OrderManager and PositionTracker.
+
+State is a set of named collections of records (dicts with an 'id'). The
+snapshot file keeps the plain JSON layout the managers always used
+({collection: [records]}); every change since the last snapshot is appended
+as one line to <path>.journal. Loading reads the snapshot and replays the
+journal; once enough events pile up the owner's state is written as a new
+snapshot and the journal is truncated.
+
+Events carry the full record, so replaying an event twice (e.g. after a crash
+between writing the snapshot and truncating the journal) is harmless.
+"""
+
+import json
+import logging
+import os
+from typing import Callable, Dict, List
+
+
+class Journal:
+    """
+    JSONL event journal with snapshot compaction.
+
+    Example:
+        journal = Journal('orders.json', ['active', 'history'], snapshot=get_state)
+        state = journal.load()              # {'active': {id: record}, ...}
+        journal.put('active', order.to_dict())
+        journal.delete('active', order.id)
+    """
+
+    def __init__(self, path: str, collections: List[str],
+                 snapshot: Callable[[], Dict[str, List[Dict]]] = None,
+                 compact_every: int = 1000, fsync: bool = False):
+        """
+        Args:
+            path: Snapshot file; the journal is written next to it
+            collections: Names of the record collections
+            snapshot: Returns the owner's full state for compaction
+            compact_every: Events between snapshots (0 disables compaction)
+            fsync: fsync after every event instead of only flushing
+        """
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.collections = collections
+        self.snapshot = snapshot
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.logger = logging.getLogger(__name__)
+        self.pending_events = 0
+        self._file = None
+
+    def load(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Read the snapshot and replay the journal on top of it.
+
+        Returns:
+            Records per collection, keyed by id in insertion order
+        """
+        state: Dict[str, Dict[str, Dict]] = {c: {} for c in self.collections}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            for collection in self.collections:
+                for record in data.get(collection, []):
+                    state[collection][record['id']] = record
+
+        self.pending_events = 0
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash; everything before it is intact
+                        self.logger.warning(f"Discarding corrupt journal tail of "
+                                            f"{self.journal_path} after "
+                                            f"{self.pending_events} events")
+                        break
+                    self._apply(state, event)
+                    self.pending_events += 1
+                    valid_bytes += len(line)
+
+            # Cut the torn tail so new events don't get glued onto it
+            if valid_bytes < os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        return state
+
+    def put(self, collection: str, record: Dict):
+        """Insert or replace a record"""
+        self._append({'op': 'put', 'c': collection, 'r': record})
+
+    def delete(self, collection: str, record_id: str):
+        """Remove a record"""
+        self._append({'op': 'del', 'c': collection, 'id': record_id})
+
+    def compact(self):
+        """Write the owner's state as a new snapshot and empty the journal"""
+        if self.snapshot is None:
+            return
+
+        data = self.snapshot()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+        self.close()
+        open(self.journal_path, 'w').close()
+        self.pending_events = 0
+
+    def close(self):
+        """Close the journal file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def _apply(state: Dict[str, Dict[str, Dict]], event: Dict):
+        records = state.setdefault(event['c'], {})
+        if event['op'] == 'put':
+            records[event['r']['id']] = event['r']
+        elif event['op'] == 'del':
+            records.pop(event['id'], None)
+
+    def _append(self, event: Dict):
+        if self._file is None:
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.journal_path, 'a')
+
+        self._file.write(json.dumps(event) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self.pending_events += 1
+        if self.compact_every and self.pending_events >= self.compact_every:
+            self.compact()
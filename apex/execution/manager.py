@@ -5,13 +5,42 @@ Unified interface for managing multiple exchanges.
 
 import os
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional
 
-from .exchanges.base import BaseExchange, Order, OrderSide, OrderType
+from .exchanges.base import BaseExchange, Order, OrderSide, OrderStatus, OrderType
+from .exchanges.async_base import AsyncBaseExchange, gather_bounded
 from .exchanges.binance import BinanceConnector
 from .exchanges.coinbase import CoinbaseConnector
 from .exchanges.kraken import KrakenConnector
 from .routing import SmartOrderRouter, RoutingPriority
+from .cache import MarketDataCache
+
+
+@dataclass
+class BatchResult:
+    """Aggregated outcome of a batch call"""
+    results: List = field(default_factory=list)     # Per item, in request order
+    errors: Dict[Hashable, str] = field(default_factory=dict)   # Item index or exchange name -> error
+    requests: Dict[str, int] = field(default_factory=dict)      # API requests per exchange
+    
+    @property
+    def failed(self) -> int:
+        return sum(1 for key in self.errors if isinstance(key, int))
+    
+    @property
+    def succeeded(self) -> int:
+        return len(self.results) - self.failed
+    
+    def summary(self) -> Dict:
+        return {
+            'items': len(self.results),
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'requests': dict(self.requests),
+            'errors': dict(self.errors),
+        }
 
 
 class ExchangeManager:
@@ -23,12 +52,22 @@ class ExchangeManager:
     - Smart order routing
     - Unified balance tracking
     - Cross-exchange arbitrage detection
+    - Concurrent queries from one event loop (*_async methods)
+    - Batch order placement and cancellation (native batch endpoints where
+      an exchange has them, bounded concurrent requests where it doesn't)
     """
     
     def __init__(self, config: dict = None):
         self.config = config or {}
         self.exchanges: Dict[str, BaseExchange] = {}
-        self.router = SmartOrderRouter()
+        # TTLs in seconds per data type, e.g. {'ticker': 0.5, 'fees': 3600}
+        self.cache = MarketDataCache(self.config.get('market_data_ttl'))
+        self.router = SmartOrderRouter(
+            cache=self.cache,
+            max_concurrency=self.config.get('max_concurrency', 10)
+        )
+        # Requests in flight per exchange during batch calls
+        self.max_batch_concurrency = self.config.get('max_batch_concurrency', 4)
         self._initialized = False
         
     def initialize(self, auto_connect: bool = True) -> bool:
@@ -80,6 +119,10 @@ class ExchangeManager:
             return True
         return False
     
+    async def add_async_exchange(self, exchange: AsyncBaseExchange) -> bool:
+        """Add and connect a native async connector"""
+        return await self.router.add_async_exchange(exchange)
+    
     def get_exchange(self, name: str) -> Optional[BaseExchange]:
         """Get a specific exchange"""
         return self.exchanges.get(name)
@@ -105,6 +148,27 @@ class ExchangeManager:
         
         return all_balances
     
+    async def get_all_balances_async(self) -> Dict[str, Dict]:
+        """Get balances from all exchanges concurrently"""
+        exchanges = self.router.async_view()
+        results = await gather_bounded(
+            [exchange.get_balance() for exchange in exchanges.values()],
+            limit=self.router.max_concurrency
+        )
+        
+        all_balances = {}
+        for name, balances in zip(exchanges, results):
+            if isinstance(balances, Exception):
+                logging.error(f"Failed to get balances from {name}: {balances}")
+                all_balances[name] = {'error': str(balances)}
+            else:
+                all_balances[name] = {
+                    asset: {'free': bal.free, 'used': bal.used, 'total': bal.total}
+                    for asset, bal in balances.items()
+                }
+        
+        return all_balances
+    
     def get_total_balance(self, asset: str) -> Dict[str, float]:
         """Get total balance of an asset across all exchanges"""
         total_free = 0.0
@@ -133,7 +197,7 @@ class ExchangeManager:
         
         for name, exchange in self.exchanges.items():
             try:
-                ticker = exchange.get_ticker(symbol)
+                ticker = self.cache.get_ticker(exchange, symbol)
                 price = ticker.ask if side == OrderSide.BUY else ticker.bid
                 all_prices[name] = price
                 
@@ -156,6 +220,34 @@ class ExchangeManager:
             'all_prices': all_prices
         }
     
+    async def get_best_price_async(self, symbol: str, side: OrderSide) -> Dict:
+        """Get the best price across all exchanges, querying them concurrently"""
+        exchanges = self.router.async_view()
+        results = await gather_bounded(
+            [self.cache.get_async('ticker', name, symbol,
+                                  lambda exchange=exchange: exchange.get_ticker(symbol))
+             for name, exchange in exchanges.items()],
+            limit=self.router.max_concurrency
+        )
+        
+        all_prices = {}
+        for name, ticker in zip(exchanges, results):
+            if isinstance(ticker, Exception):
+                logging.error(f"Failed to get price from {name}: {ticker}")
+                continue
+            all_prices[name] = ticker.ask if side == OrderSide.BUY else ticker.bid
+        
+        best_exchange = None
+        if all_prices:
+            pick = min if side == OrderSide.BUY else max
+            best_exchange = pick(all_prices, key=all_prices.get)
+        
+        return {
+            'best_price': all_prices.get(best_exchange),
+            'best_exchange': best_exchange,
+            'all_prices': all_prices
+        }
+    
     def place_order(self, order: Order, use_smart_routing: bool = True,
                     priority: RoutingPriority = None) -> Order:
         """
@@ -178,7 +270,9 @@ class ExchangeManager:
                 exchange = list(self.exchanges.values())[0]
                 order.exchange = exchange.name
             
-            return exchange.place_order(order)
+            executed = exchange.place_order(order)
+            self.cache.on_order_placed(exchange.name, order.symbol)
+            return executed
     
     def cancel_order(self, order_id: str, symbol: str, 
                      exchange_name: str = None) -> bool:
@@ -196,6 +290,231 @@ class ExchangeManager:
         
         return False
     
+    def place_orders(self, orders: List[Order], use_smart_routing: bool = True,
+                     priority: RoutingPriority = None) -> BatchResult:
+        """
+        Place many orders, e.g. the children of a TWAP or iceberg order.
+        
+        Orders naming an exchange go there; the others are routed once per
+        symbol and side (or sent to the first exchange). Each exchange gets
+        native batch requests of up to max_batch_size orders of one symbol
+        when it has a batch endpoint, otherwise one request per order, with at most
+        max_batch_concurrency requests in flight per exchange. Exchanges
+        are served in parallel.
+        
+        Args:
+            orders: Orders to place
+            use_smart_routing: Route orders without an exchange
+            priority: Routing priority (if smart routing)
+        
+        Returns:
+            BatchResult with the placed orders in request order; failed
+            orders are REJECTED and listed in errors by index
+        """
+        result = BatchResult(results=list(orders))
+        groups: Dict[str, List[int]] = {}
+        routes: Dict[tuple, Optional[str]] = {}
+        for i, order in enumerate(orders):
+            name = self._batch_exchange(order, use_smart_routing, priority, routes)
+            if name is None:
+                order.status = OrderStatus.REJECTED
+                result.errors[i] = "No exchange available"
+            else:
+                groups.setdefault(name, []).append(i)
+        
+        work, chunks = {}, {}
+        for name, indices in groups.items():
+            exchange = self.exchanges[name]
+            if exchange.supports('place_orders'):
+                # Batch endpoints take one symbol per request
+                by_symbol: Dict[str, List[int]] = {}
+                for i in indices:
+                    by_symbol.setdefault(orders[i].symbol, []).append(i)
+                size = max(1, exchange.max_batch_size)
+                chunks[name] = [same[k:k + size] for same in by_symbol.values()
+                                for k in range(0, len(same), size)]
+                work[name] = [lambda batch=[orders[i] for i in chunk], exchange=exchange:
+                              exchange.place_orders(batch) for chunk in chunks[name]]
+            else:
+                chunks[name] = [[i] for i in indices]
+                work[name] = [lambda order=orders[i], exchange=exchange: [exchange.place_order(order)]
+                              for i in indices]
+        
+        for name, outcomes in self._run_per_exchange(work).items():
+            result.requests[name] = len(outcomes)
+            for chunk, outcome in zip(chunks[name], outcomes):
+                if isinstance(outcome, Exception):
+                    logging.error(f"Batch placement failed on {name}: {outcome}")
+                    for i in chunk:
+                        orders[i].status = OrderStatus.REJECTED
+                        result.errors[i] = str(outcome)
+                    continue
+                for i, placed in zip(chunk, outcome):
+                    result.results[i] = placed
+                    if placed.status == OrderStatus.REJECTED:
+                        result.errors[i] = f"Rejected by {name}"
+            for symbol in {orders[i].symbol for i in groups[name]}:
+                self.cache.on_order_placed(name, symbol)
+        
+        return result
+    
+    def cancel_orders(self, orders: List[Order]) -> BatchResult:
+        """
+        Cancel many orders on the exchanges they were placed on.
+        
+        Orders are grouped per exchange and symbol and canceled with native
+        batch requests where available, otherwise with bounded concurrent
+        single cancels.
+        
+        Returns:
+            BatchResult with True/False per order in request order
+        """
+        result = BatchResult(results=[False] * len(orders))
+        groups: Dict[str, Dict[str, List[int]]] = {}
+        for i, order in enumerate(orders):
+            if order.exchange in self.exchanges:
+                groups.setdefault(order.exchange, {}).setdefault(order.symbol, []).append(i)
+            else:
+                result.errors[i] = f"Unknown exchange '{order.exchange}'"
+        
+        work, chunks = {}, {}
+        for name, by_symbol in groups.items():
+            exchange = self.exchanges[name]
+            native = exchange.supports('cancel_orders')
+            size = max(1, exchange.max_batch_size) if native else 1
+            chunks[name], work[name] = [], []
+            for symbol, indices in by_symbol.items():
+                for k in range(0, len(indices), size):
+                    chunk = indices[k:k + size]
+                    ids = [orders[i].order_id for i in chunk]
+                    chunks[name].append(chunk)
+                    if native:
+                        work[name].append(lambda ids=ids, symbol=symbol, exchange=exchange:
+                                          exchange.cancel_orders(ids, symbol))
+                    else:
+                        work[name].append(lambda order_id=ids[0], symbol=symbol, exchange=exchange:
+                                          [exchange.cancel_order(order_id, symbol)])
+        
+        for name, outcomes in self._run_per_exchange(work).items():
+            result.requests[name] = len(outcomes)
+            for chunk, outcome in zip(chunks[name], outcomes):
+                if isinstance(outcome, Exception):
+                    logging.error(f"Batch cancel failed on {name}: {outcome}")
+                    for i in chunk:
+                        result.errors[i] = str(outcome)
+                    continue
+                for i, canceled in zip(chunk, outcome):
+                    result.results[i] = bool(canceled)
+                    if not canceled:
+                        result.errors.setdefault(i, f"Not canceled on {name}")
+            for symbol in groups[name]:
+                self.cache.invalidate(name, symbol, kind='ticker')
+        
+        return result
+    
+    def cancel_all(self, symbol: str = None, exchange_name: str = None) -> BatchResult:
+        """
+        Cancel every open order, e.g. to flatten before an emergency exit.
+        
+        Exchanges with a native cancel-all endpoint get one request; on the
+        others the open orders are fetched and canceled through
+        cancel_orders(). All exchanges are handled in parallel.
+        
+        Args:
+            symbol: Only orders of this symbol (default: all)
+            exchange_name: Only this exchange (default: all)
+        
+        Returns:
+            BatchResult with the ids of the canceled orders; exchanges that
+            failed are listed in errors by name
+        """
+        names = [exchange_name] if exchange_name else list(self.exchanges)
+        result = BatchResult()
+        work = {}
+        for name in names:
+            exchange = self.exchanges.get(name)
+            if exchange is None:
+                result.errors[name] = f"Unknown exchange '{name}'"
+            elif exchange.supports('cancel_all_orders'):
+                work[name] = [lambda exchange=exchange: exchange.cancel_all_orders(symbol)]
+            else:
+                work[name] = [lambda exchange=exchange: exchange.get_open_orders(symbol)]
+        
+        open_orders = []
+        for name, (outcome,) in self._run_per_exchange(work).items():
+            result.requests[name] = 1
+            if isinstance(outcome, Exception):
+                logging.error(f"Cancel-all failed on {name}: {outcome}")
+                result.errors[name] = str(outcome)
+            elif self.exchanges[name].supports('cancel_all_orders'):
+                result.results.extend(outcome)
+                # Without a symbol every ticker of the exchange is affected
+                self.cache.invalidate(name, symbol, kind='ticker')
+            else:
+                for order in outcome:
+                    order.exchange = order.exchange or name
+                open_orders.extend(outcome)
+        
+        if open_orders:
+            canceled = self.cancel_orders(open_orders)
+            for name, count in canceled.requests.items():
+                result.requests[name] += count
+            result.results.extend(order.order_id for order, ok in zip(open_orders, canceled.results) if ok)
+            for i, error in canceled.errors.items():
+                order = open_orders[i]
+                result.errors.setdefault(order.exchange, f"{order.order_id}: {error}")
+        
+        logging.info(f"Canceled {len(result.results)} open orders"
+                     f"{f' for {symbol}' if symbol else ''} on {len(names)} exchanges")
+        return result
+    
+    def _batch_exchange(self, order: Order, use_smart_routing: bool,
+                        priority: RoutingPriority, routes: Dict[tuple, Optional[str]]) -> Optional[str]:
+        """Exchange an order of a batch goes to; routes caches one decision per symbol and side"""
+        if order.exchange in self.exchanges:
+            return order.exchange
+        if not self.exchanges:
+            return None
+        if not (use_smart_routing and len(self.exchanges) > 1):
+            return next(iter(self.exchanges))
+        key = (order.symbol, order.side)
+        if key not in routes:
+            try:
+                decision = self.router.get_best_exchange(order.symbol, order.side, order.amount, priority)
+                routes[key] = decision.selected_exchange
+            except Exception as e:
+                logging.error(f"Routing {order.symbol} failed: {e}")
+                routes[key] = None
+        return routes[key]
+    
+    def _run_per_exchange(self, work: Dict[str, List[Callable]]) -> Dict[str, List]:
+        """
+        Run each exchange's calls, at most max_batch_concurrency at a time per
+        exchange and all exchanges in parallel.
+        
+        Returns:
+            Results (or raised exceptions) per exchange, in call order
+        """
+        pools = {
+            name: ThreadPoolExecutor(max_workers=max(1, min(self.max_batch_concurrency, len(calls))),
+                                     thread_name_prefix=f'batch-{name}')
+            for name, calls in work.items() if calls
+        }
+        try:
+            futures = {name: [pools[name].submit(call) for call in work[name]] for name in pools}
+            results = {}
+            for name, pending in futures.items():
+                results[name] = []
+                for future in pending:
+                    try:
+                        results[name].append(future.result())
+                    except Exception as e:
+                        results[name].append(e)
+            return results
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=False)
+    
     def get_order_status(self, order_id: str, symbol: str,
                          exchange_name: str = None) -> Optional[Order]:
         """Get order status from an exchange"""
@@ -224,7 +543,8 @@ class ExchangeManager:
             'initialized': self._initialized,
             'exchange_count': len(self.exchanges),
             'exchanges': self.router.get_exchange_status(),
-            'routing_enabled': len(self.exchanges) > 1
+            'routing_enabled': len(self.exchanges) > 1,
+            'market_data_cache': self.cache.get_stats()
         }
     
     def disconnect_all(self):
@@ -3,15 +3,19 @@ Advanced Order Types
 Implements sophisticated order types for professional trading.
 """
 
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+import itertools
 import logging
 import time
 import threading
+import numpy as np
 
+from analysis.indicators import kernels
 from .manager import Order, OrderSide, OrderType, OrderStatus
+from ..triggers import TriggerBook, BELOW, ABOVE
 
 
 class AdvancedOrderType(Enum):
@@ -181,6 +185,43 @@ class TrailingStopOrder:
         
         return None
     
+    def update_prices(self, prices) -> Optional[Order]:
+        """
+        Feed a path of market prices at once.
+        
+        Equivalent to calling update_price() for each price until the stop
+        triggers, but runs in one array kernel. Prices after the trigger are
+        ignored.
+        
+        Args:
+            prices: Market prices in order
+            
+        Returns:
+            Order if the stop triggered, None otherwise
+        """
+        prices = np.asarray(prices, dtype=float)
+        if len(prices) == 0:
+            return None
+        
+        if not self.activated:
+            self._initialize(float(prices[0]))
+            prices = prices[1:]
+        
+        is_sell = self.side == OrderSide.SELL
+        extreme = self.highest_price if is_sell else self.lowest_price
+        index, extreme, stop_price = kernels.trailing_stop_scan(
+            prices, is_sell, self.trail_amount, self.trail_percent, extreme
+        )
+        if is_sell:
+            self.highest_price = extreme
+        else:
+            self.lowest_price = extreme
+        self.stop_price = stop_price
+        
+        if index >= 0:
+            return self._create_market_order()
+        return None
+    
     def _initialize(self, price: float):
         """Initialize trailing stop"""
         self.highest_price = price
@@ -230,6 +271,9 @@ class TrailingStopOrder:
         }
 
 
+_bracket_ids = itertools.count()
+
+
 @dataclass
 class BracketOrder:
     """
@@ -275,10 +319,13 @@ class BracketOrder:
     
     def create_orders(self) -> List[Order]:
         """Create all three bracket orders"""
+        # Brackets created in the same millisecond still get distinct ids
+        suffix = f"{int(time.time() * 1000)}_{next(_bracket_ids)}"
+        
         # Entry order
         entry_type = OrderType.LIMIT if self.entry_price else OrderType.MARKET
         self.entry_order = Order(
-            id=f"bracket_entry_{self.symbol}_{int(time.time() * 1000)}",
+            id=f"bracket_entry_{self.symbol}_{suffix}",
             symbol=self.symbol,
             side=self.side,
             order_type=entry_type,
@@ -290,7 +337,7 @@ class BracketOrder:
         # Stop loss (opposite side)
         stop_side = OrderSide.SELL if self.side == OrderSide.BUY else OrderSide.BUY
         self.stop_order = Order(
-            id=f"bracket_stop_{self.symbol}_{int(time.time() * 1000)}",
+            id=f"bracket_stop_{self.symbol}_{suffix}",
             symbol=self.symbol,
             side=stop_side,
             order_type=OrderType.STOP_LOSS,
@@ -301,7 +348,7 @@ class BracketOrder:
         
         # Take profit (opposite side)
         self.profit_order = Order(
-            id=f"bracket_profit_{self.symbol}_{int(time.time() * 1000)}",
+            id=f"bracket_profit_{self.symbol}_{suffix}",
             symbol=self.symbol,
             side=stop_side,
             order_type=OrderType.TAKE_PROFIT,
@@ -359,6 +406,11 @@ class AdvancedOrderManager:
     
     Handles the complexity of multi-part orders like icebergs,
     trailing stops, and bracket orders.
+    
+    Trailing stops and the exits of filled brackets are driven by market
+    data rather than a monitor thread: feed prices to on_price(), directly or
+    through ExecutionEngine. Both are kept in a TriggerBook, so a price only
+    visits the stops and brackets it moved or crossed.
     """
     
     def __init__(self):
@@ -366,31 +418,52 @@ class AdvancedOrderManager:
         self.iceberg_orders: Dict[str, IcebergOrder] = {}
         self.trailing_stops: Dict[str, TrailingStopOrder] = {}
         self.bracket_orders: Dict[str, BracketOrder] = {}
+        self._triggers = TriggerBook()
         self._lock = threading.Lock()
+        self._ids = itertools.count()
         self._running = False
-        self._monitor_thread: Optional[threading.Thread] = None
     
     def start(self):
-        """Start the advanced order monitor"""
+        """Start handling price updates"""
         self._running = True
-        self._monitor_thread = threading.Thread(target=self._monitor_loop)
-        self._monitor_thread.daemon = True
-        self._monitor_thread.start()
         self.logger.info("Advanced order manager started")
     
     def stop(self):
-        """Stop the advanced order monitor"""
+        """Stop handling price updates"""
         self._running = False
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=5)
         self.logger.info("Advanced order manager stopped")
     
-    def _monitor_loop(self):
-        """Background monitoring for trailing stops"""
-        while self._running:
-            # Trailing stops need price updates - in real implementation
-            # this would connect to market data feed
-            time.sleep(1)
+    def on_price(self, symbol: str, price: float) -> List[Tuple[str, Order]]:
+        """
+        Update the trailing stops and bracket exits of a symbol with a new
+        market price.
+        
+        Triggered stops are removed from the manager. A bracket whose stop
+        loss or take profit is crossed returns that exit order once; report
+        its fill with BracketOrder.on_exit_filled() to cancel the other leg.
+        
+        Returns:
+            (trailing stop / bracket id, order to send) for every trigger
+        """
+        if not self._running:
+            return []
+        
+        with self._lock:
+            triggered = self._triggers.update_trailing(symbol, price)
+            for stop_id, _ in triggered:
+                self.trailing_stops.pop(stop_id, None)
+            
+            exits = {}
+            for bracket_id, leg in self._triggers.pop_crossed(symbol, price):
+                # A stop loss wins if a gap crosses both levels
+                if exits.get(bracket_id) != 'stop':
+                    exits[bracket_id] = leg
+            for bracket_id, leg in exits.items():
+                self._triggers.remove((bracket_id, 'profit' if leg == 'stop' else 'stop'))
+                bracket = self.bracket_orders[bracket_id]
+                triggered.append((bracket_id, bracket.stop_order if leg == 'stop' else bracket.profit_order))
+        
+        return triggered
     
     def create_iceberg(self, symbol: str, side: OrderSide,
                        total_amount: float, display_size: float,
@@ -423,8 +496,10 @@ class AdvancedOrderManager:
             trail_percent=trail_percent
         )
         
+        stop_id = f"ts_{symbol}_{int(time.time() * 1000)}_{next(self._ids)}"
         with self._lock:
-            self.trailing_stops[f"ts_{symbol}_{int(time.time() * 1000)}"] = trailing
+            self.trailing_stops[stop_id] = trailing
+            self._triggers.add_trailing(stop_id, trailing)
         
         self.logger.info(f"Created trailing stop: {side.value} {amount} {symbol}")
         return trailing
@@ -442,6 +517,7 @@ class AdvancedOrderManager:
             stop_loss_price=stop_loss,
             take_profit_price=take_profit
         )
+        bracket.create_orders()
         
         with self._lock:
             self.bracket_orders[bracket.entry_order.id] = bracket
@@ -451,14 +527,36 @@ class AdvancedOrderManager:
                         f"(R:R = 1:{ratio:.2f})")
         return bracket
     
+    def on_bracket_entry_filled(self, bracket_id: str) -> List[Order]:
+        """
+        Arm a bracket's exits once its entry has filled.
+        
+        Returns:
+            The stop loss and take profit orders
+        """
+        with self._lock:
+            bracket = self.bracket_orders[bracket_id]
+            long = bracket.side == OrderSide.BUY
+            self._triggers.add((bracket_id, 'stop'), bracket.symbol,
+                               bracket.stop_loss_price, BELOW if long else ABOVE)
+            self._triggers.add((bracket_id, 'profit'), bracket.symbol,
+                               bracket.take_profit_price, ABOVE if long else BELOW)
+        return bracket.on_entry_filled()
+    
     def update_trailing_stop(self, order_id: str, current_price: float) -> Optional[Order]:
         """Update a trailing stop with new price"""
         with self._lock:
             trailing = self.trailing_stops.get(order_id)
-        
-        if trailing:
-            return trailing.update_price(current_price)
-        return None
+            if trailing is None:
+                return None
+            order = trailing.update_price(current_price)
+            # The stop moved outside the book: re-index it, or drop it once triggered
+            if order is None:
+                self._triggers.add_trailing(order_id, trailing)
+            else:
+                self._triggers.remove(order_id)
+                del self.trailing_stops[order_id]
+        return order
     
     def get_all_status(self) -> Dict:
         """Get status of all advanced orders"""
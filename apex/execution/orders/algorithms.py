@@ -8,10 +8,11 @@ POV - Percentage of Volume
 Implementation Shortfall - Balance urgency vs market impact
 """
 
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple, Union
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+import itertools
 import logging
 import time
 import threading
@@ -20,6 +21,8 @@ import pandas as pd
 import numpy as np
 
 from .manager import Order, OrderSide, OrderType, OrderStatus
+from .volume_profile import HistoricalVolumeProfile
+from ..scheduler import TimerScheduler, TimerHandle
 
 
 class AlgoType(Enum):
@@ -47,6 +50,7 @@ class AlgoPerformance:
     avg_executed_price: float = 0.0
     slippage_bps: float = 0.0           # Slippage in basis points
     market_impact_bps: float = 0.0      # Estimated market impact
+    implementation_shortfall_bps: float = 0.0  # Cost vs arrival price incl. unfilled part
     completion_percent: float = 0.0
     orders_placed: int = 0
     orders_filled: int = 0
@@ -232,12 +236,17 @@ class VWAPExecutor:
     
     Example: If historical volume is 30% in first hour, 20% midday, 50% close,
     VWAP front-loads and back-loads the order accordingly.
+    
+    With a HistoricalVolumeProfile the slices follow the volume learned for
+    the time of day (and weekday) the execution actually runs at.
     """
     
     def __init__(self, symbol: str, side: OrderSide, total_amount: float,
-                 duration_minutes: int, volume_profile: MarketVolumeProfile = None,
+                 duration_minutes: int,
+                 volume_profile: Union[MarketVolumeProfile, HistoricalVolumeProfile] = None,
                  price_limit: Optional[float] = None,
-                 participation_rate: float = 0.1):  # 10% of expected volume
+                 participation_rate: float = 0.1,   # 10% of expected volume
+                 start_time: Optional[datetime] = None):
         """
         Initialize VWAP executor.
         
@@ -246,14 +255,23 @@ class VWAPExecutor:
             side: Buy or sell
             total_amount: Total quantity to execute
             duration_minutes: Total execution time
-            volume_profile: Historical volume distribution
+            volume_profile: Historical volume distribution, or a profile
+                learned from candles
             price_limit: Optional price limit
-            participation_rate: Target % of volume (0.1 = 10%)
+            participation_rate: Target % of market volume (0.1 = 10%), kept
+                for reporting; slice sizes follow the profile shares
+            start_time: When the slices start, for a learned profile
+                (default: the execution's start time; naive times are UTC)
         """
         self.symbol = symbol
         self.side = side
         self.total_amount = total_amount
         self.duration_minutes = duration_minutes
+        self.start_time = start_time
+        self.learned_profile: Optional[HistoricalVolumeProfile] = None
+        if isinstance(volume_profile, HistoricalVolumeProfile):
+            self.learned_profile = volume_profile
+            volume_profile = None
         self.volume_profile = volume_profile or MarketVolumeProfile()
         self.price_limit = price_limit
         self.participation_rate = participation_rate
@@ -281,19 +299,19 @@ class VWAPExecutor:
     
     def generate_slices(self) -> List[Order]:
         """Generate VWAP slices based on volume profile"""
+        if self.learned_profile is not None:
+            start = self.start_time or self.performance.start_time or datetime.now(timezone.utc)
+            self.volume_profile.volume_distribution = self.learned_profile.window(
+                start, self.num_intervals * self.interval_minutes, self.interval_minutes
+            )
+        
         orders = []
         remaining = self.total_amount
         
         for i in range(self.num_intervals):
-            # Get target volume for this interval
+            # Each slice is the interval's share of the expected volume
             interval_pct = self.volume_profile.volume_distribution[i]
-            target_amount = self.total_amount * interval_pct
-            
-            # Adjust for participation rate
-            slice_amount = target_amount * self.participation_rate
-            
-            # Ensure we don't exceed remaining
-            slice_amount = min(slice_amount, remaining)
+            slice_amount = min(self.total_amount * interval_pct, remaining)
             
             if slice_amount > 0:
                 order_type = OrderType.LIMIT if self.price_limit else OrderType.MARKET
@@ -313,9 +331,9 @@ class VWAPExecutor:
                     }
                 )
                 orders.append(order)
-                remaining -= slice_amount
+                remaining -= order.amount
         
-        # Add any remainder to last slice
+        # Add any rounding remainder to last slice
         if remaining > 0 and orders:
             orders[-1].amount += remaining
         
@@ -417,18 +435,21 @@ class POVExecutor:
         
         self.logger = logging.getLogger(f"POV.{symbol}")
     
-    def calculate_next_slice(self, current_market_volume: float) -> Optional[Order]:
+    def calculate_next_slice(self, current_market_volume: float,
+                             now: Optional[float] = None) -> Optional[Order]:
         """
         Calculate next slice based on observed market volume.
         
         Args:
             current_market_volume: Volume traded since last check
+            now: Current time in epoch seconds (default: wall clock;
+                 simulations pass market time)
             
         Returns:
             Order if slice should be placed, None otherwise
         """
         # Check minimum interval
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         if current_time - self.last_slice_time < self.min_interval_seconds:
             return None
         
@@ -499,18 +520,50 @@ class POVExecutor:
         }
 
 
+OrderHandler = Callable[[str, Order], None]
+
+
 class ExecutionEngine:
     """
     Central execution engine for managing algorithmic orders.
     
     Coordinates multiple algo executions and provides unified interface.
+    
+    With a TimerScheduler the engine also runs the executions: TWAP and VWAP
+    slices are released on their intervals by one timer per execution, POV
+    slices are sized on every on_market_data() volume update, and prices
+    are forwarded to an AdvancedOrderManager's trailing stops. Released and
+    triggered orders go to on_order(execution_id, order).
     """
     
-    def __init__(self):
+    def __init__(self, scheduler: TimerScheduler = None, on_order: OrderHandler = None,
+                 advanced_orders=None):
+        """
+        Args:
+            scheduler: Timing core that dispatches slices (None: track only)
+            on_order: Receives every child order the engine releases
+            advanced_orders: AdvancedOrderManager fed by on_market_data() prices
+        """
         self.logger = logging.getLogger(__name__)
         self.active_executions: Dict[str, object] = {}
         self.performance_history: List[AlgoPerformance] = []
         self._lock = threading.Lock()
+        self._ids = itertools.count()
+        
+        self.scheduler = scheduler
+        self.on_order = on_order
+        self.advanced_orders = advanced_orders
+        self.orders_released = 0
+        self._timers: Dict[str, TimerHandle] = {}
+        self._schedules: Dict[str, Tuple[float, float, int]] = {}  # start, spacing, next slice
+        self._pov_by_symbol: Dict[str, Dict[str, POVExecutor]] = {}
+        self._pov_unseen: Dict[str, float] = {}
+    
+    def _new_id(self, algo: str, symbol: str) -> str:
+        return f"{algo}_{symbol}_{int(time.time() * 1000)}_{next(self._ids)}"
+    
+    def _now(self) -> float:
+        return self.scheduler.clock() if self.scheduler else time.time()
     
     def start_twap(self, symbol: str, side: OrderSide, amount: float,
                    duration_minutes: int, interval_seconds: int = 60,
@@ -525,13 +578,14 @@ class ExecutionEngine:
             price_limit=price_limit
         )
         
-        execution_id = f"twap_{symbol}_{int(time.time() * 1000)}"
+        execution_id = self._new_id('twap', symbol)
         
         with self._lock:
             self.active_executions[execution_id] = executor
         
         executor.status = AlgoStatus.RUNNING
         executor.performance.start_time = datetime.now()
+        self._schedule_slices(execution_id, executor, interval_seconds)
         
         self.logger.info(f"Started TWAP: {side.value} {amount} {symbol} "
                         f"over {duration_minutes}min")
@@ -540,24 +594,28 @@ class ExecutionEngine:
     
     def start_vwap(self, symbol: str, side: OrderSide, amount: float,
                    duration_minutes: int, price_limit: Optional[float] = None,
-                   participation_rate: float = 0.1) -> str:
+                   participation_rate: float = 0.1,
+                   volume_profile: Union[MarketVolumeProfile, HistoricalVolumeProfile] = None) -> str:
         """Start a new VWAP execution"""
         executor = VWAPExecutor(
             symbol=symbol,
             side=side,
             total_amount=amount,
             duration_minutes=duration_minutes,
+            volume_profile=volume_profile,
             price_limit=price_limit,
-            participation_rate=participation_rate
+            participation_rate=participation_rate,
+            start_time=pd.Timestamp(self._now(), unit='s', tz='UTC').to_pydatetime()
         )
         
-        execution_id = f"vwap_{symbol}_{int(time.time() * 1000)}"
+        execution_id = self._new_id('vwap', symbol)
         
         with self._lock:
             self.active_executions[execution_id] = executor
         
         executor.status = AlgoStatus.RUNNING
         executor.performance.start_time = datetime.now()
+        self._schedule_slices(execution_id, executor, executor.interval_minutes * 60)
         
         self.logger.info(f"Started VWAP: {side.value} {amount} {symbol}")
         
@@ -573,19 +631,133 @@ class ExecutionEngine:
             target_pov=target_pov
         )
         
-        execution_id = f"pov_{symbol}_{int(time.time() * 1000)}"
+        execution_id = self._new_id('pov', symbol)
         
         with self._lock:
             self.active_executions[execution_id] = executor
+            self._pov_by_symbol.setdefault(symbol, {})[execution_id] = executor
+            self._pov_unseen[execution_id] = 0.0
         
         executor.status = AlgoStatus.RUNNING
         executor.performance.start_time = datetime.now()
+        if self.scheduler is not None:
+            self._timers[execution_id] = self.scheduler.call_later(
+                executor.max_duration_minutes * 60, self.cancel_execution, execution_id)
         
         self.logger.info(f"Started POV: {side.value} {amount} {symbol} "
                         f"at {target_pov*100}% participation")
         
         return execution_id
     
+    def _schedule_slices(self, execution_id: str, executor, spacing: float):
+        """Release the executor's slices every `spacing` seconds, starting now"""
+        if self.scheduler is None:
+            return
+        executor.generate_slices()
+        start = self._now()
+        self._schedules[execution_id] = (start, spacing, 0)
+        self._timers[execution_id] = self.scheduler.call_at(start, self._release_slice, execution_id)
+    
+    def _release_slice(self, execution_id: str):
+        """Timer callback: emit the next slice and arm the timer for the one after"""
+        with self._lock:
+            executor = self.active_executions.get(execution_id)
+        schedule = self._schedules.get(execution_id)
+        if executor is None or schedule is None:
+            return
+        
+        start, spacing, k = schedule
+        if executor.status == AlgoStatus.RUNNING:
+            self._emit(execution_id, executor.slices[k])
+            k += 1
+        with self._lock:
+            # on_order may have reported fills that finished or cancelled it
+            finished = execution_id not in self.active_executions
+        if finished or k >= len(executor.slices):
+            # Fully released; the execution completes as fills are reported
+            self._schedules.pop(execution_id, None)
+            self._timers.pop(execution_id, None)
+            return
+        
+        # Paused executions hold their slice until a later interval
+        self._schedules[execution_id] = (start, spacing, k)
+        next_at = start + k * spacing
+        while next_at <= self._now() and executor.status == AlgoStatus.PAUSED:
+            next_at += spacing
+        self._timers[execution_id] = self.scheduler.call_at(next_at, self._release_slice, execution_id)
+    
+    def _emit(self, execution_id: str, order: Order):
+        self.orders_released += 1
+        if self.on_order is None:
+            return
+        try:
+            self.on_order(execution_id, order)
+        except Exception as e:
+            self.logger.error(f"Error handling order {order.id} of {execution_id}: {e}")
+    
+    def on_market_data(self, symbol: str, price: Optional[float] = None,
+                       volume: Optional[float] = None) -> List[Order]:
+        """
+        Feed a market update (trade, ticker or candle) to the running algos.
+        
+        Args:
+            symbol: Trading pair
+            price: Last price, passed to trailing stops
+            volume: Market volume traded since the previous update, passed to
+                POV executions of the symbol
+        
+        Returns:
+            Orders released by this update
+        """
+        released = []
+        if volume:
+            now = self._now()
+            with self._lock:
+                povs = list(self._pov_by_symbol.get(symbol, {}).items())
+            for execution_id, executor in povs:
+                if executor.status != AlgoStatus.RUNNING:
+                    continue
+                executor.volume_observed += volume
+                self._pov_unseen[execution_id] += volume
+                order = executor.calculate_next_slice(self._pov_unseen[execution_id], now=now)
+                if order is not None:
+                    self._pov_unseen[execution_id] = 0.0
+                    released.append((execution_id, order))
+        
+        if price is not None and self.advanced_orders is not None:
+            released.extend(self.advanced_orders.on_price(symbol, price))
+        
+        for execution_id, order in released:
+            self._emit(execution_id, order)
+        return [order for _, order in released]
+    
+    def on_fill(self, execution_id: str, order: Order, filled_amount: float,
+                avg_price: float):
+        """Record a child order fill; completed executions move to the history"""
+        with self._lock:
+            executor = self.active_executions.get(execution_id)
+        if executor is None:
+            return
+        if isinstance(executor, POVExecutor):
+            executor.on_slice_filled(filled_amount, avg_price)
+        else:
+            executor.on_slice_filled(order, filled_amount, avg_price)
+        if executor.status == AlgoStatus.COMPLETED:
+            self._finish(execution_id)
+    
+    def _finish(self, execution_id: str):
+        with self._lock:
+            executor = self.active_executions.pop(execution_id, None)
+            povs = self._pov_by_symbol.get(getattr(executor, 'symbol', None), {})
+            povs.pop(execution_id, None)
+        timer = self._timers.pop(execution_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._schedules.pop(execution_id, None)
+        self._pov_unseen.pop(execution_id, None)
+        if executor is not None:
+            self.performance_history.append(executor.performance)
+    
     def get_execution(self, execution_id: str) -> Optional[object]:
         """Get execution by ID"""
         with self._lock:
@@ -595,12 +767,11 @@ class ExecutionEngine:
         """Cancel an active execution"""
         with self._lock:
             executor = self.active_executions.get(execution_id)
-            if executor:
-                executor.status = AlgoStatus.CANCELLED
-                executor.performance.end_time = datetime.now()
-                self.performance_history.append(executor.performance)
-                del self.active_executions[execution_id]
-                return True
+        if executor:
+            executor.status = AlgoStatus.CANCELLED
+            executor.performance.end_time = datetime.now()
+            self._finish(execution_id)
+            return True
         return False
     
     def get_all_status(self) -> Dict:
@@ -608,6 +779,7 @@ class ExecutionEngine:
         return {
             'active_count': len(self.active_executions),
             'history_count': len(self.performance_history),
+            'orders_released': self.orders_released,
             'executions': {
                 k: v.get_status() for k, v in self.active_executions.items()
             }
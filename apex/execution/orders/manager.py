@@ -7,9 +7,12 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-import json
+from bisect import bisect_right
+from collections import defaultdict
 import logging
 
+from ..journal import Journal
+
 
 class OrderStatus(Enum):
     PENDING = "pending"
@@ -21,6 +24,11 @@ class OrderStatus(Enum):
     EXPIRED = "expired"
 
 
+OPEN_STATUSES = (OrderStatus.PENDING, OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED)
+TERMINAL_STATUSES = (OrderStatus.FILLED, OrderStatus.CANCELED,
+                     OrderStatus.REJECTED, OrderStatus.EXPIRED)
+
+
 class OrderSide(Enum):
     BUY = "buy"
     SELL = "sell"
@@ -80,7 +88,7 @@ class Order:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Order':
         """Create order from dictionary"""
-        return cls(
+        order = cls(
             id=data['id'],
             symbol=data['symbol'],
             side=OrderSide(data['side']),
@@ -90,13 +98,15 @@ class Order:
             stop_price=data.get('stop_price'),
             status=OrderStatus(data['status']),
             filled_amount=data.get('filled_amount', 0.0),
-            remaining_amount=data.get('remaining_amount', 0.0),
             avg_fill_price=data.get('avg_fill_price', 0.0),
             created_at=datetime.fromisoformat(data['created_at']),
             updated_at=datetime.fromisoformat(data['updated_at']),
             exchange_id=data.get('exchange_id'),
             metadata=data.get('metadata', {})
         )
+        # Set after __post_init__, which would turn a filled order's 0 back into amount
+        order.remaining_amount = data.get('remaining_amount', order.remaining_amount)
+        return order
 
 
 class OrderManager:
@@ -108,15 +118,36 @@ class OrderManager:
     - Status tracking and updates
     - Order history
     - Integration with exchange connectors
+    
+    Changes are appended to a journal next to storage_path, which is
+    compacted into a snapshot every compact_every events.
+    
+    Open orders (by symbol), status counts and fill totals are indexed on
+    every mutation, and history is kept sorted by creation time, so the
+    per-tick queries don't scan all orders.
     """
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, compact_every: int = 1000):
         self.logger = logging.getLogger(__name__)
         self.orders: Dict[str, Order] = {}
         self.order_history: List[Order] = []
         self.storage_path = storage_path
+        self.journal: Optional[Journal] = None
+        
+        # Secondary indexes, maintained by _index_order / _unindex_order
+        self._open_orders: Dict[str, Order] = {}
+        self._open_by_symbol: Dict[str, Dict[str, Order]] = defaultdict(dict)
+        self._status_counts: Dict[OrderStatus, int] = defaultdict(int)
+        self._filled_side_counts: Dict[OrderSide, int] = defaultdict(int)
+        self._filled_volume = 0.0
+        # History sorted by created_at, per symbol and for all symbols (None)
+        self._history_times: Dict[Optional[str], List[float]] = defaultdict(list)
+        self._history_sorted: Dict[Optional[str], List[Order]] = defaultdict(list)
         
         if storage_path:
+            self.journal = Journal(storage_path, ['active', 'history'],
+                                   snapshot=self._snapshot,
+                                   compact_every=compact_every)
             self._load_orders()
     
     def create_order(self, symbol: str, side: OrderSide, order_type: OrderType,
@@ -151,9 +182,13 @@ class OrderManager:
             metadata=metadata or {}
         )
         
+        if order_id in self.orders:
+            self._unindex_order(self.orders[order_id])
         self.orders[order_id] = order
+        self._index_order(order)
         self.logger.info(f"Order created: {order_id} ({side.value} {amount} {symbol})")
         
+        self._save_order(order)
         return order
     
     def update_order_status(self, order_id: str, status: OrderStatus,
@@ -178,6 +213,7 @@ class OrderManager:
             return False
         
         order = self.orders[order_id]
+        self._unindex_order(order)
         order.status = status
         order.updated_at = datetime.now()
         
@@ -191,13 +227,15 @@ class OrderManager:
         if exchange_id is not None:
             order.exchange_id = exchange_id
         
+        self._index_order(order)
+        
         # Move to history if terminal state
-        if status in [OrderStatus.FILLED, OrderStatus.CANCELED, 
-                     OrderStatus.REJECTED, OrderStatus.EXPIRED]:
-            self.order_history.append(order)
+        terminal = status in TERMINAL_STATUSES
+        if terminal:
+            self._add_to_history(order)
             self.logger.info(f"Order {order_id} completed with status: {status.value}")
         
-        self._save_orders()
+        self._save_order(order, history=terminal)
         return True
     
     def cancel_order(self, order_id: str) -> bool:
@@ -236,13 +274,9 @@ class OrderManager:
         Returns:
             List of open orders
         """
-        open_statuses = [OrderStatus.PENDING, OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]
-        orders = [o for o in self.orders.values() if o.status in open_statuses]
-        
         if symbol:
-            orders = [o for o in orders if o.symbol == symbol]
-        
-        return orders
+            return list(self._open_by_symbol.get(symbol, {}).values())
+        return list(self._open_orders.values())
     
     def get_order_history(self, symbol: str = None, limit: int = None) -> List[Order]:
         """
@@ -253,75 +287,110 @@ class OrderManager:
             limit: Maximum number of orders to return
             
         Returns:
-            List of historical orders
+            List of historical orders, newest first
         """
-        orders = self.order_history
-        
-        if symbol:
-            orders = [o for o in orders if o.symbol == symbol]
-        
-        orders = sorted(orders, key=lambda o: o.created_at, reverse=True)
+        orders = self._history_sorted.get(symbol or None, [])
         
         if limit:
-            orders = orders[:limit]
+            orders = orders[-limit:]
         
-        return orders
+        return orders[::-1]
     
     def get_statistics(self) -> Dict:
         """Get order statistics"""
-        all_orders = list(self.orders.values()) + self.order_history
+        return {
+            'total_orders': len(self.orders),
+            'open_orders': len(self._open_orders),
+            'filled_orders': self._status_counts[OrderStatus.FILLED],
+            'canceled_orders': self._status_counts[OrderStatus.CANCELED],
+            'buy_orders': self._filled_side_counts[OrderSide.BUY],
+            'sell_orders': self._filled_side_counts[OrderSide.SELL],
+            'total_volume': self._filled_volume
+        }
+    
+    def _index_order(self, order: Order):
+        """Add an order's current state to the indexes"""
+        self._status_counts[order.status] += 1
+        
+        if order.status in OPEN_STATUSES:
+            self._open_orders[order.id] = order
+            self._open_by_symbol[order.symbol][order.id] = order
+        elif order.status == OrderStatus.FILLED:
+            self._filled_side_counts[order.side] += 1
+            self._filled_volume += order.filled_amount
+    
+    def _unindex_order(self, order: Order):
+        """Remove an order's current state from the indexes (before mutating it)"""
+        self._status_counts[order.status] -= 1
         
-        filled_orders = [o for o in all_orders if o.status == OrderStatus.FILLED]
-        buy_orders = [o for o in filled_orders if o.side == OrderSide.BUY]
-        sell_orders = [o for o in filled_orders if o.side == OrderSide.SELL]
+        if order.status in OPEN_STATUSES:
+            self._open_orders.pop(order.id, None)
+            by_symbol = self._open_by_symbol.get(order.symbol)
+            if by_symbol is not None:
+                by_symbol.pop(order.id, None)
+                if not by_symbol:
+                    del self._open_by_symbol[order.symbol]
+        elif order.status == OrderStatus.FILLED:
+            self._filled_side_counts[order.side] -= 1
+            self._filled_volume -= order.filled_amount
+    
+    def _add_to_history(self, order: Order):
+        self.order_history.append(order)
         
+        created = order.created_at.timestamp()
+        for key in (None, order.symbol):
+            times = self._history_times[key]
+            position = bisect_right(times, created)
+            times.insert(position, created)
+            self._history_sorted[key].insert(position, order)
+    
+    def _snapshot(self) -> Dict:
         return {
-            'total_orders': len(all_orders),
-            'open_orders': len(self.get_open_orders()),
-            'filled_orders': len(filled_orders),
-            'canceled_orders': len([o for o in all_orders if o.status == OrderStatus.CANCELED]),
-            'buy_orders': len(buy_orders),
-            'sell_orders': len(sell_orders),
-            'total_volume': sum(o.filled_amount for o in filled_orders)
+            'active': [o.to_dict() for o in self.orders.values()],
+            'history': [o.to_dict() for o in self.order_history]
         }
     
+    def _save_order(self, order: Order, history: bool = False):
+        """Append an order change to the journal"""
+        if not self.journal:
+            return
+        
+        try:
+            record = order.to_dict()
+            self.journal.put('active', record)
+            if history:
+                self.journal.put('history', record)
+        except Exception as e:
+            self.logger.error(f"Error saving order {order.id}: {e}")
+    
     def _save_orders(self):
-        """Save orders to file"""
-        if not self.storage_path:
+        """Write all orders as a snapshot and truncate the journal"""
+        if not self.journal:
             return
         
         try:
-            data = {
-                'active': [o.to_dict() for o in self.orders.values()],
-                'history': [o.to_dict() for o in self.order_history]
-            }
-            
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            self.journal.compact()
         except Exception as e:
             self.logger.error(f"Error saving orders: {e}")
     
     def _load_orders(self):
-        """Load orders from file"""
-        import os
-        if not os.path.exists(self.storage_path):
-            return
-        
+        """Load the snapshot and replay the journal"""
         try:
-            with open(self.storage_path, 'r') as f:
-                data = json.load(f)
+            state = self.journal.load()
             
-            for order_data in data.get('active', []):
+            for order_data in state['active'].values():
                 order = Order.from_dict(order_data)
                 self.orders[order.id] = order
+                self._index_order(order)
             
-            for order_data in data.get('history', []):
-                order = Order.from_dict(order_data)
-                self.order_history.append(order)
+            for order_id, order_data in state['history'].items():
+                # Completed orders stay in self.orders too; share the object
+                order = self.orders.get(order_id) or Order.from_dict(order_data)
+                self._add_to_history(order)
             
             self.logger.info(f"Loaded {len(self.orders)} active orders, "
-                           f"{len(self.order_history)} historical orders")
+                           f"{len(self.order_history)} historical orders "
+                           f"({self.journal.pending_events} journal events)")
                            
         except Exception as e:
             self.logger.error(f"Error loading orders: {e}")
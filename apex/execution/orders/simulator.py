@@ -0,0 +1,321 @@
+"""
+Execution Simulator
+Replays market data through the TWAP, VWAP and POV executors and fills their
+child orders against a market-impact model, so algorithms can be compared
+before size is sent to a live venue.
+
+Each parent order is a small discrete-event simulation: child orders are
+events in a time-ordered queue, an event fills against the bar (or trade)
+current at its time up to a share of that bar's volume, and whatever doesn't
+fill is re-queued for the next bar until the algorithm's horizon ends.
+Results are reported through the executor's AlgoPerformance, with
+implementation shortfall measured against the arrival price.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .algorithms import AlgoPerformance, AlgoStatus, AlgoType, POVExecutor, TWAPExecutor, VWAPExecutor
+from .manager import OrderStatus
+
+
+Executor = Union[TWAPExecutor, VWAPExecutor, POVExecutor]
+
+
+@dataclass
+class ImpactModel:
+    """
+    Cost of a child order in basis points of the market price:
+
+        spread_bps / 2 + temporary_bps * participation ** exponent + drift
+
+    participation is the parent's share of the bar's volume so far and drift
+    is the permanent impact of its earlier fills (permanent_bps for trading
+    a whole bar's volume). Fills are capped at max_participation of a bar.
+    """
+    spread_bps: float = 2.0
+    temporary_bps: float = 50.0
+    exponent: float = 0.5               # Square-root law
+    permanent_bps: float = 10.0
+    max_participation: float = 0.25
+
+    def cost_bps(self, participation: float) -> float:
+        """Half spread plus temporary impact at a participation rate"""
+        return self.spread_bps / 2 + self.temporary_bps * participation ** self.exponent
+
+
+@dataclass
+class _ParentState:
+    """Fill bookkeeping of one simulated parent order"""
+    sign: int                           # +1 buy, -1 sell
+    drift_bps: float = 0.0
+    impact: float = 0.0                 # Sum of amount x impact bps
+    children: int = 0
+    fills: int = 0
+    complete: bool = True               # Every child order filled in full
+    used: Dict[int, float] = field(default_factory=dict)   # Volume taken per bar
+
+
+def _algo(executor: Executor) -> AlgoType:
+    if isinstance(executor, TWAPExecutor):
+        return AlgoType.TWAP
+    if isinstance(executor, VWAPExecutor):
+        return AlgoType.VWAP
+    if isinstance(executor, POVExecutor):
+        return AlgoType.POV
+    raise TypeError(f"Cannot simulate {type(executor).__name__}")
+
+
+def _side(executor: Executor) -> str:
+    # main.py passes sides as plain strings
+    return getattr(executor.side, 'value', executor.side)
+
+
+def _seconds(timestamp) -> float:
+    return pd.Timestamp(timestamp).as_unit('ns').value / 1e9
+
+
+def _datetime(seconds: float) -> datetime:
+    return pd.Timestamp(round(seconds * 1e9)).to_pydatetime()
+
+
+class ExecutionSimulator:
+    """
+    Fills executor child orders against historical candles or trades.
+
+    Example:
+        sim = ExecutionSimulator(candles_1m, ImpactModel(temporary_bps=30))
+        twap = TWAPExecutor('BTC/USDT', OrderSide.BUY, 5, duration_minutes=60, interval_seconds=300)
+        perf = sim.run(twap, start=candles_1m.index[100])
+        print(perf.implementation_shortfall_bps)
+
+        report = sim.run_many([(twap, start), (vwap, start), (pov, start)])
+        print(ExecutionSimulator.summarize(report))
+    """
+
+    def __init__(self, data: pd.DataFrame, impact: ImpactModel = None):
+        """
+        Args:
+            data: OHLCV candles, or trades with price and amount (or volume)
+                columns; indexed by time or with a timestamp column
+            impact: Impact/slippage model (default: ImpactModel())
+        """
+        if 'timestamp' in data.columns:
+            data = data.set_index('timestamp')
+        if len(data) == 0:
+            raise ValueError("No market data to simulate against")
+
+        self.times = pd.DatetimeIndex(data.index).as_unit('ns').asi8 / 1e9
+        if {'high', 'low', 'close'}.issubset(data.columns):
+            # Candles: arrive at the open, fill around the typical price, mark at the close
+            self.close = data['close'].to_numpy(dtype=float)
+            self.open = data['open'].to_numpy(dtype=float) if 'open' in data.columns else self.close
+            self.fill_price = ((data['high'] + data['low'] + data['close']) / 3).to_numpy(dtype=float)
+            self.volume = data['volume'].to_numpy(dtype=float)
+        else:
+            self.close = self.open = self.fill_price = data['price'].to_numpy(dtype=float)
+            self.volume = data['amount' if 'amount' in data.columns else 'volume'].to_numpy(dtype=float)
+
+        # Child orders timed after the last bar has ended never fill
+        step = self.times[-1] - self.times[-2] if len(self.times) > 1 else 0.0
+        self.end = self.times[-1] + step
+        self.impact = impact or ImpactModel()
+
+    def run(self, executor: Executor, start=None) -> AlgoPerformance:
+        """
+        Simulate one parent order.
+
+        Args:
+            executor: New TWAPExecutor, VWAPExecutor or POVExecutor
+            start: Arrival time (default: the first bar)
+
+        Returns:
+            The executor's AlgoPerformance; slippage_bps and
+            implementation_shortfall_bps are positive for costs on both sides
+        """
+        algo = _algo(executor)
+        start_i = 0 if start is None else int(np.searchsorted(self.times, _seconds(start)))
+        if start_i >= len(self.times):
+            raise ValueError(f"Start {start} is after the end of the market data")
+
+        state = _ParentState(sign=1 if _side(executor) == 'buy' else -1)
+        perf = executor.performance
+        perf.target_price = self.open[start_i]
+        perf.start_time = _datetime(self.times[start_i])
+        executor.status = AlgoStatus.RUNNING
+
+        if algo == AlgoType.POV:
+            end_i = self._run_pov(executor, start_i, state)
+        else:
+            end_i = self._run_slices(executor, start_i, state)
+        self._report(executor, end_i, state)
+        return perf
+
+    def run_many(self, parents: Iterable[Union[Executor, Tuple[Executor, object]]]) -> pd.DataFrame:
+        """
+        Simulate many parent orders.
+
+        Args:
+            parents: Executors, or (executor, start) pairs
+
+        Returns:
+            DataFrame with one row per parent
+        """
+        rows = []
+        for parent in parents:
+            executor, start = parent if isinstance(parent, tuple) else (parent, None)
+            perf = self.run(executor, start)
+            rows.append({
+                'algo': _algo(executor).value,
+                'symbol': executor.symbol,
+                'side': _side(executor),
+                'amount': executor.total_amount,
+                'start': perf.start_time,
+                'end': perf.end_time,
+                'arrival_price': perf.target_price,
+                'avg_price': perf.avg_executed_price,
+                'shortfall_bps': perf.implementation_shortfall_bps,
+                'slippage_bps': perf.slippage_bps,
+                'impact_bps': perf.market_impact_bps,
+                'completion_percent': perf.completion_percent,
+                'children': perf.orders_placed,
+                'filled_children': perf.orders_filled,
+            })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def summarize(report: pd.DataFrame) -> pd.DataFrame:
+        """Shortfall, impact and completion per algorithm of a run_many() report"""
+        return report.groupby('algo').agg(
+            parents=('shortfall_bps', 'size'),
+            shortfall_bps=('shortfall_bps', 'mean'),
+            shortfall_std_bps=('shortfall_bps', 'std'),
+            impact_bps=('impact_bps', 'mean'),
+            completion_percent=('completion_percent', 'mean'),
+        )
+
+    def _fill(self, i: int, amount: float, limit: Optional[float],
+              state: _ParentState) -> Tuple[float, float]:
+        """(filled amount, price) of a child order against bar i"""
+        volume = self.volume[i]
+        if volume <= 0:
+            return 0.0, 0.0
+        used = state.used.get(i, 0.0)
+        amount = min(amount, self.impact.max_participation * volume - used)
+        if amount <= 0:
+            return 0.0, 0.0
+
+        cost = self.impact.cost_bps((used + amount) / volume) + state.drift_bps
+        price = self.fill_price[i] * (1 + state.sign * cost / 10000)
+        if limit is not None and state.sign * (price - limit) > 0:
+            return 0.0, 0.0
+
+        state.used[i] = used + amount
+        state.drift_bps += self.impact.permanent_bps * amount / volume
+        state.impact += amount * (cost - self.impact.spread_bps / 2)
+        return amount, price
+
+    def _run_slices(self, executor: Union[TWAPExecutor, VWAPExecutor], start_i: int,
+                    state: _ParentState) -> int:
+        """TWAP/VWAP: child orders on a fixed schedule, unfilled parts rolled forward"""
+        orders = executor.generate_slices()
+        spacing = (executor.interval_seconds if isinstance(executor, TWAPExecutor)
+                   else executor.interval_minutes * 60)
+        t0 = self.times[start_i]
+        deadline = min(t0 + executor.duration_minutes * 60, self.end)
+        state.children = len(orders)
+
+        # (time, child, remaining amount)
+        queue = [(t0 + k * spacing, k, order.amount) for k, order in enumerate(orders)]
+        heapq.heapify(queue)
+        filled = [0.0] * len(orders)
+        notional = [0.0] * len(orders)
+        last_i = start_i
+
+        while queue:
+            t, k, remaining = heapq.heappop(queue)
+            order = orders[k]
+            if t < self.end:
+                i = max(start_i, int(np.searchsorted(self.times, t, side='right')) - 1)
+                amount, price = self._fill(i, remaining, order.price, state)
+                filled[k] += amount
+                notional[k] += amount * price
+                remaining -= amount
+                last_i = max(last_i, i)
+                if remaining > order.amount * 1e-9 and i + 1 < len(self.times) \
+                        and self.times[i + 1] < deadline:
+                    heapq.heappush(queue, (self.times[i + 1], k, remaining))
+                    continue
+
+            order.filled_amount = filled[k]
+            order.remaining_amount = order.amount - filled[k]
+            order.avg_fill_price = notional[k] / filled[k] if filled[k] else 0.0
+            if order.remaining_amount <= order.amount * 1e-9:
+                order.status = OrderStatus.FILLED
+            else:
+                order.status = OrderStatus.PARTIALLY_FILLED if filled[k] else OrderStatus.EXPIRED
+                state.complete = False
+            if filled[k]:
+                state.fills += 1
+            executor.on_slice_filled(order, filled[k], order.avg_fill_price)
+
+        return last_i
+
+    def _run_pov(self, executor: POVExecutor, start_i: int, state: _ParentState) -> int:
+        """POV: each bar, trade a share of the volume seen since the last slice"""
+        deadline = self.times[start_i] + executor.max_duration_minutes * 60
+        done = executor.total_amount * (1 - 1e-9)
+        unseen = 0.0
+        last_i = start_i
+
+        for i in range(start_i, len(self.times)):
+            if self.times[i] >= deadline or executor.volume_executed >= done:
+                break
+            last_i = i
+            order = executor.calculate_next_slice(unseen, now=self.times[i]) if unseen > 0 else None
+            if order is not None:
+                unseen = 0.0
+                state.children += 1
+                amount, price = self._fill(i, order.amount, None, state)
+                order.filled_amount = amount
+                order.remaining_amount = order.amount - amount
+                order.avg_fill_price = price
+                order.status = OrderStatus.FILLED if amount >= order.amount else (
+                    OrderStatus.PARTIALLY_FILLED if amount else OrderStatus.EXPIRED)
+                if amount:
+                    state.fills += 1
+                    executor.on_slice_filled(amount, price)
+            executor.volume_observed += self.volume[i]
+            unseen += self.volume[i]
+
+        state.complete = executor.volume_executed >= done
+        return last_i
+
+    def _report(self, executor: Executor, end_i: int, state: _ParentState):
+        perf = executor.performance
+        total = executor.total_amount
+        executed = perf.volume_executed
+        arrival = perf.target_price
+        unfilled = max(total - executed, 0.0)
+
+        perf.orders_placed = state.children
+        perf.orders_filled = state.fills
+        perf.volume_remaining = unfilled
+        perf.completion_percent = executed / total * 100 if total else 0.0
+        perf.end_time = _datetime(self.times[end_i])
+        if executed > 0:
+            perf.slippage_bps = state.sign * (perf.avg_executed_price - arrival) / arrival * 10000
+            perf.market_impact_bps = state.impact / executed
+
+        # Unfilled quantity costs whatever the market moved away from arrival
+        opportunity_bps = state.sign * (self.close[end_i] - arrival) / arrival * 10000
+        if total:
+            perf.implementation_shortfall_bps = (
+                perf.slippage_bps * executed + opportunity_bps * unfilled
+            ) / total
+        executor.status = AlgoStatus.COMPLETED if state.complete else AlgoStatus.CANCELLED
@@ -0,0 +1,330 @@
+"""
+Volume Profiles
+Intraday volume profiles learned from stored candles, for VWAP scheduling.
+
+A profile is the average share of a day's volume traded in each time-of-day
+bucket (UTC), optionally per day of the week. Days are weighted equally, so
+one volatile session doesn't bend the curve, and only complete days are
+used. Learning is a few bincounts over the candle columns; profiles are
+cached on disk keyed by the candles they were learned from.
+
+Layout: <root>/<exchange>/<symbol>/<timeframe>/<key>.npz holding the bucket
+shares and the learning parameters.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..exchanges.candle_store import CandleStore
+
+
+# Bump when the learning code changes, so profiles from older code are not reused
+PROFILE_VERSION = 1
+
+MINUTES_PER_DAY = 1440
+NS_PER_MINUTE = 60 * 10**9
+
+
+def _minutes(timestamps) -> np.ndarray:
+    """Epoch minutes (UTC) of a DatetimeIndex; naive times are taken as UTC"""
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns').asi8 // NS_PER_MINUTE
+
+
+def _weekday(epoch_days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday; Monday = 0 as in datetime.weekday()
+    return (epoch_days + 3) % 7
+
+
+@dataclass
+class HistoricalVolumeProfile:
+    """
+    Time-of-day volume shares learned from candles.
+
+    Example:
+        profile = HistoricalVolumeProfile.from_candles(candles_5m, 'BTC/USDT')
+        shares = profile.window(start, duration_minutes=240, interval_minutes=30)
+        vwap = VWAPExecutor('BTC/USDT', OrderSide.BUY, 5, 240,
+                            volume_profile=profile, start_time=start)
+    """
+    symbol: str
+    bucket_minutes: int
+    shares: np.ndarray                  # (buckets,) or (7, buckets); rows sum to 1
+    days: int = 0                       # Complete days learned from
+
+    @property
+    def by_weekday(self) -> bool:
+        return self.shares.ndim == 2
+
+    @property
+    def buckets(self) -> int:
+        return self.shares.shape[-1]
+
+    @classmethod
+    def from_candles(cls, data: pd.DataFrame, symbol: str = '', bucket_minutes: int = 30,
+                     by_weekday: bool = False) -> 'HistoricalVolumeProfile':
+        """
+        Learn a profile from OHLCV candles.
+
+        Args:
+            data: Candles with a volume column, indexed by open time (or with
+                a timestamp column); the timeframe must divide bucket_minutes
+            symbol: Trading pair
+            bucket_minutes: Time-of-day bucket size; must divide a day
+            by_weekday: Learn a separate curve per day of the week (weekdays
+                without history use the all-days curve)
+
+        Returns:
+            Profile; uniform when there is no usable history
+        """
+        if bucket_minutes <= 0 or MINUTES_PER_DAY % bucket_minutes:
+            raise ValueError(f"bucket_minutes must divide a day, got {bucket_minutes}")
+        buckets = MINUTES_PER_DAY // bucket_minutes
+        uniform = np.full(buckets, 1.0 / buckets)
+
+        times = data['timestamp'] if 'timestamp' in data.columns else data.index
+        minutes = _minutes(times)
+        volume = data['volume'].to_numpy(dtype=np.float64)
+        if len(minutes) == 0:
+            shares = np.tile(uniform, (7, 1)) if by_weekday else uniform
+            return cls(symbol, bucket_minutes, shares, 0)
+
+        epoch_days, day = np.unique(minutes // MINUTES_PER_DAY, return_inverse=True)
+        bucket = (minutes % MINUTES_PER_DAY) // bucket_minutes
+
+        # Day x bucket volume; days missing candles (ends of the history, outages) are dropped
+        grid = np.bincount(day * buckets + bucket, weights=volume,
+                           minlength=len(epoch_days) * buckets).reshape(len(epoch_days), buckets)
+        candles = np.bincount(day, minlength=len(epoch_days))
+        totals = grid.sum(axis=1)
+        complete = (candles >= 0.9 * candles.max()) & (totals > 0)
+        if not complete.any():
+            shares = np.tile(uniform, (7, 1)) if by_weekday else uniform
+            return cls(symbol, bucket_minutes, shares, 0)
+
+        daily = grid[complete] / totals[complete, None]
+        overall = daily.mean(axis=0)
+        if not by_weekday:
+            return cls(symbol, bucket_minutes, overall, int(complete.sum()))
+
+        weekdays = _weekday(epoch_days[complete])
+        counts = np.bincount(weekdays, minlength=7)
+        sums = np.zeros((7, buckets))
+        np.add.at(sums, weekdays, daily)
+        shares = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], overall)
+        return cls(symbol, bucket_minutes, shares, int(complete.sum()))
+
+    def window(self, start, duration_minutes: int, interval_minutes: int) -> List[float]:
+        """
+        Expected share of volume per interval of an execution window.
+
+        Args:
+            start: Window start; naive datetimes are taken as UTC
+            duration_minutes: Window length, a multiple of interval_minutes
+                (a trailing partial interval is dropped)
+            interval_minutes: Slice interval
+
+        Returns:
+            One share per interval, summing to 1
+        """
+        intervals = max(1, duration_minutes // interval_minutes)
+        first = int(_minutes([pd.Timestamp(start)])[0])
+        minutes = first + np.arange(intervals * interval_minutes)
+
+        bucket = (minutes % MINUTES_PER_DAY) // self.bucket_minutes
+        if self.by_weekday:
+            density = self.shares[_weekday(minutes // MINUTES_PER_DAY), bucket]
+        else:
+            density = self.shares[bucket]
+
+        expected = density.reshape(intervals, interval_minutes).sum(axis=1)
+        total = expected.sum()
+        if total <= 0:
+            return [1.0 / intervals] * intervals
+        return (expected / total).tolist()
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'bucket_minutes': self.bucket_minutes,
+            'by_weekday': self.by_weekday,
+            'days': self.days,
+            'shares': self.shares.tolist(),
+        }
+
+
+class VolumeProfileStore:
+    """
+    Learns volume profiles from a CandleStore and caches them on disk.
+
+    Example:
+        profiles = VolumeProfileStore(CandleStore())
+        profile = profiles.get('binance', 'BTC/USDT', '5m', days=30)
+        engine.start_vwap('BTC/USDT', OrderSide.BUY, 5, 240, volume_profile=profile)
+    """
+
+    def __init__(self, candles: CandleStore = None, root: str = 'apex/data/profiles'):
+        self.candles = candles or CandleStore()
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+
+    def _dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        return self.root / exchange.lower() / symbol.replace('/', '_') / timeframe
+
+    def key(self, symbol: str, timeframe: str, data: pd.DataFrame,
+            bucket_minutes: int, by_weekday: bool) -> str:
+        """Content hash of the candles and learning parameters"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{PROFILE_VERSION}|{symbol}|{timeframe}|{bucket_minutes}|'
+                      f'{by_weekday}|{len(data)}'.encode())
+        digest.update(np.ascontiguousarray(_minutes(data.index)).tobytes())
+        digest.update(np.ascontiguousarray(data['volume'].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+
+    def get(self, exchange: str, symbol: str, timeframe: str = '5m', days: int = 30,
+            bucket_minutes: int = 30, by_weekday: bool = False,
+            end: Optional[pd.Timestamp] = None) -> HistoricalVolumeProfile:
+        """
+        Profile learned from the cached candles of the last `days` days.
+
+        Args:
+            exchange: Exchange name the candles are stored under
+            symbol: Trading pair
+            timeframe: Candle timeframe to learn from
+            days: Days of history
+            bucket_minutes: Time-of-day bucket size
+            by_weekday: Separate curve per day of the week
+            end: Last candle to use (default: the newest cached one)
+
+        Returns:
+            Cached or freshly learned profile
+        """
+        if end is None:
+            end = self.candles.last_timestamp(exchange, symbol, timeframe)
+        start = end - pd.Timedelta(days=days) if end is not None else None
+        data = self.candles.read(exchange, symbol, timeframe, start=start, end=end)
+
+        key = self.key(symbol, timeframe, data, bucket_minutes, by_weekday)
+        file = self._dir(exchange, symbol, timeframe) / f'{key}.npz'
+        profile = self._load(file)
+        if profile is not None:
+            self.hits += 1
+            return profile
+
+        self.misses += 1
+        profile = HistoricalVolumeProfile.from_candles(data, symbol, bucket_minutes, by_weekday)
+        try:
+            self._save(file, profile)
+        except OSError as e:
+            self.logger.warning(f"Not caching volume profile for {symbol} {timeframe}: {e}")
+        return profile
+
+    def _load(self, file: Path) -> Optional[HistoricalVolumeProfile]:
+        if not file.exists():
+            return None
+        try:
+            with np.load(file) as cached:
+                meta = json.loads(str(cached['meta']))
+                return HistoricalVolumeProfile(meta['symbol'], meta['bucket_minutes'],
+                                               cached['shares'], meta['days'])
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable volume profile {file}: {e}")
+            return None
+
+    def _save(self, file: Path, profile: HistoricalVolumeProfile):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        meta = {key: value for key, value in profile.to_dict().items() if key != 'shares'}
+
+        # Write to a temporary file and rename, so readers never see a partial profile
+        tmp = file.with_name(f'.{file.stem}.{os.getpid()}.tmp')
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez(f, shares=profile.shares, meta=json.dumps(meta))
+            os.replace(tmp, file)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def replay_tracking_error(data: pd.DataFrame, schedule: Callable[[pd.Timestamp], Sequence[float]],
+                          starts: Iterable, duration_minutes: int,
+                          interval_minutes: int = 30) -> Dict[str, float]:
+    """
+    How closely a VWAP schedule follows the market over replayed windows.
+
+    Args:
+        data: Candles of the replay period (not the ones a profile learned from)
+        schedule: Share of the parent per interval for a window start,
+            e.g. lambda start: profile.window(start, 240, 30)
+        starts: Window start times
+        duration_minutes: Window length
+        interval_minutes: Slice interval
+
+    Returns:
+        windows: Windows replayed (those with market volume)
+        volume_error: Mean share of the parent traded out of step with the
+            market volume, 0.5 * sum |schedule - realized|
+        price_error_bps: Mean |schedule VWAP - market VWAP| in basis points,
+            filling each slice at its interval's VWAP
+    """
+    times = _minutes(data['timestamp'] if 'timestamp' in data.columns else data.index)
+    volume = data['volume'].to_numpy(dtype=np.float64)
+    if {'high', 'low', 'close'}.issubset(data.columns):
+        price = ((data['high'] + data['low'] + data['close']) / 3).to_numpy(dtype=np.float64)
+    else:
+        price = data['close'].to_numpy(dtype=np.float64)
+    cum_volume = np.concatenate([[0.0], np.cumsum(volume)])
+    cum_notional = np.concatenate([[0.0], np.cumsum(volume * price)])
+
+    starts = list(starts)
+    intervals = max(1, duration_minutes // interval_minutes)
+    if not starts:
+        return {'windows': 0, 'volume_error': 0.0, 'price_error_bps': 0.0}
+
+    # Realized volume and notional of every interval of every window
+    first = _minutes(pd.DatetimeIndex([pd.Timestamp(s) for s in starts]))
+    bounds = first[:, None] + interval_minutes * np.arange(intervals + 1)
+    rows = np.searchsorted(times, bounds, side='left')
+    realized = np.diff(cum_volume[rows], axis=1)
+    notional = np.diff(cum_notional[rows], axis=1)
+
+    planned = np.array([schedule(start) for start in starts], dtype=np.float64)
+    traded = realized.sum(axis=1)
+    valid = (traded > 0) & (realized > 0).all(axis=1)
+    if not valid.any():
+        return {'windows': 0, 'volume_error': 0.0, 'price_error_bps': 0.0}
+
+    realized, notional, planned = realized[valid], notional[valid], planned[valid]
+    traded = traded[valid]
+    volume_error = 0.5 * np.abs(planned - realized / traded[:, None]).sum(axis=1)
+
+    market_vwap = notional.sum(axis=1) / traded
+    schedule_vwap = (planned * notional / realized).sum(axis=1)
+    price_error = np.abs(schedule_vwap - market_vwap) / market_vwap * 10000
+
+    return {
+        'windows': int(valid.sum()),
+        'volume_error': float(volume_error.mean()),
+        'price_error_bps': float(price_error.mean()),
+    }
@@ -7,9 +7,13 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-import json
+from bisect import bisect_right
+from collections import defaultdict
 import logging
 
+from ..journal import Journal
+from ..triggers import TriggerBook, BELOW, ABOVE
+
 
 class PositionSide(Enum):
     LONG = "long"
@@ -105,15 +109,37 @@ class PositionTracker:
     - Real-time P&L calculation
     - Stop loss / take profit monitoring
     - Position history
+    
+    Changes are appended to a journal next to storage_path, which is
+    compacted into a snapshot every compact_every events.
+    
+    Open positions are indexed by symbol and closed positions kept sorted by
+    entry time, with running realized P&L and trade counts. Stop loss and
+    take profit levels live in a TriggerBook, so exit checks only visit
+    positions whose levels the price crossed; change them with
+    set_exit_levels() to keep the index current.
     """
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, compact_every: int = 1000):
         self.logger = logging.getLogger(__name__)
         self.positions: Dict[str, Position] = {}
         self.closed_positions: List[Position] = []
         self.storage_path = storage_path
+        self.journal: Optional[Journal] = None
+        
+        # Secondary indexes and running aggregates
+        self._by_symbol: Dict[str, Dict[str, Position]] = defaultdict(dict)
+        self._side_counts: Dict[PositionSide, int] = defaultdict(int)
+        self._closed_times: List[float] = []
+        self._closed_sorted: List[Position] = []
+        self._realized_pnl = 0.0
+        self._winning_trades = 0
+        self._triggers = TriggerBook()
         
         if storage_path:
+            self.journal = Journal(storage_path, ['open', 'closed'],
+                                   snapshot=self._snapshot,
+                                   compact_every=compact_every)
             self._load_positions()
     
     def open_position(self, symbol: str, side: PositionSide,
@@ -148,10 +174,10 @@ class PositionTracker:
             metadata=metadata or {}
         )
         
-        self.positions[position_id] = position
+        self._add_open(position)
         self.logger.info(f"Position opened: {position_id} ({side.value} {quantity} {symbol} @ {entry_price})")
         
-        self._save_positions()
+        self._save_position(position)
         return position
     
     def close_position(self, position_id: str, exit_price: float,
@@ -171,7 +197,7 @@ class PositionTracker:
             self.logger.warning(f"Position not found: {position_id}")
             return None
         
-        position = self.positions.pop(position_id)
+        position = self._remove_open(position_id)
         
         # Calculate realized P&L
         position.update_unrealized_pnl(exit_price)
@@ -182,11 +208,11 @@ class PositionTracker:
         position.metadata['exit_reason'] = exit_reason
         position.metadata['exit_time'] = datetime.now().isoformat()
         
-        self.closed_positions.append(position)
+        self._add_closed(position)
         
         self.logger.info(f"Position closed: {position_id} (P&L: {position.realized_pnl:.2f}, Reason: {exit_reason})")
         
-        self._save_positions()
+        self._save_position(position, closed=True)
         return position
     
     def update_positions(self, prices: Dict[str, float]):
@@ -210,15 +236,41 @@ class PositionTracker:
         Returns:
             List of (position_id, exit_reason) tuples
         """
-        exits = []
+        exits = {}
         
-        for position in self.positions.values():
-            if position.symbol in prices:
-                exit_reason = position.should_exit(prices[position.symbol])
-                if exit_reason:
-                    exits.append((position.id, exit_reason))
+        for symbol, price in prices.items():
+            for position_id, reason in self._triggers.crossed(symbol, price):
+                # A stop loss wins if a gap crosses both levels
+                if exits.get(position_id) != 'stop_loss':
+                    exits[position_id] = reason
+        
+        return list(exits.items())
+    
+    def set_exit_levels(self, position_id: str, stop_loss: float = None,
+                        take_profit: float = None) -> Optional[Position]:
+        """
+        Change a position's stop loss and/or take profit.
+        
+        Args:
+            position_id: Open position ID
+            stop_loss: New stop loss price (None keeps the current one)
+            take_profit: New take profit price (None keeps the current one)
+            
+        Returns:
+            Updated Position or None if not found
+        """
+        position = self.positions.get(position_id)
+        if position is None:
+            self.logger.warning(f"Position not found: {position_id}")
+            return None
         
-        return exits
+        if stop_loss is not None:
+            position.stop_loss = stop_loss
+        if take_profit is not None:
+            position.take_profit = take_profit
+        self._index_exits(position)
+        self._save_position(position)
+        return position
     
     def get_position(self, position_id: str) -> Optional[Position]:
         """Get position by ID"""
@@ -226,20 +278,18 @@ class PositionTracker:
     
     def get_positions_by_symbol(self, symbol: str) -> List[Position]:
         """Get all positions for a symbol"""
-        return [p for p in self.positions.values() if p.symbol == symbol]
+        return list(self._by_symbol.get(symbol, {}).values())
     
     def get_open_positions(self) -> List[Position]:
         """Get all open positions"""
         return list(self.positions.values())
     
     def get_closed_positions(self, limit: int = None) -> List[Position]:
-        """Get closed positions"""
-        positions = sorted(self.closed_positions, 
-                         key=lambda p: p.timestamp, 
-                         reverse=True)
+        """Get closed positions, newest entry first"""
+        positions = self._closed_sorted
         if limit:
-            positions = positions[:limit]
-        return positions
+            positions = positions[-limit:]
+        return positions[::-1]
     
     def get_portfolio_value(self, prices: Dict[str, float]) -> float:
         """
@@ -260,7 +310,7 @@ class PositionTracker:
     def get_total_pnl(self) -> Dict:
         """Get total P&L statistics"""
         unrealized = sum(p.unrealized_pnl for p in self.positions.values())
-        realized = sum(p.realized_pnl for p in self.closed_positions)
+        realized = self._realized_pnl
         
         return {
             'unrealized_pnl': unrealized,
@@ -274,55 +324,99 @@ class PositionTracker:
         """Get position statistics"""
         pnl = self.get_total_pnl()
         
-        long_positions = len([p for p in self.positions.values() if p.side == PositionSide.LONG])
-        short_positions = len([p for p in self.positions.values() if p.side == PositionSide.SHORT])
-        
-        winning_trades = len([p for p in self.closed_positions if p.realized_pnl > 0])
-        losing_trades = len([p for p in self.closed_positions if p.realized_pnl <= 0])
+        winning_trades = self._winning_trades
+        losing_trades = len(self.closed_positions) - winning_trades
         
         return {
             **pnl,
-            'long_positions': long_positions,
-            'short_positions': short_positions,
+            'long_positions': self._side_counts[PositionSide.LONG],
+            'short_positions': self._side_counts[PositionSide.SHORT],
             'winning_trades': winning_trades,
             'losing_trades': losing_trades,
             'win_rate': winning_trades / len(self.closed_positions) if self.closed_positions else 0.0
         }
     
+    def _add_open(self, position: Position):
+        self.positions[position.id] = position
+        self._by_symbol[position.symbol][position.id] = position
+        self._side_counts[position.side] += 1
+        self._index_exits(position)
+    
+    def _index_exits(self, position: Position):
+        """Register the position's stop loss and take profit triggers"""
+        long = position.side == PositionSide.LONG
+        levels = (('stop_loss', position.stop_loss, BELOW if long else ABOVE),
+                  ('take_profit', position.take_profit, ABOVE if long else BELOW))
+        for reason, level, direction in levels:
+            # Same truthiness as Position.should_exit(): 0/None means no level
+            if level:
+                self._triggers.add((position.id, reason), position.symbol, level, direction)
+            else:
+                self._triggers.remove((position.id, reason))
+    
+    def _remove_open(self, position_id: str) -> Position:
+        position = self.positions.pop(position_id)
+        self._triggers.remove((position_id, 'stop_loss'))
+        self._triggers.remove((position_id, 'take_profit'))
+        by_symbol = self._by_symbol[position.symbol]
+        by_symbol.pop(position_id, None)
+        if not by_symbol:
+            del self._by_symbol[position.symbol]
+        self._side_counts[position.side] -= 1
+        return position
+    
+    def _add_closed(self, position: Position):
+        self.closed_positions.append(position)
+        
+        opened = position.timestamp.timestamp()
+        index = bisect_right(self._closed_times, opened)
+        self._closed_times.insert(index, opened)
+        self._closed_sorted.insert(index, position)
+        
+        self._realized_pnl += position.realized_pnl
+        if position.realized_pnl > 0:
+            self._winning_trades += 1
+    
+    def _snapshot(self) -> Dict:
+        return {
+            'open': [p.to_dict() for p in self.positions.values()],
+            'closed': [p.to_dict() for p in self.closed_positions]
+        }
+    
+    def _save_position(self, position: Position, closed: bool = False):
+        """Append a position change to the journal"""
+        if not self.journal:
+            return
+        
+        try:
+            if closed:
+                self.journal.delete('open', position.id)
+                self.journal.put('closed', position.to_dict())
+            else:
+                self.journal.put('open', position.to_dict())
+        except Exception as e:
+            self.logger.error(f"Error saving position {position.id}: {e}")
+    
     def _save_positions(self):
-        """Save positions to file"""
-        if not self.storage_path:
+        """Write all positions as a snapshot and truncate the journal"""
+        if not self.journal:
             return
         
         try:
-            data = {
-                'open': [p.to_dict() for p in self.positions.values()],
-                'closed': [p.to_dict() for p in self.closed_positions]
-            }
-            
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            self.journal.compact()
         except Exception as e:
             self.logger.error(f"Error saving positions: {e}")
     
     def _load_positions(self):
-        """Load positions from file"""
-        import os
-        if not os.path.exists(self.storage_path):
-            return
-        
+        """Load the snapshot and replay the journal"""
         try:
-            with open(self.storage_path, 'r') as f:
-                data = json.load(f)
+            state = self.journal.load()
             
-            for pos_data in data.get('open', []):
-                position = Position.from_dict(pos_data)
-                self.positions[position.id] = position
+            for pos_data in state['open'].values():
+                self._add_open(Position.from_dict(pos_data))
             
-            for pos_data in data.get('closed', []):
-                position = Position.from_dict(pos_data)
-                self.closed_positions.append(position)
+            for pos_data in state['closed'].values():
+                self._add_closed(Position.from_dict(pos_data))
             
             self.logger.info(f"Loaded {len(self.positions)} open positions, "
                            f"{len(self.closed_positions)} closed positions")
@@ -3,13 +3,19 @@ Smart Order Router
 Routes orders to the best exchange based on price, fees, liquidity, and latency.
 """
 
+import asyncio
+import itertools
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import time
 
-from .base import BaseExchange, Order, OrderSide, OrderType, Ticker
+from .exchanges.base import BaseExchange, Order, OrderSide, OrderType, Ticker
+from .exchanges.async_base import AsyncBaseExchange, AsyncExchangeAdapter, gather_bounded
+from .cache import MarketDataCache
 
 
 class RoutingPriority(Enum):
@@ -53,19 +59,40 @@ class SmartOrderRouter:
     - Latency monitoring
     - Liquidity analysis
     - Failover support
+    
+    Market data is requested from all exchanges concurrently. Each exchange
+    has a timeout; routing proceeds with whichever exchanges answered in time.
+    Tickers and fees go through a MarketDataCache shared with the exchanges.
+    
+    The *_async methods query all exchanges from one event loop, at most
+    max_concurrency at a time. Native AsyncBaseExchange connectors are
+    used where registered; synchronous ones run through a thread adapter.
     """
     
-    def __init__(self):
+    def __init__(self, timeout: float = 2.0, max_workers: int = 8,
+                 cache: MarketDataCache = None, max_concurrency: int = 10):
         self.exchanges: Dict[str, BaseExchange] = {}
         self.latency_history: Dict[str, List[float]] = {}
         self.reliability_scores: Dict[str, float] = {}
         self.default_priority = RoutingPriority.PRICE
+        self.timeout = timeout
+        self.exchange_timeouts: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='router')
+        self._lock = threading.Lock()
+        # Start times of the market data requests still running, per exchange
+        self._in_flight: Dict[str, Dict[int, float]] = {}
+        self._request_ids = itertools.count()
+        self.cache = cache or MarketDataCache()
+        self.async_exchanges: Dict[str, AsyncBaseExchange] = {}
+        self.max_concurrency = max_concurrency
         
     def add_exchange(self, exchange: BaseExchange) -> bool:
         """Add an exchange to the router"""
         try:
             if exchange.connect():
                 self.exchanges[exchange.name] = exchange
+                exchange.cache = self.cache
                 self.reliability_scores[exchange.name] = 1.0
                 logging.info(f"Added exchange: {exchange.name}")
                 return True
@@ -74,6 +101,36 @@ class SmartOrderRouter:
             logging.error(f"Failed to add exchange {exchange.name}: {e}")
             return False
     
+    async def add_async_exchange(self, exchange: AsyncBaseExchange) -> bool:
+        """Add a native async connector (takes precedence over a sync one of the same name)"""
+        try:
+            if await exchange.connect():
+                self.async_exchanges[exchange.name] = exchange
+                self.reliability_scores.setdefault(exchange.name, 1.0)
+                logging.info(f"Added async exchange: {exchange.name}")
+                return True
+            return False
+        except Exception as e:
+            logging.error(f"Failed to add async exchange {exchange.name}: {e}")
+            return False
+    
+    def async_view(self) -> Dict[str, AsyncBaseExchange]:
+        """All exchanges as async connectors"""
+        view: Dict[str, AsyncBaseExchange] = {
+            name: AsyncExchangeAdapter(exchange)
+            for name, exchange in self.exchanges.items()
+        }
+        view.update(self.async_exchanges)
+        return view
+    
+    def set_timeout(self, name: str, timeout: float):
+        """Override the market data timeout (seconds) for one exchange"""
+        self.exchange_timeouts[name] = timeout
+    
+    def shutdown(self):
+        """Stop the market data worker threads"""
+        self._executor.shutdown(wait=False)
+    
     def remove_exchange(self, name: str) -> bool:
         """Remove an exchange from the router"""
         if name in self.exchanges:
@@ -97,10 +154,28 @@ class SmartOrderRouter:
         Returns:
             RoutingDecision with selected exchange and analysis
         """
-        priority = priority or self.default_priority
-        
         # Collect data from all exchanges
         exchange_data = self._collect_exchange_data(symbol)
+        return self._decide(symbol, side, amount, priority, exchange_data)
+    
+    async def get_best_exchange_async(self, symbol: str, side: OrderSide,
+                                      amount: float,
+                                      priority: RoutingPriority = None,
+                                      deadline: float = None) -> RoutingDecision:
+        """
+        Coroutine version of get_best_exchange().
+        
+        The decision may select a native async connector that route_order()
+        and self.exchanges don't know; execute it with route_order_async().
+        """
+        exchange_data = await self._collect_exchange_data_async(symbol, deadline)
+        return self._decide(symbol, side, amount, priority, exchange_data)
+    
+    def _decide(self, symbol: str, side: OrderSide, amount: float,
+                priority: Optional[RoutingPriority],
+                exchange_data: Dict[str, dict]) -> RoutingDecision:
+        """Score the collected exchange data and pick the best exchange"""
+        priority = priority or self.default_priority
         
         if not exchange_data:
             raise ValueError("No exchanges available for routing")
@@ -131,8 +206,7 @@ class SmartOrderRouter:
         price = ticker.ask if side == OrderSide.BUY else ticker.bid
         base_cost = amount * price
         
-        exchange = self.exchanges[best.exchange]
-        fees = exchange.get_fees()
+        fees = exchange_data[best.exchange]['fees']
         fee_rate = fees.taker  # Conservative estimate
         estimated_fee = base_cost * fee_rate
         estimated_cost = base_cost + estimated_fee
@@ -149,43 +223,185 @@ class SmartOrderRouter:
             timestamp=time.time()
         )
     
-    def _collect_exchange_data(self, symbol: str) -> Dict[str, dict]:
-        """Collect ticker and fee data from all exchanges"""
-        data = {}
+    def _collect_exchange_data(self, symbol: str,
+                               deadline: float = None) -> Dict[str, dict]:
+        """
+        Collect ticker and fee data from all exchanges concurrently.
+        
+        Args:
+            symbol: Trading pair
+            deadline: Overall time budget in seconds; exchanges that have not
+                answered by then (or by their own timeout) are left out
+            
+        Returns:
+            Data for each exchange that answered in time
+        """
+        start = time.monotonic()
+        futures = {}
+        limits = {}
         
         for name, exchange in self.exchanges.items():
+            exchange_timeout = self.exchange_timeouts.get(name, self.timeout)
+            with self._lock:
+                running = self._in_flight.setdefault(name, {})
+                busy_since = min(running.values(), default=None)
+                hung = busy_since is not None and busy_since + exchange_timeout < start
+                if not hung:
+                    request_id = next(self._request_ids)
+                    running[request_id] = start
+            if hung:
+                # Don't queue behind a request that outlived its timeout;
+                # requests of concurrent calls that are still in time are fine
+                logging.warning(f"Skipping {name}: previous request pending for "
+                                f"{start - busy_since:.1f}s")
+                self._penalize(name)
+                continue
+            
+            timeout = exchange_timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline)
+            limits[name] = start + timeout
+            future = self._executor.submit(self._fetch_exchange_data, name, exchange,
+                                           symbol, request_id)
+            futures[future] = name
+        
+        data = {}
+        pending = set(futures)
+        
+        while pending:
+            now = time.monotonic()
+            expired = {f for f in pending if limits[futures[f]] <= now}
+            for future in expired:
+                name = futures[future]
+                logging.warning(f"Timed out waiting for {name} after "
+                                f"{now - start:.2f}s")
+                self._penalize(name)
+            pending -= expired
+            if not pending:
+                break
+            
+            next_limit = min(limits[futures[f]] for f in pending)
+            done, pending = wait(pending, timeout=next_limit - now,
+                                 return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                name = futures[future]
+                try:
+                    data[name] = future.result()
+                except Exception as e:
+                    logging.warning(f"Failed to get data from {name}: {e}")
+                    self._penalize(name)
+        
+        return data
+    
+    async def _collect_exchange_data_async(self, symbol: str,
+                                           deadline: float = None) -> Dict[str, dict]:
+        """
+        Coroutine version of _collect_exchange_data().
+        
+        Exchanges are queried concurrently (bounded by max_concurrency), each
+        cancelled at its timeout or the overall deadline, which also counts
+        the time spent waiting for a concurrency slot.
+        """
+        exchanges = self.async_view()
+        names = list(exchanges)
+        loop = asyncio.get_running_loop()
+        end = None if deadline is None else loop.time() + deadline
+        
+        async def fetch(name: str) -> dict:
+            timeout = self.exchange_timeouts.get(name, self.timeout)
+            if end is not None:
+                timeout = min(timeout, end - loop.time())
+                if timeout <= 0:
+                    raise TimeoutError("deadline passed before the request started")
             try:
-                start = time.time()
-                ticker = exchange.get_ticker(symbol)
-                latency = time.time() - start
-                
-                # Update latency history
-                if name not in self.latency_history:
-                    self.latency_history[name] = []
-                self.latency_history[name].append(latency)
-                # Keep last 100 measurements
-                self.latency_history[name] = self.latency_history[name][-100:]
-                
-                fees = exchange.get_fees()
-                spread = exchange.get_spread(symbol)
-                
-                data[name] = {
-                    'ticker': ticker,
-                    'fees': fees,
-                    'spread': spread,
-                    'latency': latency,
-                    'reliability': self.reliability_scores.get(name, 1.0)
-                }
-                
-            except Exception as e:
-                logging.warning(f"Failed to get data from {name}: {e}")
-                # Reduce reliability score on failure
-                self.reliability_scores[name] = max(
-                    0.1, self.reliability_scores.get(name, 1.0) * 0.9
+                return await asyncio.wait_for(
+                    self._fetch_exchange_data_async(name, exchanges[name], symbol),
+                    timeout
                 )
+            except asyncio.TimeoutError:
+                # The request was cancelled; its latency is at least the timeout
+                self._record_latency(name, timeout)
+                raise TimeoutError(f"no answer within {timeout:.2f}s")
+        
+        results = await gather_bounded([fetch(name) for name in names],
+                                       limit=self.max_concurrency)
         
+        data = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Failed to get data from {name}: {result}")
+                self._penalize(name)
+            else:
+                data[name] = result
         return data
     
+    async def _fetch_exchange_data_async(self, name: str, exchange: AsyncBaseExchange,
+                                         symbol: str) -> dict:
+        async def fetch_ticker() -> Ticker:
+            start = time.monotonic()
+            ticker = await exchange.get_ticker(symbol)
+            self._record_latency(name, time.monotonic() - start)
+            return ticker
+        
+        ticker = await self.cache.get_async('ticker', name, symbol, fetch_ticker)
+        fees = self.cache.get('fees', name, None, exchange.get_fees)
+        
+        with self._lock:
+            latency = self.latency_history.get(name, [0.0])[-1]
+        
+        return {
+            'ticker': ticker,
+            'fees': fees,
+            'spread': (ticker.ask - ticker.bid) / ticker.last * 100,
+            'latency': latency,
+            'reliability': self.reliability_scores.get(name, 1.0)
+        }
+    
+    def _fetch_exchange_data(self, name: str, exchange: BaseExchange,
+                             symbol: str, request_id: int = None) -> dict:
+        """Fetch market data from one exchange (runs on a worker thread)"""
+        def fetch_ticker() -> Ticker:
+            start = time.monotonic()
+            ticker = exchange.get_ticker(symbol)
+            # Recorded even if the caller already gave up on this exchange,
+            # so slow exchanges are reflected in SPEED routing
+            self._record_latency(name, time.monotonic() - start)
+            return ticker
+        
+        try:
+            ticker = self.cache.get_ticker(exchange, symbol, fetch=fetch_ticker)
+            fees = self.cache.get_fees(exchange)
+            spread = exchange.get_spread(symbol)
+            
+            with self._lock:
+                latency = self.latency_history.get(name, [0.0])[-1]
+            
+            return {
+                'ticker': ticker,
+                'fees': fees,
+                'spread': spread,
+                'latency': latency,
+                'reliability': self.reliability_scores.get(name, 1.0)
+            }
+        finally:
+            with self._lock:
+                self._in_flight.get(name, {}).pop(request_id, None)
+    
+    def _record_latency(self, name: str, latency: float):
+        with self._lock:
+            history = self.latency_history.setdefault(name, [])
+            history.append(latency)
+            # Keep last 100 measurements
+            del history[:-100]
+    
+    def _penalize(self, name: str):
+        """Reduce reliability score on failure"""
+        with self._lock:
+            self.reliability_scores[name] = max(
+                0.1, self.reliability_scores.get(name, 1.0) * 0.9
+            )
+    
     def _score_exchange(self, name: str, data: dict, side: OrderSide,
                         amount: float, priority: RoutingPriority) -> ExchangeScore:
         """Score an exchange based on priority"""
@@ -261,6 +477,7 @@ class SmartOrderRouter:
         
         try:
             executed = exchange.place_order(order)
+            self.cache.on_order_placed(exchange.name, order.symbol)
             
             # Update reliability on success
             self.reliability_scores[decision.selected_exchange] = min(
@@ -278,6 +495,7 @@ class SmartOrderRouter:
                     backup_exchange = self.exchanges[score.exchange]
                     order.exchange = score.exchange
                     executed = backup_exchange.place_order(order)
+                    self.cache.on_order_placed(score.exchange, order.symbol)
                     
                     logging.info(f"Failover successful to {score.exchange}")
                     decision.selected_exchange = score.exchange
@@ -290,6 +508,39 @@ class SmartOrderRouter:
             
             raise Exception("Order failed on all exchanges")
     
+    async def route_order_async(self, order: Order,
+                                priority: RoutingPriority = None,
+                                deadline: float = None) -> Tuple[Order, RoutingDecision]:
+        """
+        Coroutine version of route_order().
+        
+        Routes over async_view(), so native async connectors can be selected
+        and executed on as well as the synchronous exchanges.
+        """
+        decision = await self.get_best_exchange_async(
+            order.symbol, order.side, order.amount, priority, deadline
+        )
+        exchanges = self.async_view()
+        
+        for i, score in enumerate(decision.all_scores):
+            order.exchange = score.exchange
+            try:
+                executed = await exchanges[score.exchange].place_order(order)
+            except Exception as e:
+                logging.error(f"Order failed on {score.exchange}: {e}")
+                continue
+            self.cache.on_order_placed(score.exchange, order.symbol)
+            self.reliability_scores[score.exchange] = min(
+                1.0, self.reliability_scores.get(score.exchange, 1.0) * 1.05
+            )
+            if i > 0:
+                logging.info(f"Failover successful to {score.exchange}")
+                decision.reason += f" (failover from {decision.selected_exchange})"
+                decision.selected_exchange = score.exchange
+            return executed, decision
+        
+        raise Exception("Order failed on all exchanges")
+    
     def get_arbitrage_opportunities(self, symbol: str,
                                      min_profit_percent: float = 0.1) -> List[Dict]:
         """
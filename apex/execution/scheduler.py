@@ -0,0 +1,164 @@
+"""
+Timer Scheduler
+One asyncio timing core for the execution runtime.
+
+TWAP/VWAP slice releases, POV deadlines and any other timed work share a
+single heap of timers driven by one coroutine, instead of a thread or a
+polling loop per algorithm. The coroutine sleeps until the earliest deadline
+and is woken early when an earlier timer is added, so thousands of
+concurrent algorithms cost one heap entry each and no idle wakeups.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class TimerHandle:
+    """A scheduled callback; cancel() stops it from firing"""
+
+    __slots__ = ('when', 'callback', 'args', 'cancelled', 'fired', '_scheduler')
+
+    def __init__(self, when: float, callback: Callable, args: tuple, scheduler: 'TimerScheduler'):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.fired = False
+        self._scheduler = scheduler
+
+    def cancel(self):
+        """Stop the callback; a no-op once it has fired"""
+        self._scheduler._cancel(self)
+
+
+class TimerScheduler:
+    """
+    Heap of timers run by a single asyncio coroutine.
+
+    Timers may be added from any thread. run_due() fires everything due at a
+    given time without the event loop, which is how simulations and tests
+    drive the scheduler on market time.
+
+    Example:
+        scheduler = TimerScheduler()
+        engine = ExecutionEngine(scheduler, on_order=place_child_order)
+        engine.start_twap('BTC/USDT', OrderSide.BUY, 5, duration_minutes=60)
+        await scheduler.run()
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            clock: Current time in seconds (default: wall clock)
+        """
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.fired = 0
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._cancelled = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running = False
+
+    def call_at(self, when: float, callback: Callable, *args) -> TimerHandle:
+        """Run callback(*args) at clock time `when`"""
+        handle = TimerHandle(when, callback, args, self)
+        with self._lock:
+            heapq.heappush(self._heap, (when, next(self._seq), handle))
+            earliest = self._heap[0][2] is handle
+        if earliest:
+            self._notify()
+        return handle
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """Run callback(*args) after `delay` seconds"""
+        return self.call_at(self.clock() + delay, callback, *args)
+
+    def next_deadline(self) -> Optional[float]:
+        """Time of the earliest pending timer"""
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+            return self._heap[0][0] if self._heap else None
+
+    def pending(self) -> int:
+        """Number of timers that will still fire"""
+        with self._lock:
+            return len(self._heap) - self._cancelled
+
+    def run_due(self, now: float = None) -> int:
+        """
+        Fire every timer due at `now` (default: the clock), in time order.
+
+        Returns:
+            Number of callbacks run
+        """
+        now = self.clock() if now is None else now
+        fired = 0
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                handle = heapq.heappop(self._heap)[2]
+                if handle.cancelled:
+                    self._cancelled -= 1
+                    continue
+                # Off the heap now, so a later cancel() has nothing to count
+                handle.fired = True
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                self.logger.error(f"Error in timer callback {handle.callback.__name__}: {e}")
+            fired += 1
+        self.fired += fired
+        return fired
+
+    async def run(self):
+        """Fire timers as they come due until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._running = True
+        try:
+            while self._running:
+                self._wake.clear()
+                self.run_due()
+                deadline = self.next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - self.clock())
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            self._loop = None
+
+    def stop(self):
+        """Stop run() after the current pass"""
+        self._running = False
+        self._notify()
+
+    def _notify(self):
+        """Wake run() so it recomputes its sleep"""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def _cancel(self, handle: TimerHandle):
+        with self._lock:
+            if handle.cancelled or handle.fired:
+                return
+            handle.cancelled = True
+            self._cancelled += 1
+            # Cancelled timers are dropped lazily; rebuild once they dominate the heap
+            if self._cancelled > 64 and self._cancelled > len(self._heap) // 2:
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
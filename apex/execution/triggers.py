@@ -0,0 +1,234 @@
+"""
+Trigger Book
+Price-indexed stop-loss, take-profit and trailing stop triggers.
+
+Triggers are kept per symbol in sorted lists, one for levels that fire when
+the price falls to them (long stop loss, short take profit, SELL stops) and
+one for levels that fire when the price rises to them. A price tick then
+only touches the triggers it actually crossed: a bisection finds them at the
+end of a list instead of checking every position or order.
+
+Trailing stops are also indexed by their high (SELL) or low (BUY) water
+mark, so a tick re-keys only the stops whose extreme it moved.
+"""
+
+import itertools
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .orders.manager import Order, OrderSide
+
+
+BELOW = 'below'     # Fires when price <= level
+ABOVE = 'above'     # Fires when price >= level
+
+
+def _sort_key(direction: str, price: float) -> float:
+    # Negating ABOVE levels puts every crossed trigger at the end of its list
+    return price if direction == BELOW else -price
+
+
+def _crossed_from(entries: List[Tuple], threshold: float) -> int:
+    """Index of the first entry whose sort key is >= threshold"""
+    return bisect_left(entries, (threshold,))
+
+
+def _remove(entries: List[Tuple], sort_key: float, seq: int):
+    index = bisect_left(entries, (sort_key, seq))
+    if index < len(entries) and entries[index][1] == seq:
+        del entries[index]
+
+
+class _Trigger:
+    __slots__ = ('key', 'symbol', 'direction', 'sort_key', 'seq', 'trailing', 'extreme_key')
+
+    def __init__(self, key, symbol, direction, sort_key, seq, trailing=None):
+        self.key = key
+        self.symbol = symbol
+        self.direction = direction
+        self.sort_key = sort_key
+        self.seq = seq
+        self.trailing = trailing
+        self.extreme_key: Optional[float] = None
+
+
+class _SymbolTriggers:
+    """Sorted (sort key, seq, key) lists of one symbol"""
+
+    def __init__(self):
+        self.levels = {BELOW: [], ABOVE: []}
+        self.trailing = {BELOW: [], ABOVE: []}
+        self.extremes = {BELOW: [], ABOVE: []}
+        self.inactive: Dict[Hashable, _Trigger] = {}
+
+    def __len__(self) -> int:
+        return (sum(len(entries) for entries in self.levels.values()) +
+                sum(len(entries) for entries in self.trailing.values()) +
+                len(self.inactive))
+
+
+class TriggerBook:
+    """
+    Stop/take-profit levels and trailing stops indexed by price.
+
+    Example:
+        book = TriggerBook()
+        book.add(('pos_1', 'stop_loss'), 'BTC/USDT', 48000, BELOW)
+        book.add(('pos_1', 'take_profit'), 'BTC/USDT', 55000, ABOVE)
+        book.crossed('BTC/USDT', 47900)        # [('pos_1', 'stop_loss')]
+
+        book.add_trailing('ts_1', trailing_stop)
+        book.update_trailing('BTC/USDT', 50100)  # [(key, market order)] when triggered
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, _SymbolTriggers] = {}
+        self._triggers: Dict[Hashable, _Trigger] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._triggers
+
+    def add(self, key: Hashable, symbol: str, level: float, direction: str):
+        """
+        Add (or move) a fixed trigger.
+
+        Args:
+            key: Identifier returned when the trigger fires
+            symbol: Trading pair
+            level: Trigger price
+            direction: BELOW (fires at price <= level) or ABOVE (price >= level)
+        """
+        if direction not in (BELOW, ABOVE):
+            raise ValueError(f"Unknown trigger direction '{direction}'")
+        self.remove(key)
+        trigger = _Trigger(key, symbol, direction, _sort_key(direction, level), next(self._seq))
+        self._triggers[key] = trigger
+        book = self._symbols.setdefault(symbol, _SymbolTriggers())
+        insort(book.levels[direction], (trigger.sort_key, trigger.seq, key))
+
+    def add_trailing(self, key: Hashable, trailing):
+        """
+        Add (or re-index) a TrailingStopOrder.
+
+        A stop that hasn't seen a price yet is activated by the next
+        update_trailing() of its symbol.
+        """
+        self.remove(key)
+        direction = BELOW if trailing.side == OrderSide.SELL else ABOVE
+        trigger = _Trigger(key, trailing.symbol, direction, None, next(self._seq), trailing)
+        self._triggers[key] = trigger
+        book = self._symbols.setdefault(trailing.symbol, _SymbolTriggers())
+        if trailing.activated:
+            self._index_trailing(book, trigger)
+        else:
+            book.inactive[key] = trigger
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop a trigger; False if it wasn't in the book"""
+        trigger = self._triggers.pop(key, None)
+        if trigger is None:
+            return False
+        book = self._symbols[trigger.symbol]
+        if trigger.trailing is None:
+            _remove(book.levels[trigger.direction], trigger.sort_key, trigger.seq)
+        elif trigger.sort_key is None:
+            book.inactive.pop(key, None)
+        else:
+            _remove(book.trailing[trigger.direction], trigger.sort_key, trigger.seq)
+            _remove(book.extremes[trigger.direction], trigger.extreme_key, trigger.seq)
+        if not book:
+            del self._symbols[trigger.symbol]
+        return True
+
+    def crossed(self, symbol: str, price: float) -> List[Hashable]:
+        """Keys of the fixed triggers a price has reached (they stay in the book)"""
+        book = self._symbols.get(symbol)
+        if book is None:
+            return []
+        keys = []
+        for direction, entries in book.levels.items():
+            start = _crossed_from(entries, _sort_key(direction, price))
+            keys.extend(entry[2] for entry in entries[start:])
+        return keys
+
+    def pop_crossed(self, symbol: str, price: float) -> List[Hashable]:
+        """Keys of the fixed triggers a price has reached, removed from the book"""
+        book = self._symbols.get(symbol)
+        if book is None:
+            return []
+        keys = []
+        for direction, entries in book.levels.items():
+            start = _crossed_from(entries, _sort_key(direction, price))
+            for entry in entries[start:]:
+                keys.append(entry[2])
+                del self._triggers[entry[2]]
+            del entries[start:]
+        if not book:
+            del self._symbols[symbol]
+        return keys
+
+    def update_trailing(self, symbol: str, price: float) -> List[Tuple[Hashable, Order]]:
+        """
+        Move the trailing stops of a symbol to a new price.
+
+        Same result as TrailingStopOrder.update_price() on every stop, but
+        only stops whose extreme moved are re-keyed and only triggered stops
+        are visited. Triggered stops are removed from the book.
+
+        Returns:
+            (key, market order) for every stop that triggered
+        """
+        book = self._symbols.get(symbol)
+        if book is None:
+            return []
+
+        for trigger in list(book.inactive.values()):
+            trigger.trailing._initialize(price)
+            del book.inactive[trigger.key]
+            self._index_trailing(book, trigger)
+
+        triggered = []
+        for direction in (BELOW, ABOVE):
+            threshold = _sort_key(direction, price)
+
+            # New high (SELL stops) / low (BUY stops): re-key the stops it passed
+            extremes = book.extremes[direction]
+            stale = extremes[:_crossed_from(extremes, threshold)]
+            if stale:
+                del extremes[:len(stale)]
+                for _, _, key in stale:
+                    trigger = self._triggers[key]
+                    _remove(book.trailing[direction], trigger.sort_key, trigger.seq)
+                    if direction == BELOW:
+                        trigger.trailing.highest_price = price
+                    else:
+                        trigger.trailing.lowest_price = price
+                    trigger.trailing._update_stop_price()
+                    self._index_trailing(book, trigger)
+
+            levels = book.trailing[direction]
+            start = _crossed_from(levels, threshold)
+            for _, seq, key in levels[start:]:
+                trigger = self._triggers.pop(key)
+                _remove(extremes, trigger.extreme_key, seq)
+                triggered.append((key, trigger.trailing._create_market_order()))
+            del levels[start:]
+
+        if not book:
+            del self._symbols[symbol]
+        return triggered
+
+    def _index_trailing(self, book: _SymbolTriggers, trigger: _Trigger):
+        trailing = trigger.trailing
+        direction = trigger.direction
+        if direction == BELOW:
+            trigger.extreme_key = trailing.highest_price
+        else:
+            trigger.extreme_key = -trailing.lowest_price
+        trigger.sort_key = _sort_key(direction, trailing.stop_price)
+        insort(book.trailing[direction], (trigger.sort_key, trigger.seq, trigger.key))
+        insort(book.extremes[direction], (trigger.extreme_key, trigger.seq, trigger.key))
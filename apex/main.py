@@ -4,11 +4,14 @@ Unified interface for backtesting, paper trading, and live trading.
 """
 
 import argparse
+import asyncio
 import json
 import sys
 from pathlib import Path
 from typing import Dict
 
+import pandas as pd
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -18,13 +21,20 @@ from trading.strategies.trend_following import TrendFollowingStrategy
 from trading.strategies.multi_timeframe import MultiTimeframeStrategy
 from trading.strategies.ensemble import StrategyEnsemble
 from trading.strategies.ml_strategy import MLStrategy
+from analysis.ml.features import FeatureEngineer, FeatureConfig
 from trading.risk.manager import RiskManager, RiskConfig, RiskLevel
+from trading.live import TradingLoop, PollingCandleFeed
 from execution.exchanges.binance import BinanceConnector
-from execution.orders.algorithms import ExecutionEngine, AlgoType
+from execution.exchanges.candle_store import CandleStore
+from execution.orders.algorithms import ExecutionEngine, AlgoType, VWAPExecutor
+from execution.orders.manager import OrderSide
+from execution.orders.volume_profile import VolumeProfileStore, replay_tracking_error
 from execution.orders.advanced import AdvancedOrderManager
 from automation.alerts import AlertManager, ScheduledTask, Scheduler, PerformanceMonitor
 from automation.dashboard import DashboardGenerator
-from backtest import run_backtest
+from backtest import run_backtest, run_portfolio_backtest, load_history
+from execution.exchanges.base import timeframe_to_seconds
+from optimizer import StrategyOptimizer, METRIC_FIELDS
 
 
 def load_config(config_path: str = 'apex/config.json') -> Dict:
@@ -115,12 +125,71 @@ def create_strategy(strategy_name: str, config: Dict):
         raise ValueError(f"Unknown strategy: {strategy_name}")
 
 
+STRATEGY_CLASSES = {
+    'breakout': BreakoutStrategy,
+    'mean_reversion': MeanReversionStrategy,
+    'trend_following': TrendFollowingStrategy,
+    'multi_timeframe': MultiTimeframeStrategy,
+    'ensemble': StrategyEnsemble,
+    'ml': MLStrategy,
+}
+STRATEGY_NAMES = list(STRATEGY_CLASSES)
+
+# Portfolio backtests need generate_signal_series()
+PORTFOLIO_STRATEGY_NAMES = [name for name, cls in STRATEGY_CLASSES.items()
+                            if cls.supports_signal_series()]
+
+
+def portfolio_strategy_error(names) -> str:
+    """Why the strategies can't run in a portfolio backtest, or '' if they can"""
+    unsupported = [name for name in names if name not in PORTFOLIO_STRATEGY_NAMES]
+    if not unsupported:
+        return ''
+    return (f"strategy '{unsupported[0]}' can't be used in a portfolio backtest "
+            f"(choose from {', '.join(PORTFOLIO_STRATEGY_NAMES)})")
+
+
+def strategy_list(value: str) -> str:
+    """argparse type for one or more comma-separated strategy names"""
+    names = value.split(',')
+    for name in names:
+        if name not in STRATEGY_NAMES:
+            raise argparse.ArgumentTypeError(
+                f"invalid strategy '{name}' (choose from {', '.join(STRATEGY_NAMES)})")
+    if len(names) > 1 and portfolio_strategy_error(names):
+        raise argparse.ArgumentTypeError(portfolio_strategy_error(names))
+    return value
+
+
 def cmd_backtest(args, config: Dict):
     """Run backtest command"""
     print(f"\n{'='*60}")
     print(f"APEX BACKTEST - {args.strategy.upper()}")
     print('='*60)
     
+    strategy_names = args.strategy.split(',')
+    symbols = [s.strip() for s in args.symbol.split(',')]
+    
+    # Several symbols or strategies share one capital pool
+    if len(strategy_names) > 1 or len(symbols) > 1:
+        risk_config = RiskConfig(
+            risk_level=RiskLevel(config['risk_management'].get('risk_level', 'moderate'))
+        )
+        result = run_portfolio_backtest(
+            strategies=[create_strategy(name, config) for name in strategy_names],
+            symbols=symbols,
+            timeframe=args.timeframe,
+            days=args.days,
+            initial_capital=args.capital,
+            risk_manager=RiskManager(risk_config)
+        )
+        if result and args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.output, 'w') as f:
+                json.dump(result.to_dict(), f, indent=2)
+            print(f"Results saved to {args.output}")
+        return result
+    
     # Create strategy
     strategy = create_strategy(args.strategy, config)
     
@@ -130,7 +199,8 @@ def cmd_backtest(args, config: Dict):
         symbol=args.symbol,
         timeframe=args.timeframe,
         days=args.days,
-        initial_capital=args.capital
+        initial_capital=args.capital,
+        vectorized=args.vectorized
     )
     
     # Save results
@@ -140,6 +210,171 @@ def cmd_backtest(args, config: Dict):
     return result
 
 
+def parse_param_grid(param_args) -> Dict:
+    """Parse --param key=v1,v2,... arguments into a parameter grid"""
+    grid = {}
+    for arg in param_args or []:
+        key, _, values = arg.partition('=')
+        if not values:
+            raise ValueError(f"Invalid --param '{arg}', expected key=v1,v2,...")
+        parsed = []
+        for value in values.split(','):
+            try:
+                parsed.append(json.loads(value))
+            except json.JSONDecodeError:
+                parsed.append(value)
+        grid[key] = parsed
+    return grid
+
+
+def cmd_optimize(args, config: Dict):
+    """Run parameter search / walk-forward optimization"""
+    print(f"\n{'='*60}")
+    print(f"APEX OPTIMIZER - {args.strategy.upper()}")
+    print('='*60)
+    
+    param_grid = parse_param_grid(args.param)
+    if not param_grid:
+        print("No parameters to optimize, use --param key=v1,v2,...")
+        return
+    
+    strategy = create_strategy(args.strategy, config)
+    trading_config = config.get('trading', {})
+    optimizer = StrategyOptimizer(
+        strategy.__class__,
+        base_config=strategy.config,
+        metric=args.metric,
+        max_workers=args.workers,
+        vectorized=not args.loop,
+        initial_capital=args.capital,
+        commission=trading_config.get('commission', 0.001),
+        slippage=trading_config.get('slippage', 0.0005)
+    )
+    
+    data = load_history(args.symbol, args.timeframe, args.days)
+    if data is None or len(data) == 0:
+        print("Error: Could not fetch data")
+        return
+    
+    if args.train_size and args.test_size:
+        windows = optimizer.walk_forward(
+            data, param_grid, args.train_size, args.test_size, symbol=args.symbol
+        )
+        for window in windows:
+            print(f"\nTrain {window.train_start} -> {window.train_end}")
+            print(f"  Best params: {window.best_params}")
+            print(f"  Train {args.metric}: {window.train_metrics[args.metric]:.4f}")
+            print(f"  Test  {args.metric}: {window.test_metrics[args.metric]:.4f} "
+                  f"({window.test_start} -> {window.test_end})")
+        return windows
+    
+    if args.search == 'random':
+        results = optimizer.random_search(data, param_grid, args.iterations, symbol=args.symbol)
+    else:
+        results = optimizer.grid_search(data, param_grid, symbol=args.symbol)
+    
+    print(f"\nTop results by {args.metric}:")
+    for result in results[:args.top]:
+        print(f"  {result.metrics[args.metric]:>10.4f}  "
+              f"trades={result.metrics['total_trades']:<4} {result.params}")
+    
+    return results
+
+
+def cmd_features(args, config: Dict):
+    """Report the memory footprint of ML features per symbol-year"""
+    print(f"\n{'='*60}")
+    print("APEX FEATURE MEMORY BENCHMARK")
+    print('='*60)
+    
+    data = load_history(args.symbol, args.timeframe, args.days)
+    if data is None or len(data) == 0:
+        print("Error: Could not fetch data")
+        return
+    
+    candles_per_year = 365 * 86400 / timeframe_to_seconds(args.timeframe)
+    scale = candles_per_year / len(data)
+    
+    print(f"\n{len(data)} {args.timeframe} candles of {args.symbol}, "
+          f"scaled to {candles_per_year:,.0f} candles per symbol-year\n")
+    print(f"  {'Layout':<10} {'Features':>8} {'Frame MB/yr':>12} {'Matrix MB/yr':>13}")
+    
+    report = {}
+    for name, compact in (('default', False), ('compact', True)):
+        footprint = FeatureEngineer(FeatureConfig(compact=compact)).memory_footprint(data)
+        frame_mb = footprint['feature_bytes'] * scale / 1e6
+        matrix_mb = footprint['matrix_bytes'] * scale / 1e6
+        report[name] = {**footprint, 'frame_mb_per_year': frame_mb, 'matrix_mb_per_year': matrix_mb}
+        print(f"  {name:<10} {footprint['features']:>8} {frame_mb:>12.2f} {matrix_mb:>13.2f}")
+    
+    saving = 1 - report['compact']['frame_mb_per_year'] / report['default']['frame_mb_per_year']
+    print(f"\nCompact features use {saving:.0%} less memory per symbol-year")
+    return report
+
+
+def cmd_volume_profile(args, config: Dict):
+    """Compare VWAP tracking error of the default and learned volume profiles"""
+    print(f"\n{'='*60}")
+    print("APEX VWAP VOLUME PROFILE BENCHMARK")
+    print('='*60)
+    
+    store = CandleStore()
+    data = load_history(args.symbol, args.timeframe, args.days, store=store)
+    if data is None or len(data) == 0:
+        print("Error: Could not fetch data")
+        return
+    
+    # Learn from the first days of history, replay VWAP windows over the rest
+    split = data.index[-1] - pd.Timedelta(days=args.replay_days)
+    profiles = VolumeProfileStore(store)
+    learned = {
+        'learned': profiles.get('binance', args.symbol, args.timeframe, days=args.days,
+                                bucket_minutes=args.bucket, end=split),
+        'weekday': profiles.get('binance', args.symbol, args.timeframe, days=args.days,
+                                bucket_minutes=args.bucket, by_weekday=True, end=split),
+    }
+    
+    interval = 30                       # VWAPExecutor slice interval
+    replay = data[data.index > split]
+    starts = pd.date_range(split.ceil(f'{interval}min'),
+                           replay.index[-1] - pd.Timedelta(minutes=args.duration),
+                           freq=f'{args.duration}min')
+    
+    def vwap_schedule(profile):
+        """Share of the parent in each slice VWAPExecutor sends for a window"""
+        def schedule(start):
+            vwap = VWAPExecutor(args.symbol, OrderSide.BUY, 1.0, args.duration,
+                                volume_profile=profile, start_time=start)
+            shares = [0.0] * vwap.num_intervals
+            for order in vwap.generate_slices():
+                shares[order.metadata['vwap_slice'] - 1] = order.amount
+            return shares
+        return schedule
+    
+    schedules = {'default': vwap_schedule(None)}
+    for name, profile in learned.items():
+        schedules[name] = vwap_schedule(profile)
+    
+    print(f"\nLearned from {learned['learned'].days} days of {args.timeframe} candles, "
+          f"replaying {len(starts)} {args.duration}-minute windows\n")
+    print(f"  {'Profile':<10} {'Windows':>8} {'Volume error':>13} {'Price error bps':>16}")
+    
+    report = {}
+    for name, schedule in schedules.items():
+        report[name] = replay_tracking_error(replay, schedule, starts, args.duration, interval)
+        print(f"  {name:<10} {report[name]['windows']:>8} "
+              f"{report[name]['volume_error']:>13.2%} {report[name]['price_error_bps']:>16.2f}")
+    return report
+
+
+def build_trading_loop(args, config: Dict, feed, on_signal) -> TradingLoop:
+    """One strategy instance per comma-separated symbol, all on one loop"""
+    loop = TradingLoop(feed, on_signal=on_signal)
+    for symbol in args.symbol.split(','):
+        loop.add_strategy(create_strategy(args.strategy, config), symbol.strip(), args.timeframe)
+    return loop
+
+
 def cmd_paper(args, config: Dict):
     """Run paper trading command"""
     print(f"\n{'='*60}")
@@ -151,9 +386,6 @@ def cmd_paper(args, config: Dict):
     print(f"Timeframe: {args.timeframe}")
     print('-'*60)
     
-    # Create strategy
-    strategy = create_strategy(args.strategy, config)
-    
     # Create risk manager
     risk_config = RiskConfig(
         risk_level=RiskLevel(config['risk_management'].get('risk_level', 'moderate'))
@@ -162,32 +394,24 @@ def cmd_paper(args, config: Dict):
     
     # Create exchange connector (always testnet for paper trading)
     exchange = BinanceConnector(testnet=True)
+    exchange.connect()
+    feed = PollingCandleFeed(exchange, CandleStore())
+    
+    def on_signal(strategy, signal, bar):
+        print(f"[{signal.timestamp}] {signal.type.value.upper()} signal for {signal.symbol}")
+        print(f"  Price: ${signal.price:,.2f}")
+        print(f"  Confidence: {signal.confidence:.1%}")
+        print(f"  Metadata: {signal.metadata}")
+        print()
+    
+    loop = build_trading_loop(args, config, feed, on_signal)
     
     print("\nStarting paper trading session...")
+    print("Strategies run as each candle closes")
     print("Press Ctrl+C to stop\n")
     
     try:
-        # Main trading loop
-        while True:
-            # Fetch latest data
-            data = exchange.fetch_ohlcv(args.symbol, args.timeframe, limit=100)
-            
-            if data is not None and len(data) > 0:
-                # Generate signals
-                signals = strategy.generate_signals(data)
-                
-                # Process signals
-                for signal in signals:
-                    print(f"[{signal.timestamp}] {signal.type.value.upper()} signal for {signal.symbol}")
-                    print(f"  Price: ${signal.price:,.2f}")
-                    print(f"  Confidence: {signal.confidence:.1%}")
-                    print(f"  Metadata: {signal.metadata}")
-                    print()
-            
-            # Sleep until next candle
-            import time
-            time.sleep(60)  # Check every minute
-            
+        asyncio.run(loop.run())
     except KeyboardInterrupt:
         print("\n\nPaper trading session ended.")
 
@@ -215,12 +439,10 @@ def cmd_live(args, config: Dict):
     
     print(f"\nStrategy: {args.strategy}")
     print(f"Symbol: {args.symbol}")
+    print(f"Timeframe: {args.timeframe}")
     print(f"Risk Level: {args.risk}")
     print('-'*60)
     
-    # Create strategy
-    strategy = create_strategy(args.strategy, config)
-    
     # Create risk manager
     risk_level = RiskLevel(args.risk)
     risk_config = RiskConfig(risk_level=risk_level)
@@ -228,31 +450,26 @@ def cmd_live(args, config: Dict):
     
     # Create exchange connector (live mode)
     exchange = BinanceConnector(testnet=False)
+    exchange.connect()
+    feed = PollingCandleFeed(exchange, CandleStore())
+    
+    def on_signal(strategy, signal, bar):
+        # Check risk management
+        if risk_manager.can_open_position(100000, signal.symbol):
+            print(f"🚀 EXECUTING {signal.type.value.upper()} ORDER")
+            print(f"   Symbol: {signal.symbol}")
+            print(f"   Price: ${signal.price:,.2f}")
+            # TODO: Execute actual order
+        else:
+            print(f"⛔ Risk management blocked {signal.type.value} signal")
+    
+    loop = build_trading_loop(args, config, feed, on_signal)
     
     print("\n⚠️  LIVE TRADING STARTED")
     print("Press Ctrl+C to stop\n")
     
     try:
-        while True:
-            # Similar to paper trading but with real orders
-            data = exchange.fetch_ohlcv(args.symbol, args.timeframe, limit=100)
-            
-            if data is not None and len(data) > 0:
-                signals = strategy.generate_signals(data)
-                
-                for signal in signals:
-                    # Check risk management
-                    if risk_manager.can_open_position(100000, signal.symbol):
-                        print(f"🚀 EXECUTING {signal.type.value.upper()} ORDER")
-                        print(f"   Symbol: {signal.symbol}")
-                        print(f"   Price: ${signal.price:,.2f}")
-                        # TODO: Execute actual order
-                    else:
-                        print(f"⛔ Risk management blocked {signal.type.value} signal")
-            
-            import time
-            time.sleep(60)
-            
+        asyncio.run(loop.run())
     except KeyboardInterrupt:
         print("\n\nLive trading session ended.")
 
@@ -406,6 +623,9 @@ Examples:
   # Run backtest
   python apex/main.py backtest --strategy breakout --days 30
 
+  # Optimize strategy parameters on 8 cores
+  python apex/main.py optimize --strategy breakout --param lookback=10,20,30 --param min_breakout_percent=0.005,0.01 --workers 8
+
   # Run execution algorithm
   python apex/main.py execute --algo twap --symbol BTC/USDT --side buy --amount 1.0 --duration 120
 
@@ -427,11 +647,10 @@ Examples:
     
     # Backtest command
     backtest_parser = subparsers.add_parser('backtest', help='Run backtest on historical data')
-    backtest_parser.add_argument('--strategy', type=str, default='breakout',
-                                choices=['breakout', 'mean_reversion', 'trend_following', 'multi_timeframe', 'ensemble', 'ml'],
-                                help='Trading strategy to use')
+    backtest_parser.add_argument('--strategy', type=strategy_list, default='breakout',
+                                help='Trading strategy to use, or a comma-separated list for a portfolio backtest')
     backtest_parser.add_argument('--symbol', type=str, default='BTC/USDT',
-                                help='Trading pair (e.g., BTC/USDT)')
+                                help='Trading pair (e.g., BTC/USDT), or a comma-separated list')
     backtest_parser.add_argument('--timeframe', type=str, default='1h',
                                 help='Candle timeframe (e.g., 1h, 4h, 1d)')
     backtest_parser.add_argument('--days', type=int, default=30,
@@ -440,6 +659,40 @@ Examples:
                                 help='Initial capital for backtest')
     backtest_parser.add_argument('--output', type=str, default='apex/logs/backtest_results.json',
                                 help='Output file for results')
+    backtest_parser.add_argument('--vectorized', action='store_true',
+                                help='Use the single-pass vectorized engine')
+
+    # Optimize command
+    optimize_parser = subparsers.add_parser('optimize', help='Search strategy parameters')
+    optimize_parser.add_argument('--strategy', type=str, default='breakout',
+                                choices=['breakout', 'mean_reversion', 'trend_following', 'multi_timeframe', 'ensemble', 'ml'],
+                                help='Trading strategy to optimize')
+    optimize_parser.add_argument('--symbol', type=str, default='BTC/USDT',
+                                help='Trading pair (e.g., BTC/USDT)')
+    optimize_parser.add_argument('--timeframe', type=str, default='1h',
+                                help='Candle timeframe (e.g., 1h, 4h, 1d)')
+    optimize_parser.add_argument('--days', type=int, default=90,
+                                help='Number of days of history')
+    optimize_parser.add_argument('--capital', type=float, default=10000.0,
+                                help='Initial capital per backtest')
+    optimize_parser.add_argument('--param', type=str, action='append',
+                                help='Values to try, e.g. --param lookback=10,20,30 (repeatable)')
+    optimize_parser.add_argument('--search', type=str, default='grid', choices=['grid', 'random'],
+                                help='Search method')
+    optimize_parser.add_argument('--iterations', type=int, default=20,
+                                help='Combinations to try (random search only)')
+    optimize_parser.add_argument('--metric', type=str, default='sharpe_ratio', choices=METRIC_FIELDS,
+                                help='Metric to maximize')
+    optimize_parser.add_argument('--workers', type=int, default=None,
+                                help='Worker processes (default: CPU count)')
+    optimize_parser.add_argument('--train-size', type=int, default=None,
+                                help='Walk-forward training window in candles')
+    optimize_parser.add_argument('--test-size', type=int, default=None,
+                                help='Walk-forward test window in candles')
+    optimize_parser.add_argument('--top', type=int, default=10,
+                                help='Number of results to print')
+    optimize_parser.add_argument('--loop', action='store_true',
+                                help='Use the candle-by-candle engine instead of the vectorized one')
 
     # Paper trading command
     paper_parser = subparsers.add_parser('paper', help='Run paper trading simulation')
@@ -447,7 +700,7 @@ Examples:
                              choices=['breakout', 'mean_reversion', 'trend_following', 'multi_timeframe', 'ensemble', 'ml'],
                              help='Trading strategy to use')
     paper_parser.add_argument('--symbol', type=str, default='BTC/USDT',
-                             help='Trading pair')
+                             help='Trading pair(s), comma-separated')
     paper_parser.add_argument('--timeframe', type=str, default='1h',
                              help='Candle timeframe')
 
@@ -457,7 +710,9 @@ Examples:
                             choices=['breakout', 'mean_reversion', 'trend_following', 'multi_timeframe', 'ensemble', 'ml'],
                             help='Trading strategy to use')
     live_parser.add_argument('--symbol', type=str, default='BTC/USDT',
-                            help='Trading pair')
+                            help='Trading pair(s), comma-separated')
+    live_parser.add_argument('--timeframe', type=str, default='1h',
+                            help='Candle timeframe')
     live_parser.add_argument('--risk', type=str, default='conservative',
                             choices=['conservative', 'moderate', 'aggressive'],
                             help='Risk level')
@@ -467,6 +722,31 @@ Examples:
     # Status command
     status_parser = subparsers.add_parser('status', help='Show system status')
     
+    # Feature memory benchmark
+    features_parser = subparsers.add_parser('features', help='Benchmark ML feature memory per symbol-year')
+    features_parser.add_argument('--symbol', type=str, default='BTC/USDT',
+                                help='Trading pair')
+    features_parser.add_argument('--timeframe', type=str, default='1h',
+                                help='Candle timeframe (e.g., 1h, 4h, 1d)')
+    features_parser.add_argument('--days', type=int, default=365,
+                                help='Days of history to measure')
+    
+    # VWAP volume profile benchmark
+    profile_parser = subparsers.add_parser('volume-profile',
+                                           help='Benchmark learned VWAP volume profiles on replayed data')
+    profile_parser.add_argument('--symbol', type=str, default='BTC/USDT',
+                               help='Trading pair')
+    profile_parser.add_argument('--timeframe', type=str, default='5m',
+                               help='Candle timeframe to learn from')
+    profile_parser.add_argument('--days', type=int, default=60,
+                               help='Days of history in total')
+    profile_parser.add_argument('--replay-days', type=int, default=20,
+                               help='Most recent days replayed (not learned from)')
+    profile_parser.add_argument('--bucket', type=int, default=30,
+                               help='Time-of-day bucket in minutes')
+    profile_parser.add_argument('--duration', type=int, default=240,
+                               help='VWAP execution window in minutes')
+    
     # Execute algorithm command
     execute_parser = subparsers.add_parser('execute', help='Run execution algorithms (TWAP, VWAP, POV)')
     execute_parser.add_argument('--algo', type=str, required=True,
@@ -526,18 +806,30 @@ Examples:
         parser.print_help()
         return
     
+    # A single strategy over several symbols is a portfolio backtest too
+    if args.command == 'backtest' and ',' in args.symbol:
+        error = portfolio_strategy_error(args.strategy.split(','))
+        if error:
+            backtest_parser.error(f"argument --strategy: {error}")
+    
     # Load configuration
     config = load_config()
     
     # Execute command
     if args.command == 'backtest':
         cmd_backtest(args, config)
+    elif args.command == 'optimize':
+        cmd_optimize(args, config)
     elif args.command == 'paper':
         cmd_paper(args, config)
     elif args.command == 'live':
         cmd_live(args, config)
     elif args.command == 'status':
         cmd_status(args, config)
+    elif args.command == 'features':
+        cmd_features(args, config)
+    elif args.command == 'volume-profile':
+        cmd_volume_profile(args, config)
     elif args.command == 'execute':
         cmd_execute(args, config)
     elif args.command == 'advanced':
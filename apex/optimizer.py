@@ -0,0 +1,358 @@
+"""
+Apex Trading System - Strategy Optimizer
+Grid/random parameter search and walk-forward analysis on top of BacktestEngine.
+
+Runs are fanned out across a ProcessPoolExecutor. The OHLCV frame is copied
+once into shared memory and every worker attaches to it, so tasks only carry
+the strategy parameters instead of a pickled DataFrame.
+"""
+
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from trading.strategies.base import BaseStrategy
+from backtest import BacktestEngine, BacktestResult
+
+
+# Fields of BacktestResult that can be used as optimization metric
+METRIC_FIELDS = [
+    'total_trades', 'winning_trades', 'losing_trades', 'win_rate',
+    'total_pnl', 'total_pnl_percent', 'avg_profit', 'avg_loss',
+    'profit_factor', 'max_drawdown', 'max_drawdown_percent',
+    'sharpe_ratio', 'final_capital',
+]
+
+
+@dataclass
+class OptimizationResult:
+    """Backtest metrics for one parameter set"""
+    params: Dict[str, Any]
+    metrics: Dict[str, float]
+
+    def score(self, metric: str) -> float:
+        value = self.metrics.get(metric, float('-inf'))
+        return float('-inf') if value is None or np.isnan(value) else value
+
+
+@dataclass
+class WalkForwardWindow:
+    """One train/test split of a walk-forward run"""
+    train_start: Any
+    train_end: Any
+    test_start: Any
+    test_end: Any
+    best_params: Dict[str, Any]
+    train_metrics: Dict[str, float]
+    test_metrics: Dict[str, float]
+
+
+class SharedOHLCV:
+    """
+    OHLCV frame stored in a shared memory block.
+
+    Layout: float64 matrix (n x 5) of open/high/low/close/volume followed by
+    the int64 index (UTC nanoseconds for a DatetimeIndex, whose time zone
+    travels in the spec).
+    """
+
+    COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, data: pd.DataFrame):
+        n = len(data)
+        self.length = n
+        self.datetime_index = isinstance(data.index, pd.DatetimeIndex)
+        self.tz = str(data.index.tz) if self.datetime_index and data.index.tz is not None else None
+
+        width = len(self.COLUMNS)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * (width + 1) * 8))
+        values, index = self._views(self.shm.buf, n)
+        values[:] = data[self.COLUMNS].to_numpy(dtype=np.float64)
+        if self.datetime_index:
+            index[:] = data.index.as_unit('ns').asi8
+        else:
+            index[:] = np.arange(n)
+
+    @property
+    def spec(self) -> Tuple[str, int, bool, Optional[str]]:
+        """Picklable handle passed to worker processes"""
+        return self.shm.name, self.length, self.datetime_index, self.tz
+
+    @classmethod
+    def _views(cls, buffer, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        width = len(cls.COLUMNS)
+        values = np.ndarray((n, width), dtype=np.float64, buffer=buffer)
+        index = np.ndarray((n,), dtype=np.int64, buffer=buffer, offset=n * width * 8)
+        return values, index
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, int, bool, Optional[str]]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+        """Attach to a block created by another process and wrap it as a DataFrame"""
+        name, n, datetime_index, tz = spec
+        # Pool workers share the creator's resource tracker, so attaching
+        # does not register a second owner; only the creator unlinks.
+        shm = shared_memory.SharedMemory(name=name)
+
+        values, index = cls._views(shm.buf, n)
+        if datetime_index:
+            # asi8 of a tz-aware index is UTC, so localize from UTC
+            index = pd.DatetimeIndex(index.view('datetime64[ns]'))
+            if tz is not None:
+                index = index.tz_localize('UTC').tz_convert(tz)
+        else:
+            index = pd.RangeIndex(n)
+        return shm, pd.DataFrame(values, columns=cls.COLUMNS, index=index, copy=False)
+
+    def close(self):
+        """Release and unlink the shared block"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process state set by _init_worker
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_data: Optional[pd.DataFrame] = None
+
+
+def _init_worker(spec: Tuple[str, int, bool, Optional[str]]):
+    global _worker_shm, _worker_data
+    _worker_shm, _worker_data = SharedOHLCV.attach(spec)
+
+
+def _summarize(result: BacktestResult) -> Dict[str, float]:
+    return {name: getattr(result, name) for name in METRIC_FIELDS}
+
+
+def _run_backtest_task(task: Tuple) -> Dict[str, float]:
+    """
+    Run one backtest on rows [start, end) of the worker's shared frame,
+    the first `warmup` of them only warming up indicators.
+    """
+    strategy_class, config, start, end, warmup, symbol, engine_kwargs, vectorized = task
+    data = _worker_data.iloc[start:end]
+
+    engine = BacktestEngine(strategy_class(config), **engine_kwargs)
+    if vectorized:
+        result = engine.run_vectorized(data, symbol, warmup=warmup)
+    else:
+        result = engine.run(data, symbol, warmup=warmup)
+    return _summarize(result)
+
+
+class StrategyOptimizer:
+    """
+    Parameter search for a strategy class.
+
+    Example:
+        optimizer = StrategyOptimizer(BreakoutStrategy, base_config, max_workers=8)
+        results = optimizer.grid_search(data, {
+            'lookback': [10, 20, 30],
+            'min_breakout_percent': [0.005, 0.01, 0.02],
+        })
+        best = results[0].params
+    """
+
+    def __init__(self,
+                 strategy_class: Type[BaseStrategy],
+                 base_config: Dict = None,
+                 metric: str = 'sharpe_ratio',
+                 max_workers: int = None,
+                 vectorized: bool = True,
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.001,
+                 slippage: float = 0.0005):
+        if metric not in METRIC_FIELDS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        self.strategy_class = strategy_class
+        self.base_config = base_config or {}
+        self.metric = metric
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine_kwargs = {
+            'initial_capital': initial_capital,
+            'commission': commission,
+            'slippage': slippage,
+        }
+        self.logger = logging.getLogger(__name__)
+
+        # Strategies without a signal series run on the candle-by-candle engine
+        self.vectorized = vectorized and strategy_class.supports_signal_series()
+        if vectorized and not self.vectorized:
+            self.logger.info(f"{strategy_class.__name__} has no vectorized signals, "
+                             f"using the candle-by-candle engine")
+
+    @staticmethod
+    def expand_grid(param_grid: Dict[str, List]) -> List[Dict[str, Any]]:
+        """All combinations of the grid values"""
+        keys = list(param_grid.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+
+    @staticmethod
+    def sample_params(param_space: Dict[str, List], n_iter: int,
+                      seed: int = None) -> List[Dict[str, Any]]:
+        """Random distinct combinations from the parameter space"""
+        combinations = StrategyOptimizer.expand_grid(param_space)
+        rng = random.Random(seed)
+        return rng.sample(combinations, min(n_iter, len(combinations)))
+
+    def grid_search(self, data: pd.DataFrame, param_grid: Dict[str, List],
+                    symbol: str = 'BTC/USDT') -> List[OptimizationResult]:
+        """Backtest every grid combination, best first"""
+        return self._evaluate(data, self.expand_grid(param_grid), symbol)
+
+    def random_search(self, data: pd.DataFrame, param_space: Dict[str, List],
+                      n_iter: int = 20, symbol: str = 'BTC/USDT',
+                      seed: int = None) -> List[OptimizationResult]:
+        """Backtest n_iter random combinations, best first"""
+        return self._evaluate(data, self.sample_params(param_space, n_iter, seed), symbol)
+
+    def walk_forward(self, data: pd.DataFrame, param_grid: Dict[str, List],
+                     train_size: int, test_size: int, step: int = None,
+                     symbol: str = 'BTC/USDT', warmup: int = None) -> List[WalkForwardWindow]:
+        """
+        Walk-forward analysis.
+
+        For each window the grid is searched on train_size candles and the best
+        parameters are backtested on the following test_size candles. The test
+        run starts with the last `warmup` training candles so its indicators
+        are primed, but it opens no trades and is scored only from the first
+        test candle on.
+
+        Args:
+            data: DataFrame with OHLCV data
+            param_grid: Values to try for each config key
+            train_size: Candles in each training window
+            test_size: Candles in each out-of-sample window
+            step: Candles to advance between windows (default: test_size)
+            symbol: Trading symbol
+            warmup: Training candles before each test window used for
+                indicators only (default: the whole training window)
+
+        Returns:
+            List of WalkForwardWindow, oldest first
+        """
+        step = step or test_size
+        warmup = train_size if warmup is None else min(warmup, train_size)
+        combinations = self.expand_grid(param_grid)
+
+        bounds = []
+        start = 0
+        while start + train_size + test_size <= len(data):
+            bounds.append((start, start + train_size, start + train_size + test_size))
+            start += step
+
+        if not bounds:
+            raise ValueError("Not enough data for a single train/test window")
+
+        windows = []
+        with self._executor(data) as run:
+            # All training runs of all windows go out in one batch
+            train_tasks = [
+                (params, train_start, train_end, 0)
+                for train_start, train_end, _ in bounds
+                for params in combinations
+            ]
+            train_metrics = run(train_tasks, symbol)
+
+            best_per_window = []
+            for w in range(len(bounds)):
+                window_results = [
+                    OptimizationResult(params, metrics)
+                    for params, metrics in zip(
+                        combinations,
+                        train_metrics[w * len(combinations):(w + 1) * len(combinations)]
+                    )
+                ]
+                best_per_window.append(max(window_results, key=lambda r: r.score(self.metric)))
+
+            test_tasks = [
+                (best.params, train_end - warmup, test_end, warmup)
+                for best, (_, train_end, test_end) in zip(best_per_window, bounds)
+            ]
+            test_metrics = run(test_tasks, symbol)
+
+        for best, metrics, (train_start, train_end, test_end) in zip(best_per_window, test_metrics, bounds):
+            windows.append(WalkForwardWindow(
+                train_start=data.index[train_start],
+                train_end=data.index[train_end - 1],
+                test_start=data.index[train_end],
+                test_end=data.index[test_end - 1],
+                best_params=best.params,
+                train_metrics=best.metrics,
+                test_metrics=metrics
+            ))
+
+        return windows
+
+    def _evaluate(self, data: pd.DataFrame, combinations: List[Dict],
+                  symbol: str) -> List[OptimizationResult]:
+        with self._executor(data) as run:
+            metrics = run([(params, 0, len(data), 0) for params in combinations], symbol)
+
+        results = [OptimizationResult(params, m) for params, m in zip(combinations, metrics)]
+        results.sort(key=lambda r: r.score(self.metric), reverse=True)
+        return results
+
+    def _executor(self, data: pd.DataFrame):
+        return _BacktestExecutor(self, data)
+
+
+class _BacktestExecutor:
+    """Context manager owning the shared frame and the process pool"""
+
+    def __init__(self, optimizer: StrategyOptimizer, data: pd.DataFrame):
+        self.optimizer = optimizer
+        self.data = data
+        self.shared: Optional[SharedOHLCV] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        if self.optimizer.max_workers > 1:
+            self.shared = SharedOHLCV(self.data)
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.optimizer.max_workers,
+                initializer=_init_worker,
+                initargs=(self.shared.spec,)
+            )
+        return self.run
+
+    def __exit__(self, *exc):
+        if self.pool:
+            self.pool.shutdown()
+        if self.shared:
+            self.shared.close()
+
+    def run(self, tasks: List[Tuple[Dict, int, int, int]], symbol: str) -> List[Dict[str, float]]:
+        """Run (params, start, end, warmup) tasks, results in task order"""
+        opt = self.optimizer
+        payloads = [
+            (opt.strategy_class, {**opt.base_config, **params}, start, end, warmup,
+             symbol, opt.engine_kwargs, opt.vectorized)
+            for params, start, end, warmup in tasks
+        ]
+
+        if self.pool is None:
+            global _worker_data
+            previous, _worker_data = _worker_data, self.data
+            try:
+                return [_run_backtest_task(p) for p in payloads]
+            finally:
+                _worker_data = previous
+
+        chunksize = max(1, len(payloads) // (opt.max_workers * 4))
+        opt.logger.info(f"Running {len(payloads)} backtests on {opt.max_workers} workers")
+        return list(self.pool.map(_run_backtest_task, payloads, chunksize=chunksize))
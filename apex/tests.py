@@ -6,11 +6,15 @@ Unit and integration tests for the trading system.
 import unittest
 import sys
 import json
+import asyncio
+import tempfile
+import time
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch, MagicMock, call
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -18,14 +22,59 @@ sys.path.insert(0, str(Path(__file__).parent))
 from trading.strategies.breakout import BreakoutStrategy
 from trading.strategies.mean_reversion import MeanReversionStrategy
 from trading.strategies.trend_following import TrendFollowingStrategy
+from trading.strategies.multi_timeframe import MultiTimeframeStrategy
 from trading.strategies.ensemble import StrategyEnsemble
 from trading.strategies.base import SignalType
+from trading.strategies.ml_strategy import MLStrategy
+from analysis.ml.features import (
+    FeatureEngineer, FeatureConfig, IncrementalFeatureEngineer, FLAG_FEATURES, is_intermediate
+)
+from analysis.ml.feature_store import FeatureStore
+from analysis.ml.models import (
+    RandomForestPriceModel, GradientBoostingPriceModel, EnsemblePriceModel, ModelType, ModelManager,
+    TrainingJob
+)
 from trading.risk.manager import RiskManager, RiskConfig, RiskLevel
+from trading.monitoring import MetricsCollector
+from trading.live import TradingLoop, ReplayCandleFeed, PollingCandleFeed, StreamingCandleFeed
 from analysis.indicators.technical import (
     calculate_sma, calculate_ema, calculate_rsi, 
     calculate_macd, calculate_bollinger_bands, calculate_atr,
+    calculate_adx, calculate_stochastic, calculate_vwap,
     TechnicalIndicators
 )
+from analysis.indicators.context import IndicatorContext
+from analysis.indicators import kernels, set_backend, get_backend, NUMBA_AVAILABLE
+from analysis.indicators.incremental import (
+    IncrementalSMA, IncrementalEMA, IncrementalRSI, IncrementalATR,
+    IncrementalADX, IncrementalStochastic, IncrementalVWAP, RollingStd
+)
+from execution.exchanges.base import (
+    MockExchange, MockBatchExchange, Order, OrderSide, OrderType, candle_close_after,
+    OrderStatus as ExchangeOrderStatus
+)
+from execution.exchanges.candle_store import CandleStore
+from execution.exchanges.binance import BinanceConnector
+from execution.exchanges.ccxt_batch import NotSupported
+from execution.routing import SmartOrderRouter
+from execution.cache import MarketDataCache
+from execution.manager import ExchangeManager
+from execution.exchanges.async_base import AsyncMockExchange, gather_bounded
+from execution.orders.advanced import TrailingStopOrder
+from execution.orders.manager import (
+    OrderManager, OrderStatus, OrderSide as OrderManagerSide, OrderType as OrderManagerType
+)
+from execution.orders.algorithms import (
+    TWAPExecutor, VWAPExecutor, POVExecutor, AlgoStatus, ExecutionEngine, MarketVolumeProfile
+)
+from execution.orders.volume_profile import HistoricalVolumeProfile, VolumeProfileStore, replay_tracking_error
+from execution.orders.advanced import AdvancedOrderManager
+from execution.scheduler import TimerScheduler
+from execution.triggers import TriggerBook, BELOW, ABOVE
+from execution.orders.simulator import ExecutionSimulator, ImpactModel
+from execution.positions.tracker import PositionTracker, PositionSide
+from backtest import BacktestEngine, PortfolioBacktestEngine
+from optimizer import StrategyOptimizer, SharedOHLCV
 
 
 class TestTechnicalIndicators(unittest.TestCase):
@@ -133,6 +182,152 @@ class TestTechnicalIndicators(unittest.TestCase):
             self.assertIn(col, result.columns)
 
 
+class TestIncrementalIndicators(unittest.TestCase):
+    """Test streaming indicators against the pandas versions"""
+    
+    def setUp(self):
+        """Set up test data with a flat stretch to hit zero-range edge cases"""
+        np.random.seed(42)
+        n = 200
+        self.close = pd.Series(50000 + np.cumsum(np.random.randn(n) * 100))
+        self.high = self.close + np.abs(np.random.randn(n) * 50)
+        self.low = self.close - np.abs(np.random.randn(n) * 50)
+        self.volume = pd.Series(np.random.randint(1000, 5000, n), dtype=float)
+        for series in (self.close, self.high, self.low):
+            series.iloc[80:110] = 50000.0
+    
+    def stream(self, indicator, *columns):
+        return np.array([indicator.update(*values) for values in zip(*columns)], dtype=float)
+    
+    def assertMatches(self, streamed, expected):
+        np.testing.assert_allclose(streamed, np.asarray(expected, dtype=float),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True)
+    
+    def test_moving_averages(self):
+        """SMA and EMA match rolling/ewm"""
+        self.assertMatches(self.stream(IncrementalSMA(20), self.close), calculate_sma(self.close, 20))
+        self.assertMatches(self.stream(IncrementalEMA(20), self.close), calculate_ema(self.close, 20))
+    
+    def test_rsi(self):
+        """RSI matches calculate_rsi"""
+        self.assertMatches(self.stream(IncrementalRSI(14), self.close), calculate_rsi(self.close, 14))
+    
+    def test_atr_and_adx(self):
+        """ATR and ADX match the pandas versions"""
+        ohlc = (self.high, self.low, self.close)
+        self.assertMatches(self.stream(IncrementalATR(14), *ohlc), calculate_atr(*ohlc, period=14))
+        self.assertMatches(self.stream(IncrementalADX(14), *ohlc), calculate_adx(*ohlc, period=14))
+    
+    def test_stochastic(self):
+        """%K and %D match calculate_stochastic"""
+        k, d = calculate_stochastic(self.high, self.low, self.close)
+        streamed = self.stream(IncrementalStochastic(), self.high, self.low, self.close)
+        self.assertMatches(streamed[:, 0], k)
+        self.assertMatches(streamed[:, 1], d)
+    
+    def test_vwap(self):
+        """VWAP matches calculate_vwap"""
+        columns = (self.high, self.low, self.close, self.volume)
+        self.assertMatches(self.stream(IncrementalVWAP(), *columns), calculate_vwap(*columns))
+    
+    def test_rolling_std(self):
+        """Rolling sample deviation matches rolling().std()"""
+        streamed = self.stream(RollingStd(20), self.close)
+        self.assertMatches(streamed, self.close.rolling(window=20).std())
+
+
+class TestIndicatorKernels(unittest.TestCase):
+    """Test the NumPy kernels and the compiled loops against pandas"""
+    
+    def setUp(self):
+        """Random walk with a flat stretch (zero ranges divide by zero in ADX)"""
+        rng = np.random.default_rng(3)
+        n = 600
+        self.close = pd.Series(50000 + np.cumsum(rng.normal(0, 100, n)))
+        self.high = self.close + np.abs(rng.normal(0, 50, n))
+        self.low = self.close - np.abs(rng.normal(0, 50, n))
+        for series in (self.close, self.high, self.low):
+            series.iloc[200:240] = 50000.0
+        self.backend = get_backend()
+    
+    def tearDown(self):
+        set_backend(self.backend)
+    
+    def reference_adx(self, high, low, close, period=14):
+        tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())],
+                       axis=1).max(axis=1)
+        plus_dm = high.diff()
+        plus_dm = plus_dm.where((plus_dm > 0) & (plus_dm > -low.diff()), 0)
+        minus_dm = -low.diff()
+        minus_dm = minus_dm.where((minus_dm > 0) & (minus_dm > high.diff()), 0)
+        atr = tr.rolling(window=period).mean()
+        plus_di = 100 * plus_dm.rolling(window=period).mean() / atr
+        minus_di = 100 * minus_dm.rolling(window=period).mean() / atr
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        return tr, dx.rolling(window=period).mean()
+    
+    def test_numpy_backend_matches_pandas(self):
+        """True range and ADX match the pandas formulas"""
+        set_backend('numpy')
+        tr, adx = self.reference_adx(self.high, self.low, self.close)
+        np.testing.assert_allclose(kernels.true_range(self.high, self.low, self.close), tr, rtol=1e-12)
+        np.testing.assert_allclose(calculate_adx(self.high, self.low, self.close), adx,
+                                   rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(calculate_atr(self.high, self.low, self.close),
+                                   tr.rolling(window=14).mean(), rtol=1e-9, equal_nan=True)
+    
+    def test_compiled_loops_match_numpy(self):
+        """The loops compiled by Numba agree with the NumPy kernels"""
+        set_backend('numpy')
+        h, l, c = (s.to_numpy() for s in (self.high, self.low, self.close))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.testing.assert_allclose(kernels._true_range_loop(h, l, c), kernels.true_range(h, l, c))
+            np.testing.assert_allclose(kernels._adx_loop(h, l, c, 14), kernels.adx(h, l, c, 14),
+                                       rtol=1e-9, equal_nan=True)
+        
+        sell = np.zeros(len(c), dtype=bool)
+        sell[500] = True
+        for start in (0, 250, 501):
+            for stop_loss, take_profit in ((49500, 50500), (0, 1e9), (c[0] * 0.98, c[0] * 1.05)):
+                self.assertEqual(kernels._exit_scan_loop(start, l, h, sell, stop_loss, take_profit),
+                                 kernels.exit_scan(start, l, h, sell, stop_loss, take_profit))
+        
+        for is_sell in (True, False):
+            for trail_amount, trail_percent in ((300.0, 0.0), (0.0, 1.5)):
+                expected = kernels._trailing_stop_loop(c, is_sell, trail_amount, trail_percent, c[0])
+                result = kernels.trailing_stop_scan(c, is_sell, trail_amount, trail_percent, c[0])
+                self.assertEqual(result[0], expected[0])
+                self.assertAlmostEqual(result[1], expected[1])
+                self.assertAlmostEqual(result[2], expected[2])
+    
+    def test_trailing_stop_path(self):
+        """update_prices() matches feeding update_price() one price at a time"""
+        prices = self.close.to_numpy()
+        for side in (OrderSide.SELL, OrderSide.BUY):
+            for trail in ({'trail_amount': 400.0}, {'trail_percent': 2.0}, {'trail_percent': 50.0}):
+                one_by_one = TrailingStopOrder('BTC/USDT', side, 1.0, **trail)
+                batched = TrailingStopOrder('BTC/USDT', side, 1.0, **trail)
+                
+                triggered = None
+                for price in prices:
+                    triggered = one_by_one.update_price(price)
+                    if triggered:
+                        break
+                
+                order = batched.update_prices(prices)
+                self.assertEqual(order is None, triggered is None)
+                self.assertEqual(batched.get_status(), one_by_one.get_status())
+    
+    def test_backend_switch(self):
+        """Unknown backends and a missing Numba are rejected"""
+        with self.assertRaises(ValueError):
+            set_backend('fortran')
+        if not NUMBA_AVAILABLE:
+            with self.assertRaises(ImportError):
+                set_backend('numba')
+        self.assertEqual(get_backend(), self.backend)
+
+
 class TestBreakoutStrategy(unittest.TestCase):
     """Test Breakout strategy"""
     
@@ -360,6 +555,2085 @@ class TestStrategyEnsemble(unittest.TestCase):
         self.assertEqual(self.ensemble.min_consensus, 2)
         # Should have at least 3 strategies (breakout, mean_reversion, trend_following)
         self.assertGreaterEqual(len(self.ensemble.strategies), 1)
+    
+    def test_shared_indicator_context(self):
+        """Members draw from one cache, which is detached afterwards"""
+        np.random.seed(42)
+        close = 50000 + np.cumsum(np.random.randn(300) * 100)
+        data = pd.DataFrame({
+            'open': close,
+            'high': close + 50,
+            'low': close - 50,
+            'close': close,
+            'volume': np.random.randint(1000, 5000, 300)
+        })
+        
+        with self.ensemble.shared_indicators(data) as context:
+            for strategy in self.ensemble.strategies:
+                self.assertIs(strategy.get_indicator_context(data), context)
+                strategy.generate_signals(data)
+            computed = context.misses
+            for strategy in self.ensemble.strategies:
+                strategy.generate_signals(data)
+        
+        self.assertEqual(context.misses, computed)
+        self.assertGreaterEqual(context.hits, computed)
+        for strategy in self.ensemble.strategies:
+            self.assertIsNone(strategy.indicator_context)
+        
+        # Trend following computes its own indicators on raw candles
+        self.assertIsInstance(self.ensemble.generate_signals(data), list)
+    
+    def test_indicator_context_checks_data(self):
+        """An attached cache is reused for copies of its frame, not other candles"""
+        close = 50000 + np.cumsum(np.random.default_rng(3).normal(0, 100, 100))
+        data = pd.DataFrame({'high': close + 50, 'low': close - 50, 'close': close})
+        strategy = self.ensemble.strategies[0]
+        
+        with self.ensemble.shared_indicators(data) as context:
+            self.assertIs(strategy.get_indicator_context(data.copy()), context)
+            self.assertIs(strategy.get_indicator_context(data.assign(extra=1.0)), context)
+            for other in (data.iloc[:-1], data.assign(close=close + 1)):
+                fresh = strategy.get_indicator_context(other)
+                self.assertIsNot(fresh, context)
+                self.assertIs(fresh.data, other)
+    
+    def test_indicator_context_memoizes(self):
+        """Same (indicator, params) is computed once and matches technical.py"""
+        close = pd.Series(np.linspace(100, 200, 50) + np.sin(np.arange(50)), name='close')
+        context = IndicatorContext(pd.DataFrame({'close': close}))
+        
+        first = context.rsi(14)
+        self.assertIs(context.rsi(14), first)
+        self.assertIsNot(context.rsi(7), first)
+        self.assertEqual((context.hits, context.misses), (1, 2))
+        pd.testing.assert_series_equal(first, calculate_rsi(close, 14))
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+    """Test single-pass backtest parity with the candle loop"""
+    
+    def setUp(self):
+        """Generate a trending random walk with a datetime index"""
+        rng = np.random.default_rng(7)
+        n = 400
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        open_ = close * (1 + rng.normal(0, 0.002, n))
+        self.data = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+    
+    def assertSameRun(self, strategy, data, warmup=0):
+        loop = BacktestEngine(strategy).run(data, 'BTC/USDT', warmup=warmup)
+        vectorized = BacktestEngine(strategy).run_vectorized(data, 'BTC/USDT', warmup=warmup)
+        
+        self.assertGreater(loop.total_trades, 0)
+        key = lambda t: (t.exit_time, t.entry_price, t.exit_price, t.quantity, t.pnl, t.exit_reason)
+        self.assertEqual([key(t) for t in loop.trades], [key(t) for t in vectorized.trades])
+        self.assertEqual([p['equity'] for p in loop.equity_curve],
+                         [p['equity'] for p in vectorized.equity_curve])
+        self.assertEqual(loop.final_capital, vectorized.final_capital)
+    
+    def test_breakout_parity(self):
+        """Breakout trades match the candle loop"""
+        strategy = BreakoutStrategy({'lookback': 20, 'min_breakout_percent': 0.002})
+        self.assertSameRun(strategy, self.data)
+    
+    def test_warmup_candles_only_prime_indicators(self):
+        """No trades or equity before the warm-up ends, in both engines"""
+        strategy = BreakoutStrategy({'lookback': 20, 'min_breakout_percent': 0.002})
+        self.assertSameRun(strategy, self.data, warmup=150)
+        
+        result = BacktestEngine(strategy).run_vectorized(self.data, 'BTC/USDT', warmup=150)
+        self.assertEqual(result.start_date, self.data.index[150])
+        self.assertEqual(result.equity_curve[0]['timestamp'], self.data.index[150])
+        self.assertEqual(len(result.equity_curve), 250)
+        self.assertTrue(all(t.entry_time >= self.data.index[150] for t in result.trades))
+    
+    def test_mean_reversion_parity(self):
+        """Mean reversion trades match the candle loop"""
+        self.assertSameRun(MeanReversionStrategy({}), self.data)
+    
+    def test_trend_following_parity(self):
+        """Trend following trades match the candle loop"""
+        strategy = TrendFollowingStrategy({
+            'fast_ema_period': 10,
+            'slow_ema_period': 30,
+            'adx_threshold': 15,
+            'pullback_threshold': 0.005
+        })
+        # generate_signals() expects indicator columns to be present
+        data = strategy.calculate_indicators(self.data.copy())
+        self.assertSameRun(strategy, data)
+    
+    def test_unsupported_strategy(self):
+        """Strategies without a signal series are rejected"""
+        ensemble = StrategyEnsemble({'symbols': ['BTC/USDT']})
+        with self.assertRaises(NotImplementedError):
+            BacktestEngine(ensemble).run_vectorized(self.data, 'BTC/USDT')
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    """Test the multi-symbol, multi-strategy backtester"""
+    
+    def _walk(self, seed, n=400, start='2024-01-01'):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        open_ = close * (1 + rng.normal(0, 0.002, n))
+        return pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range(start, periods=n, freq='h'))
+    
+    def test_single_symbol_matches_vectorized_timing(self):
+        """One symbol trades on the same candles as the single-symbol engine"""
+        data = self._walk(7)
+        strategy = BreakoutStrategy({'lookback': 20, 'min_breakout_percent': 0.002})
+        single = BacktestEngine(strategy).run_vectorized(data, 'BTC/USDT')
+        portfolio = PortfolioBacktestEngine([strategy]).run({'BTC/USDT': data})
+        
+        key = lambda t: (t.entry_time, t.exit_time, t.exit_reason)
+        self.assertGreater(single.total_trades, 0)
+        self.assertEqual([key(t) for t in single.trades], [key(t) for t in portfolio.trades])
+    
+    def test_shared_capital_and_risk_sizing(self):
+        """Positions are sized by the risk manager from one capital pool"""
+        data = {f'S{i}/USDT': self._walk(i) for i in range(6)}
+        risk = RiskManager(RiskConfig(max_position_size=0.1))
+        engine = PortfolioBacktestEngine(
+            [BreakoutStrategy({'lookback': 20, 'min_breakout_percent': 0.002}), MeanReversionStrategy({})],
+            risk_manager=risk
+        )
+        result = engine.run(data)
+        
+        self.assertGreater(result.total_trades, 0)
+        self.assertTrue(set(result.breakdown('symbol')) <= set(data))
+        self.assertEqual(set(result.breakdown('strategy')),
+                         {'BreakoutStrategy', 'MeanReversionStrategy'})
+        self.assertAlmostEqual(result.final_capital,
+                               10000.0 + sum(t.pnl for t in result.trades), places=6)
+        self.assertAlmostEqual(result.equity_curve[0]['equity'], 10000.0)
+        # No position is larger than 10% of the starting equity plus gains
+        peak = max(p['equity'] for p in result.equity_curve)
+        self.assertTrue(all(t.entry_price * t.quantity <= 0.1 * peak + 1e-6 for t in result.trades))
+        # All risk is released once positions are closed
+        self.assertEqual(risk.positions_risk, {})
+    
+    def test_one_position_per_symbol(self):
+        """A symbol's positions never overlap"""
+        data = {'A/USDT': self._walk(1), 'B/USDT': self._walk(2)}
+        result = PortfolioBacktestEngine([MeanReversionStrategy({}), BreakoutStrategy({})]).run(data)
+        for symbol in data:
+            trades = sorted((t for t in result.trades if t.symbol == symbol), key=lambda t: t.entry_time)
+            for prev, curr in zip(trades, trades[1:]):
+                self.assertGreater(curr.entry_time, prev.exit_time)
+    
+    def test_risk_limits_block_entries(self):
+        """can_open_position rejections are counted and respected"""
+        data = {f'S{i}/USDT': self._walk(i) for i in range(5)}
+        risk = RiskManager(RiskConfig(max_total_risk=0.001))
+        result = PortfolioBacktestEngine([MeanReversionStrategy({})], risk_manager=risk).run(data)
+        self.assertGreater(result.rejected_entries, 0)
+        # Only one position (risk 0.2% of equity) fits under the limit at a time
+        trades = sorted(result.trades, key=lambda t: t.entry_time)
+        for prev, curr in zip(trades, trades[1:]):
+            self.assertGreaterEqual(curr.entry_time, prev.exit_time)
+    
+    def test_unaligned_symbols(self):
+        """Symbols with different histories share one clock"""
+        data = {'OLD/USDT': self._walk(3, n=400), 'NEW/USDT': self._walk(4, n=200, start='2024-01-09 08:00')}
+        result = PortfolioBacktestEngine([MeanReversionStrategy({})]).run(data)
+        self.assertEqual(len(result.equity_curve), 400)
+        self.assertTrue(all(np.isfinite(p['equity']) for p in result.equity_curve))
+        new_trades = [t for t in result.trades if t.symbol == 'NEW/USDT']
+        self.assertTrue(all(t.entry_time >= pd.Timestamp('2024-01-09 08:00') for t in new_trades))
+    
+    def test_strategies_need_signal_series(self):
+        """Strategies without vectorized signals are rejected up front"""
+        for strategy in (StrategyEnsemble({}), MultiTimeframeStrategy({})):
+            with self.assertRaisesRegex(ValueError, strategy.name):
+                PortfolioBacktestEngine([BreakoutStrategy({}), strategy])
+        self.assertTrue(MLStrategy.supports_signal_series())
+
+
+class TestMLBatchInference(unittest.TestCase):
+    """Test vectorized model predictions and batched ML signals"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Random walk and a feature matrix shared by the model tests"""
+        rng = np.random.default_rng(5)
+        n = 700
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        open_ = close * (1 + rng.normal(0, 0.002, n))
+        cls.data = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        cls.config = {'n_estimators': 20, 'max_depth': 4, 'training_data_size': 400,
+                      'prediction_threshold': 0.4, 'min_confidence': 0.3}
+        
+        strategy = MLStrategy(cls.config)
+        df = strategy.feature_engineer.create_target(
+            strategy.feature_engineer.create_features(cls.data))
+        cls.X, cls.y = strategy.feature_engineer.get_feature_matrix(df)
+    
+    def assertSamePredictions(self, model):
+        expected = model.predict(self.X)
+        batch = model.predict_batch(self.X)
+        self.assertEqual(len(batch), len(self.X))
+        np.testing.assert_array_equal(batch.direction, [p.direction for p in expected])
+        for name in ('probability', 'confidence', 'expected_return'):
+            np.testing.assert_allclose(getattr(batch, name), [getattr(p, name) for p in expected])
+    
+    def test_random_forest_batch(self):
+        """Random forest batch predictions match the per-row path"""
+        with patch('builtins.print'):
+            classifier = RandomForestPriceModel(n_estimators=20, max_depth=4)
+            classifier.train(self.X, self.y)
+            regressor = RandomForestPriceModel(ModelType.REGRESSION, n_estimators=20, max_depth=4)
+            regressor.train(self.X, self.data['close'].pct_change().reindex(self.X.index).fillna(0))
+        
+        self.assertSamePredictions(classifier)
+        self.assertSamePredictions(regressor)
+        
+        # Per-row reference: argmax class and probability-spread confidence
+        probs = classifier.model.predict_proba(self.X.iloc[:5])
+        for prob, prediction in zip(probs, classifier.predict(self.X.iloc[:5])):
+            confidence = (prob.max() - np.mean(prob)) / (np.std(prob) + 1e-10)
+            self.assertAlmostEqual(prediction.confidence, min(max(confidence, 0), 1))
+            self.assertEqual(prediction.direction, classifier.model.classes_[np.argmax(prob)])
+            self.assertEqual(set(prediction.metadata['class_probabilities']), set(classifier.model.classes_))
+    
+    def test_ensemble_batch(self):
+        """Ensemble averages its members' batch predictions"""
+        ensemble = EnsemblePriceModel()
+        ensemble.add_model(RandomForestPriceModel(n_estimators=10, max_depth=3), weight=2.0)
+        ensemble.add_model(GradientBoostingPriceModel(n_estimators=10, max_depth=2))
+        with patch('builtins.print'):
+            ensemble.train(self.X, self.y)
+        self.assertSamePredictions(ensemble)
+        
+        members = [m.predict_batch(self.X) for m in ensemble.models]
+        np.testing.assert_allclose(ensemble.predict_batch(self.X).probability,
+                                   (2 * members[0].probability + members[1].probability) / 3)
+    
+    def test_signal_series_matches_generate_signals(self):
+        """One batched pass gives the signals generate_signals() emits per bar"""
+        batched = MLStrategy(self.config)
+        stepwise = MLStrategy(self.config)
+        with patch('builtins.print'):
+            series = batched.generate_signal_series(self.data)
+            stepwise.train(self.data.iloc[:400])
+        
+        self.assertTrue(batched.is_trained)
+        self.assertTrue((series.iloc[:399] == 0).all())
+        self.assertGreater((series != 0).sum(), 0)
+        for bar in range(399, len(self.data), 15):
+            signals = stepwise.generate_signals(self.data.iloc[:bar + 1])
+            expected = 0 if not signals else (1 if signals[0].type == SignalType.BUY else -1)
+            self.assertEqual(series.iloc[bar], expected, f"bar {bar}")
+    
+    def test_predict_symbols(self):
+        """Latest candles of several symbols are scored in one call"""
+        strategy = MLStrategy(self.config)
+        with patch('builtins.print'):
+            strategy.train(self.data.iloc[:400])
+        frames = {'BTC/USDT': self.data, 'ETH/USDT': self.data.iloc[:600], 'NEW/USDT': self.data.iloc[:100]}
+        scores = strategy.predict_symbols(frames)
+        
+        # NEW/USDT is too short for the 200-candle features
+        self.assertEqual(list(scores.index), ['BTC/USDT', 'ETH/USDT'])
+        self.assertEqual(list(scores.columns), ['direction', 'probability', 'confidence', 'expected_return'])
+        expected = strategy.model.predict(
+            strategy.feature_engineer.create_features(self.data)[strategy.feature_engineer.feature_names].iloc[-1:])[0]
+        self.assertEqual(scores.loc['BTC/USDT', 'direction'], expected.direction)
+        self.assertAlmostEqual(scores.loc['BTC/USDT', 'probability'], expected.probability)
+
+
+class TestIncrementalFeatures(unittest.TestCase):
+    """Test the streaming feature pipeline against create_features()"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Random walk with a flat stretch at the prevailing price"""
+        rng = np.random.default_rng(11)
+        n = 600
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        close[300:330] = close[299]
+        open_ = close * (1 + rng.normal(0, 0.002, n))
+        open_[301:330] = close[299]
+        cls.data = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        cls.config = {'n_estimators': 20, 'max_depth': 4, 'training_data_size': 400,
+                      'prediction_threshold': 0.4, 'min_confidence': 0.3}
+    
+    def assertParity(self, config=None):
+        engineer = FeatureEngineer(config)
+        expected = engineer.create_features(self.data)[engineer.feature_names]
+        
+        features = engineer.incremental()
+        rows = [features.update(*candle) for candle in
+                self.data[['open', 'high', 'low', 'close', 'volume']].to_numpy().tolist()]
+        streamed = pd.DataFrame(rows, index=self.data.index)
+        
+        self.assertEqual(features.feature_names, engineer.feature_names)
+        self.assertEqual(list(streamed.columns), engineer.feature_names)
+        np.testing.assert_allclose(streamed.to_numpy(dtype=float), expected.to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True)
+    
+    def test_matches_batch(self):
+        """Every streamed row equals the batch row, column for column"""
+        self.assertParity()
+    
+    def test_matches_batch_custom_config(self):
+        """Parity holds for other periods and with feature groups disabled"""
+        self.assertParity(FeatureConfig(return_periods=[2, 15], ma_periods=[7, 50, 200],
+                                        volatility_periods=[14, 20], volume_periods=[3],
+                                        include_candlestick=False, include_macd=False))
+    
+    def test_warm_up_then_update(self):
+        """Warm-up on history, then one update per new candle"""
+        engineer = FeatureEngineer()
+        expected = engineer.create_features(self.data)[engineer.feature_names]
+        
+        features = IncrementalFeatureEngineer()
+        last = features.warm_up(self.data.iloc[:500])
+        np.testing.assert_allclose(list(last.values()), expected.iloc[499].to_numpy(dtype=float), rtol=1e-9)
+        candle = self.data.iloc[500]
+        row = features.update(candle['open'], candle['high'], candle['low'],
+                              candle['close'], candle['volume'])
+        np.testing.assert_allclose(list(row.values()), expected.iloc[500].to_numpy(dtype=float), rtol=1e-9)
+        self.assertEqual(features.bars, 501)
+    
+    def test_ml_strategy_streams_features(self):
+        """MLStrategy signals are unchanged with incremental features"""
+        batch = MLStrategy(self.config)
+        live = MLStrategy({**self.config, 'incremental_features': True})
+        with patch('builtins.print'):
+            batch.train(self.data.iloc[:400])
+            live.train(self.data.iloc[:400])
+        
+        # Consecutive bars, a repeated bar, then a gap that forces a rebuild
+        for bar in list(range(450, 480)) + [479, 550, 551]:
+            window = self.data.iloc[:bar + 1]
+            expected = [(s.type, s.confidence) for s in batch.generate_signals(window)]
+            self.assertEqual([(s.type, s.confidence) for s in live.generate_signals(window)],
+                             expected, f"bar {bar}")
+        self.assertEqual(live._live_features.bars, 552)
+
+
+class TestFeatureStore(unittest.TestCase):
+    """Test the content-hash feature cache"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Candles shared by the tests"""
+        rng = np.random.default_rng(8)
+        n = 600
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        cls.data = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, n)),
+            'high': close * 1.005,
+            'low': close * 0.995,
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+    
+    def setUp(self):
+        """Store in a temp dir"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(self.tmpdir.name)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def assertSameTrainingData(self, data, config=None):
+        engineer = FeatureEngineer(config)
+        X, y = self.store.get_training_data(engineer, data, 'BTC/USDT', '1h')
+        expected_engineer = FeatureEngineer(config)
+        df = expected_engineer.create_target(expected_engineer.create_features(data))
+        expected_X, expected_y = expected_engineer.get_feature_matrix(df)
+        pd.testing.assert_frame_equal(X, expected_X, check_dtype=False)
+        pd.testing.assert_series_equal(y, expected_y, check_dtype=False)
+        self.assertEqual(engineer.feature_names, expected_engineer.feature_names)
+    
+    def test_second_request_is_served_from_disk(self):
+        """Repeated training data comes from the memory-mapped cache"""
+        self.assertSameTrainingData(self.data)
+        self.assertSameTrainingData(self.data)
+        self.assertEqual(self.store.get_stats()['hits'], 1)
+        self.assertEqual(self.store.get_stats()['misses'], 1)
+        
+        features = self.store.get_features(FeatureEngineer(), self.data, 'BTC/USDT', '1h')
+        base = features.values
+        while isinstance(base, np.ndarray) and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+    
+    def test_prefix_reuses_longer_entry(self):
+        """An expanding training window slices the cached full history"""
+        self.assertSameTrainingData(self.data)
+        self.assertSameTrainingData(self.data.iloc[:450])
+        self.assertEqual(self.store.get_stats()['hits'], 1)
+        self.assertEqual(len(self.store.entries()), 1)
+    
+    def test_changed_candles_or_config_miss(self):
+        """Revised candles and another config are different keys"""
+        self.store.get_features(FeatureEngineer(), self.data, 'BTC/USDT', '1h')
+        revised = self.data.copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] *= 1.01
+        self.assertSameTrainingData(revised)
+        other = FeatureConfig(ma_periods=[5, 10, 20])
+        self.assertSameTrainingData(self.data, other)
+        self.assertEqual(self.store.get_stats()['hits'], 0)
+        self.assertEqual(len(self.store.entries('BTC/USDT', '1h')), 3)
+    
+    def test_invalidate(self):
+        """Config changes invalidate the obsolete entries explicitly"""
+        other = FeatureConfig(ma_periods=[5, 10, 20])
+        self.store.get_features(FeatureEngineer(), self.data, 'BTC/USDT', '1h')
+        self.store.get_features(FeatureEngineer(), self.data, 'ETH/USDT', '1h')
+        self.store.get_features(FeatureEngineer(other), self.data, 'BTC/USDT', '1h')
+        
+        self.assertEqual(self.store.invalidate(stale_for=other), 2)
+        self.assertEqual([e['symbol'] for e in self.store.entries()], ['BTC/USDT'])
+        self.assertEqual(self.store.invalidate(), 1)
+        self.assertEqual(self.store.entries(), [])
+    
+    def test_strategy_and_model_manager_share_the_store(self):
+        """Retraining and ModelManager training reuse stored features"""
+        config = {'n_estimators': 10, 'max_depth': 3, 'feature_store': self.tmpdir.name}
+        strategy = MLStrategy(config)
+        with patch('builtins.print'):
+            strategy.train(self.data)
+            strategy.train(self.data)
+            manager = ModelManager(str(Path(self.tmpdir.name) / 'models'),
+                                   feature_store=strategy.feature_store)
+            model = manager.train_model('BTC/USDT', '1h', self.data,
+                                        RandomForestPriceModel(n_estimators=10, max_depth=3))
+        
+        self.assertTrue(strategy.is_trained)
+        self.assertEqual(strategy.feature_store.get_stats()['hits'], 2)
+        self.assertIs(manager.get_model('BTC/USDT', '1h'), model)
+        self.assertEqual(model.feature_names, strategy.feature_engineer.feature_names)
+
+
+class TestCompactFeatures(unittest.TestCase):
+    """Test the float32/int8 feature layout"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Default and compact features of the same candles"""
+        rng = np.random.default_rng(9)
+        n = 600
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        cls.data = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, n)),
+            'high': close * 1.005,
+            'low': close * 0.995,
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        cls.default = FeatureEngineer()
+        cls.compact = FeatureEngineer(FeatureConfig(compact=True))
+        cls.default_df = cls.default.create_features(cls.data)
+        cls.compact_df = cls.compact.create_features(cls.data)
+    
+    def test_dtypes_and_dropped_intermediates(self):
+        """Flags are int8, features float32, intermediates gone"""
+        names = self.compact.feature_names
+        self.assertNotIn('true_range', names)
+        self.assertFalse(any(n.startswith(('sma_', 'ema_')) and n[4:].isdigit() for n in names))
+        self.assertIn('sma_ratio', names)
+        self.assertEqual(names, [n for n in self.default.feature_names if not is_intermediate(n)])
+        
+        for name in names:
+            expected = np.int8 if name in FLAG_FEATURES else np.float32
+            self.assertEqual(self.compact_df[name].dtype, expected, name)
+        self.assertEqual(self.compact_df['close'].dtype, np.float64)
+        
+        np.testing.assert_allclose(self.compact_df[names].to_numpy(dtype=float),
+                                   self.default_df[names].to_numpy(dtype=float),
+                                   rtol=1e-6, equal_nan=True)
+    
+    def test_feature_matrix_is_contiguous_float32(self):
+        """Training matrix is one C-contiguous float32 block, far smaller"""
+        X, y = self.compact.get_feature_matrix(self.compact.create_target(self.compact_df.copy()))
+        values = X.to_numpy()
+        self.assertEqual(values.dtype, np.float32)
+        self.assertTrue(values.flags['C_CONTIGUOUS'])
+        self.assertEqual(len(X), len(y))
+        
+        compact = self.compact.memory_footprint(self.data)
+        default = self.default.memory_footprint(self.data)
+        self.assertLess(compact['feature_bytes'], default['feature_bytes'] / 2.5)
+        self.assertLess(compact['matrix_bytes'], default['matrix_bytes'] / 2)
+    
+    def test_incremental_and_store_follow_compact(self):
+        """The streaming pipeline and the feature store use the compact layout"""
+        features = self.compact.incremental()
+        features.warm_up(self.data)
+        self.assertEqual(features.feature_names, self.compact.feature_names)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = FeatureStore(tmpdir)
+            store.get_features(self.compact, self.data, 'BTC/USDT', '1h')
+            cached = store.get_features(self.compact, self.data, 'BTC/USDT', '1h')
+            self.assertEqual(store.get_stats()['hits'], 1)
+            self.assertTrue((cached.dtypes == np.float32).all())
+            del cached
+
+
+class TestParallelTraining(unittest.TestCase):
+    """Test parallel model, ensemble and bulk training"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Candles for two symbols"""
+        rng = np.random.default_rng(19)
+        cls.data = {}
+        for symbol, start in (('BTC/USDT', 50000), ('ETH/USDT', 3000)):
+            n = 400
+            close = start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+            cls.data[(symbol, '1h')] = pd.DataFrame({
+                'open': close * (1 + rng.normal(0, 0.002, n)),
+                'high': close * 1.005,
+                'low': close * 0.995,
+                'close': close,
+                'volume': rng.uniform(100, 1000, n)
+            }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        engineer = FeatureEngineer()
+        df = engineer.create_target(engineer.create_features(cls.data[('BTC/USDT', '1h')]))
+        cls.X, cls.y = engineer.get_feature_matrix(df)
+    
+    def test_cross_validation_optional(self):
+        """cv_folds=0 skips cross-validation, otherwise one score per fold"""
+        model = RandomForestPriceModel(n_estimators=10, cv_folds=0)
+        model.train(self.X, self.y)
+        self.assertTrue(model.is_trained)
+        self.assertIsNone(model.cv_scores)
+        
+        model = RandomForestPriceModel(n_estimators=10, cv_folds=3, n_jobs=2)
+        model.train(self.X, self.y)
+        self.assertEqual(len(model.cv_scores), 3)
+        self.assertTrue(((model.cv_scores >= 0) & (model.cv_scores <= 1)).all())
+    
+    def test_parallel_ensemble_matches_sequential(self):
+        """Members trained concurrently predict like sequentially trained ones"""
+        def ensemble(workers):
+            return EnsemblePriceModel([
+                RandomForestPriceModel(n_estimators=10, cv_folds=0),
+                GradientBoostingPriceModel(n_estimators=10)
+            ], max_workers=workers)
+        
+        sequential, parallel = ensemble(1), ensemble(2)
+        parallel.set_n_jobs(2)
+        sequential.train(self.X, self.y)
+        parallel.train(self.X, self.y)
+        self.assertTrue(parallel.is_trained)
+        self.assertTrue(all(m.n_jobs == 1 for m in parallel.models))
+        np.testing.assert_array_equal(parallel.predict(self.X), sequential.predict(self.X))
+    
+    def test_train_all_matches_serial(self):
+        """Bulk training in a process pool registers the same models as serial training"""
+        def jobs():
+            return [
+                TrainingJob(symbol, timeframe, RandomForestPriceModel(n_estimators=10, cv_folds=0))
+                for symbol, timeframe in self.data
+            ] + [TrainingJob('BTC/USDT', '1h', GradientBoostingPriceModel(n_estimators=10), 'gb'),
+                 TrainingJob('SOL/USDT', '1h', RandomForestPriceModel(n_estimators=10))]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = ModelManager(tmpdir)
+            parallel = ModelManager(tmpdir)
+            serial_models = serial.train_all(jobs(), self.data, max_workers=1)
+            parallel_models = parallel.train_all(jobs(), self.data, max_workers=2, max_cores=2)
+        
+        # SOL/USDT has no candles and is skipped
+        self.assertEqual(set(parallel_models), {'BTC_USDT_1h_rf', 'ETH_USDT_1h_rf', 'BTC_USDT_1h_gb'})
+        self.assertEqual(set(parallel_models), set(serial_models))
+        for key, model in parallel_models.items():
+            self.assertIs(parallel.models[key], model)
+            self.assertEqual(model.n_jobs, 1)
+            np.testing.assert_array_equal(model.predict(self.X), serial_models[key].predict(self.X))
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test the indexed, lazily loaded model registry"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """A small training set"""
+        rng = np.random.default_rng(20)
+        n = 300
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        cls.data = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, n)),
+            'high': close * 1.005,
+            'low': close * 0.995,
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        engineer = FeatureEngineer()
+        cls.X, cls.y = engineer.get_feature_matrix(engineer.create_target(engineer.create_features(cls.data)))
+    
+    def setUp(self):
+        """Fresh model directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def _train_and_save(self, symbols):
+        manager = ModelManager(self.tmpdir.name)
+        for symbol in symbols:
+            manager.train_model(symbol, '1h', self.data, RandomForestPriceModel(n_estimators=5, cv_folds=0))
+        manager.train_model(symbols[0], '1h', self.data,
+                            GradientBoostingPriceModel(n_estimators=5), model_name='gb')
+        manager.save_all()
+        return manager
+    
+    def test_index_without_loading(self):
+        """A new manager knows every model's metadata but loads none"""
+        self._train_and_save(['BTC/USDT', 'ETH/USDT'])
+        manager = ModelManager(self.tmpdir.name)
+        
+        self.assertEqual(manager.get_stats()['indexed'], 3)
+        self.assertEqual(len(manager.models), 0)
+        gb = manager.list_models('BTC/USDT')
+        gb = [entry for entry in gb if entry['model_name'] == 'gb'][0]
+        self.assertEqual(gb['class'], 'GradientBoostingPriceModel')
+        self.assertEqual(gb['feature_names'], list(self.X.columns))
+        self.assertEqual(gb['training_window']['rows'], len(self.X))
+        self.assertEqual(gb['training_window']['start'], str(self.X.index[0]))
+        self.assertEqual(manager.loads, 0)
+    
+    def test_lazy_load_keeps_model_class(self):
+        """get_model() loads the saved class and predicts like the original"""
+        trained = self._train_and_save(['BTC/USDT'])
+        manager = ModelManager(self.tmpdir.name)
+        
+        model = manager.get_model('BTC/USDT', '1h', 'gb')
+        self.assertIsInstance(model, GradientBoostingPriceModel)
+        self.assertIs(manager.get_model('BTC/USDT', '1h', 'gb'), model)
+        self.assertEqual(manager.loads, 1)
+        original = trained.get_model('BTC/USDT', '1h', 'gb')
+        np.testing.assert_array_equal(model.predict_batch(self.X).direction,
+                                      original.predict_batch(self.X).direction)
+        self.assertIsNone(manager.get_model('SOL/USDT', '1h'))
+    
+    def test_lru_eviction(self):
+        """Only max_loaded models stay resident; unsaved ones are kept"""
+        self._train_and_save(['BTC/USDT', 'ETH/USDT', 'SOL/USDT'])
+        manager = ModelManager(self.tmpdir.name, max_loaded=2)
+        
+        btc = manager.get_model('BTC/USDT', '1h')
+        manager.get_model('ETH/USDT', '1h')
+        manager.get_model('BTC/USDT', '1h')
+        manager.get_model('SOL/USDT', '1h')
+        self.assertEqual(list(manager.models), ['BTC_USDT_1h_rf', 'SOL_USDT_1h_rf'])
+        self.assertIs(manager.get_model('BTC/USDT', '1h'), btc)
+        
+        manager.register_model('XRP/USDT', '1h', RandomForestPriceModel())
+        manager.register_model('ADA/USDT', '1h', RandomForestPriceModel())
+        manager.get_model('ETH/USDT', '1h')
+        self.assertIn('XRP_USDT_1h_rf', manager.models)
+        self.assertIn('ADA_USDT_1h_rf', manager.models)
+        self.assertEqual(manager.loads, 4)
+    
+    def test_legacy_pickles(self):
+        """Model pickles without an index entry are loaded as Random Forests"""
+        model = RandomForestPriceModel(n_estimators=5, cv_folds=0)
+        model.train(self.X, self.y)
+        model.save(str(Path(self.tmpdir.name) / 'BTC_USDT_4h_rf.pkl'))
+        
+        manager = ModelManager(self.tmpdir.name)
+        self.assertIsNone(manager.get_model('BTC/USDT', '4h'))
+        manager.load_all()
+        loaded = manager.get_model('BTC/USDT', '4h')
+        self.assertIsInstance(loaded, RandomForestPriceModel)
+        np.testing.assert_array_equal(loaded.predict_batch(self.X).direction,
+                                      model.predict_batch(self.X).direction)
+
+
+class TestStrategyOptimizer(unittest.TestCase):
+    """Test parameter search and walk-forward optimization"""
+    
+    def setUp(self):
+        """Generate a random walk and a small breakout grid"""
+        rng = np.random.default_rng(3)
+        n = 1200
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        self.data = pd.DataFrame({
+            'open': close,
+            'high': close * 1.004,
+            'low': close * 0.996,
+            'close': close,
+            'volume': rng.uniform(100, 1000, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+        self.grid = {'lookback': [10, 20], 'min_breakout_percent': [0.002, 0.005]}
+    
+    def test_expand_grid(self):
+        """Grid expands to every combination"""
+        combinations = StrategyOptimizer.expand_grid(self.grid)
+        self.assertEqual(len(combinations), 4)
+        self.assertIn({'lookback': 20, 'min_breakout_percent': 0.002}, combinations)
+    
+    def test_shared_index_round_trip(self):
+        """Workers see the same timestamps and time zone for non-ns, tz-aware indexes"""
+        data = self.data.copy()
+        data.index = data.index.as_unit('ms').tz_localize('US/Eastern')
+        
+        with SharedOHLCV(data) as shared:
+            shm, attached = SharedOHLCV.attach(shared.spec)
+            try:
+                self.assertTrue(attached.index.equals(data.index))
+                self.assertEqual(str(attached.index.tz), 'US/Eastern')
+                np.testing.assert_array_equal(attached.to_numpy(), data[SharedOHLCV.COLUMNS].to_numpy())
+            finally:
+                del attached
+                shm.close()
+    
+    def test_parallel_matches_serial(self):
+        """Shared-memory workers produce the same ranking as in-process runs"""
+        serial = StrategyOptimizer(BreakoutStrategy, max_workers=1).grid_search(self.data, self.grid)
+        parallel = StrategyOptimizer(BreakoutStrategy, max_workers=2).grid_search(self.data, self.grid)
+        
+        self.assertEqual([r.params for r in serial], [r.params for r in parallel])
+        self.assertEqual([r.metrics for r in serial], [r.metrics for r in parallel])
+        scores = [r.metrics['sharpe_ratio'] for r in serial]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+    
+    def test_random_search(self):
+        """Random search samples distinct combinations"""
+        results = StrategyOptimizer(BreakoutStrategy, max_workers=1).random_search(
+            self.data, self.grid, n_iter=3, seed=1
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len({tuple(r.params.items()) for r in results}), 3)
+    
+    def test_strategies_without_signal_series(self):
+        """Strategies without vectorized signals run on the loop engine"""
+        data = self.data.iloc[:120]
+        for strategy_class, grid in ((MultiTimeframeStrategy, {'rsi_period': [10, 14]}),
+                                     (StrategyEnsemble, {'min_consensus': [1, 2]})):
+            optimizer = StrategyOptimizer(strategy_class, {'symbols': ['BTC/USDT']}, max_workers=1)
+            self.assertFalse(optimizer.vectorized)
+            results = optimizer.grid_search(data, grid)
+            self.assertEqual(len(results), 2)
+        self.assertTrue(StrategyOptimizer(BreakoutStrategy).vectorized)
+    
+    def test_walk_forward(self):
+        """Each test window follows its training window"""
+        windows = StrategyOptimizer(BreakoutStrategy, max_workers=2).walk_forward(
+            self.data, self.grid, train_size=600, test_size=200
+        )
+        
+        self.assertEqual(len(windows), 3)
+        for window in windows:
+            self.assertLess(window.train_end, window.test_start)
+            self.assertIn(window.best_params, StrategyOptimizer.expand_grid(self.grid))
+            self.assertIn('total_pnl', window.test_metrics)
+        
+        # Test runs are primed with the training candles but scored from the test window
+        first = windows[0]
+        expected = BacktestEngine(BreakoutStrategy(first.best_params)).run_vectorized(
+            self.data.iloc[:800], 'BTC/USDT', warmup=600)
+        self.assertEqual(first.test_metrics['total_trades'], expected.total_trades)
+        self.assertEqual(first.test_metrics['final_capital'], expected.final_capital)
+
+
+class TestCandleStore(unittest.TestCase):
+    """Test the on-disk OHLCV cache"""
+    
+    def setUp(self):
+        """Set up a store in a temp dir and a mock exchange that counts fetches"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.tmpdir.name)
+        self.exchange = MockExchange('Binance')
+        self.fetches = []
+        get_ohlcv = self.exchange.get_ohlcv
+        
+        def counting_get_ohlcv(symbol, timeframe='1h', limit=100):
+            self.fetches.append(limit)
+            return get_ohlcv(symbol, timeframe, limit)
+        
+        self.exchange.get_ohlcv = counting_get_ohlcv
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_read_through_fetches_only_missing_candles(self):
+        """Second read only refreshes the newest candle"""
+        first = self.store.get_ohlcv(self.exchange, 'BTC/USDT', '1h', limit=300)
+        second = self.store.get_ohlcv(self.exchange, 'BTC/USDT', '1h', limit=300)
+        
+        self.assertEqual(self.fetches, [300, 1])
+        self.assertEqual(len(second), 300)
+        self.assertIsInstance(second.index, pd.DatetimeIndex)
+        self.assertTrue(first.index.equals(second.index))
+    
+    def test_backfill_older_history(self):
+        """Asking for more history merges older candles"""
+        self.store.get_ohlcv(self.exchange, 'BTC/USDT', '1h', limit=100)
+        data = self.store.get_ohlcv(self.exchange, 'BTC/USDT', '1h', limit=250)
+        
+        self.assertEqual(len(data), 250)
+        self.assertTrue(data.index.is_monotonic_increasing)
+        self.assertTrue(data.index.is_unique)
+    
+    def test_range_read_and_replace(self):
+        """Range reads are inclusive and rewritten candles replace cached ones"""
+        data = self.store.get_ohlcv(self.exchange, 'ETH/USDT', '15m', limit=50)
+        window = self.store.read('Binance', 'ETH/USDT', '15m', start=data.index[10], end=data.index[19])
+        self.assertEqual(len(window), 10)
+        
+        update = data.iloc[-3:].copy()
+        update['close'] = 1.0
+        self.store.write('Binance', 'ETH/USDT', '15m', update)
+        stored = self.store.read('Binance', 'ETH/USDT', '15m')
+        self.assertEqual(len(stored), 50)
+        self.assertTrue((stored['close'].iloc[-3:] == 1.0).all())
+        self.assertEqual(self.store.last_timestamp('Binance', 'ETH/USDT', '15m'), data.index[-1])
+    
+    def test_stale_cache_leaves_no_hole(self):
+        """A cache further behind than the fetch limit is replaced, not extended"""
+        for symbol, cached in (('BTC/USDT', 50), ('ETH/USDT', 200)):
+            old = self.exchange.get_ohlcv(symbol, '1h', limit=cached)
+            old['timestamp'] -= pd.Timedelta(hours=500)
+            self.store.write('Binance', symbol, '1h', old)
+            
+            data = self.store.get_ohlcv(self.exchange, symbol, '1h', limit=100)
+            stored = self.store.read('Binance', symbol, '1h')
+            self.assertEqual(len(stored), 100)
+            self.assertTrue(data.index.equals(stored.index))
+            self.assertTrue((np.diff(stored.index) == pd.Timedelta(hours=1)).all())
+
+
+class TestSmartOrderRouter(unittest.TestCase):
+    """Test concurrent market data collection"""
+    
+    def setUp(self):
+        self.router = SmartOrderRouter(timeout=0.3)
+        self.fast = MockExchange('Binance')
+        self.slow = MockExchange('Kraken')
+        self.router.add_exchange(self.fast)
+        self.router.add_exchange(self.slow)
+    
+    def tearDown(self):
+        self.router.shutdown()
+    
+    def _delay(self, exchange, seconds):
+        get_ticker = exchange.get_ticker
+        def slow_ticker(symbol):
+            time.sleep(seconds)
+            return get_ticker(symbol)
+        exchange.get_ticker = slow_ticker
+    
+    def test_exchanges_queried_concurrently(self):
+        """Total time is the slowest exchange, not the sum"""
+        self._delay(self.fast, 0.1)
+        self._delay(self.slow, 0.1)
+        
+        start = time.monotonic()
+        data = self.router._collect_exchange_data('BTC/USDT')
+        
+        self.assertEqual(set(data), {'Binance', 'Kraken'})
+        self.assertLess(time.monotonic() - start, 0.19)
+    
+    def test_slow_exchange_left_out(self):
+        """A slow exchange is dropped at its timeout and penalized"""
+        self._delay(self.slow, 0.5)
+        
+        start = time.monotonic()
+        data = self.router._collect_exchange_data('BTC/USDT')
+        
+        self.assertEqual(set(data), {'Binance'})
+        self.assertLess(time.monotonic() - start, 0.45)
+        self.assertLess(self.router.reliability_scores['Kraken'], 1.0)
+        
+        # Still routable on the exchange that answered
+        decision = self.router.get_best_exchange('BTC/USDT', OrderSide.BUY, 0.01)
+        self.assertEqual(decision.selected_exchange, 'Binance')
+        
+        # The late answer still lands in the latency history
+        time.sleep(0.3)
+        self.assertGreaterEqual(max(self.router.latency_history['Kraken']), 0.5)
+    
+    def test_deadline(self):
+        """The overall deadline caps per-exchange timeouts"""
+        self._delay(self.slow, 0.2)
+        self.router.set_timeout('Kraken', 1.0)
+        
+        data = self.router._collect_exchange_data('BTC/USDT', deadline=0.1)
+        
+        self.assertEqual(set(data), {'Binance'})
+    
+    def test_overlapping_calls_are_not_penalized(self):
+        """Concurrent routing calls each query exchanges that are still in time"""
+        self._delay(self.fast, 0.1)
+        self._delay(self.slow, 0.1)
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda symbol: self.router._collect_exchange_data(symbol),
+                                    ['BTC/USDT', 'ETH/USDT']))
+        
+        self.assertEqual([set(data) for data in results], [{'Binance', 'Kraken'}] * 2)
+        self.assertEqual(self.router.reliability_scores, {'Binance': 1.0, 'Kraken': 1.0})
+        self.assertEqual(self.router._in_flight, {'Binance': {}, 'Kraken': {}})
+
+
+class TestMarketDataCache(unittest.TestCase):
+    """Test the shared ticker/fee cache"""
+    
+    def setUp(self):
+        self.cache = MarketDataCache({'ticker': 0.05})
+        self.exchange = MockExchange('Binance')
+        self.exchange.get_ticker = Mock(wraps=self.exchange.get_ticker)
+        self.exchange.get_fees = Mock(wraps=self.exchange.get_fees)
+    
+    def test_hits_and_expiry(self):
+        """Tickers are reused until their TTL runs out"""
+        first = self.cache.get_ticker(self.exchange, 'BTC/USDT')
+        self.assertIs(self.cache.get_ticker(self.exchange, 'BTC/USDT'), first)
+        self.assertEqual(self.exchange.get_ticker.call_count, 1)
+        
+        time.sleep(0.06)
+        self.cache.get_ticker(self.exchange, 'BTC/USDT')
+        self.assertEqual(self.exchange.get_ticker.call_count, 2)
+        
+        stats = self.cache.get_stats()['ticker']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+    
+    def test_fees_outlive_tickers(self):
+        """Fees have their own, longer TTL"""
+        self.cache.get_fees(self.exchange)
+        time.sleep(0.06)
+        self.cache.get_fees(self.exchange)
+        self.assertEqual(self.exchange.get_fees.call_count, 1)
+    
+    def test_invalidation_during_fetch(self):
+        """A ticker fetched before an order lands isn't cached after it"""
+        def fetch_then_order():
+            ticker = self.exchange.get_ticker('BTC/USDT')
+            self.cache.on_order_placed('Binance', 'BTC/USDT')
+            return ticker
+        
+        self.cache.get_ticker(self.exchange, 'BTC/USDT', fetch=fetch_then_order)
+        self.cache.get_ticker(self.exchange, 'BTC/USDT')
+        self.assertEqual(self.exchange.get_ticker.call_count, 2)
+        self.cache.get_ticker(self.exchange, 'BTC/USDT')
+        self.assertEqual(self.exchange.get_ticker.call_count, 2)
+        
+        async def fetch_then_clear():
+            self.cache.clear()
+            return 'fees'
+        
+        asyncio.run(self.cache.get_async('fees', 'Binance', None, fetch_then_clear))
+        self.assertEqual(self.cache.invalidate(kind='fees'), 0)
+    
+    def test_route_order_fetches_ticker_once(self):
+        """Routing, spread and cost estimate share one ticker per exchange"""
+        router = SmartOrderRouter(cache=self.cache)
+        router.add_exchange(self.exchange)
+        try:
+            router.get_best_exchange('BTC/USDT', OrderSide.BUY, 0.01)
+            self.exchange.estimate_cost('BTC/USDT', 0.01, OrderSide.BUY)
+            self.assertEqual(self.exchange.get_ticker.call_count, 1)
+            self.assertEqual(self.exchange.get_fees.call_count, 1)
+            
+            # Placing an order invalidates the ticker, not the fees
+            router.route_order(Order('BTC/USDT', OrderSide.BUY, OrderType.MARKET, 0.01))
+            self.assertEqual(self.cache.invalidate(kind='ticker'), 0)
+            self.assertEqual(self.cache.invalidate(kind='fees'), 1)
+        finally:
+            router.shutdown()
+
+
+class TestAsyncExchanges(unittest.TestCase):
+    """Test asyncio exchange fan-out"""
+    
+    def test_gather_bounded(self):
+        """No more than `limit` calls run at once"""
+        running = []
+        peak = []
+        
+        async def call(i):
+            running.append(i)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(i)
+            return i
+        
+        results = asyncio.run(gather_bounded([call(i) for i in range(10)], limit=3))
+        self.assertEqual(results, list(range(10)))
+        self.assertEqual(max(peak), 3)
+    
+    def test_manager_queries_concurrently(self):
+        """Prices and balances from N exchanges take one round-trip"""
+        async def run():
+            manager = ExchangeManager()
+            for name in ['Binance', 'Coinbase', 'Kraken']:
+                await manager.add_async_exchange(AsyncMockExchange(name, latency=0.1))
+            
+            start = time.monotonic()
+            prices = await manager.get_best_price_async('BTC/USDT', OrderSide.BUY)
+            balances = await manager.get_all_balances_async()
+            elapsed = time.monotonic() - start
+            manager.router.shutdown()
+            return prices, balances, elapsed
+        
+        prices, balances, elapsed = asyncio.run(run())
+        
+        self.assertEqual(len(prices['all_prices']), 3)
+        self.assertEqual(prices['best_price'], min(prices['all_prices'].values()))
+        self.assertEqual(balances['Kraken']['USDT']['free'], 10000.0)
+        self.assertLess(elapsed, 0.5)
+    
+    def test_router_async_timeout(self):
+        """A slow async exchange is cancelled and routing uses the rest"""
+        async def run():
+            router = SmartOrderRouter(timeout=0.1)
+            await router.add_async_exchange(AsyncMockExchange('Binance'))
+            await router.add_async_exchange(AsyncMockExchange('Kraken', latency=0.5))
+            router.add_exchange(MockExchange('Coinbase'))
+            
+            start = time.monotonic()
+            decision = await router.get_best_exchange_async('BTC/USDT', OrderSide.BUY, 0.01)
+            elapsed = time.monotonic() - start
+            router.shutdown()
+            return router, decision, elapsed
+        
+        router, decision, elapsed = asyncio.run(run())
+        
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual({s.exchange for s in decision.all_scores}, {'Binance', 'Coinbase'})
+        self.assertLess(router.reliability_scores['Kraken'], 1.0)
+        self.assertEqual(router.latency_history['Kraken'], [0.1])
+    
+    def test_router_async_deadline_includes_queueing(self):
+        """The deadline is absolute, even for exchanges waiting for a slot"""
+        async def run():
+            router = SmartOrderRouter(timeout=1.0, max_concurrency=1)
+            for name in ['Binance', 'Coinbase', 'Kraken']:
+                await router.add_async_exchange(AsyncMockExchange(name, latency=0.1))
+            
+            start = time.monotonic()
+            data = await router._collect_exchange_data_async('BTC/USDT', deadline=0.15)
+            elapsed = time.monotonic() - start
+            router.shutdown()
+            return data, elapsed
+        
+        data, elapsed = asyncio.run(run())
+        
+        self.assertEqual(list(data), ['Binance'])
+        self.assertLess(elapsed, 0.25)
+    
+    def test_route_order_async_executes_on_async_exchanges(self):
+        """Orders routed asynchronously can go to async-only connectors"""
+        async def run():
+            router = SmartOrderRouter()
+            await router.add_async_exchange(AsyncMockExchange('Kraken'))
+            order = Order('BTC/USDT', OrderSide.BUY, OrderType.MARKET, 0.01)
+            executed, decision = await router.route_order_async(order)
+            router.shutdown()
+            return executed, decision
+        
+        executed, decision = asyncio.run(run())
+        
+        self.assertEqual(decision.selected_exchange, 'Kraken')
+        self.assertEqual(executed.exchange, 'Kraken')
+        self.assertTrue(executed.order_id)
+
+
+class TestBatchOrders(unittest.TestCase):
+    """Test ExchangeManager batch placement and cancellation"""
+    
+    def setUp(self):
+        """One exchange with native batch endpoints, one without"""
+        self.manager = ExchangeManager({'max_batch_concurrency': 3})
+        self.native = MockBatchExchange('Binance', native=True, max_batch_size=5, latency=0.02)
+        self.single = MockBatchExchange('Kraken', native=False, latency=0.02)
+        self.manager.add_exchange(self.native)
+        self.manager.add_exchange(self.single)
+    
+    def tearDown(self):
+        self.manager.router.shutdown()
+    
+    def limit_orders(self, exchange, count, symbol='BTC/USDT'):
+        return [Order(symbol, OrderSide.BUY, OrderType.LIMIT, 0.01, price=60000, exchange=exchange)
+                for _ in range(count)]
+    
+    def test_place_orders_batches_and_bounds_requests(self):
+        """Native exchanges get chunked batches, others bounded single requests"""
+        orders = self.limit_orders('Binance', 12) + self.limit_orders('Kraken', 9)
+        
+        result = self.manager.place_orders(orders)
+        
+        self.assertEqual(result.succeeded, 21)
+        self.assertEqual(result.requests, {'Binance': 3, 'Kraken': 9})
+        self.assertEqual(self.native.requests, {'place_orders': 3})
+        self.assertEqual(self.single.requests, {'place_order': 9})
+        self.assertEqual(self.single.max_in_flight, 3)
+        self.assertLessEqual(self.native.max_in_flight, 3)
+        self.assertTrue(all(order.order_id for order in result.results))
+        self.assertEqual([order.exchange for order in result.results],
+                         ['Binance'] * 12 + ['Kraken'] * 9)
+    
+    def test_native_batches_are_per_symbol(self):
+        """Native batches never mix symbols"""
+        orders = [Order(symbol, OrderSide.BUY, OrderType.LIMIT, 0.01, price=100, exchange='Binance')
+                  for symbol in ['BTC/USDT', 'ETH/USDT'] * 4]
+        
+        result = self.manager.place_orders(orders)
+        
+        self.assertEqual(result.succeeded, 8)
+        self.assertEqual(result.requests, {'Binance': 2})
+    
+    def test_ccxt_batch_gating(self):
+        """Contract-only endpoints aren't used on spot; NotSupported falls back to single calls"""
+        connector = BinanceConnector()
+        connector.exchange = Mock(has={'createOrders': True, 'cancelOrders': True,
+                                       'cancelAllOrders': True},
+                                  options={'defaultType': 'spot'})
+        self.assertFalse(connector.supports('place_orders'))
+        self.assertFalse(connector.supports('cancel_orders'))
+        self.assertTrue(connector.supports('cancel_all_orders'))
+        
+        connector.exchange.options['defaultType'] = 'future'
+        self.assertTrue(connector.supports('place_orders'))
+        connector.exchange.create_orders.side_effect = NotSupported('spot only')
+        connector.exchange.create_order.side_effect = lambda *args: {'id': 'single'}
+        placed = connector.place_orders(self.limit_orders('Binance', 2))
+        self.assertEqual([o.order_id for o in placed], ['single', 'single'])
+        self.assertFalse(connector.supports('place_orders'))
+        
+        # Cancel results follow the statuses the exchange returned
+        connector.exchange.cancel_orders.return_value = [
+            {'id': 'a', 'status': 'canceled'}, {'id': 'b', 'status': 'closed'}, {'info': {'code': -2011}}
+        ]
+        self.assertEqual(connector.cancel_orders(['a', 'b', 'c'], 'BTC/USDT'), [True, False, False])
+    
+    def test_place_orders_aggregates_failures(self):
+        """Rejected orders and failed batches are reported by index"""
+        orders = self.limit_orders('Binance', 3) + self.limit_orders('Kraken', 2)
+        orders[1].amount = 0
+        self.native.max_batch_size = 2
+        
+        def fail(order):
+            raise ConnectionError("Kraken unreachable")
+        self.single.place_order = fail
+        
+        result = self.manager.place_orders(orders)
+        
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(set(result.errors), {1, 3, 4})
+        self.assertIn('unreachable', result.errors[3])
+        self.assertEqual(result.results[1].status, ExchangeOrderStatus.REJECTED)
+        self.assertEqual(result.results[4].status, ExchangeOrderStatus.REJECTED)
+        self.assertEqual(result.summary()['failed'], 3)
+    
+    def test_place_orders_routes_once_per_symbol(self):
+        """Orders without an exchange share one routing decision"""
+        orders = [Order('ETH/USDT', OrderSide.SELL, OrderType.MARKET, 0.5) for _ in range(4)]
+        
+        with patch.object(self.manager.router, 'get_best_exchange',
+                          wraps=self.manager.router.get_best_exchange) as route:
+            result = self.manager.place_orders(orders)
+        
+        self.assertEqual(route.call_count, 1)
+        self.assertEqual(result.succeeded, 4)
+        self.assertEqual(len({order.exchange for order in result.results}), 1)
+    
+    def test_cancel_orders(self):
+        """Cancels are grouped per exchange and symbol"""
+        placed = self.manager.place_orders(
+            self.limit_orders('Binance', 7) + self.limit_orders('Kraken', 4)).results
+        
+        result = self.manager.cancel_orders(placed[:6] + placed[7:9])
+        
+        self.assertEqual(result.results, [True] * 8)
+        self.assertEqual(result.errors, {})
+        self.assertEqual(self.native.requests['cancel_orders'], 2)
+        self.assertEqual(self.single.requests['cancel_order'], 2)
+        self.assertEqual(len(self.native.get_open_orders()), 1)
+        
+        # Already canceled
+        again = self.manager.cancel_orders(placed[:1])
+        self.assertEqual(again.results, [False])
+        self.assertEqual(list(again.errors), [0])
+    
+    def test_cancel_all(self):
+        """Open orders of a symbol are canceled on every exchange"""
+        self.manager.place_orders(self.limit_orders('Binance', 6) + self.limit_orders('Kraken', 5) +
+                                  self.limit_orders('Kraken', 2, symbol='ETH/USDT'))
+        
+        start = time.monotonic()
+        result = self.manager.cancel_all('BTC/USDT')
+        elapsed = time.monotonic() - start
+        
+        self.assertEqual(len(result.results), 11)
+        self.assertEqual(result.errors, {})
+        self.assertEqual(result.requests, {'Binance': 1, 'Kraken': 6})
+        self.assertEqual(self.native.requests['cancel_all_orders'], 1)
+        self.assertEqual(self.native.get_open_orders(), [])
+        self.assertEqual([o.symbol for o in self.single.get_open_orders()], ['ETH/USDT'] * 2)
+        # Kraken: one fetch, then 5 cancels three at a time
+        self.assertLess(elapsed, 0.02 * 8)
+        
+        self.assertEqual(len(self.manager.cancel_all().results), 2)
+    
+    def test_cancels_invalidate_tickers(self):
+        """Canceled orders drop the cached tickers of their exchange and symbol"""
+        placed = self.manager.place_orders(
+            self.limit_orders('Binance', 2) + self.limit_orders('Kraken', 2, symbol='ETH/USDT')).results
+        
+        with patch.object(self.manager.cache, 'invalidate',
+                          wraps=self.manager.cache.invalidate) as invalidate:
+            self.manager.cancel_orders(placed[:1] + placed[2:])
+            self.assertCountEqual(invalidate.call_args_list,
+                                  [call('Binance', 'BTC/USDT', kind='ticker'),
+                                   call('Kraken', 'ETH/USDT', kind='ticker')])
+            
+            invalidate.reset_mock()
+            self.manager.cancel_all()
+            self.assertEqual(invalidate.call_args_list, [call('Binance', None, kind='ticker')])
+
+
+class TestOrderJournal(unittest.TestCase):
+    """Test journaled order and position persistence"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmpdir.name) / 'orders.json')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_replay(self):
+        """Orders are restored from the journal alone"""
+        manager = OrderManager(self.path)
+        first = manager.create_order('BTC/USDT', OrderManagerSide.BUY,
+                                     OrderManagerType.LIMIT, 0.1, price=50000)
+        second = manager.create_order('ETH/USDT', OrderManagerSide.SELL,
+                                      OrderManagerType.MARKET, 1.0)
+        manager.update_order_status(first.id, OrderStatus.FILLED,
+                                    filled_amount=0.1, avg_fill_price=49990)
+        manager.journal.close()
+        
+        self.assertFalse(Path(self.path).exists())
+        
+        restored = OrderManager(self.path)
+        self.assertEqual(set(restored.orders), set(manager.orders))
+        self.assertEqual(restored.get_order(first.id).to_dict(), first.to_dict())
+        self.assertEqual(restored.get_order(second.id).status, OrderStatus.PENDING)
+        self.assertEqual([o.id for o in restored.order_history], [first.id])
+        self.assertIs(restored.order_history[0], restored.get_order(first.id))
+    
+    def test_compaction(self):
+        """The journal is folded into a snapshot every compact_every events"""
+        manager = OrderManager(self.path, compact_every=5)
+        orders = [
+            manager.create_order('BTC/USDT', OrderManagerSide.BUY,
+                                 OrderManagerType.MARKET, 0.1 * (i + 1))
+            for i in range(3)
+        ]
+        for order in orders[:2]:
+            manager.update_order_status(order.id, OrderStatus.CANCELED)
+        manager.journal.close()
+        
+        # 3 creates + 2 x (active + history) = 7 events, compacted after the 5th
+        self.assertTrue(Path(self.path).exists())
+        self.assertEqual(manager.journal.pending_events, 2)
+        
+        restored = OrderManager(self.path)
+        self.assertEqual(restored.get_statistics(), manager.get_statistics())
+    
+    def test_torn_write_and_legacy_file(self):
+        """A snapshot-only file loads, and a torn journal tail is discarded"""
+        manager = OrderManager(self.path)
+        order = manager.create_order('BTC/USDT', OrderManagerSide.BUY,
+                                     OrderManagerType.MARKET, 0.1)
+        manager._save_orders()
+        manager.journal.close()
+        self.assertEqual(Path(self.path + '.journal').stat().st_size, 0)
+        
+        with open(self.path + '.journal', 'a') as f:
+            f.write('{"op": "put", "c": "act')
+        
+        restored = OrderManager(self.path)
+        self.assertEqual(list(restored.orders), [order.id])
+        restored.update_order_status(order.id, OrderStatus.FILLED, filled_amount=0.1)
+        restored.journal.close()
+        
+        self.assertEqual(OrderManager(self.path).get_order(order.id).status,
+                         OrderStatus.FILLED)
+    
+    def test_position_tracker(self):
+        """PositionTracker persists through the same journal"""
+        path = str(Path(self.tmpdir.name) / 'positions.json')
+        tracker = PositionTracker(path)
+        kept = tracker.open_position('BTC/USDT', PositionSide.LONG, 50000, 0.1,
+                                     stop_loss=49000)
+        closed = tracker.open_position('ETH/USDT', PositionSide.SHORT, 3000, 1.0)
+        tracker.close_position(closed.id, 2900, 'take_profit')
+        tracker.journal.close()
+        
+        restored = PositionTracker(path)
+        self.assertEqual(list(restored.positions), [kept.id])
+        self.assertEqual(restored.get_position(kept.id).stop_loss, 49000)
+        self.assertAlmostEqual(restored.get_total_pnl()['realized_pnl'], 100.0)
+
+
+class TestOrderIndexes(unittest.TestCase):
+    """Indexed queries match a full scan"""
+    
+    def test_order_manager(self):
+        """Open orders, history and statistics after random updates"""
+        rng = np.random.RandomState(7)
+        manager = OrderManager()
+        symbols = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+        
+        for i in range(200):
+            order = manager.create_order(symbols[i % 3], OrderManagerSide.BUY if i % 2 else OrderManagerSide.SELL,
+                                         OrderManagerType.LIMIT, 1.0 + i, price=100.0)
+            order.created_at = datetime(2024, 1, 1) + timedelta(minutes=int(rng.randint(0, 10000)))
+            status = [OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED, OrderStatus.FILLED,
+                      OrderStatus.CANCELED, None][rng.randint(0, 5)]
+            if status is not None:
+                manager.update_order_status(order.id, status, filled_amount=rng.uniform(0, order.amount))
+        
+        all_orders = list(manager.orders.values())
+        for symbol in symbols + [None]:
+            expected_open = [o for o in all_orders
+                             if o.status in (OrderStatus.PENDING, OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED)
+                             and (symbol is None or o.symbol == symbol)]
+            self.assertEqual(manager.get_open_orders(symbol), expected_open)
+            
+            history = [o for o in manager.order_history if symbol is None or o.symbol == symbol]
+            expected = sorted(history, key=lambda o: o.created_at, reverse=True)[:10]
+            self.assertEqual([o.created_at for o in manager.get_order_history(symbol, limit=10)],
+                             [o.created_at for o in expected])
+        
+        filled = [o for o in all_orders if o.status == OrderStatus.FILLED]
+        stats = manager.get_statistics()
+        self.assertEqual(stats['total_orders'], 200)
+        self.assertEqual(stats['filled_orders'], len(filled))
+        self.assertEqual(stats['buy_orders'], len([o for o in filled if o.side == OrderManagerSide.BUY]))
+        self.assertAlmostEqual(stats['total_volume'], sum(o.filled_amount for o in filled))
+    
+    def test_position_tracker(self):
+        """Symbol lookups, closed positions and P&L aggregates"""
+        tracker = PositionTracker()
+        for i in range(30):
+            position = tracker.open_position(['BTC/USDT', 'ETH/USDT'][i % 2],
+                                             PositionSide.LONG if i % 3 else PositionSide.SHORT,
+                                             100.0, 1.0)
+            position.timestamp = datetime(2024, 1, 1) + timedelta(hours=(i * 7) % 30)
+            if i % 4 == 0:
+                tracker.close_position(position.id, 100.0 + (i % 5) - 2)
+        
+        self.assertEqual(tracker.get_positions_by_symbol('ETH/USDT'),
+                         [p for p in tracker.positions.values() if p.symbol == 'ETH/USDT'])
+        self.assertEqual([p.id for p in tracker.get_closed_positions(limit=3)],
+                         [p.id for p in sorted(tracker.closed_positions,
+                                               key=lambda p: p.timestamp, reverse=True)[:3]])
+        
+        stats = tracker.get_statistics()
+        self.assertAlmostEqual(stats['realized_pnl'],
+                               sum(p.realized_pnl for p in tracker.closed_positions))
+        self.assertEqual(stats['winning_trades'],
+                         len([p for p in tracker.closed_positions if p.realized_pnl > 0]))
+        self.assertEqual(stats['short_positions'],
+                         len([p for p in tracker.positions.values() if p.side == PositionSide.SHORT]))
+
+
+class TestExecutionSimulator(unittest.TestCase):
+    """Test simulated TWAP/VWAP/POV execution"""
+    
+    def setUp(self):
+        """Eight hours of one-minute candles"""
+        rng = np.random.default_rng(21)
+        n = 480
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+        self.data = pd.DataFrame({
+            'open': close,
+            'high': close * 1.0005,
+            'low': close * 0.9995,
+            'close': close,
+            'volume': rng.uniform(5, 50, n)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='min'))
+        self.free = ImpactModel(spread_bps=0, temporary_bps=0, permanent_bps=0, max_participation=1.0)
+    
+    def test_frictionless_twap_pays_the_path(self):
+        """Without impact a TWAP buys at the candles' typical prices"""
+        twap = TWAPExecutor('BTC/USDT', OrderManagerSide.BUY, 1.0, duration_minutes=60, interval_seconds=300)
+        perf = ExecutionSimulator(self.data, self.free).run(twap, start=self.data.index[10])
+        
+        window = self.data.iloc[10:70:5]
+        typical = ((window['high'] + window['low'] + window['close']) / 3).mean()
+        self.assertAlmostEqual(perf.avg_executed_price, typical, places=6)
+        self.assertEqual(perf.target_price, self.data['open'].iloc[10])
+        self.assertEqual((perf.orders_placed, perf.orders_filled), (12, 12))
+        self.assertAlmostEqual(perf.completion_percent, 100.0, places=4)
+        self.assertEqual(perf.market_impact_bps, 0.0)
+        self.assertAlmostEqual(perf.implementation_shortfall_bps,
+                               (typical / perf.target_price - 1) * 10000, places=6)
+        self.assertEqual(twap.status, AlgoStatus.COMPLETED)
+    
+    def test_impact_grows_with_size(self):
+        """Bigger parents cost more, on both sides"""
+        sim = ExecutionSimulator(self.data, ImpactModel(max_participation=1.0))
+        costs = {}
+        for side in (OrderManagerSide.BUY, OrderManagerSide.SELL):
+            for amount in (1.0, 50.0):
+                twap = TWAPExecutor('BTC/USDT', side, amount, duration_minutes=60, interval_seconds=60)
+                costs[side, amount] = sim.run(twap).market_impact_bps
+        for side in (OrderManagerSide.BUY, OrderManagerSide.SELL):
+            self.assertGreater(costs[side, 50.0], costs[side, 1.0])
+            self.assertGreater(costs[side, 1.0], 0)
+    
+    def test_volume_cap_rolls_and_expires(self):
+        """Children beyond the bar volume cap roll forward, the rest is opportunity cost"""
+        self.data['volume'] = 10.0
+        sim = ExecutionSimulator(self.data, ImpactModel(max_participation=0.1))
+        twap = TWAPExecutor('BTC/USDT', OrderManagerSide.BUY, 30.0, duration_minutes=10, interval_seconds=300)
+        perf = sim.run(twap)
+        
+        # One unit per bar for ten bars, all taken by the first child still rolling
+        self.assertAlmostEqual(perf.volume_executed, 10.0)
+        self.assertAlmostEqual(perf.volume_remaining, 20.0)
+        self.assertEqual(twap.status, AlgoStatus.CANCELLED)
+        self.assertEqual([order.filled_amount for order in twap.slices], [10.0, 0.0])
+        self.assertEqual([order.status for order in twap.slices],
+                         [OrderStatus.PARTIALLY_FILLED, OrderStatus.EXPIRED])
+        
+        opportunity = (self.data['close'].iloc[9] / perf.target_price - 1) * 10000
+        self.assertAlmostEqual(perf.implementation_shortfall_bps,
+                               (perf.slippage_bps * 10 + opportunity * 20) / 30)
+    
+    def test_pov_tracks_participation(self):
+        """POV trades its target share of the volume on market time"""
+        pov = POVExecutor('BTC/USDT', OrderManagerSide.SELL, 1000.0, target_pov=0.05,
+                          min_interval_seconds=120, max_duration_minutes=60)
+        perf = ExecutionSimulator(self.data, self.free).run(pov)
+        
+        self.assertEqual(pov.slices_placed, 30)
+        self.assertAlmostEqual(pov.volume_executed / pov.volume_observed, 0.05, delta=0.005)
+        self.assertLess(perf.completion_percent, 100)
+        self.assertEqual(perf.end_time, self.data.index[59].to_pydatetime())
+    
+    def test_run_many_with_trades(self):
+        """Trade prints work as market data and run_many reports every parent"""
+        trades = pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=600, freq='10s'),
+            'price': 100.0,
+            'amount': 2.0,
+        })
+        sim = ExecutionSimulator(trades)
+        parents = [
+            (TWAPExecutor('ETH/USDT', 'buy', 1.0, duration_minutes=30, interval_seconds=60), trades['timestamp'][0]),
+            (VWAPExecutor('ETH/USDT', 'sell', 1.0, duration_minutes=60), trades['timestamp'][100]),
+            POVExecutor('ETH/USDT', 'buy', 1.0, min_interval_seconds=10),
+        ]
+        report = sim.run_many(parents)
+        
+        self.assertEqual(list(report['algo']), ['twap', 'vwap', 'pov'])
+        self.assertTrue((report['shortfall_bps'] > 0).all())
+        self.assertTrue((report['arrival_price'] == 100.0).all())
+        summary = ExecutionSimulator.summarize(report)
+        self.assertEqual(list(summary['parents']), [1, 1, 1])
+
+
+class TestExecutionRuntime(unittest.TestCase):
+    """Test the timer scheduler and the scheduler-driven execution engine"""
+    
+    def setUp(self):
+        """Scheduler on a manual clock, engine collecting released orders"""
+        self.now = 1_700_000_000.0
+        self.scheduler = TimerScheduler(clock=lambda: self.now)
+        self.released = []
+        self.engine = ExecutionEngine(self.scheduler,
+                                      on_order=lambda eid, order: self.released.append((eid, order)))
+    
+    def advance(self, seconds):
+        self.now += seconds
+        return self.scheduler.run_due()
+    
+    def test_timers_fire_in_order_and_cancel(self):
+        """Due timers fire by time; cancelled ones never do"""
+        fired = []
+        self.scheduler.call_later(5, fired.append, 'b')
+        self.scheduler.call_later(1, fired.append, 'a')
+        handle = self.scheduler.call_later(3, fired.append, 'x')
+        self.scheduler.call_later(10, fired.append, 'c')
+        handle.cancel()
+        self.assertEqual(self.scheduler.pending(), 3)
+        self.assertEqual(self.scheduler.next_deadline(), self.now + 1)
+        
+        self.assertEqual(self.advance(6), 2)
+        self.assertEqual(fired, ['a', 'b'])
+        self.advance(10)
+        self.assertEqual(fired, ['a', 'b', 'c'])
+        self.assertEqual(self.scheduler.pending(), 0)
+    
+    def test_cancel_after_fire_is_noop(self):
+        """Cancelling a handle that already fired leaves the counts alone"""
+        handle = self.scheduler.call_later(1, lambda: None)
+        self.scheduler.call_later(5, lambda: None)
+        self.advance(2)
+        handle.cancel()
+        handle.cancel()
+        self.assertEqual(self.scheduler.pending(), 1)
+        
+        # POV expiry cancels the timer that is firing
+        eid = self.engine.start_pov('ETH/USDT', OrderManagerSide.SELL, 100.0, target_pov=0.1)
+        self.advance(480 * 60)
+        self.assertIsNone(self.engine.get_execution(eid))
+        self.assertEqual(self.scheduler.pending(), 0)
+    
+    def test_synchronous_fills_finish_on_last_slice(self):
+        """An on_order that fills at once completes the execution cleanly"""
+        engine = ExecutionEngine(self.scheduler)
+        engine.on_order = lambda eid, order: engine.on_fill(eid, order, order.amount, 50000.0)
+        eid = engine.start_twap('BTC/USDT', OrderManagerSide.BUY, 1.0,
+                                duration_minutes=1, interval_seconds=30)
+        with self.assertNoLogs('execution.scheduler', level='ERROR'):
+            self.scheduler.run_due()
+            self.advance(30)
+        self.assertIsNone(engine.get_execution(eid))
+        self.assertEqual(engine.orders_released, 2)
+        self.assertEqual(len(engine.performance_history), 1)
+        self.assertEqual(self.scheduler.pending(), 0)
+    
+    def test_twap_slices_released_on_interval(self):
+        """A TWAP releases one slice per interval from one timer"""
+        eid = self.engine.start_twap('BTC/USDT', OrderManagerSide.BUY, 1.0,
+                                     duration_minutes=2, interval_seconds=30)
+        self.scheduler.run_due()
+        self.assertEqual(len(self.released), 1)
+        self.advance(29)
+        self.assertEqual(len(self.released), 1)
+        self.advance(1)
+        self.assertEqual(len(self.released), 2)
+        self.assertEqual(self.scheduler.pending(), 1)
+        self.advance(120)
+        self.assertEqual([order.metadata['twap_slice'] for _, order in self.released], [1, 2, 3, 4])
+        self.assertEqual(self.scheduler.pending(), 0)
+        
+        for _, order in self.released:
+            self.engine.on_fill(eid, order, order.amount, 50000.0)
+        self.assertIsNone(self.engine.get_execution(eid))
+        self.assertEqual(len(self.engine.performance_history), 1)
+        self.assertEqual(self.engine.performance_history[0].avg_executed_price, 50000.0)
+    
+    def test_thousands_of_algos_share_one_heap(self):
+        """Each running algo holds one timer; cancelling stops its slices"""
+        ids = [self.engine.start_twap('BTC/USDT', OrderManagerSide.BUY, 1.0,
+                                      duration_minutes=10, interval_seconds=60) for _ in range(2000)]
+        self.assertEqual(len(set(ids)), 2000)
+        self.assertEqual(self.scheduler.pending(), 2000)
+        self.scheduler.run_due()
+        self.advance(60)
+        self.assertEqual(len(self.released), 4000)
+        
+        for eid in ids[:1000]:
+            self.engine.cancel_execution(eid)
+        self.assertEqual(self.scheduler.pending(), 1000)
+        self.advance(60)
+        self.assertEqual(len(self.released), 5000)
+    
+    def test_pov_sized_on_volume_updates(self):
+        """POV trades its share of volume seen since its last slice"""
+        eid = self.engine.start_pov('ETH/USDT', OrderManagerSide.SELL, 100.0, target_pov=0.1)
+        self.assertEqual(self.engine.on_market_data('ETH/USDT', volume=50.0)[0].amount, 5.0)
+        self.now += 30
+        self.assertEqual(self.engine.on_market_data('ETH/USDT', volume=40.0), [])
+        self.assertEqual(self.engine.on_market_data('BTC/USDT', volume=1000.0), [])
+        self.now += 30
+        orders = self.engine.on_market_data('ETH/USDT', volume=20.0)
+        self.assertAlmostEqual(orders[0].amount, 6.0)
+        self.assertEqual([e for e, _ in self.released], [eid, eid])
+        
+        # Expires after max_duration_minutes
+        self.advance(480 * 60)
+        self.assertIsNone(self.engine.get_execution(eid))
+        self.assertEqual(self.engine.on_market_data('ETH/USDT', volume=1000.0), [])
+    
+    def test_trailing_stops_driven_by_prices(self):
+        """Prices routed through the engine trigger trailing stops once"""
+        advanced = AdvancedOrderManager()
+        advanced.start()
+        self.engine.advanced_orders = advanced
+        advanced.create_trailing_stop('BTC/USDT', OrderManagerSide.SELL, 1.0, trail_amount=100)
+        advanced.create_trailing_stop('ETH/USDT', OrderManagerSide.SELL, 1.0, trail_amount=10)
+        
+        for price in (50000, 50300, 50250):
+            self.assertEqual(self.engine.on_market_data('BTC/USDT', price=price), [])
+        orders = self.engine.on_market_data('BTC/USDT', price=50200)
+        self.assertEqual(len(orders), 1)
+        self.assertEqual(orders[0].metadata['stop_price'], 50200)
+        self.assertEqual(self.engine.on_market_data('BTC/USDT', price=40000), [])
+        self.assertEqual(len(advanced.trailing_stops), 1)
+    
+    def test_async_run_wakes_for_earlier_timers(self):
+        """run() sleeps until the next deadline and wakes for earlier timers"""
+        scheduler = TimerScheduler()
+        fired = []
+        
+        async def scenario():
+            task = asyncio.create_task(scheduler.run())
+            scheduler.call_later(5.0, fired.append, 'late')
+            await asyncio.sleep(0.01)
+            scheduler.call_later(0.02, fired.append, 'early')
+            await asyncio.sleep(0.1)
+            scheduler.stop()
+            await asyncio.wait_for(task, 1.0)
+        
+        started = time.time()
+        asyncio.run(scenario())
+        self.assertEqual(fired, ['early'])
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(scheduler.pending(), 1)
+
+
+class TestTriggerBook(unittest.TestCase):
+    """Price-indexed triggers match checking every position/order"""
+    
+    def test_crossed_and_pop(self):
+        """Only crossed levels are returned; pop removes them"""
+        book = TriggerBook()
+        book.add('sl', 'BTC/USDT', 48000, BELOW)
+        book.add('tp', 'BTC/USDT', 55000, ABOVE)
+        book.add('eth', 'ETH/USDT', 3000, BELOW)
+        self.assertEqual(book.crossed('BTC/USDT', 50000), [])
+        self.assertEqual(book.crossed('BTC/USDT', 48000), ['sl'])
+        self.assertEqual(book.crossed('BTC/USDT', 56000), ['tp'])
+        
+        book.add('sl', 'BTC/USDT', 49000, BELOW)
+        self.assertEqual(book.pop_crossed('BTC/USDT', 48500), ['sl'])
+        self.assertEqual(book.crossed('BTC/USDT', 1), [])
+        self.assertEqual(len(book), 2)
+        self.assertTrue(book.remove('tp'))
+        self.assertFalse(book.remove('tp'))
+        with self.assertRaises(ValueError):
+            book.add('x', 'BTC/USDT', 1, 'sideways')
+    
+    def test_position_exits_match_scan(self):
+        """check_exit_conditions equals Position.should_exit over all positions"""
+        rng = np.random.default_rng(23)
+        tracker = PositionTracker()
+        for i in range(300):
+            side = PositionSide.LONG if i % 2 else PositionSide.SHORT
+            entry = rng.uniform(90, 110)
+            sl = entry * (0.95 if side == PositionSide.LONG else 1.05) if i % 7 else None
+            tp = entry * (1.08 if side == PositionSide.LONG else 0.92) if i % 5 else None
+            position = tracker.open_position(['A', 'B'][i % 3 == 0], side, entry, 1.0, sl, tp)
+            position.id = f"p{i}"
+        # Re-key by the test ids so the result is easy to compare
+        tracker = self._reindexed(tracker)
+        
+        def scan(prices):
+            return {(p.id, p.should_exit(prices[p.symbol])) for p in tracker.positions.values()
+                    if p.symbol in prices and p.should_exit(prices[p.symbol])}
+        
+        for _ in range(50):
+            prices = {'A': rng.uniform(80, 120), 'B': rng.uniform(80, 120)}
+            self.assertEqual(set(tracker.check_exit_conditions(prices)), scan(prices))
+            position_id = f"p{rng.integers(300)}"
+            if position_id in tracker.positions:
+                if rng.random() < 0.5:
+                    tracker.close_position(position_id, 100.0)
+                else:
+                    tracker.set_exit_levels(position_id, stop_loss=rng.uniform(80, 120))
+    
+    def _reindexed(self, tracker):
+        fresh = PositionTracker()
+        for position in tracker.positions.values():
+            fresh._add_open(position)
+        return fresh
+    
+    def test_trailing_stops_match_update_price(self):
+        """on_price gives the same triggers and stop prices as per-order updates"""
+        rng = np.random.default_rng(24)
+        manager = AdvancedOrderManager()
+        manager.start()
+        reference = {}
+        for i in range(200):
+            side = OrderManagerSide.SELL if i % 2 else OrderManagerSide.BUY
+            trail = {'trail_amount': rng.uniform(1, 20)} if i % 3 else {'trail_percent': rng.uniform(1, 20)}
+            trailing = manager.create_trailing_stop('BTC/USDT', side, 1.0, **trail)
+            stop_id = [k for k, v in manager.trailing_stops.items() if v is trailing][0]
+            reference[stop_id] = TrailingStopOrder('BTC/USDT', side, 1.0, **trail)
+        
+        prices = 100 + np.cumsum(rng.normal(0, 0.5, 400))
+        for price in prices:
+            expected = set()
+            for stop_id, trailing in list(reference.items()):
+                if trailing.update_price(price) is not None:
+                    expected.add(stop_id)
+                    del reference[stop_id]
+            triggered = manager.on_price('BTC/USDT', price)
+            self.assertEqual({stop_id for stop_id, _ in triggered}, expected)
+        
+        self.assertEqual(set(manager.trailing_stops), set(reference))
+        self.assertGreater(len(reference), 0)
+        for stop_id, trailing in reference.items():
+            self.assertEqual(manager.trailing_stops[stop_id].stop_price, trailing.stop_price)
+        
+        # Single-stop updates keep the book in step
+        stop_id = next(iter(reference))
+        manager.update_trailing_stop(stop_id, prices[-1] + 50)
+        reference[stop_id].update_price(prices[-1] + 50)
+        self.assertEqual(manager.trailing_stops[stop_id].stop_price, reference[stop_id].stop_price)
+    
+    def test_bracket_exits(self):
+        """A filled bracket's exit fires once when its level is crossed"""
+        manager = AdvancedOrderManager()
+        manager.start()
+        long = manager.create_bracket('BTC/USDT', OrderManagerSide.BUY, 1.0, stop_loss=48000,
+                                      take_profit=55000, entry_price=50000)
+        short = manager.create_bracket('BTC/USDT', OrderManagerSide.SELL, 1.0, stop_loss=52000,
+                                       take_profit=45000, entry_price=50000)
+        long_id, short_id = long.entry_order.id, short.entry_order.id
+        
+        self.assertEqual(manager.on_price('BTC/USDT', 40000), [])
+        self.assertEqual(manager.on_bracket_entry_filled(long_id), [long.stop_order, long.profit_order])
+        manager.on_bracket_entry_filled(short_id)
+        
+        self.assertEqual(manager.on_price('BTC/USDT', 51000), [])
+        self.assertEqual(manager.on_price('BTC/USDT', 56000),
+                         [(long_id, long.profit_order), (short_id, short.stop_order)])
+        self.assertEqual(manager.on_price('BTC/USDT', 40000), [])
+
+
+class TestVolumeProfile(unittest.TestCase):
+    """Test volume profiles learned from candles"""
+    
+    def setUp(self):
+        """Forty days of 5m candles with an afternoon volume peak and quiet weekends"""
+        rng = np.random.default_rng(3)
+        index = pd.date_range('2026-01-05', periods=40 * 288, freq='5min')
+        minutes = (index.hour * 60 + index.minute).to_numpy()
+        weekday = index.weekday.to_numpy() < 5
+        self.seasonal = 1 + 3 * np.exp(-((minutes - 885) / 60) ** 2) + weekday
+        volume = self.seasonal * rng.lognormal(0, 0.3, len(index))
+        price = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+        self.data = pd.DataFrame({'open': price, 'high': price * 1.001, 'low': price * 0.999,
+                                  'close': price, 'volume': volume}, index=index)
+        self.train, self.replay = self.data[:30 * 288], self.data[30 * 288:]
+        self.tmpdir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_learned_shares_follow_volume(self):
+        """Bucket shares match the average daily volume curve"""
+        profile = HistoricalVolumeProfile.from_candles(self.train, 'BTC/USDT', bucket_minutes=60)
+        
+        self.assertEqual(profile.days, 30)
+        self.assertEqual(profile.buckets, 24)
+        self.assertAlmostEqual(profile.shares.sum(), 1.0)
+        self.assertEqual(int(np.argmax(profile.shares)), 14)
+        
+        volume = self.train['volume']
+        daily = volume.groupby([volume.index.date, volume.index.hour]).sum().unstack()
+        expected = (daily.div(daily.sum(axis=1), axis=0)).mean().to_numpy()
+        np.testing.assert_allclose(profile.shares, expected)
+    
+    def test_partial_days_and_weekdays(self):
+        """Incomplete days are dropped; weekday curves keep their level"""
+        partial = self.train.iloc[100:-50]
+        profile = HistoricalVolumeProfile.from_candles(partial, bucket_minutes=30, by_weekday=True)
+        
+        self.assertEqual(profile.days, 28)
+        self.assertEqual(profile.shares.shape, (7, 48))
+        np.testing.assert_allclose(profile.shares.sum(axis=1), 1.0)
+        # Weekday volume adds a flat level, so the weekend peak is sharper
+        self.assertGreater(profile.shares[5].max(), profile.shares[0].max())
+    
+    def test_window_crosses_midnight(self):
+        """Window shares cover the buckets the execution runs in"""
+        profile = HistoricalVolumeProfile.from_candles(self.train, bucket_minutes=30)
+        
+        shares = profile.window(pd.Timestamp('2026-03-01 23:00'), 120, 30)
+        expected = profile.shares[[46, 47, 0, 1]]
+        np.testing.assert_allclose(shares, expected / expected.sum())
+        
+        aware = profile.window(pd.Timestamp('2026-03-01 14:00', tz='Europe/Berlin'), 60, 30)
+        np.testing.assert_allclose(aware, profile.window(pd.Timestamp('2026-03-01 13:00'), 60, 30))
+    
+    def test_vwap_slices_follow_learned_profile(self):
+        """VWAPExecutor sizes slices from the profile at its start time"""
+        profile = HistoricalVolumeProfile.from_candles(self.train, bucket_minutes=30)
+        start = datetime(2026, 3, 2, 12, 0)
+        # The default participation rate doesn't rescale the slices
+        vwap = VWAPExecutor('BTC/USDT', OrderSide.BUY, 8.0, duration_minutes=240,
+                            volume_profile=profile, start_time=start)
+        
+        slices = vwap.generate_slices()
+        amounts = np.array([order.amount for order in slices])
+        
+        self.assertEqual(len(slices), 8)
+        self.assertAlmostEqual(amounts.sum(), 8.0)
+        np.testing.assert_allclose(amounts / 8.0, profile.window(start, 240, 30), atol=1e-8)
+        self.assertEqual(int(np.argmax(amounts)), 5)   # 14:30 bucket
+    
+    def test_learned_profile_tracks_replayed_volume(self):
+        """Learned schedules track market volume better than the default curve"""
+        profile = HistoricalVolumeProfile.from_candles(self.train, bucket_minutes=30)
+        default = MarketVolumeProfile(intervals=8).volume_distribution
+        starts = pd.date_range(self.replay.index[0], periods=55, freq='4h')
+        
+        learned = replay_tracking_error(self.replay, lambda s: profile.window(s, 240, 30),
+                                        starts, 240, 30)
+        baseline = replay_tracking_error(self.replay, lambda s: default, starts, 240, 30)
+        
+        self.assertEqual(learned['windows'], 55)
+        self.assertLess(learned['volume_error'], baseline['volume_error'] / 2)
+        self.assertLess(learned['price_error_bps'], baseline['price_error_bps'])
+    
+    def test_store_caches_profiles(self):
+        """Profiles are learned once per candle range and re-read from disk"""
+        candles = CandleStore(f'{self.tmpdir.name}/candles')
+        candles.write('binance', 'BTC/USDT', '5m', self.train)
+        store = VolumeProfileStore(candles, f'{self.tmpdir.name}/profiles')
+        
+        first = store.get('binance', 'BTC/USDT', '5m', days=30)
+        second = VolumeProfileStore(candles, f'{self.tmpdir.name}/profiles').get(
+            'binance', 'BTC/USDT', '5m', days=30)
+        
+        self.assertEqual(store.get_stats()['misses'], 1)
+        np.testing.assert_allclose(first.shares, second.shares)
+        self.assertEqual(second.days, first.days)
+        
+        # New candles change the key
+        candles.write('binance', 'BTC/USDT', '5m', self.replay[:288])
+        store.get('binance', 'BTC/USDT', '5m', days=30)
+        self.assertEqual(store.get_stats()['misses'], 2)
+        
+        by_weekday = store.get('binance', 'BTC/USDT', '5m', days=30, by_weekday=True)
+        self.assertTrue(by_weekday.by_weekday)
+
+
+class TestMetricsCollector(unittest.TestCase):
+    """Test per-metric ring buffers"""
+    
+    def setUp(self):
+        self.collector = MetricsCollector(max_history=50)
+        self.start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=200)
+        self.values = np.random.RandomState(3).uniform(-10, 10, 180)
+        for i, value in enumerate(self.values):
+            self.collector.record('pnl', value, {'i': i},
+                                  timestamp=self.start + timedelta(minutes=i))
+        self.collector.record('latency', 5.0)
+    
+    def test_window_statistics(self):
+        """Statistics cover the last max_history samples of each metric"""
+        stats = self.collector.get_statistics()
+        window = self.values[-50:]
+        
+        self.assertEqual(stats['pnl']['count'], 50)
+        self.assertEqual(stats['pnl']['latest'], window[-1])
+        self.assertEqual(stats['pnl']['min'], window.min())
+        self.assertEqual(stats['pnl']['max'], window.max())
+        self.assertAlmostEqual(stats['pnl']['avg'], window.mean())
+        self.assertEqual(stats['latency']['count'], 1)
+    
+    def test_latest_and_range(self):
+        """Latest sample and time range queries"""
+        latest = self.collector.get_latest('pnl')
+        self.assertEqual(latest.value, self.values[-1])
+        self.assertEqual(latest.labels, {'i': 179})
+        self.assertEqual(latest.timestamp, self.start + timedelta(minutes=179))
+        self.assertIsNone(self.collector.get_latest('missing'))
+        
+        # Minute 200 is now, so the last 31 minutes hold samples 170..179
+        recent = self.collector.get_range('pnl', minutes=31)
+        self.assertEqual([m.labels['i'] for m in recent], list(range(170, 180)))
+        self.assertAlmostEqual(self.collector.get_average('pnl', minutes=31),
+                               self.values[170:].mean())
+        self.assertEqual(self.collector.get_range('missing'), [])
+    
+    def test_running_extremes_match_window(self):
+        """Min/max stay exact for constant, monotonic and tied series"""
+        streams = {
+            'constant': np.ones(200),
+            'rising': np.arange(200.0),
+            'falling': -np.arange(200.0),
+            'ties': np.random.RandomState(5).randint(0, 4, 200).astype(float),
+        }
+        for name, values in streams.items():
+            for i, value in enumerate(values):
+                self.collector.record(name, value, timestamp=self.start + timedelta(seconds=i))
+                window = values[max(0, i - 49):i + 1]
+                stats = self.collector.series[name].statistics()
+                self.assertEqual((stats['min'], stats['max']), (window.min(), window.max()), name)
+    
+    def test_timestamps_in_order(self):
+        """Older samples are kept at the latest time; aware timestamps are stored as UTC"""
+        latest = self.collector.get_latest('pnl').timestamp
+        self.collector.record('pnl', 100.0, timestamp=self.start)
+        self.assertEqual(self.collector.get_latest('pnl').timestamp, latest)
+        self.assertEqual(self.collector.get_statistics()['pnl']['max'], 100.0)
+        self.assertEqual(len(self.collector.get_range('pnl', minutes=31)), 11)
+        
+        # A clock step back doesn't break the default timestamp either
+        self.collector.record('latency', 6.0, timestamp=datetime.now(timezone.utc) + timedelta(hours=1))
+        self.collector.record('latency', 7.0)
+        self.assertEqual(self.collector.get_statistics()['latency']['count'], 3)
+        
+        aware = datetime(2026, 3, 1, 14, 0, tzinfo=timezone(timedelta(hours=1)))
+        self.collector.record('fill', 1.0, timestamp=aware)
+        self.assertEqual(self.collector.get_latest('fill').timestamp, datetime(2026, 3, 1, 13, 0))
+
+
+class TestTradingLoop(unittest.TestCase):
+    """Test the candle-close driven trading loop"""
+
+    def _recording(self, strategy, calls):
+        original = strategy.generate_signals
+
+        def generate(data):
+            calls.append((strategy.symbols[0], data.index[-1], len(data)))
+            return original(data)
+
+        strategy.generate_signals = generate
+        return strategy
+
+    def test_candle_close_after(self):
+        """Next close is the following timeframe boundary"""
+        self.assertEqual(candle_close_after(3600 * 5 + 10, '1h'), 3600 * 6)
+        self.assertEqual(candle_close_after(3600 * 6, '1h'), 3600 * 7)
+        self.assertEqual(candle_close_after(125, '1m'), 180)
+
+    def test_strategies_run_once_per_bar(self):
+        """Each closed bar reaches its strategies exactly once"""
+        calls = []
+        loop = TradingLoop(ReplayCandleFeed(history=50, bars=10))
+        loop.add_strategy(self._recording(BreakoutStrategy({}), calls), 'BTC/USDT', '1h')
+        asyncio.run(loop.run())
+
+        self.assertEqual(loop.bars_processed, 10)
+        self.assertEqual(len(calls), 10)
+        timestamps = [c[1] for c in calls]
+        self.assertEqual(len(set(timestamps)), 10)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertTrue(all(c[2] == 50 for c in calls))
+        # The last bar is the most recently closed candle, not the forming one
+        last_open = int(time.time()) // 3600 * 3600
+        self.assertEqual(timestamps[-1], pd.Timestamp(last_open - 3600, unit='s'))
+
+    def test_multiple_symbols_and_timeframes(self):
+        """Subscriptions share one loop and are interleaved by close time"""
+        calls = []
+        loop = TradingLoop(ReplayCandleFeed(history=30, bars=8))
+        loop.add_strategy(self._recording(BreakoutStrategy({}), calls), 'BTC/USDT', '1h')
+        loop.add_strategy(self._recording(MeanReversionStrategy({}), calls), 'ETH/USDT', '1h')
+        loop.add_strategy(self._recording(TrendFollowingStrategy({}), calls), 'ETH/USDT', '15m')
+        asyncio.run(loop.run())
+
+        self.assertEqual(loop.bars_processed, 24)
+        self.assertEqual(sum(1 for c in calls if c[0] == 'BTC/USDT'), 8)
+        self.assertEqual(sum(1 for c in calls if c[0] == 'ETH/USDT'), 16)
+        self.assertEqual(len(set(c[0] for c in calls[:8])), 2)
+
+    def test_signals_are_filtered_to_bar_symbol(self):
+        """Signals reach the handler with the symbol of their bar"""
+        received = []
+        loop = TradingLoop(ReplayCandleFeed(history=30, bars=20),
+                           on_signal=lambda strategy, signal, bar: received.append((signal, bar)))
+        for symbol in ('BTC/USDT', 'ETH/USDT'):
+            strategy = BreakoutStrategy({'lookback_period': 5, 'breakout_threshold': 0.0,
+                                         'volume_multiplier': 0.0})
+            strategy.generate_signals = Mock(side_effect=lambda data, s=strategy: [
+                Mock(symbol=s.symbols[0]), Mock(symbol='OTHER/USDT')
+            ])
+            loop.add_strategy(strategy, symbol, '1h')
+        asyncio.run(loop.run(max_bars=6))
+
+        self.assertEqual(loop.bars_processed, 6)
+        self.assertEqual(len(received), 6)
+        self.assertTrue(all(signal.symbol == bar.symbol for signal, bar in received))
+
+    def test_signals_recorded_once(self):
+        """The loop doesn't add a strategy's own signal history a second time"""
+        received = []
+        strategy = BreakoutStrategy({'lookback_period': 5, 'breakout_threshold': 0.0,
+                                     'volume_multiplier': 0.0})
+        loop = TradingLoop(ReplayCandleFeed(history=30, bars=20),
+                           on_signal=lambda strategy, signal, bar: received.append(signal))
+        loop.add_strategy(strategy, 'BTC/USDT', '1h')
+        asyncio.run(loop.run())
+
+        self.assertGreater(len(received), 0)
+        self.assertEqual(len({id(s) for s in strategy.signals}), len(strategy.signals))
+        self.assertTrue(all(any(s is r for s in strategy.signals) for r in received))
+
+    def test_strategy_errors_are_isolated(self):
+        """A failing strategy doesn't stop the others"""
+        calls = []
+        broken = BreakoutStrategy({})
+        broken.generate_signals = Mock(side_effect=ValueError('boom'))
+        loop = TradingLoop(ReplayCandleFeed(history=30, bars=5))
+        loop.add_strategy(broken, 'BTC/USDT', '1h')
+        loop.add_strategy(self._recording(BreakoutStrategy({}), calls), 'BTC/USDT', '1h')
+        asyncio.run(loop.run())
+        self.assertEqual(broken.generate_signals.call_count, 5)
+        self.assertEqual(len(calls), 5)
+
+    def test_polling_feed_wakes_on_candle_close(self):
+        """The polling feed sleeps to the boundary and emits the closed candle"""
+        boundary = candle_close_after(time.time(), '1m')
+        start = time.monotonic()
+        clock = Mock()
+        clock.time.side_effect = lambda: boundary - 0.2 + (time.monotonic() - start)
+
+        calls = []
+        feed = PollingCandleFeed(MockExchange(), history=20, grace=0.0)
+        loop = TradingLoop(feed)
+        loop.add_strategy(self._recording(BreakoutStrategy({}), calls), 'BTC/USDT', '1m')
+        with patch('trading.live.time', clock):
+            asyncio.run(loop.run(max_bars=1))
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][1], pd.Timestamp(boundary - 60, unit='s'))
+        self.assertEqual(calls[0][2], 20)
+
+    def test_streaming_feed(self):
+        """Pushed candles become bars; duplicates are ignored"""
+        feed = StreamingCandleFeed(history=3)
+        calls = []
+        loop = TradingLoop(feed)
+        loop.add_strategy(self._recording(BreakoutStrategy({}), calls), 'BTC/USDT', '1m')
+
+        async def run():
+            task = asyncio.create_task(loop.run(max_bars=3))
+            await asyncio.sleep(0)
+            candle = {'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 10}
+            for minute in (0, 1, 1, 2, 3):
+                feed.on_candle('BTC/USDT', '1m', pd.Timestamp('2024-01-01') + pd.Timedelta(minutes=minute), candle)
+            feed.on_candle('ETH/USDT', '1m', pd.Timestamp('2024-01-01'), candle)
+            await asyncio.wait_for(task, 2)
+
+        asyncio.run(run())
+        self.assertEqual([c[2] for c in calls], [1, 2, 3])
+        self.assertEqual(calls[-1][1], pd.Timestamp('2024-01-01 00:02'))
 
 
 class TestRiskConfig(unittest.TestCase):
@@ -444,11 +2718,35 @@ def run_tests():
     
     # Add all test classes
     suite.addTests(loader.loadTestsFromTestCase(TestTechnicalIndicators))
+    suite.addTests(loader.loadTestsFromTestCase(TestIncrementalIndicators))
+    suite.addTests(loader.loadTestsFromTestCase(TestIndicatorKernels))
     suite.addTests(loader.loadTestsFromTestCase(TestBreakoutStrategy))
     suite.addTests(loader.loadTestsFromTestCase(TestMeanReversionStrategy))
     suite.addTests(loader.loadTestsFromTestCase(TestTrendFollowingStrategy))
     suite.addTests(loader.loadTestsFromTestCase(TestRiskManager))
     suite.addTests(loader.loadTestsFromTestCase(TestStrategyEnsemble))
+    suite.addTests(loader.loadTestsFromTestCase(TestVectorizedBacktest))
+    suite.addTests(loader.loadTestsFromTestCase(TestPortfolioBacktest))
+    suite.addTests(loader.loadTestsFromTestCase(TestMLBatchInference))
+    suite.addTests(loader.loadTestsFromTestCase(TestIncrementalFeatures))
+    suite.addTests(loader.loadTestsFromTestCase(TestFeatureStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestCompactFeatures))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelTraining))
+    suite.addTests(loader.loadTestsFromTestCase(TestModelRegistry))
+    suite.addTests(loader.loadTestsFromTestCase(TestStrategyOptimizer))
+    suite.addTests(loader.loadTestsFromTestCase(TestCandleStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestSmartOrderRouter))
+    suite.addTests(loader.loadTestsFromTestCase(TestMarketDataCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestAsyncExchanges))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchOrders))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderJournal))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderIndexes))
+    suite.addTests(loader.loadTestsFromTestCase(TestExecutionSimulator))
+    suite.addTests(loader.loadTestsFromTestCase(TestExecutionRuntime))
+    suite.addTests(loader.loadTestsFromTestCase(TestTriggerBook))
+    suite.addTests(loader.loadTestsFromTestCase(TestVolumeProfile))
+    suite.addTests(loader.loadTestsFromTestCase(TestMetricsCollector))
+    suite.addTests(loader.loadTestsFromTestCase(TestTradingLoop))
     suite.addTests(loader.loadTestsFromTestCase(TestRiskConfig))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
     
@@ -0,0 +1,328 @@
+"""
+Event-Driven Trading Loop
+Runs strategies when a candle closes instead of polling on a fixed interval.
+
+A CandleFeed turns subscriptions (symbol, timeframe) into a stream of
+BarEvents, one per closed candle. TradingLoop drives any number of strategies
+over any number of symbols/timeframes from one asyncio loop, invoking each
+strategy only when a new bar of its subscription closes.
+
+Feeds:
+- PollingCandleFeed: sleeps until the next candle-close boundary and fetches
+  the closed candle (REST, optionally through CandleStore)
+- StreamingCandleFeed: push-based, fed by a websocket or other stream
+- ReplayCandleFeed: replays MockExchange history bar by bar (tests, demos)
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from trading.strategies.base import BaseStrategy, Signal
+from execution.exchanges.base import BaseExchange, MockExchange, timeframe_to_seconds, candle_close_after
+from execution.exchanges.candle_store import CandleStore
+
+
+Subscription = Tuple[str, str]   # (symbol, timeframe)
+
+
+@dataclass
+class BarEvent:
+    """A candle has closed"""
+    symbol: str
+    timeframe: str
+    timestamp: pd.Timestamp      # Open time of the closed candle
+    data: pd.DataFrame           # Recent closed candles, the new one last
+
+
+def _closed_candles(data: pd.DataFrame, timeframe: str, now: float) -> pd.DataFrame:
+    """Candles (indexed by open time) that have closed by `now`"""
+    if 'timestamp' in data.columns:
+        data = data.set_index('timestamp')
+    period_ns = timeframe_to_seconds(timeframe) * 1_000_000_000
+    close_ns = data.index.as_unit('ns').asi8 + period_ns
+    return data[close_ns <= int(now * 1_000_000_000)]
+
+
+class CandleFeed(ABC):
+    """Source of closed-candle events"""
+
+    @abstractmethod
+    def bars(self, subscriptions: List[Subscription]) -> AsyncIterator[BarEvent]:
+        """Yield a BarEvent for every candle that closes on a subscription"""
+        pass
+
+
+class PollingCandleFeed(CandleFeed):
+    """
+    REST feed scheduled on candle-close boundaries.
+
+    Sleeps until the earliest upcoming close across all subscriptions, then
+    fetches only the subscriptions closing at that moment. If the exchange
+    hasn't published the closed candle yet it is polled again every
+    retry_interval seconds.
+    """
+
+    def __init__(self, exchange: BaseExchange, store: CandleStore = None,
+                 history: int = 100, grace: float = 1.0,
+                 retry_interval: float = 1.0, max_retries: int = 10):
+        """
+        Args:
+            exchange: Exchange to fetch candles from
+            store: Optional CandleStore, so only new candles are downloaded
+            history: Candles passed to strategies on each bar
+            grace: Seconds to wait after the boundary before fetching
+            retry_interval: Seconds between polls for a late candle
+            max_retries: Polls before giving up on a candle
+        """
+        self.exchange = exchange
+        self.store = store
+        self.history = history
+        self.grace = grace
+        self.retry_interval = retry_interval
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+
+    def _fetch(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        # One extra candle: the last one returned is still forming
+        limit = self.history + 1
+        if self.store is not None:
+            return self.store.get_ohlcv(self.exchange, symbol, timeframe, limit=limit)
+        return self.exchange.get_ohlcv(symbol, timeframe, limit=limit)
+
+    async def bars(self, subscriptions: List[Subscription]) -> AsyncIterator[BarEvent]:
+        now = time.time()
+        # (fetch at, close time, retries, subscription)
+        schedule = [
+            (candle_close_after(now, tf) + self.grace, candle_close_after(now, tf), 0, (symbol, tf))
+            for symbol, tf in subscriptions
+        ]
+        heapq.heapify(schedule)
+        last_emitted: Dict[Subscription, pd.Timestamp] = {}
+
+        while schedule:
+            fetch_at = schedule[0][0]
+            await asyncio.sleep(max(0.0, fetch_at - time.time()))
+
+            due = []
+            while schedule and schedule[0][0] <= fetch_at:
+                due.append(heapq.heappop(schedule))
+
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._fetch, *entry[3]) for entry in due),
+                return_exceptions=True
+            )
+
+            for (_, close_time, retries, sub), data in zip(due, results):
+                symbol, tf = sub
+                event = None
+                if isinstance(data, Exception):
+                    self.logger.error(f"Error fetching {symbol} {tf}: {data}")
+                else:
+                    closed = _closed_candles(data, tf, close_time)
+                    if len(closed) and closed.index[-1] != last_emitted.get(sub):
+                        closed = closed.iloc[-self.history:]
+                        last_emitted[sub] = closed.index[-1]
+                        event = BarEvent(symbol, tf, closed.index[-1], closed)
+
+                if event is None and retries < self.max_retries:
+                    # The exchange hasn't published the closed candle yet
+                    heapq.heappush(schedule, (time.time() + self.retry_interval,
+                                              close_time, retries + 1, sub))
+                    continue
+
+                if event is None:
+                    self.logger.warning(f"No closed {tf} candle for {symbol} "
+                                        f"after {retries} retries")
+
+                next_close = candle_close_after(max(time.time(), close_time), tf)
+                heapq.heappush(schedule, (next_close + self.grace, next_close, 0, sub))
+
+                if event is not None:
+                    yield event
+
+
+class StreamingCandleFeed(CandleFeed):
+    """
+    Push-based feed for streaming sources such as exchange websockets.
+
+    The stream client calls on_candle() (from any thread) whenever a candle
+    closes; the feed keeps a rolling window per subscription and emits a
+    BarEvent for each new candle.
+    """
+
+    def __init__(self, history: int = 100):
+        self.history = history
+        self._windows: Dict[Subscription, Deque] = defaultdict(lambda: deque(maxlen=self.history))
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def seed(self, symbol: str, timeframe: str, data: pd.DataFrame):
+        """Fill a subscription's window with historical closed candles"""
+        if 'timestamp' in data.columns:
+            data = data.set_index('timestamp')
+        with self._lock:
+            window = self._windows[(symbol, timeframe)]
+            for timestamp, row in data.iloc[-self.history:].iterrows():
+                window.append((timestamp, row.to_dict()))
+
+    def on_candle(self, symbol: str, timeframe: str, timestamp, candle: Dict):
+        """
+        Record a closed candle.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            timestamp: Candle open time
+            candle: Dict with open/high/low/close/volume
+        """
+        timestamp = pd.Timestamp(timestamp)
+        with self._lock:
+            window = self._windows[(symbol, timeframe)]
+            if window and window[-1][0] >= timestamp:
+                return
+            window.append((timestamp, dict(candle)))
+            data = pd.DataFrame([c for _, c in window],
+                                index=pd.DatetimeIndex([t for t, _ in window], name='timestamp'))
+
+        if self._loop is not None:
+            event = BarEvent(symbol, timeframe, timestamp, data)
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    async def bars(self, subscriptions: List[Subscription]) -> AsyncIterator[BarEvent]:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        wanted = set(subscriptions)
+        try:
+            while True:
+                event = await self._queue.get()
+                if (event.symbol, event.timeframe) in wanted:
+                    yield event
+        finally:
+            self._loop = None
+
+
+class ReplayCandleFeed(CandleFeed):
+    """
+    Replays MockExchange candles as if they were closing live.
+
+    The first `history` candles are warm-up; each following candle becomes
+    one BarEvent. Subscriptions are interleaved by candle close time.
+    """
+
+    def __init__(self, exchange: MockExchange = None, history: int = 100,
+                 bars: int = 50, delay: float = 0.0):
+        """
+        Args:
+            exchange: Source of candles (default: a new MockExchange)
+            history: Candles passed to strategies on each bar
+            bars: Number of bars to replay per subscription
+            delay: Seconds to sleep between bars
+        """
+        self.exchange = exchange or MockExchange()
+        self.history = history
+        self.n_bars = bars
+        self.delay = delay
+
+    async def bars(self, subscriptions: List[Subscription]) -> AsyncIterator[BarEvent]:
+        frames = {}
+        replay = []
+        for symbol, tf in subscriptions:
+            data = self.exchange.get_ohlcv(symbol, tf, limit=self.history + self.n_bars + 1)
+            data = _closed_candles(data, tf, time.time())
+            frames[(symbol, tf)] = data
+            period = pd.Timedelta(seconds=timeframe_to_seconds(tf))
+            for i in range(max(len(data) - self.n_bars, 0) + 1, len(data) + 1):
+                replay.append((data.index[i - 1] + period, len(replay), (symbol, tf), i))
+
+        replay.sort()
+        for _, _, sub, end in replay:
+            data = frames[sub].iloc[max(0, end - self.history):end]
+            yield BarEvent(sub[0], sub[1], data.index[-1], data)
+            await asyncio.sleep(self.delay)
+
+
+def _bind_symbol(strategy: BaseStrategy, symbol: str):
+    """Point a strategy (and ensemble members) at one symbol"""
+    strategy.symbols = [symbol]
+    for member in getattr(strategy, 'strategies', []):
+        _bind_symbol(member, symbol)
+
+
+SignalHandler = Callable[[BaseStrategy, Signal, BarEvent], None]
+
+
+class TradingLoop:
+    """
+    Runs strategies on candle close across symbols and timeframes.
+
+    Example:
+        loop = TradingLoop(PollingCandleFeed(exchange, CandleStore()), on_signal=handle)
+        loop.add_strategy(BreakoutStrategy(config), 'BTC/USDT', '1h')
+        loop.add_strategy(MeanReversionStrategy(config), 'ETH/USDT', '15m')
+        asyncio.run(loop.run())
+    """
+
+    def __init__(self, feed: CandleFeed, on_signal: SignalHandler = None):
+        self.feed = feed
+        self.on_signal = on_signal
+        self.logger = logging.getLogger(__name__)
+        self.strategies: Dict[Subscription, List[BaseStrategy]] = defaultdict(list)
+        self.bars_processed = 0
+        self._stopped = False
+
+    def add_strategy(self, strategy: BaseStrategy, symbol: str, timeframe: str = None):
+        """
+        Run strategy on every closed candle of symbol/timeframe.
+
+        Strategies label their signals with their configured symbol, so an
+        instance is bound to `symbol`; use one instance per symbol.
+        """
+        _bind_symbol(strategy, symbol)
+        self.strategies[(symbol, timeframe or strategy.timeframe)].append(strategy)
+
+    def stop(self):
+        """Stop after the current bar"""
+        self._stopped = True
+
+    async def run(self, max_bars: int = None):
+        """
+        Process bars until stopped (or max_bars events have been handled).
+        """
+        self._stopped = False
+        subscriptions = list(self.strategies)
+        self.logger.info(f"Trading loop started for {subscriptions}")
+
+        bars = self.feed.bars(subscriptions)
+        try:
+            async for event in bars:
+                self._on_bar(event)
+                self.bars_processed += 1
+                if self._stopped or (max_bars and self.bars_processed >= max_bars):
+                    break
+        finally:
+            await bars.aclose()
+
+    def _on_bar(self, event: BarEvent):
+        for strategy in self.strategies[(event.symbol, event.timeframe)]:
+            try:
+                signals = strategy.generate_signals(event.data)
+            except Exception as e:
+                self.logger.error(f"Error in {strategy.name} on {event.symbol}: {e}")
+                continue
+
+            for signal in signals:
+                # Strategies emit for their configured symbols; only this bar's symbol applies
+                if signal.symbol != event.symbol:
+                    continue
+                if self.on_signal:
+                    self.on_signal(strategy, signal, event)
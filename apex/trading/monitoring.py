@@ -7,11 +7,14 @@ import logging
 import json
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import threading
 import time
 
+import numpy as np
+
 
 class AlertLevel(Enum):
     INFO = "info"
@@ -235,64 +238,178 @@ class AlertManager:
             self.logger.error(f"Error loading alerts: {e}")
 
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    """Exact integer encoding of a datetime (aware ones are converted to naive UTC)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(micros))
+
+
+class MetricSeries:
+    """
+    Fixed-capacity time series of one metric backed by NumPy arrays.
+    
+    Samples live in arrays of twice the capacity; when the end is reached
+    the newest window is copied back to the front, so the window is always
+    one contiguous slice (searchable with np.searchsorted) and appends stay
+    O(1) amortized. Count and sum are maintained as samples come and go,
+    min and max by monotonic deques of (sequence number, value), so none of
+    them rescans the window. Timestamps are kept in order: a sample older
+    than the latest one (a clock step back or a late backfill) is stored at
+    the latest timestamp.
+    """
+    
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self._times = np.empty(2 * capacity, dtype=np.int64)
+        self._values = np.empty(2 * capacity, dtype=np.float64)
+        self._labels = np.empty(2 * capacity, dtype=object)
+        self._start = 0
+        self._end = 0
+        self._sum = 0.0
+        self._head = 0                  # sequence number of the oldest sample
+        self._mins = deque()            # increasing values, front is the min
+        self._maxs = deque()            # decreasing values, front is the max
+    
+    def __len__(self) -> int:
+        return self._end - self._start
+    
+    def append(self, value: float, timestamp: datetime, labels: Dict):
+        """Add a sample, evicting the oldest one when full"""
+        micros = _to_micros(timestamp)
+        if len(self):
+            micros = max(micros, int(self._times[self._end - 1]))
+        
+        if len(self) == self.capacity:
+            self._sum -= self._values[self._start]
+            for extremes in (self._mins, self._maxs):
+                if extremes[0][0] == self._head:
+                    extremes.popleft()
+            self._labels[self._start] = None
+            self._start += 1
+            self._head += 1
+        
+        if self._end == len(self._values):
+            n = len(self)
+            self._times[:n] = self._times[self._start:self._end]
+            self._values[:n] = self._values[self._start:self._end]
+            self._labels[:n] = self._labels[self._start:self._end]
+            self._labels[n:] = None
+            self._start, self._end = 0, n
+        
+        self._times[self._end] = micros
+        self._values[self._end] = value
+        self._labels[self._end] = labels
+        self._end += 1
+        
+        self._sum += value
+        seq = self._head + len(self) - 1
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((seq, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((seq, value))
+    
+    def latest(self) -> Optional[Metric]:
+        if not len(self):
+            return None
+        return self._metric(self._end - 1)
+    
+    def since(self, cutoff: datetime) -> slice:
+        """Window positions with timestamp >= cutoff"""
+        times = self._times[self._start:self._end]
+        first = int(np.searchsorted(times, _to_micros(cutoff), side='left'))
+        return slice(self._start + first, self._end)
+    
+    def metrics(self, window: slice) -> List[Metric]:
+        return [self._metric(i) for i in range(window.start, window.stop)]
+    
+    def values(self, window: slice = None) -> np.ndarray:
+        window = window or slice(self._start, self._end)
+        return self._values[window]
+    
+    def statistics(self) -> Dict:
+        count = len(self)
+        return {
+            'count': count,
+            'latest': float(self._values[self._end - 1]),
+            'min': float(self._mins[0][1]),
+            'max': float(self._maxs[0][1]),
+            'avg': self._sum / count
+        }
+    
+    def _metric(self, i: int) -> Metric:
+        return Metric(
+            name=self.name,
+            value=float(self._values[i]),
+            timestamp=_from_micros(self._times[i]),
+            labels=self._labels[i]
+        )
+
+
 class MetricsCollector:
     """
     Collects and stores trading metrics.
+    
+    Each metric name has its own MetricSeries holding the last max_history
+    samples, so lookups never scan other metrics.
     """
     
     def __init__(self, max_history: int = 10000):
-        self.metrics: List[Metric] = []
+        self.series: Dict[str, MetricSeries] = {}
         self.max_history = max_history
         self._lock = threading.Lock()
     
-    def record(self, name: str, value: float, labels: Dict = None):
-        """Record a metric"""
+    def record(self, name: str, value: float, labels: Dict = None,
+               timestamp: datetime = None):
+        """Record a metric (naive timestamps are UTC; default: now)"""
         with self._lock:
-            metric = Metric(
-                name=name,
-                value=value,
-                labels=labels or {}
-            )
-            self.metrics.append(metric)
-            
-            # Trim old metrics
-            if len(self.metrics) > self.max_history:
-                self.metrics = self.metrics[-self.max_history:]
+            series = self.series.get(name)
+            if series is None:
+                series = self.series[name] = MetricSeries(name, self.max_history)
+            series.append(value, timestamp or datetime.now(timezone.utc), labels or {})
     
     def get_latest(self, name: str) -> Optional[Metric]:
         """Get the latest value for a metric"""
-        for metric in reversed(self.metrics):
-            if metric.name == name:
-                return metric
-        return None
+        with self._lock:
+            series = self.series.get(name)
+            return series.latest() if series else None
     
     def get_range(self, name: str, minutes: int = 60) -> List[Metric]:
         """Get metric values for the last N minutes"""
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        return [m for m in self.metrics if m.name == name and m.timestamp >= cutoff]
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        with self._lock:
+            series = self.series.get(name)
+            return series.metrics(series.since(cutoff)) if series else []
     
     def get_average(self, name: str, minutes: int = 60) -> Optional[float]:
         """Get average value for a metric over time period"""
-        values = [m.value for m in self.get_range(name, minutes)]
-        return sum(values) / len(values) if values else None
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        with self._lock:
+            series = self.series.get(name)
+            if not series:
+                return None
+            values = series.values(series.since(cutoff))
+            return float(values.mean()) if len(values) else None
     
     def get_statistics(self) -> Dict:
         """Get statistics for all metrics"""
-        stats = {}
-        metric_names = set(m.name for m in self.metrics)
-        
-        for name in metric_names:
-            values = [m.value for m in self.metrics if m.name == name]
-            if values:
-                stats[name] = {
-                    'count': len(values),
-                    'latest': values[-1],
-                    'min': min(values),
-                    'max': max(values),
-                    'avg': sum(values) / len(values)
-                }
-        
-        return stats
+        with self._lock:
+            return {
+                name: series.statistics()
+                for name, series in self.series.items()
+                if len(series)
+            }
 
 
 class SystemMonitor:
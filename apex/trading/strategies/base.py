@@ -10,6 +10,8 @@ from enum import Enum
 import pandas as pd
 from datetime import datetime
 
+from analysis.indicators.context import IndicatorContext
+
 
 class SignalType(Enum):
     BUY = "buy"
@@ -62,6 +64,8 @@ class BaseStrategy(ABC):
         self.symbols = config.get('symbols', ['BTC/USDT'])
         self.positions: List[Position] = []
         self.signals: List[Signal] = []
+        # Shared indicator cache, set by StrategyEnsemble for one tick
+        self.indicator_context: Optional[IndicatorContext] = None
         
     @abstractmethod
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -88,6 +92,38 @@ class BaseStrategy(ABC):
             List of Signal objects
         """
         pass
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Generate signals for every candle in a single pass (vectorized backtesting).
+
+        The value at row i must match what generate_signals() would emit when
+        called with data.iloc[:i+1], so indicators must only look backwards.
+
+        Args:
+            data: DataFrame with OHLCV data covering the whole backtest period
+
+        Returns:
+            Integer Series aligned to data.index: 1 = BUY, -1 = SELL, 0 = HOLD
+        """
+        raise NotImplementedError(f"{self.name} does not support vectorized signals")
+
+    @classmethod
+    def supports_signal_series(cls) -> bool:
+        """Whether the strategy implements generate_signal_series()"""
+        return cls.generate_signal_series is not BaseStrategy.generate_signal_series
+
+    def get_indicator_context(self, data: pd.DataFrame) -> IndicatorContext:
+        """
+        Get the indicator cache for this tick.
+        
+        Returns the context shared by an ensemble if one is attached and
+        built over the same candles, otherwise a fresh context over data.
+        """
+        context = self.indicator_context
+        if context is not None and context.covers(data):
+            return context
+        return IndicatorContext(data)
     
     def validate_data(self, data: pd.DataFrame) -> bool:
         """
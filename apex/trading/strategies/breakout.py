@@ -31,14 +31,15 @@ class BreakoutStrategy(BaseStrategy):
         """
         Calculate support, resistance, and volume indicators.
         """
+        context = self.get_indicator_context(data)
         df = data.copy()
         
         # Calculate support and resistance
-        df['resistance'] = df['high'].rolling(window=self.lookback).max()
-        df['support'] = df['low'].rolling(window=self.lookback).min()
+        df['resistance'] = context.rolling_max(self.lookback, 'high')
+        df['support'] = context.rolling_min(self.lookback, 'low')
         
         # Calculate average volume
-        df['avg_volume'] = df['volume'].rolling(window=self.lookback).mean()
+        df['avg_volume'] = context.sma(self.lookback, 'volume')
         
         # Calculate breakout thresholds
         df['resistance_break'] = df['close'] > df['resistance'].shift(1) * (1 + self.min_breakout_percent)
@@ -109,3 +110,25 @@ class BreakoutStrategy(BaseStrategy):
                 self.signals.append(signal)
         
         return signals
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of generate_signals() for every candle.
+        """
+        signals = pd.Series(0, index=data.index, dtype=np.int8)
+
+        if not self.validate_data(data) or len(data) < 2:
+            return signals
+
+        df = self.calculate_indicators(data)
+
+        volume_ok = df['volume_confirm'] if self.volume_confirm else True
+        buy = df['resistance_break'] & volume_ok
+        sell = ~df['resistance_break'] & df['support_break'] & volume_ok
+
+        signals[buy.to_numpy()] = 1
+        signals[sell.to_numpy()] = -1
+        # generate_signals() needs at least two candles
+        signals.iloc[0] = 0
+
+        return signals
@@ -4,10 +4,13 @@ Combines multiple strategies for consensus-based trading.
 """
 
 from typing import List, Dict
+from contextlib import contextmanager
 import logging
 import pandas as pd
 from datetime import datetime
 
+from analysis.indicators.context import IndicatorContext
+
 from .base import BaseStrategy, Signal, SignalType
 from .breakout import BreakoutStrategy
 from .mean_reversion import MeanReversionStrategy
@@ -48,23 +51,38 @@ class StrategyEnsemble(BaseStrategy):
         
         self.logger.info(f"Ensemble initialized with {len(self.strategies)} strategies")
     
+    @contextmanager
+    def shared_indicators(self, data: pd.DataFrame):
+        """Attach one indicator cache over data to every component strategy"""
+        context = IndicatorContext(data)
+        for strategy in self.strategies:
+            strategy.indicator_context = context
+        try:
+            yield context
+        finally:
+            for strategy in self.strategies:
+                strategy.indicator_context = None
+    
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate indicators for all component strategies"""
-        for strategy in self.strategies:
-            data = strategy.calculate_indicators(data)
+        with self.shared_indicators(data):
+            for strategy in self.strategies:
+                data = strategy.calculate_indicators(data)
         return data
     
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         """Generate consensus-based signals"""
         all_signals: List[Signal] = []
         
-        # Collect signals from all strategies
-        for strategy in self.strategies:
-            try:
-                signals = strategy.generate_signals(data)
-                all_signals.extend(signals)
-            except Exception as e:
-                self.logger.error(f"Error in {strategy.name}: {e}")
+        # Collect signals from all strategies, computing shared indicators once
+        with self.shared_indicators(data) as context:
+            for strategy in self.strategies:
+                try:
+                    signals = strategy.generate_signals(data)
+                    all_signals.extend(signals)
+                except Exception as e:
+                    self.logger.error(f"Error in {strategy.name}: {e}")
+            self.logger.debug(f"Indicator cache: {context.hits} hits, {context.misses} misses")
         
         # Group signals by symbol and type
         buy_votes: Dict[str, List[Signal]] = {}
@@ -8,6 +8,7 @@ import numpy as np
 from typing import List
 from datetime import datetime
 
+from analysis.indicators.context import IndicatorContext
 from .base import BaseStrategy, Signal, SignalType
 
 
@@ -31,20 +32,13 @@ class MeanReversionStrategy(BaseStrategy):
         self.bb_period = config.get('bb_period', 20)
         self.bb_std = config.get('bb_std', 2)
         
-    def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate Relative Strength Index"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def calculate_bollinger_bands(self, data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_bollinger_bands(self, data: pd.DataFrame,
+                                  context: IndicatorContext = None) -> pd.DataFrame:
         """Calculate Bollinger Bands"""
+        context = context or self.get_indicator_context(data)
         df = data.copy()
-        df['sma'] = df['close'].rolling(window=self.bb_period).mean()
-        df['std'] = df['close'].rolling(window=self.bb_period).std()
+        df['sma'] = context.sma(self.bb_period)
+        df['std'] = context.rolling_std(self.bb_period)
         df['upper_band'] = df['sma'] + (df['std'] * self.bb_std)
         df['lower_band'] = df['sma'] - (df['std'] * self.bb_std)
         df['band_width'] = df['upper_band'] - df['lower_band']
@@ -55,13 +49,14 @@ class MeanReversionStrategy(BaseStrategy):
         """
         Calculate RSI and Bollinger Bands.
         """
+        context = self.get_indicator_context(data)
         df = data.copy()
         
         # Calculate RSI
-        df['rsi'] = self.calculate_rsi(df['close'], self.rsi_period)
+        df['rsi'] = context.rsi(self.rsi_period)
         
         # Calculate Bollinger Bands
-        df = self.calculate_bollinger_bands(df)
+        df = self.calculate_bollinger_bands(df, context)
         
         # Mean reversion signals
         df['oversold_signal'] = (df['rsi'] < self.oversold) & (df['close'] <= df['lower_band'])
@@ -128,3 +123,25 @@ class MeanReversionStrategy(BaseStrategy):
             self.signals.append(signal)
         
         return signals
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of generate_signals() for every candle.
+        """
+        signals = pd.Series(0, index=data.index, dtype=np.int8)
+
+        if not self.validate_data(data) or len(data) < 2:
+            return signals
+
+        df = self.calculate_indicators(data)
+
+        oversold = df['oversold_signal']
+        overbought = df['overbought_signal']
+        buy = oversold & ~oversold.shift(1, fill_value=False)
+        sell = ~buy & overbought & ~overbought.shift(1, fill_value=False)
+
+        signals[buy.to_numpy()] = 1
+        signals[sell.to_numpy()] = -1
+        signals.iloc[0] = 0
+
+        return signals
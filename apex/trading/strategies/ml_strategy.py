@@ -8,10 +8,11 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from ..strategies.base import BaseStrategy, Signal, SignalType
-from ..ml.features import FeatureEngineer, FeatureConfig
-from ..ml.models import RandomForestPriceModel, ModelType, Prediction
-from ..ml.anomaly import AnomalyDetector, MarketRegimeDetector
+from .base import BaseStrategy, Signal, SignalType
+from analysis.ml.features import FeatureEngineer, FeatureConfig
+from analysis.ml.feature_store import FeatureStore
+from analysis.ml.models import RandomForestPriceModel, ModelType, BatchPrediction
+from analysis.ml.anomaly import AnomalyDetector, MarketRegimeDetector
 
 
 class MLStrategy(BaseStrategy):
@@ -35,10 +36,15 @@ class MLStrategy(BaseStrategy):
             include_bollinger=config.get('include_bollinger', True),
             include_atr=config.get('include_atr', True),
             include_volume=config.get('include_volume', True),
-            include_candlestick=config.get('include_candlestick', True)
+            include_candlestick=config.get('include_candlestick', True),
+            compact=config.get('compact_features', False)
         )
         self.feature_engineer = FeatureEngineer(feature_config)
         
+        # Optional on-disk cache of training features (directory path)
+        store_dir = config.get('feature_store')
+        self.feature_store = FeatureStore(store_dir) if store_dir else None
+        
         # ML Model
         self.model = RandomForestPriceModel(
             model_type=ModelType.CLASSIFICATION,
@@ -57,6 +63,12 @@ class MLStrategy(BaseStrategy):
         self.use_anomaly_filter = config.get('use_anomaly_filter', True)
         self.regime_preference = config.get('regime_preference', None)  # 'trending', 'ranging', None
         
+        # Stream features bar by bar instead of rebuilding them on every call.
+        # Features then cover the whole stream, not just the window passed in.
+        self.incremental_features = config.get('incremental_features', False)
+        self._live_features = None
+        self._live_last = None
+        
         # Training state
         self.is_trained = False
         self.training_data_size = config.get('training_data_size', 500)
@@ -70,16 +82,21 @@ class MLStrategy(BaseStrategy):
         """
         print(f"Training ML model on {len(historical_data)} samples...")
         
-        # Create features
-        df = self.feature_engineer.create_features(historical_data)
-        
-        # Create target
         horizon = self.config.get('prediction_horizon', 5)
         threshold = self.config.get('return_threshold', 0.01)
-        df = self.feature_engineer.create_target(df, horizon=horizon, threshold=threshold)
-        
-        # Get feature matrix
-        X, y = self.feature_engineer.get_feature_matrix(df, drop_na=True)
+        symbol = self.symbols[0] if self.symbols else 'UNKNOWN'
+        
+        if self.feature_store is not None:
+            # Reuse features cached by earlier trainings on the same candles
+            X, y = self.feature_store.get_training_data(
+                self.feature_engineer, historical_data, symbol, self.timeframe,
+                horizon=horizon, threshold=threshold
+            )
+        else:
+            # Create features and target
+            df = self.feature_engineer.create_features(historical_data)
+            df = self.feature_engineer.create_target(df, horizon=horizon, threshold=threshold)
+            X, y = self.feature_engineer.get_feature_matrix(df, drop_na=True)
         
         if len(X) < 100:
             print(f"Warning: Insufficient training data ({len(X)} samples)")
@@ -96,7 +113,7 @@ class MLStrategy(BaseStrategy):
             print(importance_df.head(10).to_string(index=False))
         
         # Fit anomaly detector
-        self.anomaly_detector.fit(historical_data, self.symbols[0] if self.symbols else 'UNKNOWN')
+        self.anomaly_detector.fit(historical_data, symbol)
         
         print(f"Training complete. Model ready for predictions.")
     
@@ -118,11 +135,8 @@ class MLStrategy(BaseStrategy):
         if not self.is_trained:
             return signals
         
-        # Create features for latest data
-        df = self.feature_engineer.create_features(data)
-        
         # Get latest features
-        latest_features = df[self.feature_engineer.feature_names].iloc[-1:]
+        latest_features = self._latest_features(data)
         
         # Check for NaN
         if latest_features.isna().any().any():
@@ -142,19 +156,11 @@ class MLStrategy(BaseStrategy):
         # Detect market regime
         regime_info = self.regime_detector.detect_regime(data)
         
-        # Filter signals based on regime preference
-        if self.use_regime_filter and self.regime_preference:
-            if self.regime_preference == 'trending' and 'trend' not in regime_info['regime']:
-                return signals
-            if self.regime_preference == 'ranging' and regime_info['regime'] != 'ranging':
-                return signals
+        if not self._passes_filters(regime_info):
+            return signals
         
-        # Filter signals during high anomaly periods
-        if self.use_anomaly_filter:
-            high_severity_anomalies = [a for a in anomalies if a.severity > 0.8]
-            if high_severity_anomalies:
-                # Reduce confidence during anomalies
-                prediction.confidence *= 0.5
+        # Reduce confidence during high anomaly periods
+        prediction.confidence *= self._anomaly_factor(anomalies)
         
         # Generate signal if confidence is high enough
         if prediction.confidence >= self.min_confidence and prediction.probability >= self.prediction_threshold:
@@ -198,6 +204,129 @@ class MLStrategy(BaseStrategy):
         
         return signals
     
+    def _latest_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Feature row of the last candle"""
+        if not self.incremental_features:
+            df = self.feature_engineer.create_features(data)
+            return df[self.feature_engineer.feature_names].iloc[-1:]
+        
+        # Candles are identified by open time, which survives re-fetching
+        stamps = pd.Index(data['timestamp']) if 'timestamp' in data.columns else data.index
+        last = stamps[-1]
+        live = self._live_features
+        if live is not None and last == self._live_last:
+            row = live.latest
+        elif live is not None and len(data) > 1 and stamps[-2] == self._live_last:
+            candle = data.iloc[-1]
+            row = live.update(candle['open'], candle['high'], candle['low'],
+                              candle['close'], candle['volume'])
+        else:
+            # First call, or the data doesn't continue the stream: rebuild
+            live = self._live_features = self.feature_engineer.incremental()
+            row = live.warm_up(data)
+        self._live_last = last
+        
+        return pd.DataFrame([row], index=data.index[-1:])[self.feature_engineer.feature_names]
+    
+    def _passes_filters(self, regime_info: Dict) -> bool:
+        """Regime preference filter"""
+        if self.use_regime_filter and self.regime_preference:
+            if self.regime_preference == 'trending' and 'trend' not in regime_info['regime']:
+                return False
+            if self.regime_preference == 'ranging' and regime_info['regime'] != 'ranging':
+                return False
+        return True
+    
+    def _anomaly_factor(self, anomalies: List) -> float:
+        """Confidence multiplier for high-severity anomalies"""
+        if self.use_anomaly_filter and any(a.severity > 0.8 for a in anomalies):
+            return 0.5
+        return 1.0
+    
+    def _is_actionable(self, prediction: BatchPrediction) -> np.ndarray:
+        """Rows whose prediction is confident enough to trade"""
+        return ((prediction.confidence >= self.min_confidence) &
+                (prediction.probability >= self.prediction_threshold) &
+                (prediction.direction != 0))
+    
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Signals for every candle with a single batched model call.
+        
+        Features are built once over the whole frame and every bar is scored
+        in one predict_batch(). The regime and anomaly filters look at the
+        history up to each bar, so they only run on bars whose prediction
+        already clears the thresholds. An untrained model is trained on the
+        same candles generate_signals() would train it on.
+        """
+        signals = pd.Series(0, index=data.index, dtype=int)
+        if len(data) < 50:
+            return signals
+        
+        first = 49
+        if not self.is_trained:
+            # generate_signals() retries training on every candle until it succeeds
+            for end in range(max(self.training_data_size, 50), len(data) + 1):
+                self.train(data.iloc[:end])
+                if self.is_trained:
+                    first = end - 1
+                    break
+        
+        if not self.is_trained:
+            return signals
+        
+        df = self.feature_engineer.create_features(data)
+        features = df[self.feature_engineer.feature_names].iloc[first:]
+        valid = features.notna().all(axis=1).to_numpy()
+        if not valid.any():
+            return signals
+        
+        batch = self.model.predict_batch(features[valid])
+        bars = np.flatnonzero(valid) + first
+        actionable = self._is_actionable(batch)
+        symbol = self.symbols[0] if self.symbols else 'UNKNOWN'
+        
+        values = signals.to_numpy(copy=True)
+        for i in np.flatnonzero(actionable):
+            bar = bars[i]
+            history = data.iloc[:bar + 1]
+            anomalies = self.anomaly_detector.detect(history, symbol)
+            if not self._passes_filters(self.regime_detector.detect_regime(history)):
+                continue
+            if batch.confidence[i] * self._anomaly_factor(anomalies) < self.min_confidence:
+                continue
+            values[bar] = batch.direction[i]
+        
+        return pd.Series(values, index=data.index)
+    
+    def predict_symbols(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Score the latest candle of many symbols in one model call.
+        
+        Args:
+            data: OHLCV DataFrame per symbol
+            
+        Returns:
+            DataFrame indexed by symbol with direction, probability,
+            confidence and expected_return (symbols whose latest features
+            are incomplete are left out)
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        rows = {}
+        for symbol, frame in data.items():
+            df = self.feature_engineer.create_features(frame)
+            latest = df[self.feature_engineer.feature_names].iloc[-1]
+            if latest.notna().all():
+                rows[symbol] = latest
+        
+        if not rows:
+            return BatchPrediction.from_predictions([]).to_frame()
+        
+        X = pd.DataFrame.from_dict(rows, orient='index')
+        return self.model.predict_batch(X).to_frame(index=X.index)
+    
     def get_model_info(self) -> Dict:
         """Get information about the trained model"""
         if not self.is_trained:
@@ -33,15 +33,17 @@ class MultiTimeframeStrategy(BaseStrategy):
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate indicators for current timeframe"""
+        context = self.get_indicator_context(data)
+        
         # EMA for trend
-        data['ema'] = data['close'].ewm(span=self.ema_period, adjust=False).mean()
+        data['ema'] = context.ema(self.ema_period)
         data['trend_up'] = data['close'] > data['ema']
         
         # RSI for momentum
-        data['rsi'] = self._calculate_rsi(data['close'], self.rsi_period)
+        data['rsi'] = context.rsi(self.rsi_period)
         
         # MACD for confirmation
-        data['macd'], data['macd_signal'], data['macd_hist'] = self._calculate_macd(data['close'])
+        data['macd'], data['macd_signal'], data['macd_hist'] = context.macd()
         
         return data
     
@@ -57,6 +59,9 @@ class MultiTimeframeStrategy(BaseStrategy):
         if len(data) < 3:
             return signals
         
+        if 'trend_up' not in data.columns:
+            data = self.calculate_indicators(data.copy())
+        
         current = data.iloc[-1]
         previous = data.iloc[-2]
         
@@ -105,25 +110,6 @@ class MultiTimeframeStrategy(BaseStrategy):
         
         return signals
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_macd(self, prices: pd.Series, 
-                       fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
-        """Calculate MACD"""
-        ema_fast = prices.ewm(span=fast, adjust=False).mean()
-        ema_slow = prices.ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        histogram = macd_line - signal_line
-        return macd_line, signal_line, histogram
-    
     def _calculate_confidence(self, data: pd.Series, direction: str) -> float:
         """Calculate signal confidence based on indicator strength"""
         confidence = 0.5
@@ -34,12 +34,14 @@ class TrendFollowingStrategy(BaseStrategy):
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate EMAs and ADX for trend detection"""
+        context = self.get_indicator_context(data)
+        
         # Calculate EMAs
-        data['ema_fast'] = data['close'].ewm(span=self.fast_ema_period, adjust=False).mean()
-        data['ema_slow'] = data['close'].ewm(span=self.slow_ema_period, adjust=False).mean()
+        data['ema_fast'] = context.ema(self.fast_ema_period)
+        data['ema_slow'] = context.ema(self.slow_ema_period)
         
         # Calculate ADX
-        data['adx'] = self._calculate_adx(data, period=14)
+        data['adx'] = context.adx(14)
         
         # Trend direction
         data['trend_up'] = (data['close'] > data['ema_fast']) & (data['ema_fast'] > data['ema_slow'])
@@ -58,6 +60,9 @@ class TrendFollowingStrategy(BaseStrategy):
         if len(data) < 2:
             return signals
         
+        if 'trend_up' not in data.columns:
+            data = self.calculate_indicators(data.copy())
+        
         current = data.iloc[-1]
         previous = data.iloc[-2]
         
@@ -140,39 +145,31 @@ class TrendFollowingStrategy(BaseStrategy):
                     ))
         
         return signals
-    
-    def _calculate_adx(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average Directional Index"""
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        # True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # Plus Directional Movement (+DM)
-        plus_dm = high.diff()
-        plus_dm = plus_dm.where((plus_dm > 0) & (plus_dm > -low.diff()), 0)
-        
-        # Minus Directional Movement (-DM)
-        minus_dm = -low.diff()
-        minus_dm = minus_dm.where((minus_dm > 0) & (minus_dm > high.diff()), 0)
-        
-        # Smooth TR, +DM, -DM
-        atr = tr.rolling(window=period).mean()
-        plus_di = 100 * plus_dm.rolling(window=period).mean() / atr
-        minus_di = 100 * minus_dm.rolling(window=period).mean() / atr
-        
-        # Directional Movement Index (DX)
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        
-        # Average Directional Index (ADX)
-        adx = dx.rolling(window=period).mean()
-        
-        return adx
-    
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of generate_signals() for every candle.
+
+        Only entry signals are produced; trend reversal / weak trend exits depend
+        on self.positions, which the backtest engine does not maintain.
+        """
+        signals = pd.Series(0, index=data.index, dtype=np.int8)
+
+        if len(data) < 2 or not self.symbols:
+            return signals
+
+        df = self.calculate_indicators(data.copy())
+
+        strong = df['adx'] > self.adx_threshold
+        fresh_touch = df['near_fast_ema'] & ~df['near_fast_ema'].shift(1, fill_value=False)
+        buy = df['trend_up'] & strong & fresh_touch
+        sell = ~buy & df['trend_down'] & strong & fresh_touch
+
+        signals[buy.to_numpy()] = 1
+        signals[sell.to_numpy()] = -1
+        signals.iloc[0] = 0
+
+        return signals
+
     def __str__(self):
         return f"TrendFollowingStrategy(EMA{self.fast_ema_period}/EMA{self.slow_ema_period}, ADX>{self.adx_threshold})"